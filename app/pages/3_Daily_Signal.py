@@ -72,6 +72,9 @@ STRATEGY_OPTIONS = {
     },
 }
 
+# 历史信号表格每页行数
+HISTORY_PAGE_SIZE = 200
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
@@ -691,7 +694,7 @@ def render_historical_signals():
             start_date = date_range if not isinstance(date_range, tuple) else date_range[0]
             end_date = start_date
         
-        df = signal_store.load_signals(
+        filters = dict(
             start_date=start_date,
             end_date=end_date,
             code=code_filter if code_filter else None,
@@ -699,9 +702,9 @@ def render_historical_signals():
         )
         
         # ========== 统计概览 ==========
-        if not df.empty:
-            stats = signal_store.get_statistics(df)
-            
+        # 统计在数据库中按筛选条件直接计算，表格按页读取
+        stats = signal_store.query_statistics(**filters)
+        if stats['total_count'] > 0:
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("总信号数", stats['total_count'])
@@ -714,18 +717,45 @@ def render_historical_signals():
             
             st.divider()
             
-            # ========== 信号表格 ==========
+            # ========== 信号表格（分页） ==========
+            page_count = (stats['total_count'] - 1) // HISTORY_PAGE_SIZE + 1
+            page = 1
+            if page_count > 1:
+                page = int(st.number_input(
+                    f"页码（共 {page_count} 页）",
+                    min_value=1,
+                    max_value=page_count,
+                    value=1,
+                    step=1,
+                    key="historical_page"
+                ))
+            df = signal_store.load_signals(
+                **filters,
+                limit=HISTORY_PAGE_SIZE,
+                offset=(page - 1) * HISTORY_PAGE_SIZE
+            )
             render_historical_signal_table(df)
             
             # ========== 导出按钮 ==========
-            csv_data = signal_store.export_csv(df)
-            st.download_button(
-                label="📥 导出 CSV",
-                data=csv_data,
-                file_name=f"signals_export_{date.today().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                key="export_historical_signals"
-            )
+            # 全量结果只在点击"准备导出"后读取，按筛选条件与信号数缓存，变化后需重新准备
+            export_key = repr((sorted(filters.items()), stats['total_count']))
+            prepared = st.session_state.get('historical_export')
+            if prepared is not None and prepared[0] != export_key:
+                prepared = None
+            if prepared is None and page_count == 1:
+                prepared = (export_key, signal_store.export_csv(df))
+            if prepared is None:
+                if st.button("📦 准备导出 CSV", key="prepare_historical_export"):
+                    prepared = (export_key, signal_store.export_csv(signal_store.load_signals(**filters)))
+                    st.session_state['historical_export'] = prepared
+            if prepared is not None:
+                st.download_button(
+                    label="📥 导出 CSV",
+                    data=prepared[1],
+                    file_name=f"signals_export_{date.today().strftime('%Y%m%d')}.csv",
+                    mime="text/csv",
+                    key="export_historical_signals"
+                )
         else:
             st.info("📭 暂无历史信号记录")
 
@@ -1166,13 +1196,12 @@ def main():
             # 自动发送飞书通知 (Requirements 5.1)
             notification_config = NotificationConfigStore.load()
             if notification_config.enabled and notification_config.webhook_url:
-                # 尝试发送飞书通知
-                with st.spinner("正在发送飞书通知..."):
-                    notification_success = auto_send_notification(signals)
+                # 提交到后台分发器，发送与重试不阻塞页面
+                notification_success = auto_send_notification(signals)
                 if notification_success:
-                    status_messages.append("飞书通知已发送")
+                    status_messages.append("飞书通知已加入发送队列")
                 else:
-                    status_messages.append("飞书通知发送失败")
+                    status_messages.append("飞书通知提交失败")
             
             # 显示信号汇总表（传入状态信息）
             render_signal_summary_table(signals, status_messages)
@@ -2,9 +2,9 @@
 MiniQuant-Lite 交易记录页面
 
 提供交易记录管理功能：
-- 交易历史表格展示（盈利绿色、亏损红色高亮）
+- 交易历史表格分页展示（盈利绿色、亏损红色高亮）
 - 添加交易记录表单
-- 统计概览（总交易次数、胜率、净利润等）
+- 统计概览（总交易次数、胜率、净利润等）及按策略/月份/股票分维度表现
 - 导出 CSV 功能
 
 Requirements: 6.1, 6.2, 6.3, 6.4, 6.5, 6.6
@@ -25,6 +25,12 @@ from core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# 交易历史表格每页行数
+TRADE_PAGE_SIZE = 200
+
+# 分维度汇总的标签
+BREAKDOWN_TABS = {'strategy': '按策略', 'month': '按月份', 'code': '按股票'}
+
 
 def get_trade_journal() -> TradeJournal:
     """获取 TradeJournal 实例"""
@@ -80,6 +86,44 @@ def render_statistics_overview(journal: TradeJournal):
     with col4:
         avg_days = f"{performance.average_holding_days:.1f} 天" if performance.closed_trades > 0 else "N/A"
         st.metric("平均持仓", avg_days)
+    
+    render_performance_breakdown(journal)
+
+
+def render_performance_breakdown(journal: TradeJournal):
+    """
+    渲染分维度交易表现（按策略 / 月份 / 股票）
+    
+    直接读取交易日志的增量汇总表，不随交易数量增长而重算。
+    
+    Args:
+        journal: TradeJournal 实例
+    """
+    if journal.count_trades() == 0:
+        return
+    
+    with st.expander("📂 分维度表现", expanded=False):
+        tabs = st.tabs(list(BREAKDOWN_TABS.values()))
+        for tab, by in zip(tabs, BREAKDOWN_TABS):
+            with tab:
+                df = journal.get_performance_breakdown(by)
+                display_df = df[[by, 'total_trades', 'closed_trades', 'win_rate',
+                                 'total_profit', 'total_commission', 'net_profit']].copy()
+                display_df[by] = display_df[by].replace('', '-')
+                display_df['win_rate'] = display_df['win_rate'] * 100
+                display_df.columns = [BREAKDOWN_TABS[by][1:], '交易次数', '已平仓', '胜率',
+                                      '毛利', '手续费', '净利润']
+                st.dataframe(
+                    display_df,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        '胜率': st.column_config.NumberColumn('胜率', format='%.1f%%'),
+                        '毛利': st.column_config.NumberColumn('毛利', format='¥%.0f'),
+                        '手续费': st.column_config.NumberColumn('手续费', format='¥%.0f'),
+                        '净利润': st.column_config.NumberColumn('净利润', format='¥%.0f'),
+                    }
+                )
 
 
 def render_trade_table(journal: TradeJournal):
@@ -93,12 +137,26 @@ def render_trade_table(journal: TradeJournal):
     """
     st.subheader("📋 交易历史")
     
-    trades = journal.get_trades()
+    total_count = journal.count_trades()
     
-    if not trades:
+    if total_count == 0:
         st.info("📭 暂无交易记录，请添加您的第一笔交易")
         return
     
+    # 分页读取（最新的在前）
+    page_count = (total_count - 1) // TRADE_PAGE_SIZE + 1
+    page = 1
+    if page_count > 1:
+        page = int(st.number_input(
+            f"页码（共 {page_count} 页，{total_count} 笔）",
+            min_value=1,
+            max_value=page_count,
+            value=1,
+            step=1,
+            key="trade_table_page"
+        ))
+    trades = journal.get_trades(limit=TRADE_PAGE_SIZE, offset=(page - 1) * TRADE_PAGE_SIZE)
+    
     # 构建表格数据
     data = []
     for trade in trades:
@@ -428,9 +486,7 @@ def render_export_section(journal: TradeJournal):
     """
     st.subheader("📥 导出交易记录")
     
-    trades = journal.get_trades()
-    
-    if not trades:
+    if journal.count_trades() == 0:
         st.info("暂无交易记录可导出")
         return
     
@@ -457,14 +513,14 @@ def render_backtest_comparison(journal: TradeJournal):
     st.subheader("📊 回测对比")
     st.caption("对比实盘交易与回测结果，验证策略有效性")
     
-    trades = journal.get_trades()
+    trade_date_range = journal.date_range()
     
-    if not trades:
+    if trade_date_range is None:
         st.info("📭 暂无交易记录，无法进行回测对比")
         return
     
-    # 获取可用的策略列表（从交易记录中提取）
-    strategies_in_trades = list(set(t.strategy for t in trades if t.strategy))
+    # 获取可用的策略列表（从汇总表中读取）
+    strategies_in_trades = journal.get_strategies()
     
     if not strategies_in_trades:
         st.warning("⚠️ 交易记录中没有关联策略信息，请在添加交易时选择策略")
@@ -486,9 +542,7 @@ def render_backtest_comparison(journal: TradeJournal):
     
     with col2:
         # 获取交易记录的日期范围
-        trade_dates = [t.trade_date for t in trades]
-        min_date = min(trade_dates)
-        max_date = max(trade_dates)
+        min_date, max_date = trade_date_range
         
         start_date = st.date_input(
             "开始日期",
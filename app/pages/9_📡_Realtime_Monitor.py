@@ -39,6 +39,9 @@ from core.realtime_monitor import (
     get_market_status,
     is_trading_time,
     MarketStatus,
+    MonitorSnapshot,
+    get_monitor_service,
+    set_monitor_mode,
 )
 
 
@@ -156,39 +159,31 @@ def get_condition_color(is_met: bool) -> str:
 # ==========================================
 
 def init_session_state():
-    """初始化 session state"""
-    if 'realtime_monitor' not in st.session_state:
-        st.session_state.realtime_monitor = RealtimeMonitor()
-    
-    if 'signal_engine' not in st.session_state:
-        st.session_state.signal_engine = SignalEngine()
-    
-    if 'data_fetcher' not in st.session_state:
-        st.session_state.data_fetcher = DataFetcher()
-    
-    if 'stock_data_cache' not in st.session_state:
-        st.session_state.stock_data_cache = {}
-    
-    if 'last_refresh_time' not in st.session_state:
-        st.session_state.last_refresh_time = None
+    """初始化 session state，并确保后台刷新服务已启动"""
+    get_monitor_service().start()
     
     if 'auto_refresh' not in st.session_state:
         st.session_state.auto_refresh = False
 
 
 def get_monitor() -> RealtimeMonitor:
-    """获取监控器实例"""
-    return st.session_state.realtime_monitor
+    """获取监控器实例（由后台服务持有，所有会话共享）"""
+    return get_monitor_service().monitor
 
 
 def get_signal_engine() -> SignalEngine:
     """获取信号引擎实例"""
-    return st.session_state.signal_engine
+    return get_monitor_service().signal_engine
 
 
 def get_data_fetcher() -> DataFetcher:
     """获取数据获取器实例"""
-    return st.session_state.data_fetcher
+    return get_monitor_service().data_fetcher
+
+
+def get_snapshot() -> MonitorSnapshot:
+    """获取后台服务发布的最新快照（不触发数据获取）"""
+    return get_monitor_service().get_snapshot()
 
 
 # ==========================================
@@ -251,7 +246,7 @@ def render_watchlist_management_section():
         st.write("")  # 占位
         if st.button("➕ 添加", key="add_watchlist_btn", use_container_width=True):
             if new_code:
-                if monitor.add_to_watchlist(new_code):
+                if get_monitor_service().add_to_watchlist(new_code):
                     st.success(f"✅ 已添加 {new_code} 到监控列表")
                     st.rerun()
                 else:
@@ -259,8 +254,8 @@ def render_watchlist_management_section():
                         st.error("❌ 无效的股票代码格式（需要6位数字，以0/3/6开头）")
                     elif new_code in monitor.watchlist:
                         st.warning("⚠️ 该股票已在监控列表中")
-                    elif monitor.watchlist_size >= MONITOR_CONFIG.max_watchlist_size:
-                        st.error(f"❌ 监控列表已满（最多{MONITOR_CONFIG.max_watchlist_size}只）")
+                    elif monitor.watchlist_size >= monitor.config.max_watchlist_size:
+                        st.error(f"❌ 监控列表已满（最多{monitor.config.max_watchlist_size}只）")
             else:
                 st.warning("⚠️ 请输入股票代码")
     
@@ -271,10 +266,10 @@ def render_watchlist_management_section():
         st.info("📭 监控列表为空，请添加股票")
         return
     
-    st.markdown(f"**当前监控: {len(watchlist)}/{MONITOR_CONFIG.max_watchlist_size} 只**")
+    st.markdown(f"**当前监控: {len(watchlist)}/{monitor.config.max_watchlist_size} 只**")
     
     # 获取股票数据
-    stock_data_cache = st.session_state.stock_data_cache
+    stock_data_cache = get_snapshot().stock_data
     
     # 构建表格数据
     data = []
@@ -315,7 +310,7 @@ def render_watchlist_management_section():
         st.write("")  # 占位
         if st.button("🗑️ 删除", key="delete_watchlist_btn", type="secondary"):
             if delete_code:
-                if monitor.remove_from_watchlist(delete_code):
+                if get_monitor_service().remove_from_watchlist(delete_code):
                     st.success(f"✅ 已从监控列表移除 {delete_code}")
                     st.rerun()
 
@@ -377,7 +372,7 @@ def render_position_management_section():
                 elif not pos_name:
                     st.error("请输入股票名称")
                 else:
-                    success = monitor.add_position(
+                    success = get_monitor_service().add_position(
                         code=pos_code,
                         name=pos_name,
                         cost_price=pos_cost,
@@ -453,7 +448,7 @@ def render_position_management_section():
         if st.button("🗑️ 删除", key="delete_position_btn", type="secondary"):
             if delete_pos:
                 code = delete_pos.split(" - ")[0]
-                if monitor.remove_position(code):
+                if get_monitor_service().remove_position(code):
                     st.success(f"✅ 已删除持仓 {code}")
                     st.rerun()
 
@@ -468,18 +463,10 @@ def render_buy_signals_section():
     st.subheader("🟢 买入信号")
     
     monitor = get_monitor()
-    signal_engine = get_signal_engine()
-    stock_data_cache = st.session_state.stock_data_cache
+    watchlist = set(monitor.watchlist)
     
-    # 检查监控列表中的买入信号
-    buy_signals = []
-    
-    for code in monitor.watchlist:
-        stock_data = stock_data_cache.get(code)
-        if stock_data:
-            signal = signal_engine.generate_buy_signal(stock_data)
-            if signal:
-                buy_signals.append(signal)
+    # 买入信号由后台服务在刷新时生成
+    buy_signals = [s for s in get_snapshot().buy_signals if s.code in watchlist]
     
     if not buy_signals:
         st.info("📭 当前无买入信号")
@@ -565,8 +552,6 @@ def render_sell_signals_section():
     st.subheader("🔴 卖出信号")
     
     monitor = get_monitor()
-    signal_engine = get_signal_engine()
-    stock_data_cache = st.session_state.stock_data_cache
     
     positions = monitor.positions
     
@@ -574,14 +559,8 @@ def render_sell_signals_section():
         st.info("📭 暂无持仓，无需检查卖出信号")
         return
     
-    # 检查所有持仓的卖出信号
-    all_sell_signals = []
-    
-    for code, position in positions.items():
-        stock_data = stock_data_cache.get(code)
-        if stock_data:
-            signals = signal_engine.generate_sell_signals(position, stock_data)
-            all_sell_signals.extend(signals)
+    # 卖出信号由后台服务在刷新时生成
+    all_sell_signals = [s for s in get_snapshot().sell_signals if s.code in positions]
     
     if not all_sell_signals:
         st.success("✅ 当前持仓无卖出信号")
@@ -692,7 +671,7 @@ def render_technical_indicators_section():
     st.subheader("📊 技术指标面板")
     
     monitor = get_monitor()
-    stock_data_cache = st.session_state.stock_data_cache
+    stock_data_cache = get_snapshot().stock_data
     
     watchlist = monitor.watchlist
     
@@ -832,39 +811,16 @@ def render_technical_indicators_section():
 # ==========================================
 
 def refresh_data():
-    """刷新所有数据"""
-    monitor = get_monitor()
-    data_fetcher = get_data_fetcher()
-    
-    watchlist = monitor.watchlist
-    positions = monitor.positions
-    
-    # 合并需要获取数据的股票代码
-    all_codes = list(set(watchlist) | set(positions.keys()))
-    
-    if not all_codes:
-        return
-    
-    # 获取股票数据
-    stock_data_dict = data_fetcher.fetch_stock_data_batch(all_codes)
-    
-    # 更新缓存
-    st.session_state.stock_data_cache = stock_data_dict
-    
-    # 更新持仓价格
-    for code, stock_data in stock_data_dict.items():
-        if code in positions:
-            monitor.update_position_price(code, stock_data.current_price)
-    
-    st.session_state.last_refresh_time = datetime.now()
+    """立即刷新所有数据（由后台服务执行，结果发布为共享快照）"""
+    get_monitor_service().refresh_now()
 
 
 def render_refresh_section():
     """渲染刷新控制区域"""
-    col1, col2, col3 = st.columns([2, 1, 1])
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
     
     with col1:
-        last_refresh = st.session_state.last_refresh_time
+        last_refresh = get_snapshot().refreshed_at
         if last_refresh:
             st.caption(f"🕐 最后刷新: {last_refresh.strftime('%Y-%m-%d %H:%M:%S')}")
         else:
@@ -875,11 +831,21 @@ def render_refresh_section():
             "自动刷新",
             value=st.session_state.auto_refresh,
             key="auto_refresh_checkbox",
-            help=f"每{MONITOR_CONFIG.refresh_interval}秒自动刷新"
+            help=f"每{get_monitor_service().config.refresh_interval}秒自动刷新"
         )
         st.session_state.auto_refresh = auto_refresh
     
     with col3:
+        bulk_mode = st.checkbox(
+            "大容量模式",
+            value=get_monitor_service().config.bulk_mode,
+            key="bulk_mode_checkbox",
+            help="行情快照 + 本地历史增量指标，监控列表上限 500 只"
+        )
+        if bulk_mode != get_monitor_service().config.bulk_mode:
+            set_monitor_mode(bulk_mode)
+    
+    with col4:
         if st.button("🔄 手动刷新", key="manual_refresh_btn", type="primary"):
             with st.spinner("正在刷新数据..."):
                 try:
@@ -1032,20 +998,15 @@ def main():
         """)
     
     # ========== 自动刷新逻辑 ==========
+    # 数据由后台服务刷新，页面仅在新快照发布后重跑读取
     if st.session_state.auto_refresh:
         market_status = get_market_status()
         if market_status.is_open:
-            # 检查是否需要刷新
-            last_refresh = st.session_state.last_refresh_time
-            if last_refresh is None or (datetime.now() - last_refresh).total_seconds() >= MONITOR_CONFIG.refresh_interval:
-                try:
-                    refresh_data()
-                except Exception as e:
-                    logger.error(f"自动刷新失败: {e}")
-            
-            # 设置自动刷新
             import time as time_module
-            time_module.sleep(0.1)  # 短暂延迟避免过于频繁
+            version = get_snapshot().version
+            deadline = time_module.monotonic() + get_monitor_service().config.refresh_interval
+            while get_snapshot().version == version and time_module.monotonic() < deadline:
+                time_module.sleep(0.5)
             st.rerun()
 
 
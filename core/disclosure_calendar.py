@@ -0,0 +1,322 @@
+"""
+MiniQuant-Lite 财报披露日历模块
+
+按报告期一次性下载全市场财报预约披露时间表（stock_yysj_em）与业绩预告（stock_yjyg_em），
+持久化到 data/disclosure_calendar/，并在内存中建立按股票代码排序的日期数组索引。
+
+查询复杂度：
+- 单只股票窗口期检查：二分查找 O(log n)
+- 一批股票的即将披露查询：全局按日期排序数组二分定位区间 O(log N + m)
+
+设计原则：
+- 每个报告期只下载一次（全市场单次请求），与被查询股票数量无关
+- 本地缓存有效期内直接读盘，不发起网络请求
+- 网络不可用时退化为空日历，由调用方使用估算窗口
+"""
+
+import bisect
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# 报告期 -> 报告类型
+PERIOD_REPORT_TYPES = {
+    '03-31': '一季报',
+    '06-30': '中报',
+    '09-30': '三季报',
+    '12-31': '年报',
+}
+
+
+def recent_report_periods(today: date, count: int = 2) -> List[date]:
+    """
+    获取截至 today 最近的 count 个报告期（季度末）
+
+    例如 2026-04-15 → [2026-03-31, 2025-12-31]，覆盖一季报与年报的披露季。
+    """
+    quarter_ends = [(3, 31), (6, 30), (9, 30), (12, 31)]
+    periods: List[date] = []
+    year = today.year
+    while len(periods) < count:
+        for month, day in reversed(quarter_ends):
+            period = date(year, month, day)
+            if period <= today:
+                periods.append(period)
+                if len(periods) == count:
+                    break
+        year -= 1
+    return periods
+
+
+class DisclosureCalendar:
+    """
+    财报披露日历（区间索引）
+
+    内部结构：
+    - _code_index: {code: (sorted_ordinals, report_types, report_periods)}
+    - _all_ordinals / _all_entries: 全市场按披露日排序的平行数组
+    """
+
+    DEFAULT_DIR = Path("data/disclosure_calendar")
+    DEFAULT_MAX_AGE_DAYS = 3
+    COLUMNS = ['code', 'report_type', 'report_period', 'disclosure_date', 'fetched_at']
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_age_days: int = DEFAULT_MAX_AGE_DAYS):
+        """
+        Args:
+            cache_dir: 日历缓存目录
+            max_age_days: 缓存有效期（天），预约时间可能变更，过期后重新下载
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else self.DEFAULT_DIR
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self._loaded_for: Optional[date] = None
+        self._code_index: Dict[str, Tuple[List[int], List[str], List[str]]] = {}
+        self._all_ordinals: List[int] = []
+        self._all_entries: List[Tuple[str, str, str]] = []
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self._code_index)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._code_index
+
+    # ========== 加载与构建 ==========
+
+    def ensure_loaded(self, today: Optional[date] = None) -> bool:
+        """
+        确保当日日历已加载（每天最多加载一次，线程安全）
+
+        Returns:
+            日历是否可用
+        """
+        today = today or date.today()
+        if self._loaded_for == today:
+            return self.is_loaded
+
+        with self._lock:
+            if self._loaded_for == today:
+                return self.is_loaded
+
+            frames = []
+            for period in recent_report_periods(today):
+                df = self._load_period(period)
+                if df is not None and not df.empty:
+                    frames.append(df)
+
+            self.build_index(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=self.COLUMNS))
+            self._loaded_for = today
+            return self.is_loaded
+
+    def invalidate(self) -> None:
+        """使当日加载标记失效，下次查询时重新读取（缓存过期时重新下载）"""
+        with self._lock:
+            self._loaded_for = None
+
+    def build_index(self, calendar_df: pd.DataFrame) -> None:
+        """
+        根据日历表构建区间索引
+
+        Args:
+            calendar_df: 包含 code, report_type, report_period, disclosure_date 列
+        """
+        code_rows: Dict[str, List[Tuple[int, str, str]]] = {}
+        all_rows: List[Tuple[int, str, str, str]] = []
+
+        if not calendar_df.empty:
+            dates = pd.to_datetime(calendar_df['disclosure_date'], errors='coerce')
+            for code, report_type, report_period, ts in zip(
+                calendar_df['code'].astype(str).str.zfill(6),
+                calendar_df['report_type'].astype(str),
+                calendar_df['report_period'].astype(str),
+                dates
+            ):
+                if pd.isna(ts):
+                    continue
+                ordinal = ts.date().toordinal()
+                code_rows.setdefault(code, []).append((ordinal, report_type, report_period))
+                all_rows.append((ordinal, code, report_type, report_period))
+
+        code_index = {}
+        for code, rows in code_rows.items():
+            rows = sorted(set(rows))
+            code_index[code] = (
+                [r[0] for r in rows],
+                [r[1] for r in rows],
+                [r[2] for r in rows],
+            )
+
+        all_rows.sort()
+        self._code_index = code_index
+        self._all_ordinals = [r[0] for r in all_rows]
+        self._all_entries = [(r[1], r[2], r[3]) for r in all_rows]
+        logger.info(f"财报披露日历索引完成: {len(code_index)} 只股票, {len(all_rows)} 条披露记录")
+
+    def _period_path(self, period: date) -> Path:
+        return self.cache_dir / f"{period.strftime('%Y%m%d')}.csv"
+
+    def _load_period(self, period: date) -> Optional[pd.DataFrame]:
+        """读取报告期日历，缓存缺失或过期时重新下载"""
+        path = self._period_path(period)
+
+        cached = None
+        if path.exists():
+            try:
+                cached = pd.read_csv(path, dtype={'code': str})
+                fetched_at = pd.to_datetime(cached['fetched_at'], errors='coerce').max()
+                if not pd.isna(fetched_at) and datetime.now() - fetched_at <= timedelta(days=self.max_age_days):
+                    return cached
+            except Exception as e:
+                logger.warning(f"读取披露日历缓存失败: {path}, {e}")
+                cached = None
+
+        fetched = self.fetch_period(period)
+        if fetched is not None and not fetched.empty:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                fetched.to_csv(path, index=False)
+            except Exception as e:
+                logger.warning(f"保存披露日历失败: {path}, {e}")
+            return fetched
+
+        # 下载失败时继续使用过期缓存
+        return cached
+
+    def fetch_period(self, period: date) -> Optional[pd.DataFrame]:
+        """
+        下载一个报告期的全市场披露日历
+
+        - 预约披露时间：实际披露 > 最后一次变更 > 首次预约
+        - 业绩预告：公告日期
+
+        Returns:
+            日历表，失败返回 None
+        """
+        try:
+            import akshare as ak
+        except ImportError:
+            return None
+
+        period_str = period.strftime('%Y%m%d')
+        report_type = PERIOD_REPORT_TYPES.get(period.strftime('%m-%d'), '财报')
+        fetched_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        frames = []
+
+        try:
+            df = ak.stock_yysj_em(symbol="沪深A股", date=period_str)
+            if df is not None and not df.empty:
+                disclosure = pd.Series(pd.NaT, index=df.index)
+                for col in ['首次预约时间', '一次变更日期', '二次变更日期', '三次变更日期', '实际披露时间']:
+                    if col in df.columns:
+                        values = pd.to_datetime(df[col], errors='coerce')
+                        disclosure = values.where(values.notna(), disclosure)
+                frames.append(pd.DataFrame({
+                    'code': df['股票代码'].astype(str),
+                    'report_type': report_type,
+                    'report_period': period.isoformat(),
+                    'disclosure_date': disclosure.dt.strftime('%Y-%m-%d'),
+                }))
+        except Exception as e:
+            logger.warning(f"下载财报预约披露时间失败: {period_str}, {e}")
+
+        try:
+            df = ak.stock_yjyg_em(date=period_str)
+            if df is not None and not df.empty:
+                frames.append(pd.DataFrame({
+                    'code': df['股票代码'].astype(str),
+                    'report_type': '业绩预告',
+                    'report_period': period.isoformat(),
+                    'disclosure_date': pd.to_datetime(df['公告日期'], errors='coerce').dt.strftime('%Y-%m-%d'),
+                }))
+        except Exception as e:
+            logger.warning(f"下载业绩预告失败: {period_str}, {e}")
+
+        if not frames:
+            return None
+
+        result = pd.concat(frames, ignore_index=True).dropna(subset=['disclosure_date'])
+        result = result.drop_duplicates(subset=['code', 'report_type', 'disclosure_date'])
+        result['fetched_at'] = fetched_at
+        logger.info(f"财报披露日历下载完成: {period_str}, {len(result)} 条记录")
+        return result[self.COLUMNS]
+
+    # ========== 查询 ==========
+
+    def find_in_window(
+        self,
+        code: str,
+        check_date: date,
+        window_days: int
+    ) -> Optional[Tuple[date, str, str]]:
+        """
+        查找 check_date 前后 window_days 天内的披露记录（二分查找）
+
+        Returns:
+            (披露日期, 报告类型, 报告期)，无则返回 None
+        """
+        entry = self._code_index.get(code)
+        if entry is None:
+            return None
+
+        ordinals, report_types, report_periods = entry
+        target = check_date.toordinal()
+        idx = bisect.bisect_left(ordinals, target - window_days)
+        if idx < len(ordinals) and ordinals[idx] <= target + window_days:
+            return date.fromordinal(ordinals[idx]), report_types[idx], report_periods[idx]
+        return None
+
+    def get_reports(self, code: str) -> List[Tuple[date, str, str]]:
+        """获取单只股票全部披露记录（按日期升序）"""
+        entry = self._code_index.get(code)
+        if entry is None:
+            return []
+        ordinals, report_types, report_periods = entry
+        return [
+            (date.fromordinal(o), t, p)
+            for o, t, p in zip(ordinals, report_types, report_periods)
+        ]
+
+    def upcoming(
+        self,
+        start: date,
+        end: date,
+        codes: Optional[set] = None
+    ) -> List[Tuple[str, date, str, str]]:
+        """
+        查询 [start, end] 区间内披露的记录（按日期升序）
+
+        Returns:
+            [(code, 披露日期, 报告类型, 报告期)]
+        """
+        lo = bisect.bisect_left(self._all_ordinals, start.toordinal())
+        hi = bisect.bisect_right(self._all_ordinals, end.toordinal())
+
+        result = []
+        for i in range(lo, hi):
+            code, report_type, report_period = self._all_entries[i]
+            if codes is None or code in codes:
+                result.append((code, date.fromordinal(self._all_ordinals[i]), report_type, report_period))
+        return result
+
+
+# 全局共享实例
+_disclosure_calendar: Optional[DisclosureCalendar] = None
+_disclosure_calendar_lock = threading.Lock()
+
+
+def get_disclosure_calendar() -> DisclosureCalendar:
+    """获取全局共享的财报披露日历"""
+    global _disclosure_calendar
+    if _disclosure_calendar is None:
+        with _disclosure_calendar_lock:
+            if _disclosure_calendar is None:
+                _disclosure_calendar = DisclosureCalendar()
+    return _disclosure_calendar
@@ -0,0 +1,185 @@
+"""
+MiniQuant-Lite 持仓卖出特征批量计算
+
+卖出检查（SellSignalChecker / TechExitManager）原先逐只持仓加载数据、
+逐只计算 ATR / RSI / 均线 / RSRS / MA20 跌破天数。
+
+本模块将全部持仓的历史数据一次并行加载，右对齐堆叠为 持仓 × 交易日 矩阵
+（较短的历史在左侧以 NaN 填充），各项特征按矩阵一次算出，
+卖出规则随后以数组掩码的方式应用。
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+
+def load_frames(data_feed, codes: Iterable[str], max_workers: int = 8) -> Dict[str, pd.DataFrame]:
+    """
+    并行加载多只股票的历史数据
+
+    Args:
+        data_feed: 数据源（需提供 load_processed_data）
+        codes: 股票代码
+        max_workers: 加载线程数
+
+    Returns:
+        {code: DataFrame}，无数据或加载失败的股票不在结果中
+    """
+    codes = list(dict.fromkeys(codes))
+
+    def load(code: str) -> Optional[pd.DataFrame]:
+        try:
+            return data_feed.load_processed_data(code)
+        except Exception as e:
+            logger.warning(f"获取 {code} 数据失败: {e}")
+            return None
+
+    if not codes:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(codes))) as executor:
+        loaded = list(executor.map(load, codes))
+
+    return {
+        code: df for code, df in zip(codes, loaded)
+        if df is not None and not df.empty
+    }
+
+
+class PortfolioBars:
+    """
+    持仓 × 交易日 的行情矩阵
+
+    每行对应一只持仓，数据右对齐（最后一列为最新交易日），
+    历史较短的持仓左侧以 NaN 填充；lengths 记录每行的真实数据长度。
+    """
+
+    def __init__(self, frames: List[pd.DataFrame]):
+        """
+        Args:
+            frames: 各持仓的历史数据（按日期升序），顺序即矩阵行序
+        """
+        self.frames = frames
+        self.lengths = np.array([len(df) for df in frames], dtype=int)
+        self.width = int(self.lengths.max()) if len(frames) else 0
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def column(self, name: str) -> np.ndarray:
+        """取某一列的矩阵（缺失该列的持仓整行为 NaN）"""
+        if name not in self._columns:
+            matrix = np.full((len(self.frames), self.width), np.nan)
+            for i, df in enumerate(self.frames):
+                if name in df.columns and len(df):
+                    matrix[i, self.width - len(df):] = df[name].to_numpy(dtype=float)
+            self._columns[name] = matrix
+        return self._columns[name]
+
+    def last(self, name: str) -> np.ndarray:
+        """某一列的最新值"""
+        if not self.width:
+            return np.full(len(self.frames), np.nan)
+        return self.column(name)[:, -1].copy()
+
+    @staticmethod
+    def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+        """
+        按行滚动均值（与 pandas Series.rolling(window).mean() 一致，
+        窗口内有 NaN 时结果为 NaN）
+        """
+        if values.size == 0:
+            return values.copy()
+        return pd.DataFrame(values.T).rolling(window=window).mean().to_numpy(copy=True).T
+
+    def ma(self, window: int, name: str = 'close') -> np.ndarray:
+        """均线矩阵"""
+        return self.rolling_mean(self.column(name), window)
+
+    def atr(self, period: int) -> np.ndarray:
+        """
+        最新 ATR
+
+        TR = max(High - Low, |High - PrevClose|, |Low - PrevClose|)，忽略缺失项
+        ATR = TR 的 period 日均值
+        """
+        high, low, close = self.column('high'), self.column('low'), self.column('close')
+        prev_close = np.concatenate([np.full((len(self), 1), np.nan), close[:, :-1]], axis=1)
+        tr = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+        return self.rolling_mean(tr, period)[:, -1]
+
+    def rsi_averages(self, period: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        最新 RSI 的平均涨幅与平均跌幅
+
+        首日及缺失值的涨跌幅按 0 计（与 delta.where(delta > 0, 0) 一致），
+        真实数据不足 period 天的持仓返回 NaN。
+        """
+        close = self.column('close')
+        delta = np.diff(close, axis=1, prepend=np.nan)
+        with np.errstate(invalid='ignore'):
+            gain = np.where(delta > 0, delta, 0.0)
+            loss = np.where(delta < 0, -delta, 0.0)
+        avg_gain = self.rolling_mean(gain, period)[:, -1]
+        avg_loss = self.rolling_mean(loss, period)[:, -1]
+        short = self.lengths < period
+        avg_gain[short] = np.nan
+        avg_loss[short] = np.nan
+        return avg_gain, avg_loss
+
+    def below_streak(self, reference: np.ndarray, name: str = 'close') -> np.ndarray:
+        """
+        从最新交易日往前数，连续 收盘价 < reference 的天数
+
+        遇到缺失值即停止计数。
+        """
+        if not self.width:
+            return np.zeros(len(self), dtype=int)
+        with np.errstate(invalid='ignore'):
+            below = self.column(name) < reference
+        reversed_below = below[:, ::-1]
+        return np.where(reversed_below.all(axis=1), self.width, reversed_below.argmin(axis=1))
+
+    def rsrs_scores(self, n_period: int, m_period: int, min_betas: int) -> np.ndarray:
+        """
+        最新 RSRS 标准分
+
+        Beta 为最近 n_period 天 High 对 Low 的回归斜率（分母为 0 时取 1），
+        标准分 = (当前 Beta - 最近 m_period 个 Beta 均值) / 标准差（标准差为 0 时取 0）。
+        标准分只依赖最近 m_period 个 Beta，因此每只持仓只取最后 m_period + n_period - 1 天；
+        截取长度相同的持仓一起用滑动窗口计算。
+
+        Returns:
+            标准分数组，Beta 数量不足 min_betas 的持仓为 NaN
+        """
+        scores = np.full(len(self), np.nan)
+        max_rows = m_period + n_period - 1
+        rows_needed = np.minimum(self.lengths, max_rows)
+        eligible = self.lengths - n_period + 1 >= min_betas
+
+        high, low = self.column('high'), self.column('low')
+        for rows in np.unique(rows_needed[eligible]):
+            idx = np.flatnonzero(eligible & (rows_needed == rows))
+            h = sliding_window_view(high[idx, self.width - rows:], n_period, axis=1)
+            l = sliding_window_view(low[idx, self.width - rows:], n_period, axis=1)
+
+            x_dev = l - l.mean(axis=2, keepdims=True)
+            y_dev = h - h.mean(axis=2, keepdims=True)
+            numerator = (x_dev * y_dev).sum(axis=2)
+            denominator = (x_dev ** 2).sum(axis=2)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                betas = np.where(denominator != 0, numerator / denominator, 1.0)
+
+            mean_beta = betas.mean(axis=1)
+            std_beta = betas.std(axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                scores[idx] = np.where(std_beta > 0, (betas[:, -1] - mean_beta) / std_beta, 0.0)
+
+        return scores
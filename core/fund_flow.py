@@ -0,0 +1,416 @@
+"""
+MiniQuant-Lite 全市场资金流向模块
+
+一次请求下载全市场个股资金流排行（stock_individual_fund_flow_rank），
+按交易日追加到本地历史库 data/fund_flow/，并在内存中提供：
+- 当日主力净流入（元）与净占比（%）
+- 近 5 日累计主力净流入（元）
+
+实时监控、v6 资金强度评分、v5 资金流向评分共享同一份数据，
+替代逐只股票调用 stock_individual_fund_flow 下载完整历史。
+
+设计原则：
+- 每个交易日一个 CSV 文件（YYYYMMDD.csv），当日多次刷新覆盖当日文件
+- 全局单例共享，查询为纯内存字典查找
+- 盘中数据超过有效期（默认 5 分钟）后刷新，收盘后的快照不再刷新
+- 本地历史不能覆盖近 5 个交易日（有缺口）时，使用排行榜自带的 5 日累计值
+- 按 code 查询默认返回最新快照（实时口径），历史调用方须指定交易日，避免未来数据
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 交易日参数：date / datetime / 'YYYY-MM-DD'
+DateLike = Union[date, datetime, str]
+
+
+@dataclass
+class FundFlowRecord:
+    """单只股票资金流向（金额单位：元）"""
+    code: str
+    name: str
+    trade_date: date
+    main_net_inflow: float          # 当日主力净流入（元）
+    main_net_inflow_pct: float      # 当日主力净流入占成交额比例（%）
+    main_net_inflow_5d: float       # 近 5 日累计主力净流入（元）
+
+
+def snapshot_trade_date(now: datetime) -> date:
+    """
+    资金流排行对应的交易日
+
+    开盘前及周末返回上一个工作日（不处理节假日）。
+    """
+    day = now.date()
+    if now.time() < time(9, 15):
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+class FundFlowStore:
+    """
+    资金流向本地历史库
+
+    内部结构：
+    - _frames: {交易日: 当日快照}
+    - _latest: {code: FundFlowRecord} 最新交易日数据
+    - _by_date: {交易日: {code: FundFlowRecord}} 已查询过的历史交易日数据
+    - _history: 日期 × 代码 的主力净流入矩阵（元）
+    """
+
+    DEFAULT_DIR = Path("data/fund_flow")
+    DEFAULT_HISTORY_DAYS = 60
+    DEFAULT_MAX_AGE_SECONDS = 300
+    SUM_DAYS = 5
+    MARKET_CLOSE = time(15, 0)
+    COLUMNS = ['code', 'name', 'main_net_inflow', 'main_net_inflow_pct', 'main_net_inflow_5d', 'updated_at']
+
+    def __init__(self,
+                 data_dir: Optional[Path] = None,
+                 history_days: int = DEFAULT_HISTORY_DAYS,
+                 max_age_seconds: int = DEFAULT_MAX_AGE_SECONDS):
+        """
+        Args:
+            data_dir: 历史库目录，默认 data/fund_flow
+            history_days: 加载到内存的交易日数量
+            max_age_seconds: 盘中快照有效期（秒）
+        """
+        self.data_dir = Path(data_dir) if data_dir is not None else self.DEFAULT_DIR
+        self.history_days = history_days
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._frames: Dict[date, pd.DataFrame] = {}
+        self._latest: Dict[str, FundFlowRecord] = {}
+        self._by_date: Dict[date, Dict[str, FundFlowRecord]] = {}
+        self._history = pd.DataFrame()
+        self._latest_date: Optional[date] = None
+        self._updated_at: Optional[datetime] = None
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._latest
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self._latest)
+
+    @property
+    def latest_date(self) -> Optional[date]:
+        return self._latest_date
+
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        return self._updated_at
+
+    # ========== 加载与写入 ==========
+
+    def _day_path(self, trade_date: date) -> Path:
+        return self.data_dir / f"{trade_date.strftime('%Y%m%d')}.csv"
+
+    def load(self) -> bool:
+        """
+        从磁盘加载最近 history_days 个交易日
+
+        Returns:
+            是否加载到数据
+        """
+        if not self.data_dir.exists():
+            return False
+
+        paths = sorted(self.data_dir.glob('[0-9]' * 8 + '.csv'))[-self.history_days:]
+        frames = {}
+        for path in paths:
+            try:
+                frames[datetime.strptime(path.stem, '%Y%m%d').date()] = pd.read_csv(path, dtype={'code': str})
+            except Exception as e:
+                logger.warning(f"读取资金流向历史失败: {path}, {e}")
+
+        if not frames:
+            return False
+
+        self._rebuild(frames)
+        logger.info(f"资金流向历史加载完成: {len(frames)} 个交易日, {len(self._latest)} 只股票")
+        return True
+
+    def _rebuild(self, frames: Dict[date, pd.DataFrame]) -> None:
+        """由 {交易日: 当日快照} 重建内存索引"""
+        history = pd.DataFrame({
+            trade_date: df.drop_duplicates(subset='code').set_index('code')['main_net_inflow']
+            for trade_date, df in sorted(frames.items())
+        }).T.sort_index()
+
+        latest_date = history.index[-1]
+        latest_df = frames[latest_date].drop_duplicates(subset='code')
+        latest = self._build_records(frames, history, latest_date)
+
+        updated_at = pd.to_datetime(latest_df['updated_at'], errors='coerce').max() \
+            if 'updated_at' in latest_df.columns else pd.NaT
+
+        with self._lock:
+            self._frames = frames
+            self._history = history
+            self._latest = latest
+            self._by_date = {latest_date: latest}
+            self._latest_date = latest_date
+            self._updated_at = None if pd.isna(updated_at) else updated_at.to_pydatetime()
+
+    @classmethod
+    def window_dates(cls, trade_date: date) -> List[date]:
+        """
+        截至 trade_date 的近 5 个交易日（按工作日推算，不处理节假日）
+        """
+        return [d.date() for d in pd.bdate_range(end=trade_date, periods=cls.SUM_DAYS)]
+
+    @classmethod
+    def _window_sum(cls, history: pd.DataFrame, trade_date: date) -> Optional[pd.Series]:
+        """
+        本地历史的近 5 日累计主力净流入
+
+        历史按交易日历重建索引，窗口内任一交易日缺少快照时返回 None
+        （缺口视为缺失，不跨缺口累加更早的快照）。
+        """
+        window = history.reindex(cls.window_dates(trade_date))
+        if window.index.isin(history.index).all():
+            return window.sum(min_count=1)
+        return None
+
+    def _build_records(self, frames: Dict[date, pd.DataFrame], history: pd.DataFrame,
+                       trade_date: date) -> Dict[str, FundFlowRecord]:
+        """构建指定交易日的 {code: FundFlowRecord}"""
+        day_df = frames[trade_date].drop_duplicates(subset='code')
+
+        # 近 5 日累计：本地历史覆盖完整窗口时按日求和，否则使用排行榜自带的 5 日累计
+        sum_5d = self._window_sum(history, trade_date)
+        if sum_5d is None:
+            sum_5d = day_df.set_index('code').get('main_net_inflow_5d', pd.Series(dtype=float))
+
+        records = {}
+        for row in day_df.itertuples(index=False):
+            code = str(row.code).zfill(6)
+            inflow = float(row.main_net_inflow) if pd.notna(row.main_net_inflow) else 0.0
+            inflow_5d = sum_5d.get(row.code, inflow)
+            records[code] = FundFlowRecord(
+                code=code,
+                name=str(row.name) if pd.notna(row.name) else '',
+                trade_date=trade_date,
+                main_net_inflow=inflow,
+                main_net_inflow_pct=float(row.main_net_inflow_pct) if pd.notna(row.main_net_inflow_pct) else 0.0,
+                main_net_inflow_5d=float(inflow_5d) if pd.notna(inflow_5d) else inflow,
+            )
+        return records
+
+    def _records_on(self, trade_date: DateLike) -> Dict[str, FundFlowRecord]:
+        """指定交易日的资金流向，本地没有该日快照时返回空字典"""
+        trade_date = pd.Timestamp(trade_date).date()
+        records = self._by_date.get(trade_date)
+        if records is None:
+            frames, history = self._frames, self._history
+            if trade_date not in frames:
+                return {}
+            records = self._build_records(frames, history, trade_date)
+            with self._lock:
+                if self._frames is frames:
+                    self._by_date[trade_date] = records
+        return records
+
+    def update(self, snapshot: pd.DataFrame, trade_date: date, save: bool = True) -> int:
+        """
+        写入一个交易日的全市场快照（同一交易日覆盖）
+
+        Args:
+            snapshot: 包含 code, name, main_net_inflow, main_net_inflow_pct 列，
+                      可选 main_net_inflow_5d（排行榜 5 日累计）
+            trade_date: 交易日
+            save: 是否写入磁盘
+
+        Returns:
+            快照股票数量
+        """
+        df = snapshot.copy()
+        df['code'] = df['code'].astype(str).str.zfill(6)
+        if 'main_net_inflow_5d' not in df.columns:
+            df['main_net_inflow_5d'] = float('nan')
+        df['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df = df[self.COLUMNS]
+
+        if save:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            path = self._day_path(trade_date)
+            tmp_path = path.with_suffix('.tmp')
+            df.to_csv(tmp_path, index=False)
+            tmp_path.replace(path)
+
+        frames = dict(self._frames)
+        frames[trade_date] = df
+        self._rebuild(dict(sorted(frames.items())[-self.history_days:]))
+        return len(df)
+
+    # ========== 刷新 ==========
+
+    def fetch_snapshot(self, trade_date: Optional[date] = None) -> Optional[pd.DataFrame]:
+        """
+        下载全市场资金流排行（今日 + 5 日）
+
+        Args:
+            trade_date: 快照对应的交易日，用于判断本地历史能否覆盖 5 日窗口
+
+        Returns:
+            标准化快照，失败返回 None
+        """
+        try:
+            import akshare as ak
+
+            today = ak.stock_individual_fund_flow_rank(indicator="今日")
+            if today is None or today.empty:
+                logger.warning("获取资金流排行为空")
+                return None
+
+            snapshot = pd.DataFrame({
+                'code': today['代码'].astype(str),
+                'name': today['名称'].astype(str),
+                'main_net_inflow': pd.to_numeric(today['今日主力净流入-净额'], errors='coerce'),
+                'main_net_inflow_pct': pd.to_numeric(today['今日主力净流入-净占比'], errors='coerce'),
+            })
+
+            # 本地历史不能覆盖近 5 个交易日（当日快照除外）时补充排行榜 5 日累计值
+            trade_date = trade_date or snapshot_trade_date(datetime.now())
+            previous_days = self.window_dates(trade_date)[:-1]
+            if not pd.Index(previous_days).isin(self._history.index).all():
+                try:
+                    five_day = ak.stock_individual_fund_flow_rank(indicator="5日")
+                    sum_5d = dict(zip(
+                        five_day['代码'].astype(str),
+                        pd.to_numeric(five_day['5日主力净流入-净额'], errors='coerce')
+                    ))
+                    snapshot['main_net_inflow_5d'] = snapshot['code'].map(sum_5d)
+                except Exception as e:
+                    logger.debug(f"获取5日资金流排行失败: {e}")
+
+            return snapshot
+
+        except Exception as e:
+            logger.warning(f"获取资金流排行失败: {e}")
+            return None
+
+    def refresh(self, now: Optional[datetime] = None) -> int:
+        """
+        下载全市场快照并写入对应交易日
+
+        Returns:
+            快照股票数量，失败返回 0
+        """
+        now = now or datetime.now()
+        trade_date = snapshot_trade_date(now)
+        snapshot = self.fetch_snapshot(trade_date)
+        if snapshot is None or snapshot.empty:
+            return 0
+
+        count = self.update(snapshot, trade_date)
+        logger.info(f"资金流向快照刷新完成: {count} 只股票")
+        return count
+
+    def is_stale(self, now: Optional[datetime] = None) -> bool:
+        """
+        快照是否需要刷新
+
+        - 没有当前交易日的快照：需要刷新
+        - 快照在收盘后获取：当日数据已定型，无需刷新
+        - 盘中快照：超过 max_age_seconds 需要刷新
+        """
+        now = now or datetime.now()
+        if not self._latest or self._updated_at is None:
+            return True
+
+        trade_date = snapshot_trade_date(now)
+        if self._latest_date != trade_date:
+            return True
+
+        if self._updated_at >= datetime.combine(trade_date, self.MARKET_CLOSE):
+            return False
+        return (now - self._updated_at).total_seconds() > self.max_age_seconds
+
+    def refresh_if_stale(self, background: bool = True) -> bool:
+        """
+        快照过期时刷新
+
+        Args:
+            background: 为 True 时在后台线程刷新，调用方继续使用旧快照
+
+        Returns:
+            是否触发了刷新
+        """
+        if not self.is_stale():
+            return False
+
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return False
+            if background:
+                self._refresh_thread = threading.Thread(
+                    target=self.refresh, name='fund-flow-refresh', daemon=True
+                )
+                self._refresh_thread.start()
+                return True
+
+        self.refresh()
+        return True
+
+    # ========== 查询 ==========
+
+    def get(self, code: str, trade_date: Optional[DateLike] = None) -> Optional[FundFlowRecord]:
+        """
+        获取单只股票的资金流向（纯内存查找）
+
+        Args:
+            code: 股票代码
+            trade_date: 交易日，None 表示最新快照（仅供实时调用方使用；
+                        历史评分须传入交易日，本地没有该日快照时返回 None）
+        """
+        if trade_date is None:
+            return self._latest.get(code)
+        return self._records_on(trade_date).get(code)
+
+    def get_many(self, codes: Iterable[str],
+                 trade_date: Optional[DateLike] = None) -> Dict[str, FundFlowRecord]:
+        """批量获取资金流向，缺失的股票不在结果中（trade_date 含义同 get）"""
+        records = self._latest if trade_date is None else self._records_on(trade_date)
+        return {code: records[code] for code in codes if code in records}
+
+    def get_history(self, code: str, days: Optional[int] = None) -> pd.Series:
+        """
+        获取单只股票的每日主力净流入历史（元，按日期升序）
+        """
+        history = self._history
+        if code not in history.columns:
+            return pd.Series(dtype=float)
+        series = history[code].dropna()
+        return series.tail(days) if days else series
+
+
+# 全局共享实例
+_fund_flow_store: Optional[FundFlowStore] = None
+_fund_flow_store_lock = threading.Lock()
+
+
+def get_fund_flow_store() -> FundFlowStore:
+    """获取全局共享的资金流向库"""
+    global _fund_flow_store
+    if _fund_flow_store is None:
+        with _fund_flow_store_lock:
+            if _fund_flow_store is None:
+                _fund_flow_store = FundFlowStore()
+    return _fund_flow_store
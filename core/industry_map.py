@@ -0,0 +1,223 @@
+"""
+MiniQuant-Lite 行业分类映射模块
+
+一次性批量下载东方财富行业板块成分股，持久化为 代码 -> 行业 映射表，
+供所有 Screener 实例共享，替代逐只股票查询 stock_individual_info_em。
+
+设计原则：
+- 本地 CSV 持久化（data/industry_map.csv），进程启动即可加载
+- 全局单例共享，不随 Screener 实例销毁
+- 超过有效期（默认 7 天）后台刷新，刷新期间继续使用旧表
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class IndustryMap:
+    """
+    行业板块成分映射表
+
+    表结构（CSV）：code, name, industry, updated_at
+    """
+
+    DEFAULT_PATH = Path("data/industry_map.csv")
+    DEFAULT_MAX_AGE_DAYS = 7
+    COLUMNS = ['code', 'name', 'industry', 'updated_at']
+
+    def __init__(self, file_path: Optional[Path] = None, max_age_days: int = DEFAULT_MAX_AGE_DAYS):
+        """
+        Args:
+            file_path: 映射表路径，默认 data/industry_map.csv
+            max_age_days: 映射表有效期（天），超过后需要刷新
+        """
+        self.file_path = Path(file_path) if file_path is not None else self.DEFAULT_PATH
+        self.max_age_days = max_age_days
+        self._map: Dict[str, str] = {}
+        self._updated_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._map
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self._map)
+
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        return self._updated_at
+
+    def load(self) -> bool:
+        """
+        从磁盘加载映射表
+
+        Returns:
+            是否加载成功
+        """
+        if not self.file_path.exists():
+            return False
+
+        try:
+            df = pd.read_csv(self.file_path, dtype={'code': str})
+            self._set_from_frame(df)
+            logger.info(f"行业映射表加载完成: {len(self._map)} 只股票")
+            return True
+        except Exception as e:
+            logger.warning(f"加载行业映射表失败: {e}")
+            return False
+
+    def _set_from_frame(self, df: pd.DataFrame) -> None:
+        df = df.dropna(subset=['code', 'industry'])
+        df = df.drop_duplicates(subset='code', keep='first')
+        mapping = dict(zip(df['code'].astype(str).str.zfill(6), df['industry'].astype(str)))
+
+        updated_at = None
+        if 'updated_at' in df.columns and not df.empty:
+            parsed = pd.to_datetime(df['updated_at'], errors='coerce').max()
+            if not pd.isna(parsed):
+                updated_at = parsed.to_pydatetime()
+
+        with self._lock:
+            self._map = mapping
+            self._updated_at = updated_at
+
+    def get(self, code: str, default: Optional[str] = None) -> Optional[str]:
+        """获取单只股票行业（纯内存查找）"""
+        return self._map.get(code, default)
+
+    def get_many(self, codes: Iterable[str], default: str = "未知") -> Dict[str, str]:
+        """批量获取行业（纯内存查找）"""
+        mapping = self._map
+        return {code: mapping.get(code, default) for code in codes}
+
+    def is_stale(self, now: Optional[datetime] = None) -> bool:
+        """映射表为空或超过有效期"""
+        if not self._map or self._updated_at is None:
+            return True
+        now = now or datetime.now()
+        return now - self._updated_at > timedelta(days=self.max_age_days)
+
+    def update(self, membership: pd.DataFrame, save: bool = True) -> int:
+        """
+        用板块成分表替换映射
+
+        Args:
+            membership: 包含 code, industry 列（可选 name）的成分表
+            save: 是否写入磁盘
+
+        Returns:
+            映射的股票数量
+        """
+        df = membership.copy()
+        if 'name' not in df.columns:
+            df['name'] = ''
+        df['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df = df[self.COLUMNS]
+
+        self._set_from_frame(df)
+
+        if save:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.file_path.with_suffix('.tmp')
+            df.to_csv(tmp_path, index=False)
+            tmp_path.replace(self.file_path)
+
+        return len(self._map)
+
+    def refresh(self) -> int:
+        """
+        从 AkShare 批量下载行业板块成分并持久化
+
+        每个行业板块一次请求（约 90 个板块），与股票数量无关。
+
+        Returns:
+            映射的股票数量，失败返回 0
+        """
+        try:
+            import akshare as ak
+
+            boards = ak.stock_board_industry_name_em()
+            if boards is None or boards.empty:
+                logger.warning("获取行业板块列表为空")
+                return 0
+
+            frames = []
+            for board_name in boards['板块名称'].tolist():
+                try:
+                    cons = ak.stock_board_industry_cons_em(symbol=board_name)
+                except Exception as e:
+                    logger.debug(f"获取板块 {board_name} 成分失败: {e}")
+                    continue
+                if cons is None or cons.empty:
+                    continue
+                frames.append(pd.DataFrame({
+                    'code': cons['代码'].astype(str),
+                    'name': cons['名称'].astype(str),
+                    'industry': board_name
+                }))
+
+            if not frames:
+                logger.warning("行业板块成分全部获取失败，保留旧映射表")
+                return 0
+
+            count = self.update(pd.concat(frames, ignore_index=True))
+            logger.info(f"行业映射表刷新完成: {len(frames)} 个板块, {count} 只股票")
+            return count
+
+        except Exception as e:
+            logger.warning(f"刷新行业映射表失败: {e}")
+            return 0
+
+    def refresh_if_stale(self, background: bool = True) -> bool:
+        """
+        映射表过期时刷新
+
+        Args:
+            background: 为 True 时在后台线程刷新，调用方继续使用旧表
+
+        Returns:
+            是否触发了刷新
+        """
+        if not self.is_stale():
+            return False
+
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return False
+            if background:
+                self._refresh_thread = threading.Thread(
+                    target=self.refresh, name='industry-map-refresh', daemon=True
+                )
+                self._refresh_thread.start()
+                return True
+
+        self.refresh()
+        return True
+
+
+# 全局共享实例
+_industry_map: Optional[IndustryMap] = None
+_industry_map_lock = threading.Lock()
+
+
+def get_industry_map() -> IndustryMap:
+    """获取全局共享的行业映射表"""
+    global _industry_map
+    if _industry_map is None:
+        with _industry_map_lock:
+            if _industry_map is None:
+                _industry_map = IndustryMap()
+    return _industry_map
@@ -0,0 +1,106 @@
+"""
+MiniQuant-Lite 编译关键词匹配器
+
+将多组关键词（热点题材、行业关键词库等）一次编译为单个正则，替代逐关键词 `in` 循环：
+- HotTopicManager.match_stock_topics: 题材关键词匹配股票名称/板块/概念
+- IndustryScreener.match_industry / screen_tech_stocks: 行业关键词匹配名称/主营/行业
+- ThemeWindScorer: 热点题材与概念的包含关系
+
+设计原则：
+- 匹配口径与 `keyword in text` 完全一致（区分大小写，关键词可重叠、可互为前缀）
+- 正则按关键词长度降序排列并以零宽前瞻在每个位置取最长匹配，
+  同一位置更短的匹配必为其前缀，由预计算的前缀表补全
+- 批量匹配先对文本去重，全市场扫描时相同的板块/行业文本只匹配一次
+- 关键词集合变化时由调用方重建（匹配器本身不可变）
+"""
+
+import re
+from typing import Dict, Hashable, Iterable, List, Mapping, Sequence, Set
+
+
+class KeywordMatcher:
+    """
+    编译多关键词匹配器
+
+    使用示例:
+        matcher = KeywordMatcher({'AI': ['AI', '大模型'], '芯片': ['芯片', '半导体']})
+        matcher.find('AI芯片龙头')            # {'AI', '芯片'}
+        matcher.match('AI芯片龙头')           # {'AI': ['AI'], '芯片': ['芯片']}
+        matcher.match_many(df['name'])       # 每个文本一个 match 结果
+    """
+
+    def __init__(self, groups: Mapping[Hashable, Sequence[str]]):
+        """
+        Args:
+            groups: {标签: 关键词列表}，同一关键词可属于多个标签
+        """
+        self.labels: List[Hashable] = list(groups)
+        # 关键词 → [(标签, 标签内序号)]，用于按原关键词顺序输出
+        self._owners: Dict[str, List[tuple]] = {}
+        for label, keywords in groups.items():
+            for i, keyword in enumerate(keywords):
+                self._owners.setdefault(keyword, []).append((label, i))
+
+        keywords = [k for k in self._owners if k]
+        # 空关键词与 `'' in text` 一致：匹配任何文本
+        self._always: Set[str] = {''} if '' in self._owners else set()
+        self._prefixes: Dict[str, List[str]] = {
+            k: [p for p in keywords if p != k and k.startswith(p)] for k in keywords
+        }
+        if keywords:
+            keywords.sort(key=len, reverse=True)
+            self._pattern = re.compile('(?=(' + '|'.join(map(re.escape, keywords)) + '))')
+        else:
+            self._pattern = None
+
+    @classmethod
+    def from_keywords(cls, keywords: Iterable[str]) -> 'KeywordMatcher':
+        """单组关键词（标签即关键词本身）"""
+        keywords = list(dict.fromkeys(keywords))
+        return cls({k: [k] for k in keywords})
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    # ========== 单文本 ==========
+
+    def find(self, text: str) -> Set[str]:
+        """文本中出现的全部关键词（同 {k for k in keywords if k in text}）"""
+        found = set(self._always)
+        if self._pattern is None or not text:
+            return found
+        for longest in {m.group(1) for m in self._pattern.finditer(text)}:
+            found.add(longest)
+            found.update(self._prefixes[longest])
+        return found
+
+    def match(self, text: str) -> Dict[Hashable, List[str]]:
+        """
+        按标签分组的匹配关键词
+
+        Returns:
+            {标签: 命中关键词（按该标签原关键词顺序）}，按标签原顺序排列，只含有命中的标签
+        """
+        hits: Dict[Hashable, List[tuple]] = {}
+        for keyword in self.find(text):
+            for label, i in self._owners[keyword]:
+                hits.setdefault(label, []).append((i, keyword))
+        return {
+            label: [k for _, k in sorted(hits[label])]
+            for label in self.labels if label in hits
+        }
+
+    # ========== 批量 ==========
+
+    def find_many(self, texts: Iterable[str]) -> List[Set[str]]:
+        """批量 find（相同文本只匹配一次）"""
+        texts = list(texts)
+        cache = {text: self.find(text) for text in dict.fromkeys(texts)}
+        return [cache[text] for text in texts]
+
+    def match_many(self, texts: Iterable[str]) -> List[Dict[Hashable, List[str]]]:
+        """批量 match（相同文本只匹配一次）"""
+        texts = list(texts)
+        cache = {text: self.match(text) for text in dict.fromkeys(texts)}
+        return [cache[text] for text in texts]
+
@@ -0,0 +1,313 @@
+"""
+MiniQuant-Lite 全市场涨跌停事件索引
+
+以 交易日 × 股票 矩阵一次向量化计算全市场的涨停 / 跌停 / 炸板标记，
+并预计算连板高度、近 20 日涨跌停次数和每日市场汇总，供以下模块 O(1) 查表：
+- StockActivityScorer: 近20日是否涨停、最大连板数
+- MarketSentimentAnalyzer: MarketSentimentData（涨跌停家数、炸板、连板分布）
+- SentimentCyclePredictor: analyze_today_sentiment 的输入
+
+设计原则：
+- 涨跌幅限制按板块区分：主板 10%、创业板/科创板 20%、北交所 30%、主板 ST 5%
+  （创业板/科创板/北交所的 ST 股沿用板块限制）
+- 判定阈值为限制幅度减 0.5 个百分点（与原评分器 9.5% / 19.5% 口径一致）
+- 涨跌幅以股票自身上一根K线收盘价计算，停牌日（无数据）不计入也不中断连板
+- 近 20 日窗口按市场交易日计
+"""
+
+import logging
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# ========== 板块涨跌幅限制 ==========
+
+LIMIT_TOLERANCE = 0.5       # 判定涨跌停的容差（百分点）
+WINDOW_DAYS = 20            # 近N日统计窗口
+
+
+def limit_ratio(code: str, name: str = '') -> float:
+    """
+    股票的涨跌幅限制（小数）
+
+    Args:
+        code: 股票代码
+        name: 股票名称（用于识别主板 ST）
+    """
+    code = str(code)
+    if code.startswith(('300', '301', '688', '689')):
+        return 0.20
+    if code.startswith(('4', '8', '92')):
+        return 0.30
+    if 'ST' in str(name).upper():
+        return 0.05
+    return 0.10
+
+
+def limit_threshold(code: str = '', name: str = '') -> float:
+    """判定涨停的涨幅阈值（百分比），主板 9.5、创业板/科创板 19.5、主板 ST 4.5"""
+    return limit_ratio(code, name) * 100 - LIMIT_TOLERANCE
+
+
+def consecutive_counts(flags: np.ndarray, valid: Optional[np.ndarray] = None, axis: int = 0) -> np.ndarray:
+    """
+    沿 axis 计算截至每个位置的连续命中次数（向量化，无逐日循环）
+
+    Args:
+        flags: 布尔数组（如是否涨停）
+        valid: 有效数据掩码，无效位置既不计数也不中断连续（停牌），默认全部有效
+        axis: 时间轴
+
+    Returns:
+        与 flags 同形状的整数数组
+    """
+    flags = np.asarray(flags, dtype=bool)
+    if valid is None:
+        valid = np.ones_like(flags)
+    hits = np.cumsum(flags & valid, axis=axis)
+    # 最近一次“有效且未命中”位置的累计命中数，之后的命中数即为连续次数
+    resets = np.maximum.accumulate(np.where(valid & ~flags, hits, 0), axis=axis)
+    return hits - resets
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """沿第 0 轴的滚动求和（不足窗口时按已有数据）"""
+    cumsum = np.cumsum(values, axis=0)
+    result = cumsum.copy()
+    result[window:] -= cumsum[:-window]
+    return result
+
+
+# ========== 涨跌停事件索引 ==========
+
+class LimitEventIndex:
+    """
+    全市场涨跌停事件索引
+
+    使用示例:
+        index = LimitEventIndex.from_frames(frames, names)
+        index.stock('600000', '2025-06-30')['limit_streak']
+        index.market('2025-06-30')['limit_up_count']
+        predictor.analyze_limit_events(index)
+    """
+
+    STOCK_FIELDS = (
+        'change_pct', 'is_limit_up', 'is_limit_down', 'failed_limit_up',
+        'limit_streak', 'limit_up_20d', 'limit_down_20d', 'max_streak_20d',
+    )
+
+    def __init__(self, dates: pd.DatetimeIndex, codes: Iterable[str],
+                 close: np.ndarray, high: np.ndarray, thresholds: np.ndarray):
+        """
+        Args:
+            dates: 交易日（升序）
+            codes: 股票代码（与矩阵列对应）
+            close: 收盘价矩阵，交易日 × 股票，无数据为 NaN
+            high: 最高价矩阵，形状同上（用于识别炸板）
+            thresholds: 每只股票的涨停判定阈值（百分比）
+        """
+        self.dates = pd.DatetimeIndex(dates)
+        self.codes = [str(code) for code in codes]
+        self._date_pos = {d: i for i, d in enumerate(self.dates)}
+        self._code_pos = {code: j for j, code in enumerate(self.codes)}
+
+        valid = ~np.isnan(close)
+        # 上一根K线收盘价（跳过停牌日）
+        rows = np.where(valid, np.arange(len(close))[:, None], -1)
+        last = np.maximum.accumulate(rows, axis=0)
+        prev_rows = np.vstack([np.full((1, close.shape[1]), -1), last[:-1]])
+        prev_close = np.where(prev_rows >= 0, close[np.maximum(prev_rows, 0), np.arange(close.shape[1])], np.nan)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_pct = (close / prev_close - 1) * 100
+            high_pct = (high / prev_close - 1) * 100
+        valid &= ~np.isnan(change_pct)
+
+        is_limit_up = valid & (change_pct >= thresholds)
+        is_limit_down = valid & (change_pct <= -thresholds)
+        failed = valid & ~is_limit_up & (high_pct >= thresholds)
+        streak = consecutive_counts(is_limit_up, valid)
+
+        # 窗口内最大连板：结束于 t-k 的连板在窗口内最多计 WINDOW_DAYS-k 次
+        max_streak = np.zeros_like(streak)
+        for k in range(min(WINDOW_DAYS, len(streak))):
+            shifted = np.minimum(streak[:len(streak) - k], WINDOW_DAYS - k)
+            max_streak[k:] = np.maximum(max_streak[k:], shifted)
+
+        self._stock = {
+            'change_pct': change_pct,
+            'is_limit_up': is_limit_up,
+            'is_limit_down': is_limit_down,
+            'failed_limit_up': failed,
+            'limit_streak': streak,
+            'limit_up_20d': _rolling_sum(is_limit_up.astype(np.int64), WINDOW_DAYS),
+            'limit_down_20d': _rolling_sum(is_limit_down.astype(np.int64), WINDOW_DAYS),
+            'max_streak_20d': max_streak,
+        }
+
+        # 每日市场汇总
+        board_streak = np.where(is_limit_up, streak, 0)
+        highest = board_streak.max(axis=1) if close.shape[1] else np.zeros(len(close), dtype=np.int64)
+        self._boards = np.zeros((len(close), int(highest.max()) + 1 if len(close) else 1), dtype=np.int64)
+        day_idx, code_idx = np.nonzero(is_limit_up)
+        np.add.at(self._boards, (day_idx, board_streak[day_idx, code_idx]), 1)
+
+        up = (valid & (change_pct > 0)).sum(axis=1)
+        down = (valid & (change_pct < 0)).sum(axis=1)
+        self._market = pd.DataFrame({
+            'limit_up_count': is_limit_up.sum(axis=1),
+            'limit_down_count': is_limit_down.sum(axis=1),
+            'failed_limit_up': failed.sum(axis=1),
+            'highest_board': highest,
+            'continuous_board_count': (board_streak >= 2).sum(axis=1),
+            'up_count': up,
+            'down_count': down,
+            'flat_count': valid.sum(axis=1) - up - down,
+        }, index=self.dates)
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame],
+                    names: Optional[Dict[str, str]] = None) -> 'LimitEventIndex':
+        """
+        从日线数据构建索引
+
+        Args:
+            frames: {code: 日线数据（date, close, 可选 high）}
+            names: {code: 股票名称}（用于识别 ST）
+        """
+        names = names or {}
+        frames = {str(code): df for code, df in frames.items() if df is not None and len(df)}
+        codes = list(frames)
+        parsed = {code: pd.to_datetime(df['date']).to_numpy() for code, df in frames.items()}
+        dates = pd.DatetimeIndex(np.unique(np.concatenate(list(parsed.values())))) if codes \
+            else pd.DatetimeIndex([])
+
+        close = np.full((len(dates), len(codes)), np.nan)
+        high = np.full_like(close, np.nan)
+        for j, code in enumerate(codes):
+            df = frames[code]
+            rows = dates.searchsorted(parsed[code])
+            close[rows, j] = df['close'].to_numpy(dtype=np.float64)
+            high[rows, j] = df['high'].to_numpy(dtype=np.float64) if 'high' in df.columns else close[rows, j]
+
+        thresholds = np.array([limit_threshold(code, names.get(code, '')) for code in codes])
+        logger.debug(f"涨跌停索引: {len(dates)}个交易日 × {len(codes)}只股票")
+        return cls(dates, codes, close, high, thresholds)
+
+    # ========== 查询 ==========
+
+    def _row(self, trade_date) -> Optional[int]:
+        if trade_date is None:
+            return len(self.dates) - 1 if len(self.dates) else None
+        return self._date_pos.get(pd.Timestamp(trade_date))
+
+    @property
+    def latest_date(self) -> Optional[pd.Timestamp]:
+        """索引中最新交易日"""
+        return self.dates[-1] if len(self.dates) else None
+
+    def stock(self, code: str, trade_date=None) -> Optional[Dict]:
+        """
+        单只股票在指定交易日的涨跌停事件
+
+        Args:
+            code: 股票代码
+            trade_date: 交易日，默认最新交易日
+
+        Returns:
+            {change_pct, is_limit_up, is_limit_down, failed_limit_up, limit_streak,
+             limit_up_20d, limit_down_20d, max_streak_20d}，无数据返回 None
+        """
+        i, j = self._row(trade_date), self._code_pos.get(str(code))
+        if i is None or j is None:
+            return None
+        return {name: self._stock[name][i, j].item() for name in self.STOCK_FIELDS}
+
+    def lookup(self, codes: Iterable[str], dates: Iterable, field: str) -> np.ndarray:
+        """
+        批量查询一个字段（每只股票可对应不同交易日）
+
+        Returns:
+            数组，无数据的位置为 NaN（布尔 / 整数字段转为浮点）
+        """
+        rows = [self._row(trade_date) for trade_date in dates]
+        rows = np.array([-1 if i is None else i for i in rows], dtype=np.intp)
+        cols = np.array([self._code_pos.get(str(code), -1) for code in codes], dtype=np.intp)
+        found = (rows >= 0) & (cols >= 0)
+        result = np.full(len(rows), np.nan)
+        result[found] = self._stock[field][rows[found], cols[found]]
+        return result
+
+    def market(self, trade_date=None) -> Optional[Dict]:
+        """
+        指定交易日的市场涨跌停汇总
+
+        Returns:
+            {limit_up_count, limit_down_count, failed_limit_up, highest_board,
+             continuous_board_count, up_count, down_count, flat_count, continuous_limit_up}
+        """
+        i = self._row(trade_date)
+        if i is None:
+            return None
+        summary = {name: int(value) for name, value in self._market.iloc[i].items()}
+        summary['continuous_limit_up'] = {
+            int(n): int(count) for n, count in enumerate(self._boards[i]) if n >= 2 and count
+        }
+        return summary
+
+    def market_history(self) -> pd.DataFrame:
+        """
+        全部交易日的市场汇总（每行一个交易日，列同 market）
+        """
+        history = self._market.copy()
+        history['continuous_limit_up'] = [
+            {int(n): int(count) for n, count in enumerate(boards) if n >= 2 and count}
+            for boards in self._boards
+        ]
+        return history
+
+    def sentiment_data(self, trade_date=None):
+        """
+        MarketSentimentAnalyzer 的输入
+
+        Returns:
+            MarketSentimentData，无数据返回 None
+        """
+        from core.short_term.market_sentiment import MarketSentimentData
+
+        summary = self.market(trade_date)
+        if summary is None:
+            return None
+        return MarketSentimentData(
+            limit_up_count=summary['limit_up_count'],
+            limit_down_count=summary['limit_down_count'],
+            failed_limit_up=summary['failed_limit_up'],
+            continuous_limit_up=summary['continuous_limit_up'],
+            highest_board=summary['highest_board'],
+            up_count=summary['up_count'],
+            down_count=summary['down_count'],
+            flat_count=summary['flat_count'],
+        )
+
+    def sentiment_inputs(self, trade_date=None) -> Optional[Dict[str, Union[int, float]]]:
+        """
+        SentimentCyclePredictor.analyze_today_sentiment 的输入
+
+        炸板率 = 炸板家数 / (涨停家数 + 炸板家数)，赚钱效应 = 上涨家数 / 有效家数
+        """
+        summary = self.market(trade_date)
+        if summary is None:
+            return None
+        touched = summary['limit_up_count'] + summary['failed_limit_up']
+        total = summary['up_count'] + summary['down_count'] + summary['flat_count']
+        return {
+            'limit_up_count': summary['limit_up_count'],
+            'limit_down_count': summary['limit_down_count'],
+            'broken_board_rate': summary['failed_limit_up'] / touched if touched else 0.0,
+            'continuous_board_count': summary['continuous_board_count'],
+            'market_profit_rate': summary['up_count'] / total if total else 0.5,
+        }
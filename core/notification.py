@@ -7,6 +7,7 @@ MiniQuant-Lite 飞书通知模块
 - 配置管理和持久化
 - 消息格式化（Markdown）
 - HTTP 发送（带重试机制）
+- 后台异步分发（见 core.notification_dispatcher）
 - 风控警告集成
 
 Requirements: 1.*, 2.*, 3.*, 5.*
@@ -144,6 +145,37 @@ class NotificationConfigStore:
         return url[:len(url)-4] + "****"
 
 
+# ==========================================
+# Webhook 请求与响应
+# ==========================================
+
+def build_webhook_payload(content: str) -> dict:
+    """构建飞书 Webhook 文本消息请求体"""
+    return {
+        "msg_type": "text",
+        "content": {
+            "text": content
+        }
+    }
+
+
+def parse_webhook_response(response) -> Tuple[bool, str]:
+    """
+    解析飞书 Webhook 响应
+    
+    Returns:
+        (成功, 错误信息) - 成功时错误信息为空
+    """
+    if response.status_code != 200:
+        return False, f"HTTP {response.status_code}: {response.text[:100]}"
+    
+    result = response.json()
+    # 飞书成功响应: {"code": 0, "msg": "success"}
+    if result.get("code") == 0 or result.get("StatusCode") == 0:
+        return True, ""
+    return False, f"飞书返回错误: {result.get('msg', result.get('StatusMessage', '未知错误'))}"
+
+
 # ==========================================
 # 通知服务
 # ==========================================
@@ -290,13 +322,7 @@ class NotificationService:
         if not HAS_REQUESTS:
             return False, "requests 库未安装"
         
-        # 飞书 Webhook 请求格式
-        payload = {
-            "msg_type": "text",
-            "content": {
-                "text": content
-            }
-        }
+        payload = build_webhook_payload(content)
         
         last_error = ""
         
@@ -308,18 +334,11 @@ class NotificationService:
                     timeout=self.config.timeout
                 )
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    # 飞书成功响应: {"code": 0, "msg": "success"}
-                    if result.get("code") == 0 or result.get("StatusCode") == 0:
-                        logger.info("飞书通知发送成功")
-                        return True, ""
-                    else:
-                        last_error = f"飞书返回错误: {result.get('msg', result.get('StatusMessage', '未知错误'))}"
-                        logger.warning(f"第 {attempt + 1} 次发送失败: {last_error}")
-                else:
-                    last_error = f"HTTP {response.status_code}: {response.text[:100]}"
-                    logger.warning(f"第 {attempt + 1} 次发送失败: {last_error}")
+                success, last_error = parse_webhook_response(response)
+                if success:
+                    logger.info("飞书通知发送成功")
+                    return True, ""
+                logger.warning(f"第 {attempt + 1} 次发送失败: {last_error}")
                     
             except requests.Timeout:
                 last_error = f"请求超时 ({self.config.timeout}秒)"
@@ -423,13 +442,15 @@ def auto_send_notification(signals: list) -> bool:
     """
     自动发送通知（信号生成后调用）
     
+    信号提交到后台通知分发器后立即返回，发送与重试在后台进行。
+    
     Validates: Requirements 5.1, 5.3
     
     Args:
         signals: 交易信号列表
         
     Returns:
-        True 发送成功或无需发送，False 发送失败
+        True 已加入发送队列或无需发送，False 提交失败（信号无法序列化、分发器无法启动等）
     """
     config = NotificationConfigStore.load()
     
@@ -439,5 +460,24 @@ def auto_send_notification(signals: list) -> bool:
     if not signals:
         return True
     
-    service = NotificationService(config)
-    return service.send_signal_notification(signals)
+    try:
+        handle = dispatch_notification(signals)
+    except Exception as e:
+        logger.error(f"飞书通知提交失败: {e}")
+        return False
+    
+    if handle.status == handle.STATUS_FAILED:
+        logger.error(f"飞书通知提交失败: {handle.error}")
+        return False
+    return True
+
+
+def dispatch_notification(signals: list):
+    """
+    提交信号通知到后台分发器
+    
+    Returns:
+        NotificationHandle，可查询发送状态或等待结果
+    """
+    from core.notification_dispatcher import get_notification_dispatcher
+    return get_notification_dispatcher().submit(signals)
@@ -0,0 +1,448 @@
+"""
+MiniQuant-Lite 异步通知分发器
+
+在后台线程中发送飞书通知，调用方提交后立即返回，不再被 HTTP 请求与重试等待阻塞。
+
+功能：
+- 持久化发件箱：未送达的消息写入本地文件，进程重启后继续发送
+- 合并窗口：同一窗口内的多次提交合并为一条汇总消息
+- 指数退避：失败后按 retry_interval * 2^n 安排重试，不占用调用线程
+- 连接复用：使用带连接池的 requests.Session
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from core.notification import (
+    HAS_REQUESTS,
+    NotificationConfig,
+    NotificationConfigStore,
+    NotificationService,
+    build_webhook_payload,
+    parse_webhook_response,
+)
+
+if HAS_REQUESTS:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+# 数据类
+# ==========================================
+
+@dataclass
+class OutboxMessage:
+    """
+    发件箱消息
+
+    status:
+    - open: 合并窗口未关闭，仍可追加信号
+    - pending: 内容已生成，等待发送或重试
+    """
+    STATUS_OPEN = "open"
+    STATUS_PENDING = "pending"
+
+    id: str
+    signals: List[dict] = field(default_factory=list)   # 序列化后的信号
+    created_at: float = 0.0                              # 创建时间（时间戳）
+    window_closes_at: float = 0.0                        # 合并窗口关闭时间
+    status: str = STATUS_OPEN
+    content: str = ""                                    # 窗口关闭时生成的消息内容
+    attempts: int = 0                                    # 已尝试次数
+    next_attempt_at: float = 0.0                         # 下次发送时间
+    last_error: str = ""
+
+    @property
+    def due_at(self) -> float:
+        """下一次需要处理的时间"""
+        if self.status == self.STATUS_OPEN:
+            return self.window_closes_at
+        return self.next_attempt_at
+
+
+class NotificationHandle:
+    """
+    通知提交句柄
+
+    submit() 立即返回，可通过 status 查询进度或 wait() 等待结果。
+    """
+    STATUS_QUEUED = "queued"      # 已进入发件箱
+    STATUS_SENT = "sent"          # 发送成功
+    STATUS_FAILED = "failed"      # 重试耗尽
+    STATUS_SKIPPED = "skipped"    # 未启用或过滤后无信号
+
+    def __init__(self, message_id: Optional[str], status: str = STATUS_QUEUED, error: str = ""):
+        self.message_id = message_id
+        self.status = status
+        self.error = error
+        self._event = threading.Event()
+        if status != self.STATUS_QUEUED:
+            self._event.set()
+
+    def done(self) -> bool:
+        """是否已有最终结果"""
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待发送结果
+
+        Returns:
+            True 发送成功或无需发送，False 失败或超时
+        """
+        self._event.wait(timeout)
+        return self.status in (self.STATUS_SENT, self.STATUS_SKIPPED)
+
+    def _resolve(self, status: str, error: str = "") -> None:
+        self.status = status
+        self.error = error
+        self._event.set()
+
+    def __repr__(self) -> str:
+        return f"NotificationHandle(message_id={self.message_id!r}, status={self.status!r})"
+
+
+# ==========================================
+# 信号序列化
+# ==========================================
+
+_SIGNAL_FIELDS = ("code", "name", "reason", "in_report_window", "high_fee_warning")
+
+
+def _serialize_signal(signal) -> dict:
+    """提取格式化消息所需字段"""
+    record = {name: getattr(signal, name, None) for name in _SIGNAL_FIELDS}
+    record["signal_type"] = signal.signal_type.value
+    return record
+
+
+def _deserialize_signal(record: dict):
+    """还原为 NotificationService 可格式化的信号对象"""
+    from core.signal_generator import SignalType
+
+    values = {name: record.get(name) for name in _SIGNAL_FIELDS}
+    values["in_report_window"] = bool(values["in_report_window"])
+    values["high_fee_warning"] = bool(values["high_fee_warning"])
+    return SimpleNamespace(signal_type=SignalType(record["signal_type"]), **values)
+
+
+# ==========================================
+# 分发器
+# ==========================================
+
+class NotificationDispatcher:
+    """
+    异步通知分发器
+
+    使用示例:
+        dispatcher = get_notification_dispatcher()
+        handle = dispatcher.submit(signals)   # 立即返回
+        handle.wait(timeout=30)               # 可选：等待结果
+    """
+
+    DEFAULT_OUTBOX_PATH = Path(__file__).parent.parent / "data" / "notification_outbox.json"
+    DEFAULT_COALESCE_WINDOW = 3.0     # 合并窗口（秒）
+    DEFAULT_MAX_BACKOFF = 300.0       # 最大退避间隔（秒）
+
+    def __init__(self,
+                 config: Optional[NotificationConfig] = None,
+                 outbox_path: Optional[Path] = None,
+                 coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+                 max_backoff: float = DEFAULT_MAX_BACKOFF,
+                 session=None):
+        """
+        初始化分发器
+
+        Args:
+            config: 通知配置，None 时每次使用 NotificationConfigStore 中的最新配置
+            outbox_path: 发件箱文件路径
+            coalesce_window: 合并窗口（秒），窗口内的提交合并为一条消息
+            max_backoff: 重试退避上限（秒）
+            session: HTTP 会话，None 时创建带连接池的会话
+        """
+        self._config = config
+        self.outbox_path = Path(outbox_path) if outbox_path is not None else self.DEFAULT_OUTBOX_PATH
+        self.coalesce_window = coalesce_window
+        self.max_backoff = max_backoff
+        self._session = session
+
+        self._cond = threading.Condition()
+        self._messages: Dict[str, OutboxMessage] = {}
+        self._handles: Dict[str, List[NotificationHandle]] = {}
+        self._open_id: Optional[str] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._load_outbox()
+        # 重启后恢复的未送达消息无需等待下一次提交即继续发送
+        if self._messages:
+            self.start()
+
+    @property
+    def config(self) -> NotificationConfig:
+        """当前通知配置"""
+        return self._config if self._config is not None else NotificationConfigStore.load()
+
+    # ==================== 提交 ====================
+
+    def submit(self, signals: list) -> NotificationHandle:
+        """
+        提交信号通知（非阻塞）
+
+        信号追加到当前合并窗口的消息中并写入发件箱，随后立即返回句柄。
+        信号无法序列化时不进入发件箱，返回 STATUS_FAILED 句柄。
+        """
+        config = self.config
+        if not config.enabled or not config.webhook_url:
+            return NotificationHandle(None, NotificationHandle.STATUS_SKIPPED)
+
+        filtered = NotificationService(config)._filter_signals(signals or [])
+        if not filtered:
+            return NotificationHandle(None, NotificationHandle.STATUS_SKIPPED)
+
+        try:
+            records = [_serialize_signal(s) for s in filtered]
+        except (AttributeError, ValueError) as e:
+            logger.error(f"通知信号无法序列化，未加入发件箱: {e}")
+            return NotificationHandle(None, NotificationHandle.STATUS_FAILED, str(e))
+
+        with self._cond:
+            message = self._messages.get(self._open_id) if self._open_id else None
+            if message is None:
+                now = time.time()
+                message = OutboxMessage(
+                    id=uuid.uuid4().hex,
+                    created_at=now,
+                    window_closes_at=now + self.coalesce_window,
+                )
+                self._messages[message.id] = message
+                self._open_id = message.id
+            message.signals.extend(records)
+
+            handle = NotificationHandle(message.id)
+            self._handles.setdefault(message.id, []).append(handle)
+            self._save_outbox()
+            self._cond.notify_all()
+
+        self.start()
+        return handle
+
+    def handle(self, message_id: str) -> NotificationHandle:
+        """获取发件箱中某条消息的句柄（如重启后恢复的消息）"""
+        with self._cond:
+            if message_id not in self._messages:
+                return NotificationHandle(message_id, NotificationHandle.STATUS_SENT)
+            handle = NotificationHandle(message_id)
+            self._handles.setdefault(message_id, []).append(handle)
+            return handle
+
+    @property
+    def pending_count(self) -> int:
+        """发件箱中未完成的消息数"""
+        with self._cond:
+            return len(self._messages)
+
+    # ==================== 生命周期 ====================
+
+    def start(self) -> None:
+        """启动后台发送线程（已运行时忽略）"""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="notification-dispatcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """停止后台线程，未送达的消息保留在发件箱中"""
+        with self._cond:
+            self._stop_event.set()
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            self._thread = None
+
+    def is_running(self) -> bool:
+        """后台线程是否运行中"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        立即发送发件箱中的全部消息（关闭合并窗口、跳过退避等待）并等待清空
+
+        Returns:
+            True 发件箱已清空，False 超时
+        """
+        with self._cond:
+            now = time.time()
+            for message in self._messages.values():
+                message.window_closes_at = min(message.window_closes_at, now)
+                message.next_attempt_at = min(message.next_attempt_at, now)
+            self._cond.notify_all()
+        self.start()
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._messages, timeout)
+
+    # ==================== 后台发送 ====================
+
+    def _run(self) -> None:
+        """后台循环：等待到期消息，关闭合并窗口并发送"""
+        while not self._stop_event.is_set():
+            with self._cond:
+                message, wait = self._next_due(time.time())
+                if message is None:
+                    self._cond.wait(wait)
+                    continue
+                if message.status == OutboxMessage.STATUS_OPEN:
+                    self._close_window(message)
+                content = message.content
+
+            success, error = self._post(content)
+            self._record_attempt(message, success, error)
+
+    def _next_due(self, now: float) -> Tuple[Optional[OutboxMessage], Optional[float]]:
+        """返回已到期的消息，或距最近到期的等待秒数"""
+        if not self._messages:
+            return None, None
+        message = min(self._messages.values(), key=lambda m: m.due_at)
+        if message.due_at <= now:
+            return message, None
+        return None, message.due_at - now
+
+    def _close_window(self, message: OutboxMessage) -> None:
+        """关闭合并窗口，生成消息内容"""
+        service = NotificationService(self.config)
+        signals = [_deserialize_signal(record) for record in message.signals]
+        if len(signals) == 1:
+            message.content = service.format_signal(signals[0])
+        else:
+            message.content = service.format_summary(signals)
+        message.status = OutboxMessage.STATUS_PENDING
+        message.next_attempt_at = time.time()
+        if self._open_id == message.id:
+            self._open_id = None
+        self._save_outbox()
+
+    def _record_attempt(self, message: OutboxMessage, success: bool, error: str) -> None:
+        """记录发送结果：成功或重试耗尽时移出发件箱，否则按指数退避安排重试"""
+        config = self.config
+        with self._cond:
+            message.attempts += 1
+            if success:
+                status = NotificationHandle.STATUS_SENT
+                logger.info(f"飞书通知发送成功（{len(message.signals)} 条信号）")
+            elif message.attempts >= config.max_retries:
+                status = NotificationHandle.STATUS_FAILED
+                logger.error(f"飞书通知发送失败，已重试 {message.attempts} 次: {error}")
+            else:
+                message.last_error = error
+                message.next_attempt_at = time.time() + self._backoff(message.attempts, config)
+                logger.warning(f"第 {message.attempts} 次发送失败: {error}")
+                self._save_outbox()
+                return
+
+            self._messages.pop(message.id, None)
+            self._save_outbox()
+            for handle in self._handles.pop(message.id, []):
+                handle._resolve(status, error)
+            self._cond.notify_all()
+
+    def _backoff(self, attempts: int, config: NotificationConfig) -> float:
+        """第 attempts 次失败后的退避间隔"""
+        return min(config.retry_interval * (2 ** (attempts - 1)), self.max_backoff)
+
+    def _get_session(self):
+        """带连接池的 HTTP 会话（仅后台线程使用）"""
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def _post(self, content: str) -> Tuple[bool, str]:
+        """发送一次请求（不重试）"""
+        if not HAS_REQUESTS:
+            return False, "requests 库未安装"
+
+        config = self.config
+        try:
+            response = self._get_session().post(
+                config.webhook_url,
+                json=build_webhook_payload(content),
+                timeout=config.timeout,
+            )
+            return parse_webhook_response(response)
+        except requests.Timeout:
+            return False, f"请求超时 ({config.timeout}秒)"
+        except requests.RequestException as e:
+            return False, f"网络错误: {str(e)}"
+        except Exception as e:
+            return False, f"未知错误: {str(e)}"
+
+    # ==================== 发件箱持久化 ====================
+
+    def _load_outbox(self) -> None:
+        """加载上次运行未送达的消息"""
+        if not self.outbox_path.exists():
+            return
+        try:
+            with open(self.outbox_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for record in data.get("messages", []):
+                message = OutboxMessage(**record)
+                self._messages[message.id] = message
+                if message.status == OutboxMessage.STATUS_OPEN:
+                    self._open_id = message.id
+        except (json.JSONDecodeError, TypeError, KeyError) as e:
+            logger.warning(f"发件箱文件损坏，忽略: {e}")
+            self._messages.clear()
+            self._open_id = None
+
+        if self._messages:
+            logger.info(f"从发件箱恢复 {len(self._messages)} 条未送达通知")
+
+    def _save_outbox(self) -> None:
+        """原子写入发件箱（调用方持有锁）"""
+        try:
+            self.outbox_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.outbox_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"messages": [asdict(m) for m in self._messages.values()]},
+                          f, ensure_ascii=False)
+            tmp_path.replace(self.outbox_path)
+        except OSError as e:
+            logger.error(f"保存发件箱失败: {e}")
+
+
+# ==========================================
+# 全局实例
+# ==========================================
+
+_dispatcher: Optional[NotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_notification_dispatcher() -> NotificationDispatcher:
+    """获取全局通知分发器（首次调用时创建）"""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = NotificationDispatcher()
+    return _dispatcher
@@ -20,6 +20,7 @@ from .topic_matcher import (
     SmartTopicMatcher,
     CompanyBusiness,
     LeaderRecord,
+    TopicStore,
     get_smart_topic_matcher,
 )
 from .call_auction_filter import (
@@ -61,6 +62,17 @@ from .picker import (
     create_overnight_picker,
     quick_overnight_pick,
 )
+from .feature_store import (
+    FeatureStore,
+    compute_features,
+    get_feature_store,
+)
+from .market_breadth import (
+    MarketBreadthStore,
+    classify_market_environment,
+    replay_sentiment,
+    get_market_breadth_store,
+)
 from .backtester import (
     OvernightBacktestEngine,
     BacktestConfig,
@@ -83,6 +95,7 @@ __all__ = [
     'SmartTopicMatcher',
     'CompanyBusiness',
     'LeaderRecord',
+    'TopicStore',
     'get_smart_topic_matcher',
     'CallAuctionFilter',
     'AuctionAction',
@@ -117,6 +130,15 @@ __all__ = [
     'MarketEnvironment',
     'create_overnight_picker',
     'quick_overnight_pick',
+    # Feature Store
+    'FeatureStore',
+    'compute_features',
+    'get_feature_store',
+    # Market Breadth Store
+    'MarketBreadthStore',
+    'classify_market_environment',
+    'replay_sentiment',
+    'get_market_breadth_store',
     # Backtest Engine
     'OvernightBacktestEngine',
     'BacktestConfig',
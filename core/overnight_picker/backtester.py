@@ -21,6 +21,9 @@ from typing import List, Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from .feature_store import FeatureStore, get_feature_store
+from .market_breadth import MarketBreadthStore, get_market_breadth_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,6 +72,8 @@ class DailyPickResult:
     is_win: bool                        # 是否盈利
     is_executed: bool                   # 是否执行买入
     skip_reason: str = ''               # 跳过原因
+    sentiment_phase: str = ''           # 选股日情绪阶段（市场宽度历史库）
+    position_multiplier: float = 1.0    # 选股日情绪仓位系数（市场宽度历史库）
 
 
 @dataclass
@@ -126,10 +131,18 @@ class OvernightBacktestEngine:
     Requirements: 12.1
     """
     
+    # 从特征库读取的每日数据列
+    FEATURE_COLUMNS = [
+        'open', 'high', 'low', 'close', 'volume', 'prev_close',
+        'ma5', 'ma10', 'ma20', 'ma60', 'ma5_vol', 'volatility',
+    ]
+    
     def __init__(self, 
                  config: BacktestConfig = None,
                  data_path: str = "data/processed",
-                 stock_pool: List[str] = None):
+                 stock_pool: List[str] = None,
+                 feature_store: Optional[FeatureStore] = None,
+                 breadth_store: Optional[MarketBreadthStore] = None):
         """
         初始化回测引擎
         
@@ -137,15 +150,21 @@ class OvernightBacktestEngine:
             config: 回测配置
             data_path: 数据文件路径
             stock_pool: 股票池列表
+            feature_store: 特征库，提供时交易日历与每日数据直接查表，不再加载K线计算指标
+            breadth_store: 市场宽度历史库，提供时按当日大盘环境决定是否选股，
+                           收益按情绪仓位系数加权（评分本身不受市场环境影响）
         """
         self.config = config or BacktestConfig()
         self.data_path = data_path
+        self.feature_store = feature_store
+        self.breadth_store = breadth_store
         
         # 初始化股票池
         self.stock_pool = stock_pool or self._load_stock_pool()
         
         # 数据缓存
         self._stock_data_cache: Dict[str, pd.DataFrame] = {}
+        self._feature_sections: Dict[str, pd.DataFrame] = {}
         
         # 交易日历
         self._trading_days: List[str] = []
@@ -234,6 +253,10 @@ class OvernightBacktestEngine:
         
         从数据中提取所有交易日
         """
+        if self.feature_store is not None:
+            dates = self.feature_store.load([])['date']
+            return sorted(dates.dt.strftime('%Y-%m-%d').unique().tolist())
+        
         all_dates = set()
         
         for code in self.stock_pool[:10]:  # 使用前10只股票构建日历
@@ -270,6 +293,9 @@ class OvernightBacktestEngine:
         Returns:
             数据字典或None
         """
+        if self.feature_store is not None:
+            return self._get_feature_row(code, target_date)
+        
         df = self.load_stock_data(code)
         if df is None or df.empty:
             return None
@@ -302,6 +328,48 @@ class OvernightBacktestEngine:
             'volatility': row.get('volatility', 0.05),
         }
     
+    def _get_feature_row(self, code: str, target_date: str) -> Optional[Dict]:
+        """
+        从特征库读取股票在指定日期的数据（口径与 _get_stock_data_on_date 一致）
+        
+        每个交易日只做一次截面查询，结果缓存。
+        """
+        section = self._feature_sections.get(target_date)
+        if section is None:
+            section = self.feature_store.cross_section(
+                pd.to_datetime(target_date).date(), self.FEATURE_COLUMNS,
+            )
+            self._feature_sections[target_date] = section
+        
+        if code not in section.index:
+            return None
+        
+        row = section.loc[code]
+        # 首个交易日没有前一日数据，以当日收盘价代替
+        prev_close = row['prev_close'] if pd.notna(row['prev_close']) else row['close']
+        
+        data = {'date': target_date}
+        data.update({name: row[name] for name in self.FEATURE_COLUMNS})
+        data['prev_close'] = prev_close
+        return data
+    
+    def _sentiment_on_date(self, pick_date: str) -> Tuple[str, float]:
+        """
+        查表重现选股日收盘后的情绪阶段与仓位系数
+        
+        Returns:
+            (情绪阶段, 仓位系数)，未提供市场宽度历史库或缺少当日数据时为 ('', 1.0)
+        """
+        if self.breadth_store is None:
+            return '', 1.0
+        sentiment = self.breadth_store.sentiment(pick_date)
+        if sentiment is None:
+            return '', 1.0
+        position_multiplier = sentiment['position_multiplier']
+        if pd.isna(position_multiplier):
+            position_multiplier = 1.0
+        return sentiment['phase'], float(position_multiplier)
+    
     def _score_stock_on_date(self, code: str, pick_date: str) -> Optional[Tuple[float, Dict]]:
         """
         对股票在指定日期进行评分
@@ -501,6 +569,14 @@ class OvernightBacktestEngine:
             logger.debug(f"无法获取{pick_date}的下一个交易日")
             return results
         
+        # 市场环境：查表重现选股日收盘后的大盘判断、情绪阶段与仓位系数
+        if self.breadth_store is not None:
+            tradable, reason = self.breadth_store.is_tradable(pick_date)
+            if not tradable:
+                logger.debug(f"{pick_date} 不选股: {reason}")
+                return results
+        sentiment_phase, position_multiplier = self._sentiment_on_date(pick_date)
+        
         # 对所有股票评分
         scored_stocks = []
         for code in self.stock_pool:
@@ -550,6 +626,8 @@ class OvernightBacktestEngine:
                 trade_data=trade_data,
                 entry_prices=entry_prices,
             )
+            result.sentiment_phase = sentiment_phase
+            result.position_multiplier = position_multiplier
             
             results.append(result)
         
@@ -680,8 +758,9 @@ class OvernightBacktestEngine:
         # 平均收益率
         avg_return = np.mean(returns) if returns else 0.0
         
-        # 总收益率（假设等权重投资）
-        total_return = np.sum(returns) / max(1, executed_picks / self.config.max_recommendations)
+        # 总收益率（假设等权重投资，按当日情绪仓位系数加权）
+        weighted = [r.return_pct * r.position_multiplier for r in executed_results]
+        total_return = np.sum(weighted) / max(1, executed_picks / self.config.max_recommendations)
         
         # 平均盈利/亏损
         avg_win = np.mean([r.return_pct for r in wins]) if wins else 0.0
@@ -799,12 +878,12 @@ class OvernightBacktestEngine:
         if not results:
             return pd.DataFrame(columns=['date', 'value', 'return'])
         
-        # 按交易日期分组
+        # 按交易日期分组（收益按当日情绪仓位系数加权）
         daily_returns = {}
         for r in results:
             if r.trade_date not in daily_returns:
                 daily_returns[r.trade_date] = []
-            daily_returns[r.trade_date].append(r.return_pct)
+            daily_returns[r.trade_date].append(r.return_pct * r.position_multiplier)
         
         # 计算每日平均收益
         equity_data = []
@@ -1037,6 +1116,8 @@ class OvernightBacktestEngine:
                 'is_win': r.is_win,
                 'is_executed': r.is_executed,
                 'skip_reason': r.skip_reason,
+                'sentiment_phase': r.sentiment_phase,
+                'position_multiplier': r.position_multiplier,
             })
         
         df = pd.DataFrame(records)
@@ -1056,6 +1137,8 @@ def run_overnight_backtest(
     data_path: str = "data/processed",
     stock_pool: List[str] = None,
     save_report: bool = True,
+    use_feature_store: bool = False,
+    use_market_breadth: bool = False,
 ) -> BacktestResult:
     """
     便捷函数：运行隔夜选股回测
@@ -1069,6 +1152,8 @@ def run_overnight_backtest(
         data_path: 数据路径
         stock_pool: 股票池
         save_report: 是否保存报告
+        use_feature_store: 是否从全局特征库读取交易日历与每日数据（特征库由选股器每晚增量更新）
+        use_market_breadth: 是否按全局市场宽度历史库重现每日大盘环境与情绪仓位（库为空时先从 data_path 回算）
     
     Returns:
         BacktestResult
@@ -1090,10 +1175,18 @@ def run_overnight_backtest(
         max_recommendations=max_recommendations,
     )
     
+    breadth_store = None
+    if use_market_breadth:
+        breadth_store = get_market_breadth_store()
+        if breadth_store.load().empty:
+            breadth_store.build_from_dir(data_path)
+    
     engine = OvernightBacktestEngine(
         config=config,
         data_path=data_path,
         stock_pool=stock_pool,
+        feature_store=get_feature_store() if use_feature_store else None,
+        breadth_store=breadth_store,
     )
     
     result = engine.run()
@@ -0,0 +1,381 @@
+"""
+隔夜选股特征库 (FeatureStore)
+
+按 交易日 × 股票 持久化评分所需的派生特征（均线、量比、涨跌幅、涨停标记、波动率、
+价格分位点、股性特征等），选股器与回测引擎直接查表，不再从原始K线重复计算。
+
+设计原则：
+- 每个自然月一个分区文件 data/features/YYYYMM.csv（长表：date, code, 特征列...）
+- 全量构建一次，之后每晚增量更新：每只股票只计算库中最新日期之后的K线
+  （前序 LOOKBACK 根K线只参与计算，不重复写入）
+- 读取按列投影（只解析需要的列）并按月份裁剪分区，已读取的分区缓存在内存
+- 特征口径与 OvernightStockPicker._v6_batch_frame 一致，查表评分与现算评分相同
+"""
+
+import logging
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.limit_events import limit_threshold
+from .scorer_v6 import StockActivityScorer
+
+logger = logging.getLogger(__name__)
+
+
+KEY_COLUMNS = ['date', 'code']
+
+FEATURE_COLUMNS = [
+    # 当日与前一日K线
+    'open', 'high', 'low', 'close', 'volume', 'prev_close', 'prev_low',
+    # 均线与量能
+    'ma5', 'ma10', 'ma20', 'ma60', 'ma5_vol', 'ma10_vol',
+    # 涨跌、量比、波动与位置
+    'change_pct', 'volume_ratio', 'volatility', 'price_percentile',
+    'turnover_rate', 'turnover_amount', 'is_breakout', 'is_limit_up',
+    # 股性特征（StockActivityScorer）
+    'kline_bars', 'has_limit_up_20d', 'consecutive_limit_ups',
+    'volatility_20d', 'max_gain_60d', 'is_sideways',
+]
+
+BOOL_COLUMNS = ['is_breakout', 'is_limit_up', 'has_limit_up_20d', 'is_sideways']
+INT_COLUMNS = ['kline_bars', 'consecutive_limit_ups']
+
+
+# ========== 特征计算 ==========
+
+def _windows(values: np.ndarray, width: int) -> np.ndarray:
+    """每个位置结尾的 width 长度窗口（左侧以 NaN 填充），形状 (n, width)"""
+    padded = np.concatenate([np.full(width - 1, np.nan), values])
+    return sliding_window_view(padded, width)
+
+
+def _rolling_mean(values: np.ndarray, width: int) -> np.ndarray:
+    """滚动均值，窗口内有缺失值时为 NaN（同 pandas rolling(width).mean()）"""
+    return _windows(values, width).mean(axis=1)
+
+
+def _rolling_nanmean(values: np.ndarray, width: int) -> np.ndarray:
+    """滚动均值，忽略缺失值（同 Series.tail(width).mean()）"""
+    windows = _windows(values, width)
+    count = (~np.isnan(windows)).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.nansum(windows, axis=1) / np.where(count > 0, count, np.nan)
+
+
+def compute_features(df: pd.DataFrame, code: str = '', start_bar: int = 0, name: str = '') -> pd.DataFrame:
+    """
+    计算单只股票每个交易日的特征
+
+    Args:
+        df: 按日期升序的日线数据（date, open, high, low, close, volume）
+        code: 股票代码（用于按板块确定涨停阈值）
+        start_bar: df 第一行之前已有的K线数（增量计算时传入，用于 kline_bars）
+        name: 股票名称（用于识别主板 ST 的涨停阈值）
+
+    Returns:
+        每个交易日一行的特征表（date, code, FEATURE_COLUMNS）
+    """
+    n = len(df)
+    open_p = df['open'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    volume = df['volume'].to_numpy(dtype=np.float64)
+    bars = start_bar + np.arange(1, n + 1)
+
+    prev_close = np.concatenate([[np.nan], close[:-1]])
+    prev_low = np.concatenate([[np.nan], low[:-1]])
+    prev_high_20 = np.concatenate([[np.nan], _windows(high, 20).max(axis=1)[:-1]])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ma5_vol = _rolling_mean(volume, 5)
+        change_pct = (close - prev_close) / prev_close * 100
+        avg_volume = _rolling_nanmean(volume, 20)
+        close_60 = _windows(close, 60)
+        rows_60 = np.minimum(bars, 60)
+        percentile = (close_60 <= close[:, None]).sum(axis=1) / rows_60 * 100
+
+    threshold = limit_threshold(code, name)
+    activity = StockActivityScorer().features_batch(
+        close_60, _windows(high, 60), _windows(low, 60), _windows(change_pct, 60), bars,
+        np.full(n, threshold),
+    )
+
+    features = pd.DataFrame({
+        'date': pd.to_datetime(df['date']).to_numpy(),
+        'code': code,
+        'open': open_p,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume,
+        'prev_close': prev_close,
+        'prev_low': prev_low,
+        'ma5': _rolling_mean(close, 5),
+        'ma10': _rolling_mean(close, 10),
+        'ma20': _rolling_mean(close, 20),
+        'ma60': _rolling_mean(close, 60),
+        'ma5_vol': ma5_vol,
+        'ma10_vol': _rolling_mean(volume, 10),
+        'change_pct': change_pct,
+        'volume_ratio': np.where(ma5_vol > 0, volume / ma5_vol, 1.0),
+        'volatility': _rolling_mean((high - low) / prev_close, 5),
+        'price_percentile': np.where(rows_60 > 1, percentile, 50.0),
+        'turnover_rate': np.where(avg_volume > 0, volume / avg_volume * 5, 5.0),
+        'turnover_amount': volume * close,
+        'is_breakout': close > prev_high_20,
+        'is_limit_up': change_pct >= threshold,
+    })
+    for name, values in activity.items():
+        features[name] = values
+    return features
+
+
+# ========== 特征库 ==========
+
+class FeatureStore:
+    """
+    按月分区的 交易日 × 股票 特征库
+
+    使用示例:
+        store = FeatureStore()
+        store.update(frames)                                  # 每晚增量更新
+        today = store.cross_section(trade_date, ['ma20', 'change_pct'])
+        history = store.load(['close', 'ma5'], start=date(2025, 1, 1))
+    """
+
+    DEFAULT_DIR = Path("data/features")
+    LOOKBACK = 60       # 计算单日特征需要的前序K线数
+
+    def __init__(self, data_dir: Optional[Path] = None):
+        """
+        Args:
+            data_dir: 特征库目录，默认 data/features
+        """
+        self.data_dir = Path(data_dir) if data_dir is not None else self.DEFAULT_DIR
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, Tuple[str, ...]], pd.DataFrame] = {}
+
+    # ========== 分区 ==========
+
+    def _month_path(self, month: str) -> Path:
+        return self.data_dir / f"{month}.csv"
+
+    @property
+    def months(self) -> List[str]:
+        """已有分区（YYYYMM，升序）"""
+        if not self.data_dir.exists():
+            return []
+        return sorted(path.stem for path in self.data_dir.glob('[0-9]' * 6 + '.csv'))
+
+    def _read_partition(self, month: str, columns: Sequence[str]) -> pd.DataFrame:
+        """读取一个分区的指定列（结果缓存）"""
+        key = (month, tuple(columns))
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        df = pd.read_csv(
+            self._month_path(month),
+            usecols=KEY_COLUMNS + list(columns),
+            dtype={'code': str},
+            parse_dates=['date'],
+            float_precision='round_trip',
+        )
+        for name in BOOL_COLUMNS:
+            if name in df.columns:
+                df[name] = df[name].astype(bool)
+        with self._lock:
+            self._cache[key] = df
+        return df
+
+    def _write_partition(self, month: str, rows: pd.DataFrame,
+                         replace_codes: Iterable[str] = ()) -> None:
+        """
+        合并写入一个分区（同一交易日同一股票以新数据为准）
+
+        Args:
+            replace_codes: 先删除这些股票在分区中的全部已有行
+        """
+        path = self._month_path(month)
+        replace_codes = set(replace_codes)
+        if path.exists():
+            existing = pd.read_csv(path, dtype={'code': str}, parse_dates=['date'], float_precision='round_trip')
+            if replace_codes:
+                stale = existing['code'].isin(replace_codes)
+                if not stale.any() and rows.empty:
+                    return
+                existing = existing[~stale]
+            rows = pd.concat([existing, rows], ignore_index=True)
+        elif rows.empty:
+            return
+        rows = rows.drop_duplicates(subset=KEY_COLUMNS, keep='last').sort_values(KEY_COLUMNS)
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        rows.to_csv(tmp_path, index=False, date_format='%Y-%m-%d')
+        tmp_path.replace(path)
+        with self._lock:
+            self._cache = {key: df for key, df in self._cache.items() if key[0] != month}
+
+    def latest_date(self) -> Optional[date]:
+        """库中最新交易日"""
+        months = self.months
+        if not months:
+            return None
+        dates = self._read_partition(months[-1], [])['date']
+        return dates.max().date() if len(dates) else None
+
+    # ========== 写入 ==========
+
+    def update(self, frames: Dict[str, pd.DataFrame], rebuild: bool = False,
+               names: Optional[Dict[str, str]] = None) -> int:
+        """
+        写入特征（默认增量）
+
+        增量模式下，库中已有的股票只计算该股票在库中最新日期之后的K线
+        （从最新分区向前查找其最新日期），库中没有的股票计算全部历史。
+        库中最新日期的收盘价与传入K线不一致（如除权后前复权历史被改写）时，
+        该股票的已有特征全部删除并按新K线重建。
+
+        Args:
+            frames: {code: 按日期升序的日线数据}
+            rebuild: 为 True 时重新计算全部历史
+            names: {code: 股票名称}，用于识别主板 ST 的涨停阈值
+
+        Returns:
+            写入的行数
+        """
+        names = names or {}
+        latest: Dict[str, Tuple[pd.Timestamp, float]] = {}
+        pending = set(frames) if not rebuild else set()
+        for month in reversed(self.months):
+            if not pending:
+                break
+            keys = self._read_partition(month, ['close'])
+            found = keys[keys['code'].isin(pending)].sort_values('date').groupby('code').tail(1)
+            latest.update(zip(found['code'], zip(found['date'], found['close'])))
+            pending -= set(found['code'])
+
+        parts = []
+        rewritten = set()
+        for code, df in frames.items():
+            if df is None or df.empty:
+                continue
+            try:
+                if code in latest and not self._history_rewritten(df, *latest[code]):
+                    dates = pd.to_datetime(df['date'])
+                    new = int((dates > latest[code][0]).sum())
+                    if new == 0:
+                        continue
+                    start = max(len(df) - new - self.LOOKBACK, 0)
+                    features = compute_features(
+                        df.iloc[start:], code, start_bar=start, name=names.get(code, '')
+                    ).tail(new)
+                else:
+                    if code in latest:
+                        logger.info(f"K线历史已改写（复权），重建特征: {code}")
+                        rewritten.add(code)
+                    features = compute_features(df, code, name=names.get(code, ''))
+                parts.append(features)
+            except Exception as e:
+                logger.warning(f"计算特征失败: {code}, 错误: {e}")
+
+        if not parts:
+            return 0
+
+        rows = pd.concat(parts, ignore_index=True)
+        written = set()
+        for month, month_rows in rows.groupby(rows['date'].dt.strftime('%Y%m')):
+            self._write_partition(month, month_rows, replace_codes=rewritten)
+            written.add(month)
+        if rewritten:
+            # 重建股票在新K线已不覆盖的月份中的旧特征
+            for month in set(self.months) - written:
+                self._write_partition(month, rows.iloc[:0], replace_codes=rewritten)
+        logger.info(f"特征库更新完成: {len(rows)} 行, {len(parts)} 只股票")
+        return len(rows)
+
+    @staticmethod
+    def _history_rewritten(df: pd.DataFrame, last_date: pd.Timestamp, last_close: float) -> bool:
+        """库中最新日期的收盘价与K线不一致（或该日已不在K线中）"""
+        on_date = (pd.to_datetime(df['date']) == last_date).to_numpy()
+        if not on_date.any():
+            return True
+        close = float(df['close'].to_numpy(dtype=np.float64)[on_date][-1])
+        return not np.isclose(close, last_close, rtol=1e-6, atol=1e-9)
+
+    # ========== 查询 ==========
+
+    def load(self,
+             columns: Optional[Iterable[str]] = None,
+             start: Optional[date] = None,
+             end: Optional[date] = None,
+             codes: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        读取特征（按列投影、按月份裁剪分区）
+
+        Args:
+            columns: 需要的特征列，默认全部
+            start/end: 日期范围（含两端）
+            codes: 股票代码过滤
+
+        Returns:
+            date, code + 指定特征列，按 (date, code) 排序
+        """
+        columns = list(columns) if columns is not None else list(FEATURE_COLUMNS)
+        unknown = set(columns) - set(FEATURE_COLUMNS)
+        if unknown:
+            raise ValueError(f"未知特征列: {sorted(unknown)}")
+
+        months = [
+            month for month in self.months
+            if (start is None or month >= start.strftime('%Y%m'))
+            and (end is None or month <= end.strftime('%Y%m'))
+        ]
+        if not months:
+            return pd.DataFrame(columns=KEY_COLUMNS + columns)
+
+        df = pd.concat([self._read_partition(month, columns) for month in months], ignore_index=True)
+        mask = np.ones(len(df), dtype=bool)
+        if start is not None:
+            mask &= (df['date'] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (df['date'] <= pd.Timestamp(end)).to_numpy()
+        if codes is not None:
+            mask &= df['code'].isin(set(codes)).to_numpy()
+        return df[mask].reset_index(drop=True)
+
+    def cross_section(self,
+                      trade_date: date,
+                      columns: Optional[Iterable[str]] = None,
+                      codes: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        读取单个交易日的截面
+
+        Returns:
+            index 为股票代码的特征表
+        """
+        df = self.load(columns, start=trade_date, end=trade_date, codes=codes)
+        return df.drop(columns='date').set_index('code')
+
+
+_feature_store: Optional[FeatureStore] = None
+_feature_store_lock = threading.Lock()
+
+
+def get_feature_store() -> FeatureStore:
+    """获取全局共享的特征库"""
+    global _feature_store
+    if _feature_store is None:
+        with _feature_store_lock:
+            if _feature_store is None:
+                _feature_store = FeatureStore()
+    return _feature_store
@@ -0,0 +1,390 @@
+"""
+隔夜选股市场宽度历史库 (MarketBreadthStore)
+
+从本地日线库一次向量化回算全部历史交易日的市场输入并持久化：
+- 涨跌停 / 炸板 / 连板 / 涨跌家数（LimitEventIndex 的每日汇总）
+- 情绪周期：按日顺序回放 SentimentCyclePredictor（阶段、等级、明日仓位系数）
+- 大盘环境：指数均线与涨跌幅，口径与 OvernightStockPicker.analyze_market_environment 一致
+
+回测按交易日查表即可重现当日的真实情绪阶段与大盘环境，不再以空的市场数据评分；
+MarketSentimentAnalyzer / IndexEnvironmentAnalyzer 的输入也可从库中按日生成。
+
+设计原则：
+- 单个 CSV 文件 data/market_breadth/breadth.csv，每个交易日一行
+- 重建为一次全量计算（按列向量化），查询为内存字典查找
+"""
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.limit_events import LimitEventIndex
+from .picker import MarketEnvironment
+from .sentiment_predictor import SentimentCyclePredictor, SentimentLevel
+
+logger = logging.getLogger(__name__)
+
+
+# 情绪等级 → 选股器情绪描述（同 OvernightStockPicker.analyze_market_sentiment）
+SENTIMENT_MAP = {
+    SentimentLevel.EXTREME_GREED: '乐观',
+    SentimentLevel.GREED: '乐观',
+    SentimentLevel.NEUTRAL: '中性',
+    SentimentLevel.FEAR: '恐慌',
+    SentimentLevel.EXTREME_FEAR: '恐慌',
+}
+
+
+# ========== 向量化计算 ==========
+
+def classify_market_environment(index_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    逐日判断大盘环境（口径与 OvernightStockPicker.analyze_market_environment 一致）
+
+    Args:
+        index_df: 指数日线（date, close），按日期升序
+
+    Returns:
+        每个交易日一行：index_close, index_change, change_5d, ma5/ma10/ma20/ma60,
+        market_env, ma_status, should_empty
+    """
+    dates = pd.to_datetime(index_df['date']).to_numpy()
+    series = index_df['close'].astype(float).reset_index(drop=True)
+    ma = {n: series.rolling(window=n).mean().to_numpy() for n in (5, 10, 20, 60)}
+    close = series.to_numpy()
+
+    prev_close = np.concatenate([close[:1], close[:-1]])
+    index_change = (close - prev_close) / prev_close
+    close_5d_ago = series.shift(4).to_numpy()
+    change_5d = np.where(np.arange(len(close)) >= 4, (close - close_5d_ago) / close_5d_ago, 0.0)
+
+    above = {n: close > ma[n] for n in ma}
+    bullish = (ma[5] > ma[10]) & (ma[10] > ma[20])
+    bearish = (ma[5] < ma[10]) & (ma[10] < ma[20])
+    strong = above[5] & above[10] & above[20]
+    crash = bearish & ((index_change < -0.02) | (change_5d < -0.05))
+    conditions = [
+        strong & bullish, strong, above[20], above[60],
+        crash, bearish, index_change < -0.03,
+    ]
+    env = np.select(conditions, [
+        MarketEnvironment.STRONG, MarketEnvironment.STRONG, MarketEnvironment.NEUTRAL,
+        MarketEnvironment.NEUTRAL, MarketEnvironment.EXTREME_WEAK, MarketEnvironment.WEAK,
+        MarketEnvironment.EXTREME_WEAK,
+    ], default=MarketEnvironment.WEAK)
+    ma_status = np.select(conditions, [
+        '多头排列', '站上MA20', '震荡偏强', '震荡', '空头排列+大跌', '空头排列', '大幅下跌',
+    ], default='弱势')
+    should_empty = np.select(conditions, [False] * 4 + [True, False, True], default=False)
+
+    return pd.DataFrame({
+        'index_close': close,
+        'index_change': index_change,
+        'change_5d': change_5d,
+        'ma5': ma[5],
+        'ma10': ma[10],
+        'ma20': ma[20],
+        'ma60': ma[60],
+        'market_env': env,
+        'ma_status': ma_status,
+        'should_empty': should_empty.astype(bool),
+    }, index=pd.DatetimeIndex(dates, name='date'))
+
+
+def replay_sentiment(history: pd.DataFrame) -> pd.DataFrame:
+    """
+    按日顺序回放情绪周期预判（与每日收盘后运行 SentimentCyclePredictor 的结果一致）
+
+    Args:
+        history: LimitEventIndex.market_history() 的每日汇总
+
+    Returns:
+        每个交易日一行：broken_board_rate, market_profit_rate, sentiment_score, sentiment_phase,
+        sentiment_level, sentiment, predicted_phase, position_multiplier
+    """
+    touched = (history['limit_up_count'] + history['failed_limit_up']).to_numpy()
+    total = (history['up_count'] + history['down_count'] + history['flat_count']).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        broken_rate = np.where(touched > 0, history['failed_limit_up'] / touched, 0.0)
+        profit_rate = np.where(total > 0, history['up_count'] / total, 0.5)
+
+    predictor = SentimentCyclePredictor()
+    rows = []
+    for i, (limit_up, limit_down, continuous) in enumerate(zip(
+            history['limit_up_count'], history['limit_down_count'], history['continuous_board_count'])):
+        today = predictor.analyze_today_sentiment(
+            limit_up_count=int(limit_up),
+            limit_down_count=int(limit_down),
+            broken_board_rate=float(broken_rate[i]),
+            continuous_board_count=int(continuous),
+            market_profit_rate=float(profit_rate[i]),
+        )
+        prediction = predictor.predict_tomorrow(today)
+        rows.append((
+            today.score, today.phase.value, today.level.value, SENTIMENT_MAP.get(today.level, '中性'),
+            prediction.predicted_phase, prediction.position_multiplier,
+        ))
+
+    replay = pd.DataFrame(rows, index=history.index, columns=[
+        'sentiment_score', 'sentiment_phase', 'sentiment_level', 'sentiment',
+        'predicted_phase', 'position_multiplier',
+    ])
+    replay.insert(0, 'broken_board_rate', broken_rate)
+    replay.insert(1, 'market_profit_rate', profit_rate)
+    return replay
+
+
+# ========== 市场宽度历史库 ==========
+
+class MarketBreadthStore:
+    """
+    市场宽度历史库
+
+    使用示例:
+        store = MarketBreadthStore()
+        store.build_from_dir('data/processed')          # 回算全部历史并保存
+        store.sentiment('2025-06-30')['phase']
+        store.is_tradable('2025-06-30')
+    """
+
+    DEFAULT_DIR = Path("data/market_breadth")
+    FILE_NAME = "breadth.csv"
+    INDEX_CODE = "000001"       # 上证指数（同 OvernightStockPicker.analyze_market_environment）
+    LOAD_WORKERS = 8
+
+    def __init__(self, data_dir: Optional[Path] = None):
+        """
+        Args:
+            data_dir: 存储目录，默认 data/market_breadth
+        """
+        self.data_dir = Path(data_dir) if data_dir is not None else self.DEFAULT_DIR
+        self._lock = threading.Lock()
+        self._frame: Optional[pd.DataFrame] = None
+        self._rows: Dict[pd.Timestamp, int] = {}
+
+    @property
+    def path(self) -> Path:
+        return self.data_dir / self.FILE_NAME
+
+    # ========== 构建 ==========
+
+    def build(self,
+              frames: Dict[str, pd.DataFrame],
+              index_df: Optional[pd.DataFrame] = None,
+              names: Optional[Dict[str, str]] = None,
+              save: bool = True) -> pd.DataFrame:
+        """
+        回算全部历史交易日的市场宽度、情绪与大盘环境
+
+        Args:
+            frames: {code: 个股日线（date, close, high）}
+            index_df: 指数日线（date, close），缺省时大盘环境按震荡处理
+            names: {code: 股票名称}（用于识别 ST）
+            save: 是否写入文件
+
+        Returns:
+            每个交易日一行的历史表（index 为交易日）
+        """
+        history = LimitEventIndex.from_frames(frames, names).market_history()
+        history = history.join(replay_sentiment(history))
+
+        if index_df is None:
+            index_df = pd.DataFrame({'date': [], 'close': []})
+        history = history.join(classify_market_environment(index_df), how='left')
+        # 无指数数据的交易日按震荡处理（同 analyze_market_environment 取不到指数时）
+        history['market_env'] = history['market_env'].fillna(MarketEnvironment.NEUTRAL)
+        history['ma_status'] = history['ma_status'].fillna('未知')
+        history['should_empty'] = history['should_empty'].astype(object).fillna(False).astype(bool)
+        history.index.name = 'date'
+
+        self._set_frame(history)
+        if save:
+            self.save()
+        logger.info(f"市场宽度历史回算完成: {len(history)}个交易日")
+        return history
+
+    def build_from_dir(self,
+                       data_path: str = "data/processed",
+                       codes: Optional[List[str]] = None,
+                       index_code: str = INDEX_CODE,
+                       names: Optional[Dict[str, str]] = None,
+                       save: bool = True) -> pd.DataFrame:
+        """
+        从本地日线目录回算（每只股票一个 {code}.csv）
+
+        Args:
+            data_path: 日线目录
+            codes: 股票代码列表，默认目录下全部（不含指数）
+            index_code: 指数文件代码
+        """
+        if codes is None:
+            codes = [f[:-4] for f in os.listdir(data_path) if f.endswith('.csv')]
+        codes = [code for code in codes if code != index_code]
+
+        def read(code: str) -> Optional[pd.DataFrame]:
+            path = os.path.join(data_path, f"{code}.csv")
+            if not os.path.exists(path):
+                return None
+            try:
+                return pd.read_csv(path, usecols=lambda c: c in ('date', 'close', 'high'))
+            except Exception as e:
+                logger.warning(f"加载数据失败: {code}, 错误: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.LOAD_WORKERS) as executor:
+            frames = dict(zip(codes, executor.map(read, codes)))
+        index_df = read(index_code)
+        return self.build({c: df for c, df in frames.items() if df is not None}, index_df, names, save)
+
+    # ========== 读写 ==========
+
+    def _set_frame(self, frame: pd.DataFrame) -> None:
+        with self._lock:
+            self._frame = frame
+            self._rows = {d: i for i, d in enumerate(frame.index)}
+
+    def save(self) -> None:
+        """写入文件（连板分布以 JSON 保存）"""
+        frame = self.load().copy()
+        frame['continuous_limit_up'] = [json.dumps(boards) for boards in frame['continuous_limit_up']]
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        frame.to_csv(tmp_path, date_format='%Y-%m-%d')
+        tmp_path.replace(self.path)
+
+    def load(self) -> pd.DataFrame:
+        """读取全部历史（首次调用时从文件加载）"""
+        if self._frame is None:
+            if not self.path.exists():
+                return pd.DataFrame()
+            frame = pd.read_csv(self.path, index_col='date', parse_dates=['date'])
+            frame['continuous_limit_up'] = [
+                {int(n): count for n, count in json.loads(boards).items()}
+                for boards in frame['continuous_limit_up']
+            ]
+            self._set_frame(frame)
+        return self._frame
+
+    # ========== 查询 ==========
+
+    def day(self, trade_date) -> Optional[Dict]:
+        """指定交易日的全部字段，无数据返回 None"""
+        frame = self.load()
+        i = self._rows.get(pd.Timestamp(trade_date)) if len(frame) else None
+        if i is None:
+            return None
+        row = frame.iloc[i].to_dict()
+        row['date'] = frame.index[i]
+        return row
+
+    def market_env(self, trade_date) -> Optional[Dict]:
+        """大盘环境（字段同 OvernightStockPicker.analyze_market_environment）"""
+        row = self.day(trade_date)
+        if row is None:
+            return None
+        index_change = 0.0 if pd.isna(row['index_change']) else row['index_change']
+        return {
+            'env': row['market_env'],
+            'description': f"指数{index_change*100:+.2f}%，{row['ma_status']}",
+            'index_change': index_change,
+            'change_5d': row['change_5d'],
+            'ma_status': row['ma_status'],
+            'close': row['index_close'],
+            'ma5': row['ma5'],
+            'ma10': row['ma10'],
+            'ma20': row['ma20'],
+            'ma60': row['ma60'],
+            'should_empty': bool(row['should_empty']),
+        }
+
+    def sentiment(self, trade_date) -> Optional[Dict]:
+        """情绪周期（字段同 OvernightStockPicker.analyze_market_sentiment 的摘要部分）"""
+        row = self.day(trade_date)
+        if row is None:
+            return None
+        return {
+            'sentiment': row['sentiment'],
+            'phase': row['sentiment_phase'],
+            'score': row['sentiment_score'],
+            'level': row['sentiment_level'],
+            'predicted_phase': row['predicted_phase'],
+            'position_multiplier': row['position_multiplier'],
+        }
+
+    def is_tradable(self, trade_date) -> Tuple[bool, str]:
+        """
+        当日收盘后是否适合选股（口径同 OvernightStockPicker.is_market_tradable）
+
+        无该交易日数据时不做限制。
+        """
+        env = self.market_env(trade_date)
+        if env is None:
+            return True, "无市场宽度数据"
+        if env['env'] == MarketEnvironment.EXTREME_WEAK:
+            return False, "大盘环境极差，建议空仓观望"
+        if env['should_empty']:
+            return False, "市场风险较高，建议空仓"
+        if env['index_change'] < -0.03:
+            return False, "大盘大幅下跌，建议观望"
+        return True, "市场环境正常"
+
+    def sentiment_data(self, trade_date):
+        """MarketSentimentAnalyzer.update_data 的输入（MarketSentimentData）"""
+        from core.short_term.market_sentiment import MarketSentimentData
+
+        row = self.day(trade_date)
+        if row is None:
+            return None
+        return MarketSentimentData(
+            limit_up_count=int(row['limit_up_count']),
+            limit_down_count=int(row['limit_down_count']),
+            failed_limit_up=int(row['failed_limit_up']),
+            continuous_limit_up=dict(row['continuous_limit_up']),
+            highest_board=int(row['highest_board']),
+            up_count=int(row['up_count']),
+            down_count=int(row['down_count']),
+            flat_count=int(row['flat_count']),
+        )
+
+    def index_data(self, trade_date):
+        """IndexEnvironmentAnalyzer.update_index_data 的上证指数输入（IndexData），无指数数据返回 None"""
+        from core.short_term.index_analyzer import IndexData
+
+        frame = self.load()
+        row = self.day(trade_date)
+        if row is None or pd.isna(row['index_close']):
+            return None
+        i = self._rows[pd.Timestamp(trade_date)]
+        recent = frame['index_change'].iloc[max(i - 4, 0):i + 1].fillna(0) * 100
+        return IndexData(
+            code=self.INDEX_CODE,
+            name='上证指数',
+            price=float(row['index_close']),
+            change_pct=float(row['index_change'] * 100),
+            ma5=float(row['ma5']),
+            ma10=float(row['ma10']),
+            ma20=float(row['ma20']),
+            ma60=float(row['ma60']),
+            recent_changes=recent.tolist(),
+        )
+
+
+_market_breadth_store: Optional[MarketBreadthStore] = None
+_market_breadth_store_lock = threading.Lock()
+
+
+def get_market_breadth_store() -> MarketBreadthStore:
+    """获取全局共享的市场宽度历史库"""
+    global _market_breadth_store
+    if _market_breadth_store is None:
+        with _market_breadth_store_lock:
+            if _market_breadth_store is None:
+                _market_breadth_store = MarketBreadthStore()
+    return _market_breadth_store
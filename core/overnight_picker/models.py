@@ -131,6 +131,9 @@ class TradingPlan:
     tomorrow_prediction: str = ""       # 明日预判
     position_multiplier: float = 1.0    # 仓位调整系数
     
+    # 运行信息
+    stage_timings: Dict[str, float] = field(default_factory=dict)  # 选股各阶段耗时(秒)
+    
     def __post_init__(self):
         """验证数据有效性"""
         # 确保推荐列表不超过5只
@@ -167,6 +170,7 @@ class TradingPlan:
             'risk_warnings': self.risk_warnings,
             'tomorrow_prediction': self.tomorrow_prediction,
             'position_multiplier': self.position_multiplier,
+            'stage_timings': self.stage_timings,
         }
     
     def to_markdown(self) -> str:
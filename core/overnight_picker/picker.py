@@ -20,14 +20,21 @@ Requirements: 1.1-1.6
 """
 
 import os
+import heapq
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
+from time import perf_counter
 from typing import List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 from .models import StockRecommendation, TradingPlan
 from .scorer import TomorrowPotentialScorer
 from .scorer_v6 import ScorerV6
+from .feature_store import FeatureStore, get_feature_store
+from core.limit_events import LimitEventIndex, limit_threshold
 from .calculator import (
     EntryPriceCalculator,
     PositionAdvisor,
@@ -43,6 +50,7 @@ from .sentiment_predictor import (
     SentimentLevel,
 )
 from .plan_generator import TradingPlanGenerator
+from core.fund_flow import get_fund_flow_store
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +87,14 @@ class OvernightStockPicker:
     DEFAULT_MAX_RECOMMENDATIONS = 15    # 最多推荐15只
     DEFAULT_MIN_SCORE = 70              # 最低评分阈值
     DEFAULT_DATA_PATH = "data/processed"  # 数据路径
+    LOAD_WORKERS = 8                    # 并行加载线程数
+    V6_LOOKBACK = 61                    # v6批量指标回看天数 (MA60 + 前一日)
+    V6_FEATURES = [                     # v6评分从特征库读取的列
+        'open', 'high', 'low', 'close', 'prev_close', 'prev_low', 'volume',
+        'ma5', 'ma10', 'ma20', 'ma60', 'ma5_vol', 'price_percentile', 'change_pct',
+        'turnover_rate', 'turnover_amount', 'is_breakout', 'kline_bars', 'has_limit_up_20d',
+        'consecutive_limit_ups', 'volatility_20d', 'max_gain_60d', 'is_sideways',
+    ]
     
     def __init__(self,
                  total_capital: float = DEFAULT_TOTAL_CAPITAL,
@@ -86,7 +102,9 @@ class OvernightStockPicker:
                  min_score: float = DEFAULT_MIN_SCORE,
                  data_path: str = DEFAULT_DATA_PATH,
                  stock_pool: List[str] = None,
-                 scorer_version: str = "v6"):
+                 scorer_version: str = "v6",
+                 feature_store: Optional[FeatureStore] = None,
+                 limit_index: Optional[LimitEventIndex] = None):
         """
         初始化隔夜选股器
         
@@ -97,19 +115,23 @@ class OvernightStockPicker:
             data_path: 数据文件路径
             stock_pool: 股票池列表，如果为None则从配置加载
             scorer_version: 评分器版本 ("v5" 或 "v6")，默认使用v6
+            feature_store: 特征库，提供时v6评分增量更新特征库后直接查表，不再现算指标
+            limit_index: 全市场涨跌停索引，提供时情绪分析输入与v6股性涨停/连板特征从索引读取
         """
         self.total_capital = total_capital
         self.max_recommendations = max_recommendations
         self.min_score = min_score
         self.data_path = data_path
         self.scorer_version = scorer_version
+        self.feature_store = feature_store
+        self.limit_index = limit_index
         
         # 初始化股票池
         self.stock_pool = stock_pool or self._load_stock_pool()
         
         # 初始化评分器 (支持版本切换)
         if scorer_version == "v6":
-            self.scorer = ScorerV6()
+            self.scorer = ScorerV6(limit_index=limit_index)
             logger.info("使用评分系统 v6.0 (6维度100分体系)")
         else:
             self.scorer = TomorrowPotentialScorer(total_capital=total_capital)
@@ -220,6 +242,35 @@ class OvernightStockPicker:
         if code in self._stock_data_cache:
             return self._stock_data_cache[code]
         
+        df = self._read_stock_file(code)
+        if df is not None:
+            # 缓存数据
+            self._stock_data_cache[code] = df
+        return df
+    
+    def load_stock_data_batch(self, codes: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        并行加载多只股票数据（已缓存的股票直接返回）
+        
+        Args:
+            codes: 股票代码列表
+        
+        Returns:
+            {code: DataFrame}，无数据的股票不在结果中
+        """
+        codes = list(dict.fromkeys(codes))
+        missing = [code for code in codes if code not in self._stock_data_cache]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.LOAD_WORKERS, len(missing))) as executor:
+                loaded = list(executor.map(self._read_stock_file, missing))
+            for code, df in zip(missing, loaded):
+                if df is not None:
+                    self._stock_data_cache[code] = df
+        
+        return {code: self._stock_data_cache[code] for code in codes if code in self._stock_data_cache}
+    
+    def _read_stock_file(self, code: str) -> Optional[pd.DataFrame]:
+        """从CSV读取单只股票数据（不经过缓存）"""
         file_path = os.path.join(self.data_path, f"{code}.csv")
         
         if not os.path.exists(file_path):
@@ -229,15 +280,28 @@ class OvernightStockPicker:
         try:
             df = pd.read_csv(file_path)
             df['date'] = pd.to_datetime(df['date'])
-            df = df.sort_values('date').reset_index(drop=True)
-            
-            # 缓存数据
-            self._stock_data_cache[code] = df
-            return df
+            return df.sort_values('date').reset_index(drop=True)
         except Exception as e:
             logger.error(f"加载数据失败: {code}, 错误: {e}")
             return None
-    
+
+    def build_limit_index(self) -> LimitEventIndex:
+        """
+        从股票池日线构建涨跌停索引并启用（情绪分析输入与v6股性涨停/连板特征查表）
+
+        日线经 load_stock_data_batch 读取并缓存，随后的评分复用同一批数据。
+
+        Returns:
+            构建的涨跌停索引
+        """
+        frames = self.load_stock_data_batch(self.stock_pool)
+        names = {code: self._get_stock_name(code) for code in frames}
+        self.limit_index = LimitEventIndex.from_frames(frames, names)
+        if self.scorer_version == "v6":
+            self.scorer.stock_activity_scorer.limit_index = self.limit_index
+        logger.info(f"涨跌停索引已启用: {len(frames)}只股票, 最新交易日 {self.limit_index.latest_date}")
+        return self.limit_index
+
     def calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         计算技术指标
@@ -403,14 +467,10 @@ class OvernightStockPicker:
         Returns:
             成功加载的股票数量
         """
-        success_count = 0
-        
         logger.info(f"预加载数据: {len(self.stock_pool)}只股票")
         
-        for code in self.stock_pool:
-            df = self.load_stock_data(code)
-            if df is not None and not df.empty:
-                success_count += 1
+        frames = self.load_stock_data_batch(self.stock_pool)
+        success_count = sum(1 for df in frames.values() if not df.empty)
         
         logger.info(f"预加载完成: {success_count}/{len(self.stock_pool)}")
         return success_count
@@ -654,6 +714,23 @@ class OvernightStockPicker:
         """
         使用v6评分器进行评分
         """
+        stock_data = self._v6_stock_data(code, name, concepts, df, latest)
+        
+        market_data = {
+            'hot_topics': hot_topics or [],
+            'sector_limit_up_count': 0,  # 需要外部数据
+        }
+        
+        # 使用v6评分器评分
+        total_score, details = self.scorer.score_stock(stock_data, market_data)
+        
+        return total_score, details
+    
+    def _v6_stock_data(self, code: str, name: str, concepts: List[str],
+                       df: pd.DataFrame, latest: Dict) -> Dict:
+        """
+        构建v6评分器需要的股票数据
+        """
         # 计算价格分位点 (近60日)
         recent_60d = df.tail(60) if len(df) >= 60 else df
         if len(recent_60d) > 1:
@@ -692,21 +769,136 @@ class OvernightStockPicker:
             'change_pct': change_pct,
             'turnover_rate': turnover_rate,
             'turnover_amount': latest['volume'] * latest['close'],  # 成交额估算
-            'main_net_inflow': 0,  # 需要外部数据，暂时设为0
+            # main_net_inflow 缺省：评分器从全市场资金流向库读取
             'is_breakout': latest.get('has_breakout', False),
             'is_sector_leader': False,  # 需要外部数据
-            'kline_df': df,  # 传入完整K线数据用于股性活跃度计算
+            # 传入完整K线数据用于股性活跃度计算（change_pct 列转为百分比，与涨停阈值同口径）
+            'kline_df': df.assign(change_pct=df['change_pct'] * 100) if 'change_pct' in df.columns else df,
         }
         
-        market_data = {
-            'hot_topics': hot_topics or [],
-            'sector_limit_up_count': 0,  # 需要外部数据
-        }
+        return stock_data
+    
+    def _v6_batch_frame(self, frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        一次向量化计算整个股票池的v6评分截面（口径与逐只 _v6_stock_data 一致）
         
-        # 使用v6评分器评分
-        total_score, details = self.scorer.score_stock(stock_data, market_data)
+        只取每只股票最近 V6_LOOKBACK 日数据堆叠为 股票 × 天数 矩阵，
+        均线、量能、分位点、突破与股性特征全部按列一次计算。
         
-        return total_score, details
+        Args:
+            frames: {code: 原始日线数据}，数据不足60日或OHLCV无法转换为数值的股票跳过
+        
+        Returns:
+            ScorerV6.score_batch 的输入截面
+        """
+        width = self.V6_LOOKBACK
+        columns = ['open', 'high', 'low', 'close', 'volume']
+        
+        # 逐只校验并转换为数值块，异常数据只剔除该股票，不影响整个截面
+        blocks = {}
+        for code, df in frames.items():
+            if df is None or len(df) < 60 or not set(columns) <= set(df.columns):
+                continue
+            try:
+                blocks[code] = df[columns].tail(width).to_numpy(dtype=np.float64)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"日线数据无法转换为数值，跳过: {code}, 错误: {e}")
+        
+        codes = list(blocks)
+        n = len(codes)
+        names = [self._get_stock_name(code) for code in codes]
+        stacked = np.full((n, width, len(columns)), np.nan)
+        bars = np.zeros(n, dtype=np.int64)
+        dates = []
+        for i, code in enumerate(codes):
+            block = blocks[code]
+            stacked[i, width - len(block):] = block
+            bars[i] = len(frames[code])
+            dates.append(frames[code]['date'].iloc[-1] if 'date' in frames[code].columns else None)
+        matrices = {name: stacked[:, :, j] for j, name in enumerate(columns)}
+        
+        open_p, high, low = matrices['open'], matrices['high'], matrices['low']
+        close, volume = matrices['close'], matrices['volume']
+        last_close, prev_close = close[:, -1], close[:, -2]
+        last_volume = volume[:, -1]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            recent_volume = volume[:, -20:]
+            count = (~np.isnan(recent_volume)).sum(axis=1)
+            avg_volume = np.nansum(recent_volume, axis=1) / np.where(count > 0, count, np.nan)
+            turnover_rate = np.where(avg_volume > 0, last_volume / avg_volume * 5, 5)
+            # 百分比涨跌幅，与涨停阈值 limit_threshold 同口径
+            daily_change = np.full_like(close, np.nan)
+            daily_change[:, 1:] = (close[:, 1:] / close[:, :-1] - 1) * 100
+        
+        frame = pd.DataFrame({
+            'code': codes,
+            'name': names,
+            'date': dates,
+            'open': open_p[:, -1],
+            'high': high[:, -1],
+            'low': low[:, -1],
+            'close': last_close,
+            'prev_close': prev_close,
+            'prev_open': prev_close,
+            'prev_high': high[:, -1],
+            'prev_low': low[:, -2],
+            'volume': last_volume,
+            'ma5': close[:, -5:].mean(axis=1),
+            'ma10': close[:, -10:].mean(axis=1),
+            'ma20': close[:, -20:].mean(axis=1),
+            'ma60': close[:, -60:].mean(axis=1),
+            'ma5_vol': volume[:, -5:].mean(axis=1),
+            'price_percentile': (close[:, -60:] <= last_close[:, None]).mean(axis=1) * 100,
+            'change_pct': (last_close - prev_close) / prev_close * 100,
+            'turnover_rate': turnover_rate,
+            'turnover_amount': last_volume * last_close,
+            'is_breakout': last_close > high[:, -21:-1].max(axis=1),
+            'is_sector_leader': False,
+        })
+        frame['concepts'] = [[] for _ in range(n)]
+        
+        features = self.scorer.stock_activity_scorer.features_batch(
+            close[:, -60:], high[:, -60:], low[:, -60:], daily_change[:, -60:], bars,
+            np.array([limit_threshold(code, name) for code, name in zip(codes, names)]),
+        )
+        for name, values in features.items():
+            frame[name] = values
+        return frame
+    
+    def _v6_store_frame(self, frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        从特征库读取整个股票池的v6评分截面（口径与 _v6_batch_frame 一致）
+        
+        每只股票取其最新交易日的特征行，按交易日分组做一次截面查询。
+        
+        Args:
+            frames: {code: 原始日线数据}，数据不足60日或OHLCV无法转换为数值的股票跳过
+        
+        Returns:
+            ScorerV6.score_batch 的输入截面
+        """
+        by_date: Dict[date, List[str]] = {}
+        for code, df in frames.items():
+            if df is not None and len(df) >= 60:
+                by_date.setdefault(pd.Timestamp(df['date'].iloc[-1]).date(), []).append(code)
+        
+        sections = [
+            self.feature_store.cross_section(trade_date, self.V6_FEATURES, codes).assign(date=trade_date)
+            for trade_date, codes in by_date.items()
+        ]
+        if not sections:
+            return self._v6_batch_frame({})
+        
+        frame = pd.concat(sections)
+        order = [code for codes in by_date.values() for code in codes if code in frame.index]
+        frame = frame.loc[order].reset_index()
+        frame.insert(1, 'name', [self._get_stock_name(code) for code in frame['code']])
+        frame['prev_open'] = frame['prev_close']
+        frame['prev_high'] = frame['high']
+        frame['is_sector_leader'] = False
+        frame['concepts'] = [[] for _ in range(len(frame))]
+        return frame
     
     def _score_stock_v5(self, code: str, name: str, sector: str,
                         concepts: List[str], hot_topics: List[str],
@@ -732,7 +924,7 @@ class OvernightStockPicker:
             'ma60': latest['ma60'],
             'ma5_vol': latest['ma5_vol'],
             'ma10_vol': latest['ma10_vol'],
-            'main_net_inflow': 0,  # 需要外部数据
+            # main_net_inflow 缺省：评分器从全市场资金流向库读取
             'sector_rank': 5,  # 默认值
             'sector_size': 20,
             'sector_market_rank': 10,
@@ -1008,7 +1200,7 @@ class OvernightStockPicker:
         Args:
             plan_date: 计划日期，默认明天
             hot_topics: 当前热点列表
-            limit_up_count: 涨停家数 (用于情绪分析)
+            limit_up_count: 涨停家数 (用于情绪分析，设置了涨跌停索引时从索引读取)
             limit_down_count: 跌停家数
             broken_board_rate: 炸板率
             continuous_board_count: 连板股数量
@@ -1021,6 +1213,8 @@ class OvernightStockPicker:
         logger.info("=" * 50)
         logger.info("开始运行隔夜选股...")
         logger.info("=" * 50)
+        run_start = perf_counter()
+        timings: Dict[str, float] = {}
         
         # 确定计划日期 (默认明天)
         if plan_date is None:
@@ -1029,18 +1223,23 @@ class OvernightStockPicker:
         
         # 1. 分析大盘环境
         logger.info("步骤1: 分析大盘环境...")
-        market_env = self.analyze_market_environment()
+        with self._timed(timings, 'market_env'):
+            market_env = self.analyze_market_environment()
         logger.info(f"大盘环境: {market_env['env']} - {market_env['description']}")
         
         # 2. 分析市场情绪
         logger.info("步骤2: 分析市场情绪...")
-        sentiment = self.analyze_market_sentiment(
-            limit_up_count=limit_up_count,
-            limit_down_count=limit_down_count,
-            broken_board_rate=broken_board_rate,
-            continuous_board_count=continuous_board_count,
-            market_profit_rate=market_profit_rate,
-        )
+        with self._timed(timings, 'sentiment'):
+            sentiment_inputs = {
+                'limit_up_count': limit_up_count,
+                'limit_down_count': limit_down_count,
+                'broken_board_rate': broken_board_rate,
+                'continuous_board_count': continuous_board_count,
+                'market_profit_rate': market_profit_rate,
+            }
+            if self.limit_index is not None:
+                sentiment_inputs.update(self.limit_index.sentiment_inputs() or {})
+            sentiment = self.analyze_market_sentiment(**sentiment_inputs)
         logger.info(f"市场情绪: {sentiment['sentiment']} ({sentiment['phase']})")
         logger.info(f"明日预判: {sentiment['prediction']}")
         
@@ -1048,44 +1247,50 @@ class OvernightStockPicker:
         is_tradable, reason = self.is_market_tradable(market_env)
         if not is_tradable:
             logger.warning(f"市场不适合交易: {reason}")
-            return self._create_empty_plan(
+            plan = self._create_empty_plan(
                 plan_date=plan_date,
                 market_env=market_env,
                 sentiment=sentiment,
                 hot_topics=hot_topics or [],
                 reason=reason,
             )
+            return self._finish_timings(plan, timings, run_start)
         
-        # 4. 对股票池评分
+        # 4. 对股票池评分（资金流向一次性下载全市场快照）
+        with self._timed(timings, 'fund_flow'):
+            get_fund_flow_store().refresh_if_stale(background=False)
         logger.info(f"步骤3: 对股票池评分 (共{len(self.stock_pool)}只)...")
-        scored_stocks = self._score_all_stocks(hot_topics)
+        scored_stocks = self._score_all_stocks(hot_topics, timings)
         logger.info(f"评分完成: {len(scored_stocks)}只有效股票")
         
-        # 5. 筛选高分股票
+        # 5. 筛选高分股票（只需前N只，堆选择代替全排序；同分保持股票池顺序）
         logger.info(f"步骤4: 筛选高分股票 (阈值: {self.min_score}分)...")
-        qualified_stocks = [s for s in scored_stocks if s['score'] >= self.min_score]
-        qualified_stocks.sort(key=lambda x: x['score'], reverse=True)
-        logger.info(f"符合条件: {len(qualified_stocks)}只")
+        with self._timed(timings, 'select'):
+            qualified = [s for s in scored_stocks if s['score'] >= self.min_score]
+            qualified_stocks = heapq.nlargest(self.max_recommendations * 2, qualified, key=lambda x: x['score'])
+        logger.info(f"符合条件: {len(qualified)}只，候选前{len(qualified_stocks)}只")
         
         # 如果没有符合条件的股票
         if not qualified_stocks:
             logger.warning("没有符合条件的股票")
-            return self._create_empty_plan(
+            plan = self._create_empty_plan(
                 plan_date=plan_date,
                 market_env=market_env,
                 sentiment=sentiment,
                 hot_topics=hot_topics or [],
                 reason="没有符合评分条件的股票",
             )
+            return self._finish_timings(plan, timings, run_start)
         
         # 6. 创建推荐列表
         logger.info("步骤5: 创建推荐列表...")
-        recommendations = self._create_recommendations(
-            qualified_stocks=qualified_stocks,
-            market_env=market_env['env'],
-            sentiment=sentiment['sentiment'],
-            hot_topics=hot_topics,
-        )
+        with self._timed(timings, 'recommend'):
+            recommendations = self._create_recommendations(
+                qualified_stocks=qualified_stocks,
+                market_env=market_env['env'],
+                sentiment=sentiment['sentiment'],
+                hot_topics=hot_topics,
+            )
         logger.info(f"生成推荐: {len(recommendations)}只")
         
         # 7. 应用情绪调整
@@ -1098,13 +1303,15 @@ class OvernightStockPicker:
         
         # 9. 生成交易计划
         logger.info("步骤6: 生成交易计划...")
-        plan = self.plan_generator.generate_plan(
-            date=plan_date,
-            market_env=market_env,
-            sentiment=sentiment,
-            recommendations=recommendations,
-            hot_topics=hot_topics or [],
-        )
+        with self._timed(timings, 'plan'):
+            plan = self.plan_generator.generate_plan(
+                date=plan_date,
+                market_env=market_env,
+                sentiment=sentiment,
+                recommendations=recommendations,
+                hot_topics=hot_topics or [],
+            )
+        self._finish_timings(plan, timings, run_start)
         
         # 10. 保存计划
         if save_plan:
@@ -1117,42 +1324,105 @@ class OvernightStockPicker:
         
         return plan
     
-    def _score_all_stocks(self, hot_topics: List[str] = None) -> List[Dict]:
+    def _score_all_stocks(self, hot_topics: List[str] = None,
+                          timings: Optional[Dict[str, float]] = None) -> List[Dict]:
         """
         对所有股票评分
         
         Args:
             hot_topics: 当前热点列表
+            timings: 可选，记录各阶段耗时（秒）
         
         Returns:
             评分结果列表
         """
-        scored_stocks = []
+        if timings is None:
+            timings = {}
+        if self.scorer_version == "v6":
+            return self._score_all_stocks_v6(hot_topics, timings)
         
-        for i, code in enumerate(self.stock_pool):
-            if (i + 1) % 50 == 0:
-                logger.info(f"评分进度: {i+1}/{len(self.stock_pool)}")
-            
-            try:
-                result = self.score_stock(
-                    code=code,
-                    name=self._get_stock_name(code),
-                    hot_topics=hot_topics,
-                )
+        with self._timed(timings, 'load'):
+            self.load_stock_data_batch(self.stock_pool)
+        
+        scored_stocks = []
+        with self._timed(timings, 'score'):
+            for i, code in enumerate(self.stock_pool):
+                if (i + 1) % 50 == 0:
+                    logger.info(f"评分进度: {i+1}/{len(self.stock_pool)}")
                 
-                if result is not None:
-                    total_score, details = result
-                    scored_stocks.append({
-                        'code': code,
-                        'name': self._get_stock_name(code),
-                        'score': total_score,
-                        'details': details,
-                    })
-            except Exception as e:
-                logger.warning(f"评分失败 {code}: {e}")
+                try:
+                    name = self._get_stock_name(code)
+                    result = self.score_stock(code=code, name=name, hot_topics=hot_topics)
+                    
+                    if result is not None:
+                        total_score, details = result
+                        scored_stocks.append({
+                            'code': code,
+                            'name': name,
+                            'score': total_score,
+                            'details': details,
+                        })
+                except Exception as e:
+                    logger.warning(f"评分失败 {code}: {e}")
         
         return scored_stocks
     
+    def _score_all_stocks_v6(self, hot_topics: List[str],
+                             timings: Dict[str, float]) -> List[Dict]:
+        """
+        v6分阶段评分：并行加载 → 整个股票池一次向量化计算指标 → 一次批量评分
+        
+        Args:
+            hot_topics: 当前热点列表
+            timings: 记录各阶段耗时（秒）
+        
+        Returns:
+            评分结果列表
+        """
+        with self._timed(timings, 'load'):
+            frames = self.load_stock_data_batch(self.stock_pool)
+        logger.info(f"数据加载完成: {len(frames)}/{len(self.stock_pool)}只")
+        
+        with self._timed(timings, 'indicators'):
+            if self.feature_store is not None:
+                names = {code: self._get_stock_name(code) for code in frames}
+                self.feature_store.update(frames, names=names)
+                frame = self._v6_store_frame(frames)
+            else:
+                frame = self._v6_batch_frame(frames)
+        if len(frame) < len(frames):
+            logger.warning(f"数据不足60日或无效的股票: {len(frames) - len(frame)}只")
+        if frame.empty:
+            return []
+        
+        market_data = {
+            'hot_topics': hot_topics or [],
+            'sector_limit_up_count': 0,  # 需要外部数据
+        }
+        with self._timed(timings, 'score'):
+            result = self.scorer.score_batch(frame, market_data, log_score=True)
+            details = result.all_details()
+        
+        return [
+            {
+                'code': code,
+                'name': name,
+                'score': int(result.total[i]),
+                'details': details[i],
+            }
+            for i, (code, name) in enumerate(zip(frame['code'], frame['name']))
+        ]
+    
+    @staticmethod
+    @contextmanager
+    def _timed(timings: Dict[str, float], stage: str):
+        """记录阶段耗时（秒）"""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            timings[stage] = timings.get(stage, 0.0) + perf_counter() - start
+    
     def _create_recommendations(self,
                                 qualified_stocks: List[Dict],
                                 market_env: str,
@@ -1228,6 +1498,13 @@ class OvernightStockPicker:
             scale = 0.8 / total_position
             self._apply_position_adjustment(recommendations, scale)
     
+    def _finish_timings(self, plan: TradingPlan, timings: Dict[str, float], run_start: float) -> TradingPlan:
+        """将各阶段耗时写入交易计划"""
+        timings['total'] = perf_counter() - run_start
+        plan.stage_timings = {stage: round(seconds, 4) for stage, seconds in timings.items()}
+        logger.info("阶段耗时: " + ", ".join(f"{stage}={seconds:.3f}s" for stage, seconds in timings.items()))
+        return plan
+    
     def _create_empty_plan(self,
                            plan_date: str,
                            market_env: Dict,
@@ -1298,7 +1575,8 @@ class OvernightStockPicker:
 # 便捷函数
 def create_overnight_picker(total_capital: float = 70000,
                             stock_pool: List[str] = None,
-                            scorer_version: str = "v6") -> OvernightStockPicker:
+                            scorer_version: str = "v6",
+                            use_feature_store: bool = False) -> OvernightStockPicker:
     """
     创建隔夜选股器
     
@@ -1306,6 +1584,7 @@ def create_overnight_picker(total_capital: float = 70000,
         total_capital: 总资金
         stock_pool: 股票池
         scorer_version: 评分器版本 ("v5" 或 "v6")
+        use_feature_store: 是否使用全局特征库（v6评分增量更新后查表）
     
     Returns:
         OvernightStockPicker实例
@@ -1314,6 +1593,7 @@ def create_overnight_picker(total_capital: float = 70000,
         total_capital=total_capital,
         stock_pool=stock_pool,
         scorer_version=scorer_version,
+        feature_store=get_feature_store() if use_feature_store else None,
     )
 
 
@@ -558,6 +558,7 @@ class TradingPlanGenerator:
                 risk_warnings=data.get('risk_warnings', []),
                 tomorrow_prediction=data.get('tomorrow_prediction', ''),
                 position_multiplier=data.get('position_multiplier', 1.0),
+                stage_timings=data.get('stage_timings', {}),
             )
             
             return plan
@@ -7,6 +7,8 @@
 from typing import Dict, Tuple, List, Optional
 import pandas as pd
 
+from core.fund_flow import DateLike, FundFlowStore, get_fund_flow_store
+
 
 class TomorrowPotentialScorer:
     """
@@ -23,8 +25,15 @@ class TomorrowPotentialScorer:
     - 技术形态 (8分)
     """
     
-    def __init__(self, total_capital: float = 70000):
+    def __init__(self, total_capital: float = 70000,
+                 fund_flow_store: Optional[FundFlowStore] = None):
+        """
+        Args:
+            total_capital: 总资金
+            fund_flow_store: 资金流向库，默认使用全局共享实例
+        """
         self.total_capital = total_capital
+        self.fund_flow_store = fund_flow_store
         self.weights = {
             'closing_pattern': 15,    # 收盘形态
             'volume_analysis': 15,    # 量能分析
@@ -223,9 +232,11 @@ class TomorrowPotentialScorer:
         
         return score, details
     
-    def score_capital_flow(self, main_net_inflow: float, 
+    def score_capital_flow(self, main_net_inflow: Optional[float] = None, 
                            large_order_ratio: float = 0,
-                           north_flow: float = 0) -> Tuple[float, Dict]:
+                           north_flow: float = 0,
+                           code: Optional[str] = None,
+                           trade_date: Optional[DateLike] = None) -> Tuple[float, Dict]:
         """
         资金流向评分 (15分)
         
@@ -235,9 +246,17 @@ class TomorrowPotentialScorer:
         - 资金均衡: 8分
         - 主力小幅流出: 5分
         - 主力大幅流出: 2分
+        
+        未提供 main_net_inflow 时，按 code 从全市场资金流向库读取 trade_date 当日数据；
+        trade_date 为 None 时读取最新快照，仅用于实时评分（历史评分须传入交易日）。
         """
         max_score = self.weights['capital_flow']
         
+        if main_net_inflow is None:
+            store = self.fund_flow_store if self.fund_flow_store is not None else get_fund_flow_store()
+            record = store.get(code, trade_date) if code else None
+            main_net_inflow = record.main_net_inflow / 10000 if record else 0  # 元 -> 万元
+        
         score = 0
         flow_type = ""
         
@@ -482,7 +501,8 @@ class TomorrowPotentialScorer:
                 - ma10: 10日均线
                 - ma20: 20日均线
                 - ma60: 60日均线
-                - main_net_inflow: 主力净流入(万元)
+                - main_net_inflow: 主力净流入(万元)，缺省时从资金流向库读取
+                - trade_date: 评分交易日，历史评分缺省 main_net_inflow 时必须提供
                 - concepts: 概念列表
                 - sector: 所属板块
                 - sector_rank: 板块内排名
@@ -532,9 +552,11 @@ class TomorrowPotentialScorer:
         
         # 4. 资金流向评分
         scores['capital_flow'] = self.score_capital_flow(
-            main_net_inflow=stock_data.get('main_net_inflow', 0),
+            main_net_inflow=stock_data.get('main_net_inflow'),
             large_order_ratio=stock_data.get('large_order_ratio', 0),
-            north_flow=stock_data.get('north_flow', 0)
+            north_flow=stock_data.get('north_flow', 0),
+            code=stock_data.get('code'),
+            trade_date=stock_data.get('trade_date')
         )
         
         # 5. 热点关联评分
@@ -17,6 +17,9 @@ from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from core.fund_flow import DateLike, FundFlowStore, get_fund_flow_store
+from core.keyword_matcher import KeywordMatcher
+from core.limit_events import WINDOW_DAYS, LimitEventIndex, consecutive_counts, limit_threshold
 from core.logging_config import get_logger
 
 # 获取模块日志记录器
@@ -87,6 +90,59 @@ class ScoreResult:
             'risks': self.risks,
         }
 
+@dataclass
+class BatchScoreResult:
+    """批量评分结果（每行一只股票，行顺序与输入截面一致）"""
+    codes: List[str]                       # 股票代码
+    total: np.ndarray                      # 总分 (0-100)
+    scores: np.ndarray                     # 各维度得分矩阵 (股票数 × 6，列顺序同 DIMENSIONS)
+    breakdowns: Dict[str, pd.DataFrame]    # 各维度评分详情表 {维度: DataFrame}
+    risks: List[List[str]]                 # 各股票风险标记
+    
+    DIMENSIONS = (
+        'trend_position', 'kline_pattern', 'volume_price',
+        'capital_strength', 'theme_wind', 'stock_activity',
+    )
+    
+    # 数据无效时单只评分返回的详情字段（未列出的维度无效时字段不变）
+    INVALID_KEYS = {
+        'trend_position': ('score', 'max_score', 'trend_type', 'deviation_rate', 'price_percentile'),
+        'kline_pattern': ('score', 'max_score', 'pattern', 'change_pct'),
+        'volume_price': ('score', 'max_score', 'volume_type', 'volume_ratio', 'turnover_rate'),
+    }
+    
+    _details: Optional[List[Dict]] = field(default=None, init=False, repr=False)
+    
+    def __len__(self) -> int:
+        return len(self.codes)
+    
+    def score_frame(self) -> pd.DataFrame:
+        """总分与各维度得分表（index 为股票代码）"""
+        frame = pd.DataFrame(self.scores, index=pd.Index(self.codes, name='code'), columns=list(self.DIMENSIONS))
+        frame.insert(0, 'total_score', self.total)
+        return frame
+    
+    def details(self, i: int) -> Dict:
+        """第 i 只股票的评分详情（格式与 ScorerV6.score_stock 相同）"""
+        return self.all_details()[i]
+    
+    def all_details(self) -> List[Dict]:
+        """全部股票的评分详情（首次调用时一次性展开并缓存）"""
+        if self._details is None:
+            rows = {dim: self.breakdowns[dim].to_dict('records') for dim in self.DIMENSIONS}
+            self._details = []
+            for i in range(len(self.codes)):
+                details = {'total_score': int(self.total[i])}
+                for dim in self.DIMENSIONS:
+                    row = rows[dim][i]
+                    valid = row.pop('valid')
+                    if not valid and dim in self.INVALID_KEYS:
+                        row = {k: row[k] for k in self.INVALID_KEYS[dim]}
+                    details[dim] = row
+                details['risks'] = list(self.risks[i])
+                self._details.append(details)
+        return self._details
+
 
 class TrendPositionScorer:
     """
@@ -254,6 +310,59 @@ class TrendPositionScorer:
         }
         
         return score, details, risks
+    
+    def score_batch(self, price: np.ndarray, ma5: np.ndarray, ma10: np.ndarray,
+                    ma20: np.ndarray, ma60: np.ndarray,
+                    price_percentile: np.ndarray,
+                    prev_close: np.ndarray) -> Tuple[np.ndarray, pd.DataFrame, Dict[str, np.ndarray]]:
+        """
+        批量计算趋势与位置得分（口径与 score 一致）
+        
+        Args:
+            price/ma5/ma10/ma20/ma60/price_percentile: 各股票数值数组
+            prev_close: 昨日收盘价数组，NaN 表示未提供
+        
+        Returns:
+            (得分数组, 详情表, {风险标记: 布尔数组})
+        """
+        valid = ~((price <= 0) | (ma5 <= 0) | (ma10 <= 0) | (ma20 <= 0) | (ma60 <= 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            deviation_rate = np.where(ma20 <= 0, 0.0, (price - ma20) / ma20 * 100)
+            ma_max = np.maximum(np.maximum(ma5, ma10), ma20)
+            ma_min = np.minimum(np.minimum(ma5, ma10), ma20)
+            avg_ma = (ma5 + ma10 + ma20) / 3
+            converging = ((ma5 > 0) & (ma10 > 0) & (ma20 > 0) & (avg_ma > 0)
+                          & ((ma_max - ma_min) / avg_ma < 0.03))
+        
+        bullish = (price > ma5) & (ma5 > ma10) & (ma10 > ma20) & (ma20 > ma60)
+        bearish = (price < ma5) & (ma5 < ma10) & (ma10 < ma20) & (ma20 < ma60)
+        has_prev = ~np.isnan(prev_close)
+        break_ma60 = has_prev & (price > ma60) & (prev_close <= ma60)
+        break_ma20 = has_prev & (price > ma20) & (prev_close <= ma20)
+        high_chase = deviation_rate > 15
+        
+        conditions = [
+            ~valid, bearish, high_chase, bullish & (price_percentile <= 50), bullish,
+            break_ma60, break_ma20, converging, price > ma20, price > ma60,
+        ]
+        scores = np.select(conditions, [0, 0, 10, 20, 16, 18, 16, 13, 12, 8], default=4)
+        trend_type = np.select(conditions, [
+            '数据无效', '空头排列', '高位加速', '低位多头排列', '多头排列',
+            '突破MA60', '突破MA20', '均线粘合', '站上MA20', '站上MA60',
+        ], default='均线下方')
+        
+        details = pd.DataFrame({
+            'valid': valid,
+            'score': scores,
+            'max_score': self.MAX_SCORE,
+            'trend_type': trend_type,
+            'deviation_rate': np.where(valid, np.round(deviation_rate, 2), 0),
+            'price_percentile': price_percentile,
+            'is_bullish': bullish,
+            'is_bearish': bearish,
+            'is_converging': converging,
+        })
+        return scores, details, {'追高风险': valid & ~bearish & high_chase}
 
 
 class KLinePatternScorer:
@@ -548,6 +657,73 @@ class KLinePatternScorer:
         }
         
         return score, details, risks
+    
+    def score_batch(self, open_p: np.ndarray, high: np.ndarray, low: np.ndarray,
+                    close: np.ndarray, prev_close: np.ndarray,
+                    prev_open: np.ndarray, prev_high: np.ndarray, prev_low: np.ndarray,
+                    is_at_high: np.ndarray,
+                    is_cyb_kcb: np.ndarray) -> Tuple[np.ndarray, pd.DataFrame, Dict[str, np.ndarray]]:
+        """
+        批量计算K线形态得分（口径与 score 一致，按形态优先级选取）
+        
+        Args:
+            open_p/high/low/close/prev_close: 各股票数值数组
+            prev_open/prev_high/prev_low: 可选数值数组，NaN 表示未提供
+            is_at_high/is_cyb_kcb: 布尔数组
+        
+        Returns:
+            (得分数组, 详情表, {风险标记: 布尔数组})
+        """
+        valid = ~((close <= 0) | (prev_close <= 0) | (open_p <= 0) | (high <= 0) | (low <= 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = np.where(prev_close <= 0, 0.0, (close - prev_close) / prev_close)
+            body = np.abs(close - open_p)
+            total_range = high - low
+            doji = (total_range > 0) & (body / total_range < 0.1)
+        
+        threshold = np.where(is_cyb_kcb, self.LIMIT_UP_THRESHOLD_20, self.LIMIT_UP_THRESHOLD)
+        limit_up = change >= threshold
+        positive = close > open_p
+        negative = close < open_p
+        lower_shadow = np.minimum(open_p, close) - low
+        upper_shadow = high - np.maximum(open_p, close)
+        hammer = (body > 0) & (lower_shadow >= body * 2) & (upper_shadow < body)
+        
+        has_prev_open = ~np.isnan(prev_open)
+        has_prev_high = ~np.isnan(prev_high)
+        has_prev_low = ~np.isnan(prev_low)
+        reversal = has_prev_low & positive & (open_p < prev_close) & (close > prev_close) & ~(low > prev_low)
+        breakout = has_prev_high & (prev_high > 0) & (close > prev_high)
+        cover_high = np.where(has_prev_high & (prev_high != 0), prev_high, high)
+        dark_cloud = (has_prev_open & (prev_close > prev_open) & negative & (open_p > cover_high)
+                      & (close < (prev_open + prev_close) / 2))
+        engulfing = (has_prev_open & positive & (prev_close < prev_open)
+                     & (open_p <= prev_close) & (close >= prev_open))
+        hanging_man = is_at_high & hammer
+        
+        # 按优先级：涨停 > 吊颈线 > 乌云盖顶 > 反包 > 突破前高 > 下影线阳线 > 多方炮 > 十字星 > 阳线 > 平盘 > 阴线
+        conditions = [
+            ~valid, limit_up, hanging_man, dark_cloud, reversal, breakout,
+            ~is_at_high & hammer & positive, engulfing, doji, positive, ~negative,
+        ]
+        scores = np.select(conditions, [0, 15, 0, 0, 15, 15, 12, 10, 10, 8, 4], default=4)
+        pattern = np.select(conditions, [
+            '数据无效', '涨停', '吊颈线', '乌云盖顶', '反包', '突破前高',
+            '下影线阳线', '多方炮', '十字星', '阳线', '平盘',
+        ], default='阴线')
+        top_pattern = valid & ~limit_up & (hanging_man | dark_cloud)
+        
+        details = pd.DataFrame({
+            'valid': valid,
+            'score': scores,
+            'max_score': self.MAX_SCORE,
+            'pattern': pattern,
+            'change_pct': np.where(valid, np.round(change * 100, 2), 0),
+            'is_positive': positive,
+            'is_limit_up': limit_up,
+            'is_at_high': is_at_high,
+        })
+        return scores, details, {'顶部形态风险': top_pattern}
 
 
 class VolumePriceScorer:
@@ -747,6 +923,78 @@ class VolumePriceScorer:
         }
         
         return score, details, risks
+    
+    def score_batch(self, volume: np.ndarray, ma5_vol: np.ndarray,
+                    change_pct: np.ndarray, turnover_rate: np.ndarray,
+                    is_at_bottom: np.ndarray, is_at_breakout: np.ndarray,
+                    is_at_high: np.ndarray) -> Tuple[np.ndarray, pd.DataFrame, Dict[str, np.ndarray]]:
+        """
+        批量计算量价配合得分（口径与 score 一致）
+        
+        Args:
+            volume/ma5_vol/change_pct/turnover_rate: 各股票数值数组
+            is_at_bottom/is_at_breakout/is_at_high: 布尔数组
+        
+        Returns:
+            (得分数组, 详情表, {风险标记: 布尔数组})
+        """
+        valid = ~(volume <= 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = np.where(ma5_vol <= 0, 1.0, volume / ma5_vol)
+        
+        volume_class = np.select(
+            [volume_ratio < 0.8, volume_ratio < 1.5, volume_ratio <= 2.0, volume_ratio <= 3.0],
+            ['缩量', '正常', '温和放量', '放量'], default='巨量',
+        )
+        shrink = volume_class == '缩量'
+        normal = volume_class == '正常'
+        expand = volume_class == '放量'
+        huge = volume_class == '巨量'
+        rising = change_pct > 0
+        falling = change_pct < 0
+        
+        stagnation = is_at_high & huge & (np.abs(change_pct) < 3)
+        conditions = [
+            ~valid,
+            stagnation,
+            huge & falling,
+            shrink & (change_pct >= 9.5),
+            (volume_class == '温和放量') & rising,
+            (is_at_bottom | is_at_breakout) & (volume_ratio >= 2.0) & rising,
+            (expand | normal) & (change_pct > 3),
+            shrink & rising,
+            normal & rising,
+            shrink & falling,
+            (expand | huge) & falling,
+        ]
+        base = np.select(conditions, [0, 0, 0, 15, 15, 15, 12, 10, 8, 6, 3], default=5)
+        vol_price_type = np.select(conditions, [
+            '无成交', '高位巨量滞涨', '天量阴线', '缩量涨停', '温和放量上涨', '底部/突破倍量',
+            '放量上涨', '缩量上涨', '正常上涨', '缩量下跌', '放量下跌',
+        ], default='量价一般')
+        
+        turnover_conditions = [turnover_rate < 1, turnover_rate > 25, (turnover_rate >= 3) & (turnover_rate <= 15)]
+        turnover_adj = np.select(turnover_conditions, [-2, -3, 0], default=0)
+        turnover_desc = np.select(turnover_conditions, ['换手率过低', '换手率过高', '换手率正常'],
+                                  default='换手率偏离')
+        scores = np.where(valid, np.clip(base + turnover_adj, 0, self.MAX_SCORE), 0)
+        
+        details = pd.DataFrame({
+            'valid': valid,
+            'score': scores,
+            'max_score': self.MAX_SCORE,
+            'volume_type': vol_price_type,
+            'volume_ratio': np.where(valid, np.round(volume_ratio, 2), 0),
+            'volume_class': volume_class,
+            'turnover_rate': np.where(valid, np.round(turnover_rate, 2), turnover_rate),
+            'turnover_adjustment': turnover_adj,
+            'turnover_desc': turnover_desc,
+            'change_pct': np.round(change_pct, 2),
+            'is_at_bottom': is_at_bottom,
+            'is_at_breakout': is_at_breakout,
+            'is_at_high': is_at_high,
+        })
+        return scores, details, {'出货风险': valid & (stagnation | (huge & falling))}
 
 
 class CapitalStrengthScorer:
@@ -759,10 +1007,19 @@ class CapitalStrengthScorer:
     - 占比0%-5%: 8分
     - 占比-5%-0%: 5分
     - 占比<-10%: 0分
+    
+    未提供主力净流入时，从全市场资金流向库读取当日净流入与净占比。
     """
     
     MAX_SCORE = 15
     
+    def __init__(self, fund_flow_store: Optional[FundFlowStore] = None):
+        """
+        Args:
+            fund_flow_store: 资金流向库，默认使用全局共享实例
+        """
+        self.fund_flow_store = fund_flow_store
+    
     def calculate_inflow_ratio(self, inflow: float, amount: float) -> float:
         """
         计算净流入占比
@@ -801,22 +1058,36 @@ class CapitalStrengthScorer:
         else:
             return "主力大幅流出"
     
-    def score(self, main_net_inflow: float, 
-              turnover_amount: float) -> Tuple[float, Dict, List[str]]:
+    def score(self, main_net_inflow: Optional[float], 
+              turnover_amount: float,
+              code: Optional[str] = None,
+              trade_date: Optional[DateLike] = None) -> Tuple[float, Dict, List[str]]:
         """
         计算资金强度得分
         
         Args:
-            main_net_inflow: 主力净流入(元)
+            main_net_inflow: 主力净流入(元)，为 None 时按 code 从资金流向库读取
             turnover_amount: 成交额(元)
+            code: 股票代码（从资金流向库读取时使用）
+            trade_date: 评分交易日（从资金流向库读取时使用），None 表示最新快照，
+                        仅用于实时评分；历史评分须传入交易日或 main_net_inflow
         
         Returns:
             (得分, 详情, 风险标记列表)
         """
         risks = []
         
+        # 从资金流向库读取（净占比直接使用排行榜数据）
+        store_ratio = None
+        if main_net_inflow is None:
+            store = self.fund_flow_store if self.fund_flow_store is not None else get_fund_flow_store()
+            record = store.get(code, trade_date) if code else None
+            main_net_inflow = record.main_net_inflow if record else 0
+            if record is not None and record.main_net_inflow_pct:
+                store_ratio = record.main_net_inflow_pct
+        
         # 处理无效数据
-        if turnover_amount <= 0:
+        if store_ratio is None and turnover_amount <= 0:
             return 0, {
                 'score': 0,
                 'max_score': self.MAX_SCORE,
@@ -827,7 +1098,10 @@ class CapitalStrengthScorer:
             }, risks
         
         # 计算净流入占比
-        inflow_ratio = self.calculate_inflow_ratio(main_net_inflow, turnover_amount)
+        if store_ratio is not None:
+            inflow_ratio = store_ratio
+        else:
+            inflow_ratio = self.calculate_inflow_ratio(main_net_inflow, turnover_amount)
         flow_type = self._classify_capital_flow(inflow_ratio)
         
         # 评分逻辑
@@ -858,6 +1132,67 @@ class CapitalStrengthScorer:
         }
         
         return score, details, risks
+    
+    def score_batch(self, main_net_inflow: np.ndarray,
+                    turnover_amount: np.ndarray,
+                    codes: List[str],
+                    trade_dates: Optional[List[Optional[DateLike]]] = None
+                    ) -> Tuple[np.ndarray, pd.DataFrame, Dict[str, np.ndarray]]:
+        """
+        批量计算资金强度得分（口径与 score 一致）
+        
+        主力净流入为 NaN 的股票按交易日分组从资金流向库批量读取。
+        
+        Args:
+            main_net_inflow: 主力净流入数组(元)，NaN 表示未提供
+            turnover_amount: 成交额数组(元)
+            codes: 股票代码
+            trade_dates: 每只股票的评分交易日，None 表示最新快照（同 score）
+        
+        Returns:
+            (得分数组, 详情表, {风险标记: 布尔数组})
+        """
+        main_net_inflow = np.array(main_net_inflow, dtype=np.float64)
+        store_ratio = np.full(len(codes), np.nan)
+        has_store_ratio = np.zeros(len(codes), dtype=bool)
+        
+        missing = np.flatnonzero(np.isnan(main_net_inflow))
+        if len(missing):
+            store = self.fund_flow_store if self.fund_flow_store is not None else get_fund_flow_store()
+            dates = [None] * len(codes) if trade_dates is None else list(trade_dates)
+            records = {}
+            for day in dict.fromkeys(dates[i] for i in missing):
+                day_codes = [codes[i] for i in missing if dates[i] == day and codes[i]]
+                records.update({(day, code): record
+                                for code, record in store.get_many(day_codes, day).items()})
+            for i in missing:
+                record = records.get((dates[i], codes[i]))
+                main_net_inflow[i] = record.main_net_inflow if record else 0
+                if record is not None and record.main_net_inflow_pct:
+                    store_ratio[i] = record.main_net_inflow_pct
+                    has_store_ratio[i] = True
+        
+        valid = has_store_ratio | ~(turnover_amount <= 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            computed = np.where(turnover_amount <= 0, 0.0, main_net_inflow / turnover_amount * 100)
+        inflow_ratio = np.where(has_store_ratio, store_ratio, computed)
+        
+        conditions = [inflow_ratio > 10, inflow_ratio > 5, inflow_ratio > 0, inflow_ratio > -5, inflow_ratio > -10]
+        scores = np.where(valid, np.select(conditions, [15, 12, 8, 5, 2], default=0), 0)
+        flow_type = np.where(valid, np.select(conditions, [
+            '主力大幅流入', '主力明显流入', '主力小幅流入', '主力小幅流出', '主力明显流出',
+        ], default='主力大幅流出'), '成交额无效')
+        
+        details = pd.DataFrame({
+            'valid': valid,
+            'score': scores,
+            'max_score': self.MAX_SCORE,
+            'flow_type': flow_type,
+            'inflow_ratio': np.where(valid, np.round(inflow_ratio, 2), 0),
+            'main_net_inflow': main_net_inflow,
+            'turnover_amount': turnover_amount,
+        })
+        return scores, details, {'资金大幅流出': valid & (inflow_ratio < -10)}
 
 
 class ThemeWindScorer:
@@ -876,6 +1211,31 @@ class ThemeWindScorer:
     
     MAX_SCORE = 25
     
+    def __init__(self):
+        self._topic_matcher: Optional[KeywordMatcher] = None
+        self._topic_matcher_key: Tuple[str, ...] = ()
+    
+    def _concept_topics(self, concepts: List[str], hot_topics: List[str]) -> Dict[str, List[str]]:
+        """
+        各概念匹配的热点题材（概念包含题材或题材包含概念）
+        
+        题材关键词编译为匹配器（热点列表变化时重建）；反向包含先在拼接后的题材文本中
+        一次查找，命中后再定位具体题材。
+        """
+        key = tuple(hot_topics)
+        if self._topic_matcher is None or key != self._topic_matcher_key:
+            self._topic_matcher = KeywordMatcher.from_keywords(hot_topics)
+            self._topic_matcher_key = key
+        topics_text = '\n'.join(hot_topics)
+        
+        result = {}
+        for concept in dict.fromkeys(concepts):
+            found = self._topic_matcher.find(concept)
+            if concept in topics_text:
+                found.update(t for t in hot_topics if concept in t)
+            result[concept] = [t for t in hot_topics if t in found]
+        return result
+    
     def _match_hot_topics(self, concepts: List[str], hot_topics: List[str]) -> Tuple[List[str], bool]:
         """
         匹配热点题材
@@ -890,12 +1250,9 @@ class ThemeWindScorer:
         if not concepts or not hot_topics:
             return [], False
         
-        matched_topics = []
-        for concept in concepts:
-            for hot_topic in hot_topics:
-                # 简单的字符串匹配，实际应用中可能需要更复杂的匹配逻辑
-                if concept in hot_topic or hot_topic in concept:
-                    matched_topics.append(hot_topic)
+        # 字符串包含匹配（概念包含题材或题材包含概念）
+        concept_topics = self._concept_topics(concepts, hot_topics)
+        matched_topics = [t for concept in concepts for t in concept_topics[concept]]
         
         # 去重
         matched_topics = list(set(matched_topics))
@@ -1029,6 +1386,68 @@ class ThemeWindScorer:
         }
         
         return score, details, risks
+    
+    def score_batch(self, concepts: List[List[str]],
+                    hot_topics: List[str],
+                    sector_limit_up_count: int,
+                    is_sector_leader: np.ndarray) -> Tuple[np.ndarray, pd.DataFrame, Dict[str, np.ndarray]]:
+        """
+        批量计算题材风口得分（口径与 score 一致）
+        
+        题材匹配为字符串包含关系，全部股票的概念去重后一次匹配，其余评分向量化计算。
+        
+        Args:
+            concepts: 各股票概念列表
+            hot_topics: 当前热点题材
+            sector_limit_up_count: 板块涨停家数
+            is_sector_leader: 布尔数组
+        
+        Returns:
+            (得分数组, 详情表, {风险标记: 布尔数组})
+        """
+        main_themes = hot_topics[:3]
+        topic_cache: Dict[str, List[str]] = {}
+        if hot_topics:
+            topic_cache = self._concept_topics([c for stock_concepts in concepts for c in (stock_concepts or [])],
+                                               hot_topics)
+        matched_topics = [
+            list(set(t for concept in (stock_concepts or []) for t in topic_cache.get(concept, [])))
+            for stock_concepts in concepts
+        ]
+        
+        has_match = np.array([bool(m) for m in matched_topics], dtype=bool)
+        has_concepts = np.array([bool(c) for c in concepts], dtype=bool)
+        is_main_theme = np.array([any(t in main_themes for t in m) for m in matched_topics], dtype=bool)
+        
+        effect_desc, _ = self._assess_sector_effect(sector_limit_up_count, False)
+        _, leader_score = self._assess_sector_effect(sector_limit_up_count, True)
+        _, follower_score = self._assess_sector_effect(sector_limit_up_count, False)
+        effect_score = np.where(is_sector_leader, leader_score, follower_score)
+        is_fading = has_match & (sector_limit_up_count == 0)
+        
+        conditions = [~has_match & has_concepts, ~has_match, is_main_theme]
+        base_score = np.select(conditions, [3, 1, 15], default=8)
+        topic_type = np.select(conditions, ['无热点题材', '无概念', '主线题材'], default='支线题材')
+        topic_type = np.where(is_fading, np.char.add(topic_type, '(退潮)'), topic_type)
+        
+        scores = base_score + effect_score
+        scores = np.clip(np.where(is_fading, scores // 2, scores), 0, self.MAX_SCORE)
+        
+        details = pd.DataFrame({
+            'valid': True,
+            'score': scores,
+            'max_score': self.MAX_SCORE,
+            'topic_type': topic_type,
+            'matched_topics': matched_topics,
+            'is_main_theme': is_main_theme,
+            'sector_effect': effect_desc,
+            'sector_limit_up_count': sector_limit_up_count,
+            'is_sector_leader': is_sector_leader,
+            'is_fading': is_fading,
+            'base_score': base_score,
+            'sector_effect_score': effect_score,
+        })
+        return scores, details, {'题材退潮风险': is_fading}
 
 
 class StockActivityScorer:
@@ -1045,74 +1464,78 @@ class StockActivityScorer:
     
     MAX_SCORE = 10
     
-    def has_limit_up_in_days(self, df: pd.DataFrame, days: int = 20) -> bool:
+    def __init__(self, limit_index: Optional[LimitEventIndex] = None):
         """
-        检查近N日是否有涨停
+        Args:
+            limit_index: 全市场涨跌停索引，提供时近20日涨停与连板数直接查表
+        """
+        self.limit_index = limit_index
+    
+    def limit_up_stats(self, df: pd.DataFrame, days: int = 20,
+                       code: str = '', name: str = '') -> Tuple[bool, int]:
+        """
+        近N日是否有涨停及最大连板数（涨跌幅只计算一次）
         
         Args:
-            df: K线数据 (需包含 'change_pct' 或 'close'/'prev_close' 列)
+            df: K线数据 (需包含 'change_pct' 或 'close' 列)
             days: 检查天数
+            code/name: 股票代码与名称，用于按板块确定涨停阈值（缺省按主板 9.5%）
         
         Returns:
-            是否有涨停
+            (是否有涨停, 最大连板数)
         """
         if df is None or len(df) == 0:
-            return False
+            return False, 0
         
-        # 取最近N日数据
-        recent_df = df.tail(days) if len(df) >= days else df
+        # 涨跌停索引按同一口径预计算，直接查表
+        if self.limit_index is not None and code and days == WINDOW_DAYS and 'date' in df.columns:
+            events = self.limit_index.stock(code, df['date'].iloc[-1])
+            if events is not None:
+                return events['limit_up_20d'] > 0, events['max_streak_20d']
         
-        # 计算涨跌幅
+        # 取最近N日数据并计算涨跌幅
+        recent_df = df.tail(days)
         if 'change_pct' in recent_df.columns:
-            change_pcts = recent_df['change_pct']
+            change_pcts = recent_df['change_pct'].to_numpy(dtype=np.float64)
         elif 'close' in recent_df.columns:
-            change_pcts = recent_df['close'].pct_change() * 100
+            change_pcts = recent_df['close'].pct_change().to_numpy(dtype=np.float64) * 100
         else:
-            return False
+            return False, 0
+        
+        # 连板：缺失值跳过（不中断连板）
+        hits = change_pcts >= limit_threshold(code, name)
+        streaks = consecutive_counts(hits, ~np.isnan(change_pcts))
+        return bool(hits.any()), int(streaks.max())
+    
+    def has_limit_up_in_days(self, df: pd.DataFrame, days: int = 20,
+                             code: str = '', name: str = '') -> bool:
+        """
+        检查近N日是否有涨停
+        
+        Args:
+            df: K线数据 (需包含 'change_pct' 或 'close'/'prev_close' 列)
+            days: 检查天数
+            code/name: 股票代码与名称，用于按板块确定涨停阈值
         
-        # 检查是否有涨停 (>=9.5% 或 >=19.5%)
-        return (change_pcts >= 9.5).any() or (change_pcts >= 19.5).any()
+        Returns:
+            是否有涨停
+        """
+        return self.limit_up_stats(df, days, code, name)[0]
     
-    def count_consecutive_limit_ups(self, df: pd.DataFrame, days: int = 20) -> int:
+    def count_consecutive_limit_ups(self, df: pd.DataFrame, days: int = 20,
+                                    code: str = '', name: str = '') -> int:
         """
         统计近N日内的最大连板数
         
         Args:
             df: K线数据
             days: 检查天数
+            code/name: 股票代码与名称，用于按板块确定涨停阈值
         
         Returns:
             最大连板数
         """
-        if df is None or len(df) == 0:
-            return 0
-        
-        # 取最近N日数据
-        recent_df = df.tail(days) if len(df) >= days else df
-        
-        # 计算涨跌幅
-        if 'change_pct' in recent_df.columns:
-            change_pcts = recent_df['change_pct'].values
-        elif 'close' in recent_df.columns:
-            change_pcts = recent_df['close'].pct_change().values * 100
-        else:
-            return 0
-        
-        # 统计连板
-        max_consecutive = 0
-        current_consecutive = 0
-        
-        for pct in change_pcts:
-            if pd.isna(pct):
-                continue
-            # 涨停判断 (9.5% 或 19.5%)
-            if pct >= 9.5:
-                current_consecutive += 1
-                max_consecutive = max(max_consecutive, current_consecutive)
-            else:
-                current_consecutive = 0
-        
-        return max_consecutive
+        return self.limit_up_stats(df, days, code, name)[1]
     
     def calculate_volatility(self, df: pd.DataFrame, days: int = 20) -> float:
         """
@@ -1206,12 +1629,13 @@ class StockActivityScorer:
         # 如果价格波动范围小于阈值，认为是横盘
         return price_range < threshold
     
-    def score(self, df: pd.DataFrame) -> Tuple[float, Dict, List[str]]:
+    def score(self, df: pd.DataFrame, code: str = '', name: str = '') -> Tuple[float, Dict, List[str]]:
         """
         计算股性活跃度得分
         
         Args:
             df: 近60日K线数据
+            code/name: 股票代码与名称，用于按板块确定涨停阈值
         
         Returns:
             (得分, 详情, 风险标记列表)
@@ -1232,8 +1656,7 @@ class StockActivityScorer:
             }, risks
         
         # 计算各项指标
-        has_limit_up_20d = self.has_limit_up_in_days(df, 20)
-        consecutive_limit_ups = self.count_consecutive_limit_ups(df, 20)
+        has_limit_up_20d, consecutive_limit_ups = self.limit_up_stats(df, 20, code, name)
         volatility = self.calculate_volatility(df, 20)
         max_gain_60d = self.calculate_max_gain(df, 60)
         is_sideways = self.is_sideways(df, 60)
@@ -1291,6 +1714,142 @@ class StockActivityScorer:
         }
         
         return score, details, risks
+    
+    def features(self, df: Optional[pd.DataFrame], code: str = '', name: str = '') -> Dict:
+        """
+        计算批量评分所需的股性特征（只截取一次近60日数据）
+        
+        Args:
+            df: K线数据
+            code/name: 股票代码与名称，用于按板块确定涨停阈值
+        
+        Returns:
+            {kline_bars, has_limit_up_20d, consecutive_limit_ups, volatility_20d, max_gain_60d, is_sideways}
+        """
+        if df is None or len(df) == 0:
+            return {
+                'kline_bars': 0, 'has_limit_up_20d': False, 'consecutive_limit_ups': 0,
+                'volatility_20d': 0.0, 'max_gain_60d': 0.0, 'is_sideways': False,
+            }
+        recent = df.tail(60)
+        has_limit_up, consecutive = self.limit_up_stats(recent, 20, code, name)
+        return {
+            'kline_bars': len(df),
+            'has_limit_up_20d': bool(has_limit_up),
+            'consecutive_limit_ups': consecutive,
+            'volatility_20d': float(self.calculate_volatility(recent, 20)),
+            'max_gain_60d': float(self.calculate_max_gain(recent, 60)),
+            'is_sideways': bool(self.is_sideways(recent, 60)),
+        }
+    
+    def features_batch(self, close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                       change_pct: np.ndarray, kline_bars: np.ndarray,
+                       thresholds: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        批量计算股性特征（口径与 features 一致）
+        
+        Args:
+            close/high/low/change_pct: 近60日K线矩阵，股票 × 60，右对齐（最后一列为最新），
+                                       数据不足60日的左侧以 NaN 填充；change_pct 与K线 change_pct 列口径相同
+            kline_bars: 每只股票的K线总根数
+            thresholds: 每只股票的涨停阈值（limit_threshold），缺省按主板 9.5%
+        
+        Returns:
+            {特征名: 数组}，键与 features 相同
+        """
+        rows = np.minimum(kline_bars, close.shape[1])
+        recent_change = change_pct[:, -20:]
+        if thresholds is None:
+            thresholds = np.full(len(close), limit_threshold())
+        hits = recent_change >= np.asarray(thresholds, dtype=np.float64)[:, None]
+        
+        # 连板数：缺失值跳过（不中断连板）
+        streaks = consecutive_counts(hits, ~np.isnan(recent_change), axis=1)
+        consecutive = streaks.max(axis=1) if streaks.shape[1] else np.zeros(len(close), dtype=np.int64)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            amplitudes = (high[:, -20:] - low[:, -20:]) / close[:, -20:] * 100
+            count = (~np.isnan(amplitudes)).sum(axis=1)
+            volatility = np.nansum(amplitudes, axis=1) / np.where(count > 0, count, np.nan)
+            
+            present = ~np.isnan(close)
+            min_close = np.where(present, close, np.inf).min(axis=1)
+            max_close = np.where(present, close, -np.inf).max(axis=1)
+            min_close = np.where(present.any(axis=1), min_close, np.nan)
+            gain = (max_close - min_close) / min_close * 100
+        max_gain = np.where((rows < 2) | (min_close <= 0), 0.0, gain)
+        
+        return {
+            'kline_bars': kline_bars,
+            'has_limit_up_20d': hits.any(axis=1),
+            'consecutive_limit_ups': consecutive,
+            'volatility_20d': volatility,
+            'max_gain_60d': max_gain,
+            'is_sideways': (rows >= 10) & (min_close > 0) & (gain < 10),
+        }
+    
+    def lookup_limit_events(self, codes: List[str], dates, has_limit_up_20d: np.ndarray,
+                            consecutive_limit_ups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        以涨跌停索引覆盖批量特征中的近20日涨停与连板数（索引中无数据的股票保留原值）
+        
+        Args:
+            codes: 股票代码
+            dates: 每只股票的最新交易日
+        
+        Returns:
+            (has_limit_up_20d, consecutive_limit_ups)
+        """
+        if self.limit_index is None:
+            return has_limit_up_20d, consecutive_limit_ups
+        limit_ups = self.limit_index.lookup(codes, dates, 'limit_up_20d')
+        streaks = self.limit_index.lookup(codes, dates, 'max_streak_20d')
+        found = ~np.isnan(limit_ups)
+        return (
+            np.where(found, limit_ups > 0, has_limit_up_20d),
+            np.where(found, np.nan_to_num(streaks), consecutive_limit_ups).astype(np.int64),
+        )
+    
+    def score_batch(self, kline_bars: np.ndarray, has_limit_up_20d: np.ndarray,
+                    consecutive_limit_ups: np.ndarray, volatility: np.ndarray,
+                    max_gain_60d: np.ndarray,
+                    is_sideways: np.ndarray) -> Tuple[np.ndarray, pd.DataFrame, Dict[str, np.ndarray]]:
+        """
+        批量计算股性活跃度得分（口径与 score 一致）
+        
+        Args:
+            kline_bars: K线根数（0 表示无数据）
+            其余: features 计算的各股票股性特征数组
+        
+        Returns:
+            (得分数组, 详情表, {风险标记: 布尔数组})
+        """
+        valid = kline_bars > 0
+        poor = ~valid | is_sideways | (max_gain_60d < 10)
+        # 连板加分（额外+2分，但不超过满分）
+        multi_limit_up = ~poor & has_limit_up_20d & (consecutive_limit_ups >= 2)
+        conditions = [
+            ~valid, is_sideways, max_gain_60d < 10, multi_limit_up, has_limit_up_20d,
+            volatility > 3, volatility > 2,
+        ]
+        scores = np.select(conditions, [0, 0, 2, min(self.MAX_SCORE, 12), 10, 8, 6], default=4)
+        activity_type = np.select(conditions, [
+            '数据无效', '长期横盘', '涨幅有限', '', '近期涨停', '高波动', '中等波动',
+        ], default='低波动').astype(object)
+        activity_type[multi_limit_up] = [f"连板{n}次" for n in consecutive_limit_ups[multi_limit_up]]
+        
+        details = pd.DataFrame({
+            'valid': valid,
+            'score': scores,
+            'max_score': self.MAX_SCORE,
+            'activity_type': activity_type,
+            'has_limit_up': valid & has_limit_up_20d,
+            'consecutive_limit_ups': np.where(valid, consecutive_limit_ups, 0),
+            'volatility': np.where(valid, np.round(volatility, 2), 0),
+            'max_gain_60d': np.where(valid, np.round(max_gain_60d, 2), 0),
+            'is_sideways': valid & is_sideways,
+        })
+        return scores, details, {'股性差': valid & (is_sideways | (max_gain_60d < 10))}
 
 
 class RiskMarker:
@@ -1433,6 +1992,40 @@ class RiskMarker:
         
         # 去重
         return list(set(risks))
+    
+    def mark_risks_batch(self, breakdowns: Dict[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+        """
+        根据批量评分详情标记风险（口径与 mark_risks 一致，数据无效的维度按缺省值判断）
+        
+        Args:
+            breakdowns: 各维度评分详情表
+        
+        Returns:
+            {风险标记: 布尔数组}
+        """
+        trend = breakdowns['trend_position']
+        volume = breakdowns['volume_price']
+        theme = breakdowns['theme_wind']
+        activity = breakdowns['stock_activity']
+        
+        volume_valid = volume['valid'].to_numpy(dtype=bool)
+        volume_ratio = volume['volume_ratio'].to_numpy(dtype=np.float64)
+        change_pct = np.where(volume_valid, volume['change_pct'].to_numpy(dtype=np.float64), 0)
+        is_at_high = volume_valid & volume['is_at_high'].to_numpy(dtype=bool)
+        max_gain_60d = activity['max_gain_60d'].to_numpy(dtype=np.float64)
+        
+        return {
+            self.RISK_TYPES['HIGH_CHASE']: trend['deviation_rate'].to_numpy(dtype=np.float64) > 15.0,
+            self.RISK_TYPES['DISTRIBUTION']: (
+                ((volume_ratio > 3) & (change_pct < 0))
+                | (is_at_high & (volume_ratio > 3) & (np.abs(change_pct) < 3))
+            ),
+            self.RISK_TYPES['THEME_FADE']: theme['is_fading'].to_numpy(dtype=bool),
+            self.RISK_TYPES['LOW_ACTIVITY']: (
+                activity['is_sideways'].to_numpy(dtype=bool)
+                | ((max_gain_60d < 10) & ~activity['has_limit_up'].to_numpy(dtype=bool))
+            ),
+        }
 
 
 class ScorerV6:
@@ -1459,7 +2052,9 @@ class ScorerV6:
     
     def __init__(self, weights: Optional[Dict[str, int]] = None, 
                  enable_logging: bool = True,
-                 log_dir: str = "data/score_logs"):
+                 log_dir: str = "data/score_logs",
+                 fund_flow_store: Optional[FundFlowStore] = None,
+                 limit_index: Optional[LimitEventIndex] = None):
         """
         初始化评分器
         
@@ -1467,6 +2062,8 @@ class ScorerV6:
             weights: 可选的权重配置，默认使用标准权重
             enable_logging: 是否启用评分日志记录
             log_dir: 日志存储目录
+            fund_flow_store: 资金流向库，默认使用全局共享实例
+            limit_index: 全市场涨跌停索引，提供时股性活跃度的涨停/连板特征直接查表
         """
         self.weights = weights or self.DEFAULT_WEIGHTS.copy()
         self.enable_logging = enable_logging
@@ -1475,9 +2072,9 @@ class ScorerV6:
         self.trend_position_scorer = TrendPositionScorer()
         self.kline_pattern_scorer = KLinePatternScorer()
         self.volume_price_scorer = VolumePriceScorer()
-        self.capital_strength_scorer = CapitalStrengthScorer()
+        self.capital_strength_scorer = CapitalStrengthScorer(fund_flow_store)
         self.theme_wind_scorer = ThemeWindScorer()
-        self.stock_activity_scorer = StockActivityScorer()
+        self.stock_activity_scorer = StockActivityScorer(limit_index)
         self.risk_marker = RiskMarker()
         
         # 初始化评分日志记录器
@@ -1559,8 +2156,10 @@ class ScorerV6:
         
         # 4. 资金强度评分
         capital_score, capital_details, capital_risks = self.capital_strength_scorer.score(
-            main_net_inflow=stock_data.get('main_net_inflow', 0),
+            main_net_inflow=stock_data.get('main_net_inflow'),
             turnover_amount=stock_data.get('turnover_amount', 1),
+            code=stock_code,
+            trade_date=stock_data.get('trade_date'),
         )
         all_risks.extend(capital_risks)
         
@@ -1575,7 +2174,9 @@ class ScorerV6:
         
         # 6. 股性活跃度评分
         kline_df = stock_data.get('kline_df')
-        activity_score, activity_details, activity_risks = self.stock_activity_scorer.score(kline_df)
+        activity_score, activity_details, activity_risks = self.stock_activity_scorer.score(
+            kline_df, stock_code, stock_data.get('name', ''),
+        )
         all_risks.extend(activity_risks)
         
         # 计算总分
@@ -1616,6 +2217,161 @@ class ScorerV6:
         
         return total_score, details
     
+    # 批量评分截面的列及缺省值（与 score_stock 读取 stock_data 的缺省值一致，NaN 表示未提供）
+    BATCH_COLUMNS = {
+        'code': '', 'name': '',
+        'close': 0.0, 'ma5': 0.0, 'ma10': 0.0, 'ma20': 0.0, 'ma60': 0.0,
+        'price_percentile': 50.0, 'prev_close': np.nan,
+        'open': 0.0, 'high': 0.0, 'low': 0.0,
+        'prev_open': np.nan, 'prev_high': np.nan, 'prev_low': np.nan,
+        'is_breakout': False,
+        'volume': 0.0, 'ma5_vol': 0.0, 'change_pct': 0.0, 'turnover_rate': 5.0,
+        'main_net_inflow': np.nan, 'turnover_amount': 1.0,
+        'is_sector_leader': False,
+        'kline_bars': 0, 'has_limit_up_20d': False, 'consecutive_limit_ups': 0,
+        'volatility_20d': 0.0, 'max_gain_60d': 0.0, 'is_sideways': False,
+    }
+    
+    def batch_frame(self, stock_data_list: List[Dict]) -> pd.DataFrame:
+        """
+        将 score_stock 格式的股票数据列表转换为批量评分截面
+        
+        kline_df 替换为股性特征列（StockActivityScorer.features），其余字段原样保留；
+        设置了涨跌停索引时附加K线最新交易日 date 列，供 score_batch 查表。
+        
+        Args:
+            stock_data_list: 股票数据列表
+        
+        Returns:
+            每行一只股票的 DataFrame
+        """
+        rows = []
+        for stock_data in stock_data_list:
+            row = {k: v for k, v in stock_data.items() if k != 'kline_df'}
+            kline_df = stock_data.get('kline_df')
+            row.update(self.stock_activity_scorer.features(
+                kline_df, stock_data.get('code', ''), stock_data.get('name', ''),
+            ))
+            if self.stock_activity_scorer.limit_index is not None and kline_df is not None \
+                    and len(kline_df) and 'date' in kline_df.columns:
+                row['date'] = kline_df['date'].iloc[-1]
+            rows.append(row)
+        return pd.DataFrame(rows)
+    
+    def score_batch(self, frame: pd.DataFrame, market_data: Dict = None,
+                    log_score: bool = False) -> BatchScoreResult:
+        """
+        对一个截面的全部股票批量评分
+        
+        每个维度以数组掩码 / np.select 一次计算全部股票，结果与逐只调用 score_stock 一致。
+        
+        Args:
+            frame: 每行一只股票的预计算特征（列见 BATCH_COLUMNS，缺失列使用缺省值；
+                   可由 batch_frame 从 score_stock 格式的数据构建）
+            market_data: 市场数据（热点、板块等）
+            log_score: 是否记录评分日志
+        
+        Returns:
+            BatchScoreResult
+        """
+        if market_data is None:
+            market_data = {}
+        n = len(frame)
+        
+        def column(name: str, dtype=np.float64) -> np.ndarray:
+            default = self.BATCH_COLUMNS[name]
+            if name not in frame.columns:
+                return np.full(n, default, dtype=dtype)
+            values = frame[name]
+            if not (isinstance(default, float) and np.isnan(default)):
+                values = values.fillna(default)
+            return values.to_numpy(dtype=dtype)
+        
+        codes = [str(c) for c in column('code', object)]
+        price_percentile = column('price_percentile')
+        is_at_high = price_percentile >= 80
+        prev_close = column('prev_close')
+        
+        # 1. 趋势与位置
+        trend = self.trend_position_scorer.score_batch(
+            column('close'), column('ma5'), column('ma10'), column('ma20'), column('ma60'),
+            price_percentile, prev_close,
+        )
+        
+        # 2. K线与形态
+        is_cyb_kcb = np.array([c.startswith('300') or c.startswith('688') for c in codes], dtype=bool)
+        kline = self.kline_pattern_scorer.score_batch(
+            column('open'), column('high'), column('low'), column('close'),
+            np.where(np.isnan(prev_close), 0.0, prev_close),
+            column('prev_open'), column('prev_high'), column('prev_low'),
+            is_at_high, is_cyb_kcb,
+        )
+        
+        # 3. 量价配合
+        volume = self.volume_price_scorer.score_batch(
+            column('volume'), column('ma5_vol'), column('change_pct'), column('turnover_rate'),
+            price_percentile <= 20, column('is_breakout', bool), is_at_high,
+        )
+        
+        # 4. 资金强度
+        capital = self.capital_strength_scorer.score_batch(
+            column('main_net_inflow'), column('turnover_amount'), codes,
+            frame['trade_date'].tolist() if 'trade_date' in frame.columns else None,
+        )
+        
+        # 5. 题材风口
+        concepts = list(frame['concepts']) if 'concepts' in frame.columns else [[]] * n
+        theme = self.theme_wind_scorer.score_batch(
+            [c if isinstance(c, list) else [] for c in concepts],
+            market_data.get('hot_topics', []),
+            market_data.get('sector_limit_up_count', 0),
+            column('is_sector_leader', bool),
+        )
+        
+        # 6. 股性活跃度（截面带 date 列时涨停/连板特征从涨跌停索引查表）
+        has_limit_up, consecutive = column('has_limit_up_20d', bool), column('consecutive_limit_ups', np.int64)
+        if 'date' in frame.columns:
+            has_limit_up, consecutive = self.stock_activity_scorer.lookup_limit_events(
+                codes, frame['date'], has_limit_up, consecutive,
+            )
+        activity = self.stock_activity_scorer.score_batch(
+            column('kline_bars', np.int64), has_limit_up, consecutive, column('volatility_20d'),
+            column('max_gain_60d'), column('is_sideways', bool),
+        )
+        
+        dimensions = dict(zip(BatchScoreResult.DIMENSIONS, (trend, kline, volume, capital, theme, activity)))
+        scores = np.column_stack([result[0] for result in dimensions.values()]) if n else np.zeros((0, 6), int)
+        total = np.clip(scores.sum(axis=1), 0, 100)
+        breakdowns = {dim: result[1] for dim, result in dimensions.items()}
+        
+        # 风险标记：各维度风险 + RiskMarker 综合风险
+        risk_masks = {}
+        for masks in [result[2] for result in dimensions.values()] + [self.risk_marker.mark_risks_batch(breakdowns)]:
+            for risk, mask in masks.items():
+                risk_masks[risk] = risk_masks[risk] | mask if risk in risk_masks else mask
+        risks = [[] for _ in range(n)]
+        for risk, mask in risk_masks.items():
+            for i in np.flatnonzero(mask):
+                risks[i].append(risk)
+        
+        result = BatchScoreResult(codes=codes, total=total, scores=scores, breakdowns=breakdowns, risks=risks)
+        
+        # 记录评分日志
+        if log_score and self._score_logger is not None:
+            names = column('name', object)
+            trade_dates = frame['trade_date'].tolist() if 'trade_date' in frame.columns else [None] * n
+            for i in range(n):
+                self._score_logger.log_score(
+                    stock_code=codes[i],
+                    stock_name=names[i],
+                    total_score=int(total[i]),
+                    details=result.details(i),
+                    market_data=market_data,
+                    trade_date=trade_dates[i],
+                )
+        
+        return result
+    
     def get_score_summary(self, total_score: float, details: Dict) -> str:
         """
         生成可读的评分摘要
@@ -181,6 +181,22 @@ class SentimentCyclePredictor:
         
         return result
     
+    def analyze_limit_events(self, limit_index, trade_date=None) -> Optional[SentimentAnalysisResult]:
+        """
+        以全市场涨跌停索引的当日汇总分析情绪（core.limit_events.LimitEventIndex）
+        
+        Args:
+            limit_index: 涨跌停事件索引
+            trade_date: 交易日，默认索引中最新交易日
+        
+        Returns:
+            SentimentAnalysisResult，索引中无该交易日数据时返回 None
+        """
+        inputs = limit_index.sentiment_inputs(trade_date)
+        if inputs is None:
+            return None
+        return self.analyze_today_sentiment(**inputs)
+    
     def _calculate_sentiment_score(
         self,
         limit_up_count: int,
@@ -9,14 +9,19 @@
 3. 龙头指数计算 - 涨停时间、封单量、连板天数、市场认可度
 4. 龙头类型识别 - 真龙头、二线龙头、跟风股、蹭热点
 
+主营业务与龙头记录存于 SQLite（TopicStore，data/topic_matcher.db），
+按主键索引查询，批量记录单事务写入；旧版 JSON 文件在数据库为空时导入一次。
+
 Requirements: 3.1, 3.2, 3.3, 3.4
 """
 
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
@@ -47,6 +52,152 @@ class LeaderRecord:
     market_cap: float = 0              # 流通市值(亿元)
 
 
+class TopicStore:
+    """
+    题材数据存储（SQLite）
+    
+    公司主营业务与历史龙头记录各一张表，主键即索引：
+    - company_business: 按股票代码点查
+    - leader_history: (topic, date, code) 主键，按题材+日期范围查询为索引扫描，
+      同一题材同一天同一股票的记录覆盖写入
+    
+    批量写入在单个事务内完成，记录一天的龙头只需一次写入。
+    """
+    
+    LEADER_RETENTION_DAYS = 30          # 龙头记录保留天数
+    
+    _BUSINESS_FIELDS = ['code', 'name', 'main_business', 'products', 'industry', 'concepts', 'keywords']
+    _LIST_FIELDS = ('products', 'concepts', 'keywords')
+    _LEADER_FIELDS = [
+        'topic', 'date', 'code', 'name', 'leader_index', 'leader_type',
+        'limit_up_time', 'seal_amount', 'continuous_boards', 'market_cap',
+    ]
+    
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径（':memory:' 为内存库）
+        """
+        self.db_path = db_path
+        if db_path != ':memory:':
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS company_business ("
+                "code TEXT PRIMARY KEY, name TEXT, main_business TEXT, products TEXT, "
+                "industry TEXT, concepts TEXT, keywords TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS leader_history ("
+                "topic TEXT NOT NULL, date TEXT NOT NULL, code TEXT NOT NULL, name TEXT, "
+                "leader_index REAL, leader_type TEXT, limit_up_time TEXT, seal_amount REAL, "
+                "continuous_boards INTEGER, market_cap REAL, "
+                "PRIMARY KEY (topic, date, code))"
+            )
+    
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+    
+    # ========== 公司主营业务 ==========
+    
+    def upsert_businesses(self, businesses: Iterable[CompanyBusiness]) -> int:
+        """
+        批量写入公司主营业务（同代码覆盖）
+        
+        Returns:
+            写入条数
+        """
+        rows = [
+            tuple(
+                json.dumps(getattr(b, f), ensure_ascii=False) if f in self._LIST_FIELDS else getattr(b, f)
+                for f in self._BUSINESS_FIELDS
+            )
+            for b in businesses
+        ]
+        if rows:
+            placeholders = ', '.join('?' * len(self._BUSINESS_FIELDS))
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO company_business VALUES ({placeholders})", rows
+                )
+        return len(rows)
+    
+    def get_business(self, code: str) -> Optional[CompanyBusiness]:
+        """按股票代码查询公司主营业务"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM company_business WHERE code = ?", (code,)
+            ).fetchone()
+        if row is None:
+            return None
+        values = dict(zip(self._BUSINESS_FIELDS, row))
+        for f in self._LIST_FIELDS:
+            values[f] = json.loads(values[f]) if values[f] else []
+        return CompanyBusiness(**values)
+    
+    def count_businesses(self) -> int:
+        """公司主营业务条数"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM company_business").fetchone()[0]
+    
+    # ========== 历史龙头 ==========
+    
+    def upsert_leaders(self, records: Iterable[LeaderRecord], today: Optional[str] = None) -> int:
+        """
+        批量写入龙头记录，并清理所涉题材超过保留天数的记录（单个事务）
+        
+        Args:
+            records: 龙头记录
+            today: 清理基准日期，默认今天
+        
+        Returns:
+            写入条数
+        """
+        rows = [tuple(getattr(r, f) for f in self._LEADER_FIELDS) for r in records]
+        if not rows:
+            return 0
+        
+        base = datetime.strptime(today, "%Y-%m-%d") if today else datetime.now()
+        cutoff_date = (base - timedelta(days=self.LEADER_RETENTION_DAYS)).strftime("%Y-%m-%d")
+        topics = sorted({row[0] for row in rows})
+        placeholders = ', '.join('?' * len(self._LEADER_FIELDS))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO leader_history ({', '.join(self._LEADER_FIELDS)}) "
+                f"VALUES ({placeholders})", rows
+            )
+            self._conn.executemany(
+                "DELETE FROM leader_history WHERE topic = ? AND date < ?",
+                [(topic, cutoff_date) for topic in topics]
+            )
+        return len(rows)
+    
+    def topic_leaders(self, topic: str, since: str = '') -> List[LeaderRecord]:
+        """
+        题材自 since（含）以来的龙头记录，按龙头指数降序
+        
+        Args:
+            topic: 题材名称
+            since: 起始日期 YYYY-MM-DD
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(self._LEADER_FIELDS)} FROM leader_history "
+                "WHERE topic = ? AND date >= ? ORDER BY leader_index DESC, date, rowid",
+                (topic, since)
+            ).fetchall()
+        return [LeaderRecord(**dict(zip(self._LEADER_FIELDS, row))) for row in rows]
+    
+    def count_leaders(self) -> int:
+        """龙头记录条数"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM leader_history").fetchone()[0]
+
+
 class SmartTopicMatcher:
     """
     智能题材匹配器 - 解决题材匹配僵化问题
@@ -59,6 +210,8 @@ class SmartTopicMatcher:
     """
     
     # 默认数据文件路径
+    DEFAULT_DB_PATH = "data/topic_matcher.db"
+    # 旧版 JSON 数据文件（数据库为空时导入一次）
     DEFAULT_BUSINESS_DB_PATH = "data/company_business.json"
     DEFAULT_LEADER_HISTORY_PATH = "data/leader_history.json"
     
@@ -78,91 +231,74 @@ class SmartTopicMatcher:
     
     def __init__(self, 
                  business_db_path: str = None,
-                 leader_history_path: str = None):
+                 leader_history_path: str = None,
+                 db_path: str = None):
         """
         初始化智能题材匹配器
         
         Args:
-            business_db_path: 公司主营业务数据库路径
-            leader_history_path: 历史龙头记录路径
+            business_db_path: 旧版公司主营业务 JSON 路径（导入用）
+            leader_history_path: 旧版历史龙头记录 JSON 路径（导入用）
+            db_path: 题材数据库路径，默认 data/topic_matcher.db
         """
         self.business_db_path = business_db_path or self.DEFAULT_BUSINESS_DB_PATH
         self.leader_history_path = leader_history_path or self.DEFAULT_LEADER_HISTORY_PATH
+        self.db_path = db_path or self.DEFAULT_DB_PATH
         
-        # 公司主营业务数据库 {code: CompanyBusiness}
-        self.company_business: Dict[str, CompanyBusiness] = {}
-        
-        # 历史龙头记录 {topic: [LeaderRecord]}
-        self.leader_history: Dict[str, List[LeaderRecord]] = {}
+        # 公司主营业务与历史龙头记录
+        self.store = TopicStore(self.db_path)
         
-        # 加载数据
+        # 导入旧版数据
         self._load_business_db()
         self._load_leader_history()
     
     def _load_business_db(self):
-        """加载公司主营业务数据库"""
-        if os.path.exists(self.business_db_path):
-            try:
-                with open(self.business_db_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                for code, info in data.items():
-                    self.company_business[code] = CompanyBusiness(
-                        code=code,
-                        name=info.get('name', ''),
-                        main_business=info.get('main_business', ''),
-                        products=info.get('products', []),
-                        industry=info.get('industry', ''),
-                        concepts=info.get('concepts', []),
-                        keywords=info.get('keywords', [])
-                    )
-            except Exception as e:
-                print(f"⚠️ 加载公司业务数据库失败: {e}")
+        """数据库为空时导入旧版公司主营业务 JSON"""
+        if self.store.count_businesses() or not os.path.exists(self.business_db_path):
+            return
+        try:
+            with open(self.business_db_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.store.upsert_businesses(
+                CompanyBusiness(
+                    code=code,
+                    name=info.get('name', ''),
+                    main_business=info.get('main_business', ''),
+                    products=info.get('products', []),
+                    industry=info.get('industry', ''),
+                    concepts=info.get('concepts', []),
+                    keywords=info.get('keywords', [])
+                )
+                for code, info in data.items()
+            )
+        except Exception as e:
+            print(f"⚠️ 加载公司业务数据库失败: {e}")
     
     def _load_leader_history(self):
-        """加载历史龙头记录"""
-        if os.path.exists(self.leader_history_path):
-            try:
-                with open(self.leader_history_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                for topic, records in data.items():
-                    self.leader_history[topic] = [
-                        LeaderRecord(
-                            code=r.get('code', ''),
-                            name=r.get('name', ''),
-                            topic=topic,
-                            date=r.get('date', ''),
-                            leader_index=r.get('leader_index', 0),
-                            leader_type=r.get('leader_type', ''),
-                            limit_up_time=r.get('limit_up_time', ''),
-                            seal_amount=r.get('seal_amount', 0),
-                            continuous_boards=r.get('continuous_boards', 0),
-                            market_cap=r.get('market_cap', 0)
-                        )
-                        for r in records
-                    ]
-            except Exception as e:
-                print(f"⚠️ 加载龙头历史记录失败: {e}")
-    
-    def _save_business_db(self):
-        """保存公司主营业务数据库"""
-        Path(self.business_db_path).parent.mkdir(parents=True, exist_ok=True)
-        data = {
-            code: asdict(info) 
-            for code, info in self.company_business.items()
-        }
-        with open(self.business_db_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    def _save_leader_history(self):
-        """保存历史龙头记录"""
-        Path(self.leader_history_path).parent.mkdir(parents=True, exist_ok=True)
-        data = {
-            topic: [asdict(r) for r in records]
-            for topic, records in self.leader_history.items()
-        }
-        with open(self.leader_history_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
+        """数据库为空时导入旧版历史龙头记录 JSON"""
+        if self.store.count_leaders() or not os.path.exists(self.leader_history_path):
+            return
+        try:
+            with open(self.leader_history_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.store.upsert_leaders(
+                LeaderRecord(
+                    code=r.get('code', ''),
+                    name=r.get('name', ''),
+                    topic=topic,
+                    date=r.get('date', ''),
+                    leader_index=r.get('leader_index', 0),
+                    leader_type=r.get('leader_type', ''),
+                    limit_up_time=r.get('limit_up_time', ''),
+                    seal_amount=r.get('seal_amount', 0),
+                    continuous_boards=r.get('continuous_boards', 0),
+                    market_cap=r.get('market_cap', 0)
+                )
+                for topic, records in data.items()
+                for r in records
+            )
+        except Exception as e:
+            print(f"⚠️ 加载龙头历史记录失败: {e}")
     
     def add_company_business(self, business: CompanyBusiness) -> bool:
         """
@@ -174,10 +310,18 @@ class SmartTopicMatcher:
         Returns:
             是否添加成功
         """
-        self.company_business[business.code] = business
-        self._save_business_db()
+        self.store.upsert_businesses([business])
         return True
     
+    def add_company_businesses(self, businesses: List[CompanyBusiness]) -> int:
+        """
+        批量添加公司主营业务信息（一次写入）
+        
+        Returns:
+            添加条数
+        """
+        return self.store.upsert_businesses(businesses)
+    
     def get_company_business(self, code: str) -> Optional[CompanyBusiness]:
         """
         获取公司主营业务信息
@@ -188,41 +332,32 @@ class SmartTopicMatcher:
         Returns:
             公司主营业务信息，不存在返回None
         """
-        return self.company_business.get(code)
+        return self.store.get_business(code)
     
     def add_leader_record(self, record: LeaderRecord) -> bool:
         """
         添加龙头记录
         
+        同一题材同一天同一股票的记录覆盖写入，只保留最近30天的记录。
+        
         Args:
             record: 龙头记录
         
         Returns:
             是否添加成功
         """
-        topic = record.topic
-        if topic not in self.leader_history:
-            self.leader_history[topic] = []
-        
-        # 检查是否已存在同一天的记录
-        existing = [r for r in self.leader_history[topic] 
-                   if r.code == record.code and r.date == record.date]
-        if existing:
-            # 更新现有记录
-            idx = self.leader_history[topic].index(existing[0])
-            self.leader_history[topic][idx] = record
-        else:
-            self.leader_history[topic].append(record)
-        
-        # 只保留最近30天的记录
-        cutoff_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-        self.leader_history[topic] = [
-            r for r in self.leader_history[topic] if r.date >= cutoff_date
-        ]
-        
-        self._save_leader_history()
+        self.store.upsert_leaders([record])
         return True
     
+    def add_leader_records(self, records: List[LeaderRecord]) -> int:
+        """
+        批量添加龙头记录（一次写入）
+        
+        Returns:
+            添加条数
+        """
+        return self.store.upsert_leaders(records)
+    
     def get_topic_leaders(self, topic: str, days: int = 7) -> List[LeaderRecord]:
         """
         获取题材的历史龙头
@@ -232,17 +367,10 @@ class SmartTopicMatcher:
             days: 查询天数
         
         Returns:
-            龙头记录列表
+            龙头记录列表（按龙头指数排序）
         """
-        if topic not in self.leader_history:
-            return []
-        
         cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        records = [r for r in self.leader_history[topic] if r.date >= cutoff_date]
-        
-        # 按龙头指数排序
-        records.sort(key=lambda x: x.leader_index, reverse=True)
-        return records
+        return self.store.topic_leaders(topic, cutoff_date)
     
     def match_topic_relevance(self, 
                               stock_code: str,
@@ -605,25 +733,25 @@ class SmartTopicMatcher:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
         
-        count = 0
-        for leader in leaders:
-            if leader.get('leader_type') in ['真龙头', '二线龙头']:
-                record = LeaderRecord(
-                    code=leader.get('stock_code', ''),
-                    name=leader.get('stock_name', ''),
-                    topic=topic_name,
-                    date=date,
-                    leader_index=leader.get('leader_index', 0),
-                    leader_type=leader.get('leader_type', ''),
-                    limit_up_time=leader.get('details', {}).get('limit_up_time', ''),
-                    seal_amount=leader.get('details', {}).get('seal_amount', 0),
-                    continuous_boards=leader.get('details', {}).get('continuous_boards', 0),
-                    market_cap=leader.get('details', {}).get('market_cap', 0)
-                )
-                self.add_leader_record(record)
-                count += 1
+        records = [
+            LeaderRecord(
+                code=leader.get('stock_code', ''),
+                name=leader.get('stock_name', ''),
+                topic=topic_name,
+                date=date,
+                leader_index=leader.get('leader_index', 0),
+                leader_type=leader.get('leader_type', ''),
+                limit_up_time=leader.get('details', {}).get('limit_up_time', ''),
+                seal_amount=leader.get('details', {}).get('seal_amount', 0),
+                continuous_boards=leader.get('details', {}).get('continuous_boards', 0),
+                market_cap=leader.get('details', {}).get('market_cap', 0)
+            )
+            for leader in leaders
+            if leader.get('leader_type') in ['真龙头', '二线龙头']
+        ]
+        self.add_leader_records(records)
         
-        return count
+        return len(records)
     
     def predict_tomorrow_leader(self, topic_name: str) -> Optional[Dict]:
         """
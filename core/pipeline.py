@@ -0,0 +1,691 @@
+"""
+MiniQuant-Lite 每日流水线编排模块
+
+把分散在 Screener / SignalGenerator / SellSignalChecker / 通知模块中的每日流程
+组织为一个有向无环图（DAG）：
+
+    数据刷新 → 指标面板 → 选股 → 买入信号 ┐
+                 大盘状态 ┘                ├→ 通知
+    数据刷新 ────────────→ 卖出检查 ───────┘
+
+设计原则：
+- 每个阶段声明输入与输出（按名字关联），由编排器推导依赖关系
+- 互不依赖的阶段并发执行（线程池）
+- 中间产物按内容哈希持久化到磁盘（data/pipeline/），成功运行后删除不再引用的旧产物
+- 输入内容未变化的阶段直接复用上次产物，跳过执行
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import concurrent.futures
+from dataclasses import dataclass, field, is_dataclass, fields
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# ========== 内容哈希 ==========
+
+def content_hash(value: Any) -> str:
+    """
+    计算任意产物的内容哈希
+
+    DataFrame / Series 使用 pandas 的逐行哈希（与内存布局无关），
+    容器类型递归展开，其余对象回退到 pickle 字节。
+
+    Args:
+        value: 产物对象
+
+    Returns:
+        SHA-256 十六进制字符串
+    """
+    hasher = hashlib.sha256()
+    _update_hash(hasher, value)
+    return hasher.hexdigest()
+
+
+def _update_hash(hasher, value: Any) -> None:
+    """递归更新哈希"""
+    if isinstance(value, pd.DataFrame):
+        hasher.update(b'df')
+        hasher.update(repr(list(value.columns)).encode('utf-8'))
+        hasher.update(repr([str(t) for t in value.dtypes]).encode('utf-8'))
+        hasher.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, pd.Series):
+        hasher.update(b'series')
+        hasher.update(str(value.name).encode('utf-8'))
+        hasher.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        hasher.update(b'ndarray')
+        hasher.update(str(value.dtype).encode('utf-8'))
+        hasher.update(repr(value.shape).encode('utf-8'))
+        hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        hasher.update(b'dict')
+        for key in sorted(value.keys(), key=repr):
+            hasher.update(repr(key).encode('utf-8'))
+            _update_hash(hasher, value[key])
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b'list' if isinstance(value, list) else b'tuple')
+        for item in value:
+            _update_hash(hasher, item)
+    elif is_dataclass(value) and not isinstance(value, type):
+        hasher.update(type(value).__name__.encode('utf-8'))
+        for f in fields(value):
+            hasher.update(f.name.encode('utf-8'))
+            _update_hash(hasher, getattr(value, f.name))
+    elif isinstance(value, Enum):
+        hasher.update(f"{type(value).__name__}.{value.name}".encode('utf-8'))
+    elif value is None or isinstance(value, (str, int, float, bool, date, datetime)):
+        hasher.update(repr(value).encode('utf-8'))
+    else:
+        try:
+            hasher.update(pickle.dumps(value, protocol=4))
+        except Exception:
+            hasher.update(repr(value).encode('utf-8'))
+
+
+# ========== 数据结构 ==========
+
+@dataclass
+class PipelineStage:
+    """
+    流水线阶段定义
+
+    func 以关键字参数接收 inputs 中声明的产物，返回包含 outputs 中全部键的字典。
+    """
+    name: str                                   # 阶段名称（唯一）
+    func: Callable[..., Dict[str, Any]]         # 阶段函数
+    inputs: List[str] = field(default_factory=list)   # 输入产物名
+    outputs: List[str] = field(default_factory=list)  # 输出产物名
+    always_run: bool = False                    # 读取外部数据源的阶段，输入不变也要重跑
+    persist: bool = True                        # 是否持久化产物（不持久化则无法跳过）
+    version: str = "1"                          # 阶段逻辑版本，修改后使旧产物失效
+    cacheable: Optional[Callable[[Dict[str, Any]], bool]] = None  # 按输出判断能否记入清单（临时性失败不缓存）
+
+    def __post_init__(self):
+        if not self.name:
+            raise ValueError("阶段名称不能为空")
+        if not self.outputs:
+            raise ValueError(f"阶段 {self.name} 至少需要一个输出")
+        if len(set(self.outputs)) != len(self.outputs):
+            raise ValueError(f"阶段 {self.name} 的输出名重复: {self.outputs}")
+
+
+@dataclass
+class StageResult:
+    """单个阶段的运行结果"""
+    name: str
+    status: str                       # executed / skipped / failed / blocked
+    duration: float = 0.0             # 耗时（秒）
+    input_hash: str = ""              # 输入指纹
+    output_hashes: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass
+class PipelineRunResult:
+    """一次流水线运行的结果"""
+    stage_results: Dict[str, StageResult] = field(default_factory=dict)
+    artifacts: Dict[str, Any] = field(default_factory=dict)
+    total_duration: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """是否所有阶段都成功（执行或跳过）"""
+        return all(r.status in ('executed', 'skipped') for r in self.stage_results.values())
+
+    @property
+    def executed_stages(self) -> List[str]:
+        return [name for name, r in self.stage_results.items() if r.status == 'executed']
+
+    @property
+    def skipped_stages(self) -> List[str]:
+        return [name for name, r in self.stage_results.items() if r.status == 'skipped']
+
+    @property
+    def failed_stages(self) -> List[str]:
+        return [name for name, r in self.stage_results.items() if r.status in ('failed', 'blocked')]
+
+    def get_timings(self) -> Dict[str, float]:
+        """各阶段耗时（秒）"""
+        return {name: r.duration for name, r in self.stage_results.items()}
+
+
+# ========== 产物存储 ==========
+
+class ArtifactStore:
+    """
+    按内容哈希存储的产物仓库
+
+    目录结构：
+        {root}/artifacts/{hash}.pkl   产物本体（相同内容只存一份）
+        {root}/manifest.json          各阶段最近一次运行的输入指纹与输出哈希
+    """
+
+    DEFAULT_ROOT = Path("data/pipeline")
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root is not None else self.DEFAULT_ROOT
+        self.artifact_dir = self.root / "artifacts"
+        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._manifest: Dict[str, Dict[str, Any]] = self._load_manifest()
+
+    def _artifact_path(self, artifact_hash: str) -> Path:
+        return self.artifact_dir / f"{artifact_hash}.pkl"
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        manifest_path = self.root / self.MANIFEST_FILE
+        if not manifest_path.exists():
+            return {}
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"读取流水线清单失败，将全部重新计算: {e}")
+            return {}
+
+    def _save_manifest(self) -> None:
+        manifest_path = self.root / self.MANIFEST_FILE
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    def has(self, artifact_hash: str) -> bool:
+        return self._artifact_path(artifact_hash).exists()
+
+    def put(self, value: Any, artifact_hash: Optional[str] = None) -> str:
+        """
+        存储产物
+
+        Returns:
+            产物的内容哈希
+        """
+        if artifact_hash is None:
+            artifact_hash = content_hash(value)
+        path = self._artifact_path(artifact_hash)
+        if not path.exists():
+            tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=4)
+            os.replace(tmp_path, path)
+        return artifact_hash
+
+    def get(self, artifact_hash: str) -> Any:
+        """读取产物，不存在时抛出 KeyError"""
+        path = self._artifact_path(artifact_hash)
+        if not path.exists():
+            raise KeyError(f"产物不存在: {artifact_hash}")
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def get_stage_record(self, stage_name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._manifest.get(stage_name)
+            return dict(record) if record else None
+
+    def set_stage_record(self, stage_name: str, input_hash: str, output_hashes: Dict[str, str]) -> None:
+        with self._lock:
+            self._manifest[stage_name] = {
+                'input_hash': input_hash,
+                'output_hashes': dict(output_hashes),
+                'updated_at': datetime.now().isoformat(timespec='seconds')
+            }
+            self._save_manifest()
+
+    def prune(self) -> int:
+        """
+        删除清单中不再引用的产物
+
+        每次运行都会写入新的 price_data 等产物，旧产物被清单替换后即可删除。
+
+        Returns:
+            删除的产物数量
+        """
+        with self._lock:
+            referenced = {
+                h for record in self._manifest.values()
+                for h in record.get('output_hashes', {}).values()
+            }
+            removed = 0
+            for path in self.artifact_dir.glob('*.pkl'):
+                if path.stem in referenced:
+                    continue
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError as e:
+                    logger.warning(f"删除流水线产物失败 {path.name}: {e}")
+        if removed:
+            logger.info(f"流水线产物清理: 删除 {removed} 个未引用产物")
+        return removed
+
+    def clear(self) -> None:
+        """清空全部产物与清单"""
+        with self._lock:
+            for path in self.artifact_dir.glob('*.pkl'):
+                path.unlink()
+            self._manifest = {}
+            self._save_manifest()
+        logger.info(f"流水线产物已清空: {self.root}")
+
+
+# ========== 编排器 ==========
+
+class PipelineOrchestrator:
+    """
+    流水线编排器
+
+    用法：
+        orchestrator = PipelineOrchestrator()
+        orchestrator.add_stage(PipelineStage('load', load_fn, inputs=['codes'], outputs=['prices']))
+        orchestrator.add_stage(PipelineStage('panel', panel_fn, inputs=['prices'], outputs=['panel']))
+        result = orchestrator.run({'codes': ['000001']})
+    """
+
+    def __init__(self, store: Optional[ArtifactStore] = None, max_workers: int = 4):
+        """
+        Args:
+            store: 产物仓库，None 时使用默认目录 data/pipeline
+            max_workers: 并发执行的最大阶段数
+        """
+        self.store = store if store is not None else ArtifactStore()
+        self.max_workers = max_workers
+        self._stages: Dict[str, PipelineStage] = {}
+
+    @property
+    def stages(self) -> List[PipelineStage]:
+        return list(self._stages.values())
+
+    def add_stage(self, stage: PipelineStage) -> 'PipelineOrchestrator':
+        """添加阶段，支持链式调用"""
+        if stage.name in self._stages:
+            raise ValueError(f"阶段名称重复: {stage.name}")
+
+        producers = self._producers()
+        for output in stage.outputs:
+            if output in producers:
+                raise ValueError(f"产物 {output} 已由阶段 {producers[output]} 输出")
+
+        self._stages[stage.name] = stage
+        return self
+
+    def _producers(self) -> Dict[str, str]:
+        """产物名 -> 产出阶段名"""
+        return {output: stage.name for stage in self._stages.values() for output in stage.outputs}
+
+    def get_dependencies(self, stage_name: str) -> List[str]:
+        """获取阶段的直接上游阶段"""
+        producers = self._producers()
+        stage = self._stages[stage_name]
+        return sorted({producers[i] for i in stage.inputs if i in producers})
+
+    def execution_levels(self) -> List[List[str]]:
+        """
+        按依赖关系分层（同一层内的阶段可并发执行）
+
+        Raises:
+            ValueError: 存在循环依赖
+        """
+        remaining = {name: set(self.get_dependencies(name)) for name in self._stages}
+        levels: List[List[str]] = []
+
+        while remaining:
+            ready = sorted(name for name, deps in remaining.items() if not deps)
+            if not ready:
+                raise ValueError(f"流水线存在循环依赖: {sorted(remaining.keys())}")
+            levels.append(ready)
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        return levels
+
+    def _external_inputs(self) -> List[str]:
+        producers = self._producers()
+        return sorted({i for stage in self._stages.values() for i in stage.inputs if i not in producers})
+
+    def _stage_fingerprint(self, stage: PipelineStage, input_hashes: Dict[str, str]) -> str:
+        payload = {
+            'stage': stage.name,
+            'version': stage.version,
+            'inputs': {name: input_hashes[name] for name in stage.inputs}
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _try_reuse(self, stage: PipelineStage, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """输入指纹与上次一致且产物齐全时，返回上次的产物"""
+        if stage.always_run or not stage.persist:
+            return None
+
+        record = self.store.get_stage_record(stage.name)
+        if not record or record.get('input_hash') != fingerprint:
+            return None
+
+        output_hashes = record.get('output_hashes', {})
+        if set(output_hashes.keys()) != set(stage.outputs):
+            return None
+        if not all(self.store.has(h) for h in output_hashes.values()):
+            return None
+
+        try:
+            return {name: (self.store.get(h), h) for name, h in output_hashes.items()}
+        except Exception as e:
+            logger.warning(f"读取阶段 {stage.name} 的缓存产物失败，重新执行: {e}")
+            return None
+
+    def _execute_stage(self, stage: PipelineStage, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        outputs = stage.func(**kwargs)
+        if not isinstance(outputs, dict):
+            raise TypeError(f"阶段 {stage.name} 必须返回字典，实际返回 {type(outputs).__name__}")
+        missing = [name for name in stage.outputs if name not in outputs]
+        if missing:
+            raise ValueError(f"阶段 {stage.name} 缺少输出: {missing}")
+        return {name: outputs[name] for name in stage.outputs}
+
+    def run(
+        self,
+        inputs: Optional[Dict[str, Any]] = None,
+        force: bool = False
+    ) -> PipelineRunResult:
+        """
+        运行流水线
+
+        Args:
+            inputs: 外部输入产物（如股票池、交易日期、持仓列表）
+            force: 为 True 时忽略缓存，全部阶段重新执行
+
+        Returns:
+            PipelineRunResult
+
+        Raises:
+            ValueError: 缺少外部输入或存在循环依赖
+        """
+        inputs = dict(inputs or {})
+        self.execution_levels()  # 提前检查循环依赖
+
+        missing = [name for name in self._external_inputs() if name not in inputs]
+        if missing:
+            raise ValueError(f"缺少外部输入: {missing}")
+
+        run_start = time.perf_counter()
+        result = PipelineRunResult()
+        artifacts: Dict[str, Any] = dict(inputs)
+        artifact_hashes: Dict[str, str] = {name: content_hash(value) for name, value in inputs.items()}
+
+        pending = dict(self._stages)
+        running: Dict[concurrent.futures.Future, tuple] = {}
+
+        logger.info(f"流水线开始运行: {len(pending)} 个阶段")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # 1. 处理上游失败导致无法执行的阶段
+                for name, stage in list(pending.items()):
+                    blocked_by = [
+                        dep for dep in self.get_dependencies(name)
+                        if dep in result.stage_results
+                        and result.stage_results[dep].status in ('failed', 'blocked')
+                    ]
+                    if blocked_by:
+                        result.stage_results[name] = StageResult(
+                            name=name, status='blocked', error=f"上游阶段失败: {blocked_by}"
+                        )
+                        del pending[name]
+                        logger.warning(f"阶段 {name} 被跳过（上游失败: {blocked_by}）")
+
+                # 2. 调度输入已就绪的阶段
+                for name, stage in list(pending.items()):
+                    if not all(i in artifact_hashes for i in stage.inputs):
+                        continue
+                    del pending[name]
+
+                    fingerprint = self._stage_fingerprint(stage, artifact_hashes)
+                    reused = None if force else self._try_reuse(stage, fingerprint)
+
+                    if reused is not None:
+                        for output, (value, h) in reused.items():
+                            artifacts[output] = value
+                            artifact_hashes[output] = h
+                        result.stage_results[name] = StageResult(
+                            name=name, status='skipped', input_hash=fingerprint,
+                            output_hashes={o: h for o, (_, h) in reused.items()}
+                        )
+                        logger.info(f"阶段 {name} 输入未变化，复用上次产物")
+                        continue
+
+                    kwargs = {i: artifacts[i] for i in stage.inputs}
+                    future = executor.submit(self._timed_execute, stage, kwargs)
+                    running[future] = (stage, fingerprint)
+
+                if not running:
+                    if pending:
+                        # 没有可运行的阶段但仍有待执行阶段，说明依赖无法满足
+                        for name in list(pending.keys()):
+                            result.stage_results[name] = StageResult(
+                                name=name, status='blocked', error="依赖产物缺失"
+                            )
+                        pending.clear()
+                    break
+
+                # 3. 等待至少一个阶段完成
+                done, _ = concurrent.futures.wait(
+                    list(running.keys()), return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    stage, fingerprint = running.pop(future)
+                    try:
+                        outputs, duration = future.result()
+                    except Exception as e:
+                        result.stage_results[stage.name] = StageResult(
+                            name=stage.name, status='failed', input_hash=fingerprint, error=str(e)
+                        )
+                        logger.error(f"阶段 {stage.name} 执行失败: {e}")
+                        continue
+
+                    output_hashes = {}
+                    for output, value in outputs.items():
+                        h = content_hash(value)
+                        if stage.persist:
+                            try:
+                                self.store.put(value, h)
+                            except Exception as e:
+                                logger.warning(f"阶段 {stage.name} 产物 {output} 无法持久化: {e}")
+                        artifacts[output] = value
+                        artifact_hashes[output] = h
+                        output_hashes[output] = h
+
+                    if stage.persist and (stage.cacheable is None or stage.cacheable(outputs)):
+                        self.store.set_stage_record(stage.name, fingerprint, output_hashes)
+
+                    result.stage_results[stage.name] = StageResult(
+                        name=stage.name, status='executed', duration=duration,
+                        input_hash=fingerprint, output_hashes=output_hashes
+                    )
+                    logger.info(f"阶段 {stage.name} 完成，耗时 {duration:.2f} 秒")
+
+        # 成功运行后清单已指向最新产物，删除被替换的旧产物
+        if result.success:
+            try:
+                self.store.prune()
+            except Exception as e:
+                logger.warning(f"清理流水线产物失败: {e}")
+
+        result.artifacts = artifacts
+        result.total_duration = time.perf_counter() - run_start
+        logger.info(
+            f"流水线运行结束: 执行 {len(result.executed_stages)} 个, "
+            f"跳过 {len(result.skipped_stages)} 个, 失败 {len(result.failed_stages)} 个, "
+            f"耗时 {result.total_duration:.2f} 秒"
+        )
+        return result
+
+    def _timed_execute(self, stage: PipelineStage, kwargs: Dict[str, Any]) -> tuple:
+        start = time.perf_counter()
+        outputs = self._execute_stage(stage, kwargs)
+        return outputs, time.perf_counter() - start
+
+
+# ========== 每日流程 ==========
+
+def build_daily_pipeline(
+    data_feed,
+    screener=None,
+    signal_generator=None,
+    sell_checker=None,
+    store: Optional[ArtifactStore] = None,
+    send_notification: bool = True,
+    max_workers: int = 4,
+    notification_timeout: float = 30.0
+) -> PipelineOrchestrator:
+    """
+    构建每日流程流水线
+
+    外部输入：
+        stock_pool: 股票池代码列表
+        positions:  持仓列表（List[Holding]）
+        trade_date: 交易日期字符串（用于大盘状态按日缓存）
+
+    阶段：
+        data_refresh    stock_pool, positions -> price_data       （每次运行，读取本地数据）
+        market_status   trade_date -> market_status               （每日获取一次，获取失败时下次重试）
+        indicator_panel price_data -> indicator_panel
+        screen          price_data, indicator_panel, market_status -> screened_codes
+                        （与 Screener.screen 共用 screen_frames 精筛链）
+        signals         screened_codes, price_data -> buy_signals
+        sells           positions, price_data -> sell_signals     （与选股、信号并发）
+        notifications   buy_signals, sell_signals -> notification_sent （信号不变时不重复推送；
+                        等待送达后才记录结果，超时或失败时下次运行重试）
+
+    信号与卖出阶段直接使用 price_data 中已加载的日线，不再重复读取本地文件。
+    隔夜选股（OvernightStockPicker）、TechSignalGenerator 与股票池自动更新不在本流水线内。
+
+    Args:
+        data_feed: 数据源
+        screener: 选股器（提供流动性快照与精筛链），None 时使用默认配置
+        signal_generator: 信号生成器，None 时按默认策略创建
+        sell_checker: 卖出信号检查器，None 时创建默认实例
+        store: 产物仓库
+        send_notification: 是否发送飞书通知
+        max_workers: 最大并发阶段数
+        notification_timeout: 等待通知送达的最长时间（秒）
+    """
+    if screener is None:
+        from core.screener import Screener
+        screener = Screener(data_feed)
+    if signal_generator is None:
+        from core.signal_generator import SignalGenerator
+        signal_generator = SignalGenerator(data_feed)
+    if sell_checker is None:
+        from core.sell_signal_checker import SellSignalChecker
+        sell_checker = SellSignalChecker(data_feed)
+
+    def data_refresh(stock_pool, positions):
+        codes = list(dict.fromkeys(list(stock_pool) + [h.code for h in positions]))
+        price_data = {}
+        for code in codes:
+            df = data_feed.load_processed_data(code)
+            if df is not None and not df.empty:
+                price_data[code] = df
+        logger.info(f"数据刷新: 加载 {len(price_data)}/{len(codes)} 只股票")
+        return {'price_data': price_data}
+
+    def market_status(trade_date):
+        return {'market_status': screener.get_market_status()}
+
+    def indicator_panel(price_data):
+        return {'indicator_panel': {
+            code: screener.calculate_indicators(df) for code, df in price_data.items()
+        }}
+
+    def screen(price_data, indicator_panel, market_status):
+        if screener.market_filter.enabled and market_status.get('status') == 'unhealthy':
+            logger.warning("大盘环境不佳，选股阶段返回空列表")
+            return {'screened_codes': []}
+
+        # 与 Screener.screen 共用同一条精筛链：流动性快照预剪枝（市值、换手率、ST）、
+        # NATR、趋势安全、策略预筛、MA60、技术条件、财报窗口标记与行业互斥
+        if screener.industry_diversification.enabled:
+            screener.industry_map.refresh_if_stale(background=True)
+        snapshot = screener.get_liquidity_snapshot()
+        if snapshot is not None and not snapshot.empty:
+            listed = set(snapshot['code'].astype(str))
+            frames = {code: df for code, df in price_data.items() if code in listed}
+            check_listing = False
+        else:
+            logger.warning("流动性快照不可用，改为逐只检查上市天数")
+            frames = dict(price_data)
+            check_listing = True
+
+        results = screener.screen_frames(
+            frames, snapshot_data=snapshot, check_listing=check_listing,
+            indicator_panel=indicator_panel
+        )
+        return {'screened_codes': [r.code for r in results]}
+
+    def signals(screened_codes, price_data):
+        codes = [code for code in screened_codes if code in price_data]
+        return {'buy_signals': signal_generator.generate_signals(codes, frames=price_data)}
+
+    def sells(positions, price_data):
+        return {'sell_signals': sell_checker.check_all_positions(positions, frames=price_data)}
+
+    def notifications(buy_signals, sell_signals):
+        if not send_notification:
+            return {'notification_sent': False}
+        from core.notification import dispatch_notification
+        from core.notification_dispatcher import get_notification_dispatcher
+        # 卖出信号转换为 TradingSignal，与买入信号合并为一条通知
+        signals = list(buy_signals) + [s.to_trading_signal() for s in sell_signals]
+        handle = dispatch_notification(signals)
+        # 分发器是后台守护线程，命令行进程退出前必须等待发送完成；
+        # 未送达时阶段失败、结果不写入清单，下次运行重新发送
+        if not handle.done():
+            get_notification_dispatcher().flush(notification_timeout)
+        if not handle.wait(0):
+            raise RuntimeError(f"飞书通知未送达: status={handle.status} {handle.error}".strip())
+        return {'notification_sent': handle.status == handle.STATUS_SENT}
+
+    orchestrator = PipelineOrchestrator(store=store, max_workers=max_workers)
+    orchestrator.add_stage(PipelineStage(
+        'data_refresh', data_refresh, inputs=['stock_pool', 'positions'],
+        outputs=['price_data'], always_run=True
+    ))
+    orchestrator.add_stage(PipelineStage(
+        'market_status', market_status, inputs=['trade_date'], outputs=['market_status'],
+        # 获取失败（error / unknown）不缓存，下次运行重新获取
+        cacheable=lambda outputs: outputs['market_status'].get('status') in ('healthy', 'unhealthy')
+    ))
+    orchestrator.add_stage(PipelineStage(
+        'indicator_panel', indicator_panel, inputs=['price_data'], outputs=['indicator_panel']
+    ))
+    orchestrator.add_stage(PipelineStage(
+        'screen', screen, inputs=['price_data', 'indicator_panel', 'market_status'],
+        outputs=['screened_codes']
+    ))
+    orchestrator.add_stage(PipelineStage(
+        'signals', signals, inputs=['screened_codes', 'price_data'], outputs=['buy_signals']
+    ))
+    orchestrator.add_stage(PipelineStage(
+        'sells', sells, inputs=['positions', 'price_data'], outputs=['sell_signals']
+    ))
+    orchestrator.add_stage(PipelineStage(
+        'notifications', notifications, inputs=['buy_signals', 'sell_signals'],
+        outputs=['notification_sent']
+    ))
+    return orchestrator
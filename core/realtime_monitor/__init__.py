@@ -4,7 +4,7 @@ Realtime Monitor Module
 实时监控模块，基于v11.4g科技股策略提供买卖信号生成、持仓管理和可视化界面。
 """
 
-from .config import V114G_STRATEGY_PARAMS, MONITOR_CONFIG
+from .config import V114G_STRATEGY_PARAMS, MONITOR_CONFIG, BULK_MONITOR_CONFIG
 from .models import Position, StockData, BuySignal, SellSignal
 from .indicators import TechIndicators
 from .signal_engine import SignalEngine
@@ -18,11 +18,18 @@ from .data_fetcher import (
     DataCache,
     CacheConfig,
     CACHE_CONFIG,
+    LatencyStats,
 )
+from .bulk_fetcher import BulkDataFetcher, IndicatorState
+from .signal_tracker import SignalTracker, SignalTransition, SignalEvaluation
+from .service import MonitorService, MonitorSnapshot, get_monitor_service, set_monitor_mode
+from .tick_recorder import TickRecorder, TickChunk, read_ticks
+from .replay import ReplayDataFetcher, ReplayDriver, ReplayReport, ReplayTick, TechReplayContext
 
 __all__ = [
     'V114G_STRATEGY_PARAMS',
     'MONITOR_CONFIG',
+    'BULK_MONITOR_CONFIG',
     'Position',
     'StockData',
     'BuySignal',
@@ -38,4 +45,22 @@ __all__ = [
     'DataCache',
     'CacheConfig',
     'CACHE_CONFIG',
+    'LatencyStats',
+    'BulkDataFetcher',
+    'IndicatorState',
+    'SignalTracker',
+    'SignalTransition',
+    'SignalEvaluation',
+    'MonitorService',
+    'MonitorSnapshot',
+    'get_monitor_service',
+    'set_monitor_mode',
+    'TickRecorder',
+    'TickChunk',
+    'read_ticks',
+    'ReplayDataFetcher',
+    'ReplayDriver',
+    'ReplayReport',
+    'ReplayTick',
+    'TechReplayContext',
 ]
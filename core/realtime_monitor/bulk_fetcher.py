@@ -0,0 +1,375 @@
+"""
+Bulk Data Fetcher Module
+
+大容量监控模式（300-500 只）的数据获取器。
+
+逐只获取（行情 + 历史 + 资金流向）的成本随监控数量线性增长，大容量模式改为：
+- 行情：一次全市场批量快照（DataFetcher.fetch_realtime_quotes_batch）
+- 历史：本地已处理数据（DataFeed.load_processed_data），每个交易日只加载一次
+- 指标：由历史收盘数据预先压缩为增量状态（部分和），每次刷新只代入当日行情，
+  全部股票一次向量化计算
+- 资金流向：全市场资金流向库（FundFlowStore）
+
+增量状态（每只股票一行）：
+- 各均线周期的前 N-1 日收盘价之和
+- RSI 周期内前 N-1 日涨幅/跌幅之和与昨收
+- MA20 斜率所需的历史 MA20
+- 量比所需的前 N 日平均成交量
+
+计算口径与 TechIndicators.calculate_all_indicators 一致（历史日线 + 当日行情作为最后一根K线）。
+"""
+
+import logging
+import sys
+from datetime import date, datetime
+from functools import partial
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.fund_flow import FundFlowStore
+from .config import MONITOR_CONFIG, V114G_STRATEGY_PARAMS
+from .data_fetcher import DataFetcher, LatencyStats
+from .models import StockData
+
+logger = logging.getLogger(__name__)
+
+
+class IndicatorState:
+    """
+    指标增量状态（结构化数组，每只股票一行）
+
+    由截至昨日的日线构建，当日只需代入最新价格与成交量即可得到全部指标。
+    """
+
+    def __init__(self, params=None):
+        self.params = params or V114G_STRATEGY_PARAMS
+        p = self.params
+        self.ma_periods = (p.MA5_PERIOD, p.MA10_PERIOD, p.MA20_PERIOD, p.MA60_PERIOD)
+        # 构建状态需要的最少历史根数
+        self.history_days = max(max(self.ma_periods), p.MA20_PERIOD + p.MA_SLOPE_PERIOD,
+                                p.RSI_PERIOD + 1, p.VOLUME_RATIO_PERIOD + 1)
+
+        self.codes: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.fields = (
+            ['n_bars', 'last_close', 'gain_sum', 'loss_sum', 'past_ma20', 'avg_volume']
+            + [f"sum_{period}" for period in self.ma_periods]
+        )
+        self._data = np.empty((0, len(self.fields)), dtype=np.float64)
+        self._col = {name: i for i, name in enumerate(self.fields)}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._index
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def column(self, name: str) -> np.ndarray:
+        return self._data[:, self._col[name]]
+
+    def rows(self, codes: List[str]) -> np.ndarray:
+        """代码对应的行号"""
+        return np.fromiter((self._index[code] for code in codes), dtype=np.intp, count=len(codes))
+
+    # ========== 构建 ==========
+
+    def build_row(self, closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+        """由历史收盘价与成交量（按日期升序，不含当日）构建一行状态"""
+        p = self.params
+        closes = closes[-self.history_days:]
+        volumes = volumes[-self.history_days:]
+        n = len(closes)
+        row = np.full(len(self.fields), np.nan)
+        row[self._col['n_bars']] = n
+        if n == 0:
+            return row
+
+        row[self._col['last_close']] = closes[-1]
+        for period in self.ma_periods:
+            if n >= period - 1:
+                row[self._col[f"sum_{period}"]] = closes[len(closes) - (period - 1):].sum()
+
+        # RSI：当日窗口包含前 period-1 个历史涨跌
+        rsi_prev = p.RSI_PERIOD - 1
+        if n >= p.RSI_PERIOD:
+            delta = np.diff(closes[-(rsi_prev + 1):])
+            row[self._col['gain_sum']] = delta[delta > 0].sum()
+            row[self._col['loss_sum']] = -delta[delta < 0].sum()
+
+        # MA20 斜率：当日（位置 n）回溯 slope_days-1 根的 MA20，窗口完全落在历史数据内
+        lag = p.MA_SLOPE_PERIOD - 1
+        if n >= p.MA20_PERIOD + lag:
+            end = n - lag + 1
+            row[self._col['past_ma20']] = closes[end - p.MA20_PERIOD:end].mean()
+
+        if n >= p.VOLUME_RATIO_PERIOD:
+            row[self._col['avg_volume']] = volumes[-p.VOLUME_RATIO_PERIOD:].mean()
+        return row
+
+    def set(self, rows: Dict[str, np.ndarray]) -> None:
+        """以 {code: 状态行} 替换全部状态"""
+        self.codes = list(rows)
+        self._index = {code: i for i, code in enumerate(self.codes)}
+        self._data = np.vstack(list(rows.values())) if rows else np.empty((0, len(self.fields)))
+
+    def update(self, rows: Dict[str, np.ndarray], keep: Optional[List[str]] = None) -> None:
+        """保留 keep 中已有的状态并追加/覆盖 rows"""
+        merged = {code: self._data[self._index[code]] for code in (self.codes if keep is None else keep)
+                  if code in self._index}
+        merged.update(rows)
+        self.set(merged)
+
+    # ========== 计算 ==========
+
+    def compute(self, rows: np.ndarray, prices: np.ndarray, volumes: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        向量化计算指标
+
+        Args:
+            rows: 状态行号
+            prices: 当日最新价
+            volumes: 当日成交量
+
+        Returns:
+            {指标名: 数组}，口径与 TechIndicators.calculate_all_indicators 一致
+        """
+        p = self.params
+        data = self._data[rows]
+        col = self._col
+        bars = data[:, col['n_bars']] + 1          # 含当日的K线数
+
+        result = {}
+        for period, name in zip(self.ma_periods, ('ma5', 'ma10', 'ma20', 'ma60')):
+            ma = (data[:, col[f"sum_{period}"]] + prices) / period
+            result[name] = np.where(bars >= period, ma, np.nan)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = prices - data[:, col['last_close']]
+            avg_gain = (data[:, col['gain_sum']] + np.maximum(delta, 0.0)) / p.RSI_PERIOD
+            avg_loss = (data[:, col['loss_sum']] + np.maximum(-delta, 0.0)) / p.RSI_PERIOD
+            rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+            result['rsi'] = np.where((bars >= p.RSI_PERIOD + 1) & ~np.isnan(rsi), rsi, 50.0)
+
+            avg_volume = data[:, col['avg_volume']]
+            ratio = volumes / avg_volume
+            valid = (bars >= p.VOLUME_RATIO_PERIOD + 1) & (avg_volume > 0)
+            result['volume_ratio'] = np.where(valid, ratio, 1.0)
+
+            past_ma20 = data[:, col['past_ma20']]
+            slope = (result['ma20'] - past_ma20) / past_ma20 * 100
+            valid = (bars >= p.MA20_PERIOD + p.MA_SLOPE_PERIOD) & (past_ma20 > 0) & ~np.isnan(slope)
+            result['ma20_slope'] = np.where(valid, slope, 0.0)
+        return result
+
+
+class BulkDataFetcher(DataFetcher):
+    """
+    大容量监控数据获取器
+
+    与 DataFetcher 接口一致（fetch_stock_data_batch），可直接作为 MonitorService 的数据获取器。
+    本地无历史数据的股票回退到 DataFetcher.fetch_historical_data 在线获取（每日一次）。
+    """
+
+    def __init__(self,
+                 config: Optional[MONITOR_CONFIG.__class__] = None,
+                 fund_flow_store: Optional[FundFlowStore] = None,
+                 data_feed=None,
+                 params=None):
+        """
+        Args:
+            config: 监控配置，默认使用MONITOR_CONFIG
+            fund_flow_store: 资金流向库，默认使用全局共享实例
+            data_feed: 本地数据源（提供 load_processed_data），默认按全局配置创建
+            params: 策略参数，默认使用V114G_STRATEGY_PARAMS
+        """
+        super().__init__(config, fund_flow_store=fund_flow_store)
+        self._data_feed = data_feed
+        self._state = IndicatorState(params)
+        self._state_date: Optional[date] = None
+        self._state_lock = Lock()
+        self._unavailable: set = set()           # 当日无历史数据的股票，不重复加载
+        self._latency['state'] = LatencyStats()
+
+    @property
+    def data_feed(self):
+        if self._data_feed is None:
+            from config.settings import get_settings
+            from core.data_feed import DataFeed
+            settings = get_settings()
+            self._data_feed = DataFeed(settings.path.get_raw_path(), settings.path.get_processed_path())
+        return self._data_feed
+
+    @property
+    def state(self) -> IndicatorState:
+        return self._state
+
+    # ========== 增量状态 ==========
+
+    def _load_history(self, code: str, today: date) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """读取本地历史（不含当日），本地缺失时在线获取"""
+        df = self.data_feed.load_processed_data(code, use_cache=False)
+        if df is None or df.empty:
+            df = self.fetch_historical_data(code)
+        if df is None or df.empty:
+            return None
+        if self.recorder is not None:
+            self.recorder.record_history(code, df)
+
+        if 'date' in df.columns:
+            df = df[pd.to_datetime(df['date']).dt.date < today]
+        df = df.tail(self._state.history_days)
+        return df['close'].to_numpy(dtype=np.float64), df['volume'].to_numpy(dtype=np.float64)
+
+    def prepare(self, codes: List[str], today: Optional[date] = None) -> int:
+        """
+        构建/更新监控股票的指标状态
+
+        - 交易日切换时全部重建（昨日K线已收盘）
+        - 否则只为新增股票加载历史
+
+        Returns:
+            本次加载历史的股票数量
+        """
+        today = today or date.today()
+        codes = list(dict.fromkeys(codes))
+
+        with self._state_lock:
+            rebuild = self._state_date != today
+            if rebuild:
+                self._unavailable = set()
+                missing = codes
+            else:
+                missing = [code for code in codes
+                           if code not in self._state and code not in self._unavailable]
+            if not missing and not rebuild:
+                if len(self._state) > len(codes):
+                    self._state.update({}, keep=codes)   # 移除已不在监控列表的股票
+                return 0
+
+            tasks: Dict[Tuple[str, str], Callable] = {
+                ('state', code): partial(self._load_history, code, today) for code in missing
+            }
+            loaded, timed_out = self._fan_out(tasks)
+
+            rows = {}
+            for code in missing:
+                history = loaded.get(('state', code))
+                if history is not None and len(history[0]) > 0:
+                    rows[code] = self._state.build_row(*history)
+                elif ('state', code) not in timed_out:
+                    self._unavailable.add(code)
+                    logger.warning(f"无历史数据，无法构建指标状态: {code}")
+
+            if rebuild:
+                self._state.set(rows)
+                self._state_date = today
+            else:
+                self._state.update(rows, keep=codes)
+            return len(missing)
+
+    @property
+    def cache_stats(self) -> Dict[str, Dict]:
+        """缓存统计，historical 中附带指标状态的规模与逐只加载耗时"""
+        stats = super().cache_stats
+        stats['historical']['state_codes'] = len(self._state)
+        stats['historical']['state_latency'] = self._latency['state'].stats
+        return stats
+
+    def memory_usage(self) -> Dict[str, float]:
+        """
+        指标状态内存占用
+
+        Returns:
+            codes: 股票数量, state_bytes: 状态数组字节数,
+            index_bytes: 代码索引估算字节数, bytes_per_code: 每只股票字节数
+        """
+        state = self._state
+        index_bytes = sys.getsizeof(state._index) + sys.getsizeof(state.codes) \
+            + sum(sys.getsizeof(code) for code in state.codes)
+        total = state.nbytes + index_bytes
+        return {
+            'codes': len(state),
+            'state_bytes': state.nbytes,
+            'index_bytes': index_bytes,
+            'bytes_per_code': total / len(state) if len(state) else 0.0,
+        }
+
+    # ========== 批量获取 ==========
+
+    def fetch_stock_data_batch(self, codes: List[str]) -> Dict[str, StockData]:
+        """
+        批量获取股票数据（一次行情快照 + 增量指标 + 全市场资金流向）
+
+        Args:
+            codes: 股票代码列表
+
+        Returns:
+            Dict[str, StockData]: 股票代码到数据的映射
+        """
+        batch_start = perf_counter()
+        codes = list(dict.fromkeys(codes))
+        self.prepare(codes)
+
+        quote_start = perf_counter()
+        quotes = self.fetch_realtime_quotes_batch(codes)
+        self._latency['quote'].record(perf_counter() - quote_start)
+
+        # 与逐只获取一致：历史（含当日）不足 MA60 周期的股票不输出
+        min_bars = max(self._state.ma_periods) - 1
+        ready = [code for code in codes if code in quotes and code in self._state]
+        if ready:
+            bars = self._state.column('n_bars')[self._state.rows(ready)]
+            ready = [code for code, n in zip(ready, bars) if n >= min_bars]
+        if not ready:
+            self._latency['batch'].record(perf_counter() - batch_start)
+            return {}
+
+        flows = self._fund_flows_from_store(ready)
+        if self.recorder is not None:
+            self.recorder.record_fund_flows(flows)
+
+        prices = np.array([quotes[code]['current_price'] for code in ready], dtype=np.float64)
+        volumes = np.array([quotes[code]['volume'] for code in ready], dtype=np.float64)
+        indicators = self._state.compute(self._state.rows(ready), prices, volumes)
+        columns = {name: values.tolist() for name, values in indicators.items()}
+
+        now = datetime.now()
+        results = {}
+        for i, code in enumerate(ready):
+            quote = quotes[code]
+            fund_flow = flows.get(code) or self._fund_flow_cache.get(code)
+            if fund_flow is not None:
+                self._fund_flow_cache[code] = fund_flow
+            stock_data = StockData(
+                code=code,
+                name=quote['name'],
+                current_price=quote['current_price'],
+                change_pct=quote['change_pct'],
+                volume=quote['volume'],
+                turnover=quote['turnover'],
+                ma5=columns['ma5'][i],
+                ma10=columns['ma10'][i],
+                ma20=columns['ma20'][i],
+                ma60=columns['ma60'][i],
+                rsi=columns['rsi'][i],
+                volume_ratio=columns['volume_ratio'][i],
+                ma20_slope=columns['ma20_slope'][i],
+                main_fund_flow=fund_flow.main_net_inflow if fund_flow else 0.0,
+                fund_flow_5d=fund_flow.main_net_inflow_5d if fund_flow else 0.0,
+                updated_at=now,
+            )
+            results[code] = stock_data
+            self._cache[code] = stock_data
+
+        self._last_update = now
+        self._latency['batch'].record(perf_counter() - batch_start)
+        logger.info(f"大容量批量获取完成: {len(results)}/{len(codes)} 只股票")
+        return results
@@ -59,6 +59,16 @@ class MonitorConfig:
     refresh_interval: int = 30           # 正常刷新间隔（秒）
     retry_interval: int = 60             # 重试间隔（秒）
     
+    # 并发获取
+    fetch_max_workers: int = 8           # 历史数据/资金流向并发线程数
+    fetch_call_timeout: float = 8.0      # 单次接口调用超时（秒）
+    
+    # 大容量监控模式（行情快照 + 本地历史增量指标 + 全市场资金流向）
+    bulk_mode: bool = False              # 是否使用大容量数据获取器
+    
+    # 行情录制（供离线回放，见 replay.py）
+    record_ticks: bool = False           # 是否录制收到的行情数据
+    
     # 交易时间
     trading_hours: List[Tuple[time, time]] = field(default_factory=lambda: [
         (time(9, 30), time(11, 30)),      # 上午交易时段
@@ -77,3 +87,4 @@ class MonitorConfig:
 # 全局配置实例
 V114G_STRATEGY_PARAMS = V114GStrategyParams()
 MONITOR_CONFIG = MonitorConfig()
+BULK_MONITOR_CONFIG = MonitorConfig(max_watchlist_size=500, bulk_mode=True)
@@ -7,23 +7,32 @@ Requirements: 5.1, 5.2, 7.1, 7.2
 Performance Optimizations (Task 10.2):
 - 数据缓存机制：避免重复获取相同数据
 - 批量数据获取：减少API调用次数
-- 缓存过期管理：自动清理过期缓存
+- 缓存过期管理：O(1) TTL + LRU 缓存，按命名空间（行情/历史/资金流向）限制容量，后台定期清理过期条目
 - 历史数据缓存：减少历史数据重复获取
+- 并发获取：历史数据与资金流向有界并发获取，单次调用超时后返回部分结果
 """
 
 import logging
+import math
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, time, date, timedelta
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, field
-from threading import Lock
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field, replace
+from collections import OrderedDict
+from threading import Lock, Thread
+from time import monotonic, perf_counter, sleep
 import hashlib
+import weakref
 
 import pandas as pd
 import numpy as np
 
+from core.fund_flow import FundFlowStore, get_fund_flow_store
 from .config import MONITOR_CONFIG, V114G_STRATEGY_PARAMS
 from .models import StockData
 from .indicators import TechIndicators
+from .tick_recorder import TickRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -39,8 +48,14 @@ class CacheConfig:
     historical_cache_ttl: int = 3600  # 1小时
     # 资金流向缓存过期时间（秒）
     fund_flow_cache_ttl: int = 300  # 5分钟
-    # 最大缓存条目数
+    # 最大缓存条目数（未指定命名空间上限时使用）
     max_cache_entries: int = 100
+    # 各命名空间最大条目数（覆盖大容量监控的 500 只股票）
+    realtime_max_entries: int = 600
+    historical_max_entries: int = 600
+    fund_flow_max_entries: int = 600
+    # 后台过期清理间隔（秒），<= 0 时不启用
+    sweep_interval: float = 60.0
 
 
 CACHE_CONFIG = CacheConfig()
@@ -52,26 +67,98 @@ class CacheEntry:
     data: any
     timestamp: datetime
     ttl: int  # 过期时间（秒）
+    expires_at: float = 0.0  # 过期时刻（monotonic），默认由 timestamp + ttl 推算
     
-    def is_expired(self) -> bool:
+    def __post_init__(self):
+        if not self.expires_at:
+            age = (datetime.now() - self.timestamp).total_seconds()
+            self.expires_at = monotonic() + self.ttl - age
+    
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """检查缓存是否过期"""
-        elapsed = (datetime.now() - self.timestamp).total_seconds()
-        return elapsed >= self.ttl
+        return (now if now is not None else monotonic()) >= self.expires_at
+
+
+class _CacheSweeper:
+    """后台过期清理线程，定期清理所有注册缓存中的过期条目"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._caches: "weakref.WeakSet[DataCache]" = weakref.WeakSet()
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+    
+    def register(self, cache: 'DataCache') -> None:
+        with self._lock:
+            self._caches.add(cache)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name='realtime-cache-sweep', daemon=True)
+                self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            sleep(self.interval)
+            with self._lock:
+                caches = list(self._caches)
+            for cache in caches:
+                try:
+                    cache.sweep()
+                except Exception as e:
+                    logger.debug(f"缓存过期清理失败: {e}")
+
+
+# 按清理间隔共享的后台清理线程
+_cache_sweepers: Dict[float, _CacheSweeper] = {}
+_cache_sweepers_lock = Lock()
+
+
+def _get_cache_sweeper(interval: float) -> _CacheSweeper:
+    """获取指定间隔的后台清理线程（首次使用时创建）"""
+    with _cache_sweepers_lock:
+        sweeper = _cache_sweepers.get(interval)
+        if sweeper is None:
+            sweeper = _cache_sweepers[interval] = _CacheSweeper(interval)
+        return sweeper
 
 
 class DataCache:
     """
     数据缓存管理器
     
-    提供线程安全的缓存操作，支持TTL过期机制。
+    基于 OrderedDict 的 TTL + LRU 缓存，提供线程安全的缓存操作：
+    - get/set/delete/淘汰均为 O(1)：命中时移到末尾，超出上限时淘汰最久未使用的条目
+    - 读取时惰性检查过期，另有后台线程定期清理过期条目
+    - 统计命中率、淘汰数与过期数
     """
     
-    def __init__(self, config: CacheConfig = None):
+    def __init__(self,
+                 config: CacheConfig = None,
+                 max_entries: Optional[int] = None,
+                 default_ttl: Optional[int] = None,
+                 name: str = ''):
+        """
+        Args:
+            config: 缓存配置，默认使用CACHE_CONFIG
+            max_entries: 最大条目数，默认 config.max_cache_entries
+            default_ttl: 默认过期时间（秒），默认 config.realtime_cache_ttl
+            name: 命名空间名称（用于统计与日志）
+        """
         self.config = config or CACHE_CONFIG
-        self._cache: Dict[str, CacheEntry] = {}
+        self.name = name
+        self.max_entries = max_entries or self.config.max_cache_entries
+        self.default_ttl = default_ttl or self.config.realtime_cache_ttl
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self._lock = Lock()
         self._hit_count = 0
         self._miss_count = 0
+        self._eviction_count = 0
+        self._expired_count = 0
+        
+        if self.config.sweep_interval > 0:
+            _get_cache_sweeper(self.config.sweep_interval).register(self)
+    
+    def __len__(self) -> int:
+        return len(self._cache)
     
     def get(self, key: str) -> Optional[any]:
         """
@@ -91,9 +178,11 @@ class DataCache:
             
             if entry.is_expired():
                 del self._cache[key]
+                self._expired_count += 1
                 self._miss_count += 1
                 return None
             
+            self._cache.move_to_end(key)
             self._hit_count += 1
             return entry.data
     
@@ -104,18 +193,18 @@ class DataCache:
         Args:
             key: 缓存键
             data: 缓存数据
-            ttl: 过期时间（秒），默认使用实时数据TTL
+            ttl: 过期时间（秒），默认使用 default_ttl
         """
+        ttl = ttl or self.default_ttl
+        entry = CacheEntry(data=data, timestamp=datetime.now(), ttl=ttl, expires_at=monotonic() + ttl)
         with self._lock:
-            # 检查缓存大小限制
-            if len(self._cache) >= self.config.max_cache_entries:
-                self._evict_expired()
-            
-            self._cache[key] = CacheEntry(
-                data=data,
-                timestamp=datetime.now(),
-                ttl=ttl or self.config.realtime_cache_ttl
-            )
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            
+            # 超出上限时淘汰最久未使用的条目
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self._eviction_count += 1
     
     def delete(self, key: str) -> bool:
         """
@@ -128,10 +217,7 @@ class DataCache:
             是否删除成功
         """
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+            return self._cache.pop(key, None) is not None
     
     def clear(self) -> None:
         """清空所有缓存"""
@@ -139,23 +225,23 @@ class DataCache:
             self._cache.clear()
             self._hit_count = 0
             self._miss_count = 0
+            self._eviction_count = 0
+            self._expired_count = 0
     
-    def _evict_expired(self) -> None:
-        """清理过期缓存"""
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if entry.is_expired()
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-        
-        # 如果仍然超过限制，删除最旧的条目
-        if len(self._cache) >= self.config.max_cache_entries:
-            oldest_key = min(
-                self._cache.keys(),
-                key=lambda k: self._cache[k].timestamp
-            )
-            del self._cache[oldest_key]
+    def sweep(self) -> int:
+        """
+        清理过期条目（由后台线程定期调用）
+        
+        Returns:
+            清理的条目数
+        """
+        now = monotonic()
+        with self._lock:
+            expired_keys = [key for key, entry in self._cache.items() if entry.is_expired(now)]
+            for key in expired_keys:
+                del self._cache[key]
+            self._expired_count += len(expired_keys)
+        return len(expired_keys)
     
     @property
     def stats(self) -> Dict[str, any]:
@@ -165,9 +251,62 @@ class DataCache:
             hit_rate = self._hit_count / total if total > 0 else 0
             return {
                 'size': len(self._cache),
+                'max_entries': self.max_entries,
                 'hit_count': self._hit_count,
                 'miss_count': self._miss_count,
                 'hit_rate': hit_rate,
+                'evictions': self._eviction_count,
+                'expirations': self._expired_count,
+            }
+
+
+class LatencyStats:
+    """
+    阶段耗时统计
+    
+    线程安全，记录调用次数、最近/平均/最大耗时与超时次数。
+    """
+    
+    def __init__(self):
+        self._lock = Lock()
+        self._count = 0
+        self._total = 0.0
+        self._last = 0.0
+        self._max = 0.0
+        self._timeouts = 0
+    
+    def record(self, seconds: float) -> None:
+        """记录一次调用耗时（秒）"""
+        with self._lock:
+            self._count += 1
+            self._total += seconds
+            self._last = seconds
+            self._max = max(self._max, seconds)
+    
+    def record_timeout(self) -> None:
+        """记录一次超时"""
+        with self._lock:
+            self._timeouts += 1
+    
+    def reset(self) -> None:
+        """重置统计"""
+        with self._lock:
+            self._count = 0
+            self._total = 0.0
+            self._last = 0.0
+            self._max = 0.0
+            self._timeouts = 0
+    
+    @property
+    def stats(self) -> Dict[str, any]:
+        """获取耗时统计（毫秒）"""
+        with self._lock:
+            return {
+                'count': self._count,
+                'last_ms': self._last * 1000,
+                'avg_ms': self._total / self._count * 1000 if self._count > 0 else 0.0,
+                'max_ms': self._max * 1000,
+                'timeouts': self._timeouts,
             }
 
 
@@ -220,24 +359,35 @@ class DataFetcher:
     - 使用DataCache进行数据缓存
     - 批量获取减少API调用
     - 历史数据缓存避免重复计算
+    - 历史数据与资金流向通过共享线程池有界并发获取
+    - 资金流向优先读取全市场资金流向库（一次请求覆盖全市场）
     
     Requirements: 5.1, 5.2, 7.1, 7.2
     """
     
-    def __init__(self, config: Optional[MONITOR_CONFIG.__class__] = None):
+    def __init__(self, config: Optional[MONITOR_CONFIG.__class__] = None,
+                 fund_flow_store: Optional[FundFlowStore] = None):
         """
         初始化数据获取器
         
         Args:
             config: 监控配置，默认使用MONITOR_CONFIG
+            fund_flow_store: 资金流向库，默认使用全局共享实例
         """
         self.config = config or MONITOR_CONFIG
+        self._fund_flow_store = fund_flow_store
         self._last_update: Optional[datetime] = None
         
         # 使用新的缓存系统
-        self._realtime_cache = DataCache()
-        self._historical_cache = DataCache()
-        self._fund_flow_cache_obj = DataCache()
+        self._realtime_cache = DataCache(
+            max_entries=CACHE_CONFIG.realtime_max_entries,
+            default_ttl=CACHE_CONFIG.realtime_cache_ttl, name='quote')
+        self._historical_cache = DataCache(
+            max_entries=CACHE_CONFIG.historical_max_entries,
+            default_ttl=CACHE_CONFIG.historical_cache_ttl, name='hist')
+        self._fund_flow_cache_obj = DataCache(
+            max_entries=CACHE_CONFIG.fund_flow_max_entries,
+            default_ttl=CACHE_CONFIG.fund_flow_cache_ttl, name='fundflow')
         
         # 保留旧的缓存字典以保持向后兼容
         self._cache: Dict[str, StockData] = {}
@@ -247,6 +397,22 @@ class DataFetcher:
         self._batch_quote_cache: Optional[pd.DataFrame] = None
         self._batch_quote_timestamp: Optional[datetime] = None
         self._batch_quote_ttl: int = 10  # 批量行情缓存10秒
+        self._batch_quote_index: Dict[str, int] = {}  # 代码 -> 行号
+        
+        # 并发获取线程池（懒加载，跨刷新复用）
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = Lock()
+        
+        # 分阶段耗时统计
+        self._latency: Dict[str, LatencyStats] = {
+            'quote': LatencyStats(),
+            'historical': LatencyStats(),
+            'fund_flow': LatencyStats(),
+            'batch': LatencyStats(),
+        }
+        
+        # 行情录制（可选）：收到的行情快照、历史数据与资金流向写入录制文件
+        self.recorder: Optional[TickRecorder] = None
     
     @property
     def last_update(self) -> Optional[datetime]:
@@ -255,11 +421,26 @@ class DataFetcher:
     
     @property
     def cache_stats(self) -> Dict[str, Dict]:
-        """获取缓存统计信息"""
+        """
+        获取缓存统计信息
+        
+        每个缓存附带对应获取阶段的耗时统计（latency），
+        批量获取整体耗时见 realtime['batch_latency']。
+        """
         return {
-            'realtime': self._realtime_cache.stats,
-            'historical': self._historical_cache.stats,
-            'fund_flow': self._fund_flow_cache_obj.stats,
+            'realtime': {
+                **self._realtime_cache.stats,
+                'latency': self._latency['quote'].stats,
+                'batch_latency': self._latency['batch'].stats,
+            },
+            'historical': {
+                **self._historical_cache.stats,
+                'latency': self._latency['historical'].stats,
+            },
+            'fund_flow': {
+                **self._fund_flow_cache_obj.stats,
+                'latency': self._latency['fund_flow'].stats,
+            },
         }
     
     # ==================== 市场状态检测 ====================
@@ -445,11 +626,17 @@ class DataFetcher:
                     logger.warning("获取实时行情失败: 返回数据为空")
                     return results
                 
-                # 更新批量缓存
+                # 更新批量缓存，按代码建立行号索引（重复代码保留第一行）
+                index: Dict[str, int] = {}
+                for position, stock_code in enumerate(df['代码'].astype(str)):
+                    index.setdefault(stock_code, position)
                 self._batch_quote_cache = df
+                self._batch_quote_index = index
                 self._batch_quote_timestamp = datetime.now()
                 logger.debug("更新批量行情缓存")
             
+            index = self._batch_quote_index
+            
             # 筛选目标股票
             for code in codes:
                 # 先检查单个缓存
@@ -459,13 +646,13 @@ class DataFetcher:
                     results[code] = cached
                     continue
                 
-                stock_row = df[df['代码'] == code]
+                position = index.get(code)
                 
-                if stock_row.empty:
+                if position is None:
                     logger.warning(f"未找到股票: {code}")
                     continue
                 
-                row = stock_row.iloc[0]
+                row = df.iloc[position]
                 
                 quote_data = {
                     'code': code,
@@ -486,6 +673,8 @@ class DataFetcher:
                 self._realtime_cache.set(cache_key, quote_data, CACHE_CONFIG.realtime_cache_ttl)
             
             self._last_update = datetime.now()
+            if self.recorder is not None:
+                self.recorder.record_quotes(results)
             logger.info(f"批量获取实时行情成功: {len(results)}/{len(codes)} 只股票")
             
         except ImportError:
@@ -557,6 +746,8 @@ class DataFetcher:
             # 缓存历史数据（1小时过期）
             self._historical_cache.set(cache_key, df, CACHE_CONFIG.historical_cache_ttl)
             logger.debug(f"缓存历史数据: {code}")
+            if self.recorder is not None:
+                self.recorder.record_history(code, df)
             
             return df
             
@@ -590,14 +781,36 @@ class DataFetcher:
             logger.warning(f"历史数据不足: {code}")
             return None
         
-        # 计算技术指标
-        prices = hist_df['close']
-        volumes = hist_df['volume']
-        
-        indicators = TechIndicators.calculate_all_indicators(prices, volumes)
-        
         # 获取资金流向
         fund_flow = self.fetch_fund_flow(code)
+        
+        return self._build_stock_data(code, quote, hist_df, fund_flow)
+    
+    def _build_stock_data(
+        self,
+        code: str,
+        quote: Dict,
+        hist_df: pd.DataFrame,
+        fund_flow: Optional[FundFlowData],
+        indicators: Optional[Dict[str, float]] = None
+    ) -> StockData:
+        """
+        由实时行情、历史数据和资金流向组装股票数据
+        
+        Args:
+            code: 股票代码
+            quote: 实时行情
+            hist_df: 历史数据（至少 60 条）
+            fund_flow: 资金流向，缺失时按 0 处理
+            indicators: 已批量计算的技术指标，默认由 hist_df 计算
+            
+        Returns:
+            StockData: 股票数据
+        """
+        # 计算技术指标
+        if indicators is None:
+            indicators = TechIndicators.calculate_all_indicators(hist_df['close'], hist_df['volume'])
+        
         main_fund_flow = fund_flow.main_net_inflow if fund_flow else 0.0
         fund_flow_5d = fund_flow.main_net_inflow_5d if fund_flow else 0.0
         
@@ -624,31 +837,207 @@ class DataFetcher:
         """
         批量获取股票数据
         
+        流程：
+        1. 实时行情取自一次全市场批量快照（所有股票共享）
+        2. 历史数据与资金流向在线程池中有界并发获取
+        3. 超时的调用不再等待，返回部分结果：
+           - 资金流向超时：沿用上次的资金流向
+           - 历史数据超时：沿用上次的技术指标，仅更新行情
+        
+        各阶段耗时记录在 cache_stats 中。
+        
         Args:
             codes: 股票代码列表
             
         Returns:
             Dict[str, StockData]: 股票代码到数据的映射
         """
+        batch_start = perf_counter()
+        codes = list(dict.fromkeys(codes))
+        
+        # 1. 共享批量行情快照
+        quote_start = perf_counter()
+        quotes = self.fetch_realtime_quotes_batch(codes)
+        self._latency['quote'].record(perf_counter() - quote_start)
+        
+        quoted_codes = [code for code in codes if code in quotes]
+        
+        # 2. 资金流向优先取自全市场资金流向库，其余与历史数据一起并发获取
+        store_flows = self._fund_flows_from_store(quoted_codes)
+        
+        tasks: Dict[Tuple[str, str], Callable[[], Any]] = {}
+        for code in quoted_codes:
+            tasks[('historical', code)] = partial(self.fetch_historical_data, code)
+            if code not in store_flows:
+                tasks[('fund_flow', code)] = partial(self.fetch_fund_flow, code)
+        fetched, timed_out = self._fan_out(tasks)
+        
+        # 3. 历史数据充足的股票一次批量计算技术指标
+        histories = {code: fetched.get(('historical', code)) for code in quoted_codes}
+        indicators = self._batch_indicators({
+            code: df for code, df in histories.items() if df is not None and len(df) >= 60
+        })
+        
+        # 4. 组装结果
         results = {}
+        partial_codes = []
+        received_flows = {}
         
-        for code in codes:
-            stock_data = self.fetch_stock_data(code)
-            if stock_data:
-                results[code] = stock_data
-                self._cache[code] = stock_data
+        for code in quoted_codes:
+            quote = quotes[code]
+            
+            fund_flow = store_flows.get(code) or fetched.get(('fund_flow', code))
+            if fund_flow is not None:
+                self._fund_flow_cache[code] = fund_flow
+                received_flows[code] = fund_flow
+            elif ('fund_flow', code) in timed_out:
+                fund_flow = self._fund_flow_cache.get(code)
+                partial_codes.append(code)
+            
+            hist_df = histories[code]
+            if code in indicators:
+                stock_data = self._build_stock_data(code, quote, hist_df, fund_flow, indicators[code])
+            elif ('historical', code) in timed_out and code in self._cache:
+                stock_data = self._refresh_cached_stock_data(self._cache[code], quote, fund_flow)
+                partial_codes.append(code)
+            else:
+                logger.warning(f"历史数据不足: {code}")
+                continue
+            
+            results[code] = stock_data
+            self._cache[code] = stock_data
+        
+        if self.recorder is not None:
+            self.recorder.record_fund_flows(received_flows)
         
         self._last_update = datetime.now()
+        self._latency['batch'].record(perf_counter() - batch_start)
+        
+        if timed_out:
+            logger.warning(
+                f"批量获取部分超时: {len(timed_out)} 次调用超时, "
+                f"{len(set(partial_codes))} 只股票使用上次数据"
+            )
         logger.info(f"批量获取股票数据成功: {len(results)}/{len(codes)} 只股票")
         
         return results
     
+    @staticmethod
+    def _batch_indicators(histories: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, float]]:
+        """以 TechIndicators.calculate_batch 一次计算多只股票的技术指标"""
+        if not histories:
+            return {}
+        width = TechIndicators.lookback()
+        closes, lengths = TechIndicators.pad_rows([df['close'] for df in histories.values()], width)
+        volumes, volume_lengths = TechIndicators.pad_rows([df['volume'] for df in histories.values()], width)
+        columns = TechIndicators.calculate_batch(
+            closes, volumes, lengths=lengths, volume_lengths=volume_lengths
+        )
+        columns = {name: values.tolist() for name, values in columns.items()}
+        return {
+            code: {name: values[i] for name, values in columns.items()}
+            for i, code in enumerate(histories)
+        }
+    
+    def _refresh_cached_stock_data(
+        self,
+        cached: StockData,
+        quote: Dict,
+        fund_flow: Optional[FundFlowData]
+    ) -> StockData:
+        """
+        用最新行情更新上次的股票数据（技术指标基于日线，沿用上次结果）
+        """
+        return replace(
+            cached,
+            name=quote['name'],
+            current_price=quote['current_price'],
+            change_pct=quote['change_pct'],
+            volume=quote['volume'],
+            turnover=quote['turnover'],
+            main_fund_flow=fund_flow.main_net_inflow if fund_flow else cached.main_fund_flow,
+            fund_flow_5d=fund_flow.main_net_inflow_5d if fund_flow else cached.fund_flow_5d,
+            updated_at=datetime.now()
+        )
+    
+    # ==================== 并发获取 ====================
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取共享线程池（懒加载）"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.fetch_max_workers,
+                    thread_name_prefix='realtime-fetch'
+                )
+            return self._executor
+    
+    def _timed_call(self, stage: str, func: Callable[[], Any]) -> Any:
+        """执行一次获取调用并记录耗时"""
+        start = perf_counter()
+        try:
+            return func()
+        finally:
+            self._latency[stage].record(perf_counter() - start)
+    
+    def _fan_out(
+        self,
+        tasks: Dict[Tuple[str, str], Callable[[], Any]]
+    ) -> Tuple[Dict[Tuple[str, str], Any], Set[Tuple[str, str]]]:
+        """
+        有界并发执行获取任务
+        
+        等待时间按单次调用超时 × 批次轮数计算，并且不超过刷新间隔。
+        超时的任务不再等待：未开始的直接取消，已开始的在后台完成并写入缓存，
+        供下次刷新使用。
+        
+        Args:
+            tasks: {(阶段, 股票代码): 无参调用}
+            
+        Returns:
+            (完成的结果, 超时的任务键)
+        """
+        if not tasks:
+            return {}, set()
+        
+        executor = self._get_executor()
+        futures = {
+            executor.submit(self._timed_call, key[0], func): key
+            for key, func in tasks.items()
+        }
+        
+        waves = math.ceil(len(tasks) / self.config.fetch_max_workers)
+        budget = min(self.config.fetch_call_timeout * waves, self.config.refresh_interval)
+        done, not_done = wait(futures, timeout=budget)
+        
+        results = {}
+        for future in done:
+            key = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.debug(f"获取失败: {key}, 错误: {e}")
+                continue
+            if result is not None:
+                results[key] = result
+        
+        timed_out = set()
+        for future in not_done:
+            key = futures[future]
+            future.cancel()
+            self._latency[key[0]].record_timeout()
+            timed_out.add(key)
+        
+        return results, timed_out
+    
     # ==================== 主力资金流向 ====================
     
     def fetch_fund_flow(self, code: str) -> Optional[FundFlowData]:
         """
         获取主力资金流向
         
+        Performance Optimization: 使用缓存避免刷新间隔内重复请求
+        
         Requirements: 7.1, 7.2
         
         Args:
@@ -657,6 +1046,15 @@ class DataFetcher:
         Returns:
             FundFlowData: 资金流向数据，失败返回None
         """
+        store_flow = self._fund_flows_from_store([code]).get(code)
+        if store_flow is not None:
+            return store_flow
+        
+        cache_key = f"fund_flow_{code}"
+        cached = self._fund_flow_cache_obj.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             import akshare as ak
             
@@ -677,7 +1075,7 @@ class DataFetcher:
             recent_5d = df.tail(5)
             main_net_5d = recent_5d['主力净流入-净额'].sum() if '主力净流入-净额' in df.columns else 0.0
             
-            return FundFlowData(
+            fund_flow = FundFlowData(
                 code=code,
                 name='',  # 名称从其他接口获取
                 main_net_inflow=float(latest.get('主力净流入-净额', 0)) / 10000,  # 转换为万元
@@ -685,6 +1083,9 @@ class DataFetcher:
                 updated_at=datetime.now()
             )
             
+            self._fund_flow_cache_obj.set(cache_key, fund_flow, CACHE_CONFIG.fund_flow_cache_ttl)
+            return fund_flow
+            
         except ImportError:
             logger.error("AkShare 未安装，无法获取资金流向")
             return None
@@ -706,16 +1107,46 @@ class DataFetcher:
         """
         results = {}
         
+        codes = list(dict.fromkeys(codes))
+        store_flows = self._fund_flows_from_store(codes)
+        fetched, timed_out = self._fan_out({
+            ('fund_flow', code): partial(self.fetch_fund_flow, code)
+            for code in codes if code not in store_flows
+        })
+        
         for code in codes:
-            fund_flow = self.fetch_fund_flow(code)
+            fund_flow = store_flows.get(code) or fetched.get(('fund_flow', code))
             if fund_flow:
                 results[code] = fund_flow
                 self._fund_flow_cache[code] = fund_flow
         
+        if timed_out:
+            logger.warning(f"批量获取资金流向部分超时: {len(timed_out)} 只股票")
         logger.info(f"批量获取资金流向成功: {len(results)}/{len(codes)} 只股票")
         
         return results
     
+    def _fund_flows_from_store(self, codes: List[str]) -> Dict[str, FundFlowData]:
+        """
+        从全市场资金流向库读取资金流向（纯内存）
+        
+        快照过期时在后台刷新，本次继续使用旧快照；
+        库中没有的股票由调用方逐只获取。
+        """
+        store = self._fund_flow_store if self._fund_flow_store is not None else get_fund_flow_store()
+        store.refresh_if_stale(background=True)
+        
+        return {
+            code: FundFlowData(
+                code=code,
+                name=record.name,
+                main_net_inflow=record.main_net_inflow / 10000,  # 转换为万元
+                main_net_inflow_5d=record.main_net_inflow_5d / 10000,
+                updated_at=store.updated_at or datetime.now()
+            )
+            for code, record in store.get_many(codes).items()
+        }
+    
     # ==================== 缓存管理 ====================
     
     def get_cached_data(self, code: str) -> Optional[StockData]:
@@ -750,8 +1181,11 @@ class DataFetcher:
         self._historical_cache.clear()
         self._fund_flow_cache_obj.clear()
         self._batch_quote_cache = None
+        self._batch_quote_index = {}
         self._batch_quote_timestamp = None
         self._last_update = None
+        for latency in self._latency.values():
+            latency.reset()
         logger.info("数据缓存已清空")
     
     def should_refresh(self) -> bool:
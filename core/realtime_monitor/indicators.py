@@ -2,12 +2,15 @@
 Technical Indicators Module
 
 技术指标计算模块，提供MA、RSI、量比、斜率等指标计算函数。
+
+calculate_batch 以 股票 × 回看天数 的二维数组一次计算全部股票的策略指标（纯 NumPy），
+calculate_all_indicators 为其单只股票的包装。
 Requirements: 8.1
 """
 
 import pandas as pd
 import numpy as np
-from typing import Optional, Union
+from typing import Dict, Optional, Sequence, Tuple, Union
 
 from .config import V114G_STRATEGY_PARAMS
 
@@ -192,6 +195,8 @@ class TechIndicators:
         """
         计算所有v11.4g策略所需的技术指标
         
+        单只股票的 calculate_batch 包装。
+        
         Args:
             prices: 价格序列
             volumes: 成交量序列
@@ -200,33 +205,146 @@ class TechIndicators:
         Returns:
             dict: 包含所有指标的字典
         """
+        closes = np.asarray(prices, dtype=np.float64).reshape(1, -1)
+        vols = np.asarray(volumes, dtype=np.float64).reshape(1, -1)
+        result = TechIndicators.calculate_batch(
+            closes, vols, params,
+            lengths=np.array([closes.shape[1]]), volume_lengths=np.array([vols.shape[1]]),
+        )
+        return {name: float(values[0]) for name, values in result.items()}
+    
+    # ==================== 批量计算 ====================
+    
+    @staticmethod
+    def lookback(params: Optional[object] = None) -> int:
+        """批量计算需要的回看天数（更早的数据不影响结果）"""
         if params is None:
             params = V114G_STRATEGY_PARAMS
+        return max(
+            params.MA60_PERIOD, params.MA20_PERIOD + params.MA_SLOPE_PERIOD,
+            params.RSI_PERIOD + 1, params.VOLUME_RATIO_PERIOD + 1,
+        )
+    
+    @staticmethod
+    def pad_rows(sequences: Sequence, width: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        将多条序列右对齐堆叠为二维数组（较短的序列左侧以 NaN 填充）
         
-        # 计算各周期MA
-        ma5 = TechIndicators.calculate_ma_value(prices, params.MA5_PERIOD)
-        ma10 = TechIndicators.calculate_ma_value(prices, params.MA10_PERIOD)
-        ma20 = TechIndicators.calculate_ma_value(prices, params.MA20_PERIOD)
-        ma60 = TechIndicators.calculate_ma_value(prices, params.MA60_PERIOD)
-        
-        # 计算RSI
-        rsi = TechIndicators.calculate_rsi_value(prices, params.RSI_PERIOD)
+        Args:
+            sequences: 序列列表（Series / 数组）
+            width: 只保留每条序列的最后 width 个值，默认保留全部
+            
+        Returns:
+            (二维数组, 每行的真实长度)
+        """
+        rows = [np.asarray(seq, dtype=np.float64) for seq in sequences]
+        if width is not None:
+            rows = [row[len(row) - min(len(row), width):] for row in rows]
+        lengths = np.array([len(row) for row in rows], dtype=np.intp)
+        matrix = np.full((len(rows), int(lengths.max()) if len(rows) else 0), np.nan)
+        for i, row in enumerate(rows):
+            if len(row):
+                matrix[i, matrix.shape[1] - len(row):] = row
+        return matrix, lengths
+    
+    @staticmethod
+    def calculate_batch(
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        params: Optional[object] = None,
+        lengths: Optional[np.ndarray] = None,
+        volume_lengths: Optional[np.ndarray] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        批量计算v11.4g策略指标（一次 NumPy 计算，不创建 pandas 对象）
         
-        # 计算量比
-        volume_ratio = TechIndicators.calculate_volume_ratio(volumes, params.VOLUME_RATIO_PERIOD)
+        口径与逐只计算一致：
+        - MA: 最近 N 日均值（忽略缺失值），数据不足为 NaN
+        - RSI: 最近 N 日平均涨跌幅，数据不足或无涨跌时为 50
+        - 量比: 当日量 / 前 N 日均量，数据不足或均量非正时为 1
+        - MA20斜率: 当前 MA20 相对 N-1 日前 MA20 的百分比变化，数据不足或无效时为 0
         
-        # 计算MA20斜率
-        ma20_slope = TechIndicators.calculate_ma_slope_from_prices(
-            prices, params.MA20_PERIOD, params.MA_SLOPE_PERIOD
+        Args:
+            closes: 收盘价，股票 × 回看天数，按日期升序右对齐（最后一列为最新）
+            volumes: 成交量，形状同上
+            params: 策略参数，默认使用V114G_STRATEGY_PARAMS
+            lengths: 每行收盘价的真实长度，默认按左侧 NaN 填充推断
+            volume_lengths: 每行成交量的真实长度，默认按左侧 NaN 填充推断
+            
+        Returns:
+            {指标名: 数组}，键与 calculate_all_indicators 相同
+        """
+        if params is None:
+            params = V114G_STRATEGY_PARAMS
+        closes = np.asarray(closes, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        if lengths is None:
+            lengths = TechIndicators._padded_lengths(closes)
+        if volume_lengths is None:
+            volume_lengths = TechIndicators._padded_lengths(volumes)
+        
+        result = {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # 均线
+            for period, name in zip(
+                (params.MA5_PERIOD, params.MA10_PERIOD, params.MA20_PERIOD, params.MA60_PERIOD),
+                ('ma5', 'ma10', 'ma20', 'ma60'),
+            ):
+                ma = TechIndicators._nanmean(TechIndicators._tail(closes, period))
+                result[name] = np.where(lengths >= period, ma, np.nan)
+            
+            # RSI（缺失的涨跌按 0 计）
+            period = params.RSI_PERIOD
+            delta = np.diff(TechIndicators._tail(closes, period + 1), axis=1)
+            avg_gain = TechIndicators._mean(np.where(delta > 0, delta, 0.0))
+            avg_loss = TechIndicators._mean(np.where(delta < 0, -delta, 0.0))
+            rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+            result['rsi'] = np.where((lengths >= period + 1) & np.isfinite(rsi), rsi, 50.0)
+            
+            # 量比
+            period = params.VOLUME_RATIO_PERIOD
+            window = TechIndicators._tail(volumes, period + 1)
+            avg_volume = TechIndicators._nanmean(window[:, :-1])
+            current_volume = window[:, -1] if window.shape[1] else np.full(len(volumes), np.nan)
+            valid = (volume_lengths >= period + 1) & (avg_volume > 0)
+            result['volume_ratio'] = np.where(valid, current_volume / avg_volume, 1.0)
+            
+            # MA20斜率（窗口内有缺失值时 MA 为 NaN，斜率为 0）
+            ma_period, days = params.MA20_PERIOD, params.MA_SLOPE_PERIOD
+            window = TechIndicators._tail(closes, ma_period + days - 1)
+            current_ma = TechIndicators._mean(TechIndicators._tail(window, ma_period))
+            past_ma = TechIndicators._mean(window[:, :ma_period])
+            slope = (current_ma - past_ma) / past_ma * 100
+            valid = (lengths >= ma_period + days) & (past_ma > 0) & np.isfinite(slope)
+            result['ma20_slope'] = np.where(valid, slope, 0.0)
+        
+        result['current_price'] = np.where(
+            lengths > 0, closes[:, -1] if closes.shape[1] else np.nan, np.nan
         )
-        
-        return {
-            'ma5': ma5,
-            'ma10': ma10,
-            'ma20': ma20,
-            'ma60': ma60,
-            'rsi': rsi,
-            'volume_ratio': volume_ratio,
-            'ma20_slope': ma20_slope,
-            'current_price': prices.iloc[-1] if len(prices) > 0 else np.nan,
-        }
+        return result
+    
+    @staticmethod
+    def _padded_lengths(values: np.ndarray) -> np.ndarray:
+        """每行去掉左侧 NaN 填充后的长度"""
+        if values.shape[1] == 0:
+            return np.zeros(len(values), dtype=np.int64)
+        valid = ~np.isnan(values)
+        return np.where(valid.any(axis=1), values.shape[1] - valid.argmax(axis=1), 0)
+    
+    @staticmethod
+    def _tail(values: np.ndarray, n: int) -> np.ndarray:
+        """每行最后 n 列"""
+        return values[:, max(values.shape[1] - n, 0):]
+    
+    @staticmethod
+    def _mean(values: np.ndarray) -> np.ndarray:
+        """按行求均值（回看窗口为空时为 NaN，不产生 Mean of empty slice 警告）"""
+        if values.shape[1] == 0:
+            return np.full(len(values), np.nan)
+        return values.mean(axis=1)
+    
+    @staticmethod
+    def _nanmean(values: np.ndarray) -> np.ndarray:
+        """按行忽略 NaN 求均值（全为 NaN 时为 NaN）"""
+        count = (~np.isnan(values)).sum(axis=1)
+        return np.nansum(values, axis=1) / np.where(count > 0, count, np.nan)
@@ -0,0 +1,322 @@
+"""
+Replay Module
+
+行情回放模块，将 TickRecorder 录制的交易时段离线回放到 SignalEngine 与 RealtimeMonitor，
+用于复现盘中信号、确定性的性能基准与整条盘中链路的离线耗时分析。
+
+回放速度：
+- speed=None: 不等待，尽快回放
+- speed=1.0: 按录制时的时间间隔回放（1×）
+- speed=N: N 倍速回放
+
+每个行情快照为一个回放节拍（ReplayTick），其 recorded_at 为录制时刻。
+传入 TechReplayContext 时，每个节拍还以录制日线 + 当日行情合成的日K调用
+TechSignalGenerator.generate_signals，current_time 为录制时刻，使依赖时段的量能预估可复现。
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from time import monotonic, perf_counter, sleep
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .config import MONITOR_CONFIG
+from .data_fetcher import DataFetcher, FundFlowData, LatencyStats, MarketStatus
+from .models import BuySignal, SellSignal, StockData
+from .monitor import RealtimeMonitor
+from .signal_engine import SignalEngine
+from .signal_tracker import SignalTracker, SignalTransition
+from .tick_recorder import KIND_FUND_FLOW, KIND_HISTORY, KIND_QUOTES, TickChunk, read_ticks
+
+if TYPE_CHECKING:
+    from core.tech_stock.hard_filter import HardFilterResult
+    from core.tech_stock.market_filter import MarketStatus as TechMarketStatus
+    from core.tech_stock.sector_ranker import SectorRank
+    from core.tech_stock.signal_generator import TechBuySignal, TechSignalGenerator
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== 回放数据获取器 ====================
+
+class ReplayDataFetcher(DataFetcher):
+    """
+    回放数据获取器
+
+    行情、历史数据与资金流向全部取自录制内容，不访问网络；
+    市场状态按回放时钟（录制时刻）判断。
+    """
+
+    def __init__(self, config: Optional[MONITOR_CONFIG.__class__] = None):
+        super().__init__(config)
+        self.clock: Optional[datetime] = None
+        self._quotes: Dict[str, Dict] = {}
+        self._histories: Dict[str, pd.DataFrame] = {}
+        self._flows: Dict[str, FundFlowData] = {}
+
+    def apply(self, chunk: TickChunk) -> None:
+        """应用一个录制数据块"""
+        self.clock = chunk.recorded_at
+        if chunk.kind == KIND_QUOTES:
+            self._quotes = {row['code']: row for row in chunk.rows()}
+        elif chunk.kind == KIND_HISTORY:
+            self._histories[chunk.code] = chunk.to_frame()
+        elif chunk.kind == KIND_FUND_FLOW:
+            for row in chunk.rows():
+                self._flows[row['code']] = FundFlowData(
+                    code=row['code'],
+                    name=row['name'],
+                    main_net_inflow=row['main_net_inflow'],
+                    main_net_inflow_5d=row['main_net_inflow_5d'],
+                    updated_at=self.clock,
+                )
+
+    @property
+    def quoted_codes(self) -> List[str]:
+        """当前快照中的股票代码"""
+        return list(self._quotes)
+
+    def daily_frames(self, codes: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        录制日线 + 当日行情合成的日K（当日K线以当前价为收盘价、累计成交量为成交量）
+
+        Args:
+            codes: 股票代码列表
+
+        Returns:
+            {code: 按日期升序的日线}，缺少录制日线或当前行情的股票不在结果中
+        """
+        today = pd.Timestamp(self.clock.date())
+        frames = {}
+        for code in codes:
+            history, quote = self._histories.get(code), self._quotes.get(code)
+            if history is None or quote is None:
+                continue
+            bar = pd.DataFrame({
+                'date': [today],
+                'open': [quote['open']],
+                'close': [quote['current_price']],
+                'high': [quote['high']],
+                'low': [quote['low']],
+                'volume': [quote['volume']],
+            })
+            frames[code] = pd.concat([history[history['date'] < today], bar], ignore_index=True)
+        return frames
+
+    def fetch_realtime_quotes_batch(self, codes: List[str]) -> Dict[str, Dict]:
+        self._last_update = self.clock
+        return {code: dict(self._quotes[code]) for code in codes if code in self._quotes}
+
+    def fetch_historical_data(self, code: str, days: int = 100) -> Optional[pd.DataFrame]:
+        return self._histories.get(code)
+
+    def fetch_fund_flow(self, code: str) -> Optional[FundFlowData]:
+        return self._flows.get(code)
+
+    def _fund_flows_from_store(self, codes: List[str]) -> Dict[str, FundFlowData]:
+        return {code: self._flows[code] for code in codes if code in self._flows}
+
+    def get_market_status(self, check_time: Optional[datetime] = None) -> MarketStatus:
+        return super().get_market_status(check_time if check_time is not None else self.clock)
+
+
+# ==================== 回放驱动 ====================
+
+@dataclass
+class TechReplayContext:
+    """
+    科技股信号回放上下文
+
+    大盘红绿灯、行业排名与硬性筛选为盘前结果，回放期间保持不变。
+    基本面条件仍由 generator 查询，离线回放可传入覆写 _check_fundamental_condition 的子类。
+
+    Attributes:
+        generator: 科技股信号生成器
+        market_status: 大盘红绿灯状态
+        sector_rankings: 行业排名
+        hard_filter_results: 硬性筛选结果
+    """
+    generator: 'TechSignalGenerator'
+    market_status: 'TechMarketStatus'
+    sector_rankings: List['SectorRank']
+    hard_filter_results: List['HardFilterResult']
+
+
+@dataclass
+class ReplayTick:
+    """
+    一个回放节拍（一次行情快照）
+
+    Attributes:
+        recorded_at: 录制时刻
+        stock_data: 本节拍的股票数据
+        buy_signals: 买入信号
+        sell_signals: 卖出信号
+        transitions: 信号状态迁移
+        tech_signals: 科技股买入信号（设置 TechReplayContext 时）
+        latency: 本节拍处理耗时（秒）
+    """
+    recorded_at: datetime
+    stock_data: Dict[str, StockData]
+    buy_signals: List[BuySignal] = field(default_factory=list)
+    sell_signals: List[SellSignal] = field(default_factory=list)
+    transitions: List[SignalTransition] = field(default_factory=list)
+    tech_signals: List['TechBuySignal'] = field(default_factory=list)
+    latency: float = 0.0
+
+
+@dataclass
+class ReplayReport:
+    """
+    回放结果汇总
+
+    Attributes:
+        ticks: 回放节拍数
+        buy_signals: 买入信号总数
+        sell_signals: 卖出信号总数
+        tech_signals: 科技股买入信号总数
+        events: 信号状态迁移 (录制时刻, 买/卖, 迁移类型, 股票代码)，用于比较两次回放
+        recorded_seconds: 录制时段跨度（秒）
+        wall_seconds: 回放实际耗时（秒）
+        latency: 各阶段耗时统计（fetch / signals / tech / tick）
+    """
+    ticks: int = 0
+    buy_signals: int = 0
+    sell_signals: int = 0
+    tech_signals: int = 0
+    events: List[tuple] = field(default_factory=list)
+    recorded_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    latency: Dict[str, Dict] = field(default_factory=dict)
+
+
+class ReplayDriver:
+    """
+    回放驱动
+
+    使用示例:
+        driver = ReplayDriver('data/realtime_ticks/20240105.ticks', monitor=monitor)
+        report = driver.run()                      # 尽快回放
+        report = ReplayDriver(path, speed=1.0).run(on_tick=print)   # 按录制节奏回放
+    """
+
+    def __init__(self,
+                 path: Path,
+                 monitor: Optional[RealtimeMonitor] = None,
+                 signal_engine: Optional[SignalEngine] = None,
+                 speed: Optional[float] = None,
+                 fetcher: Optional[ReplayDataFetcher] = None,
+                 tech_context: Optional[TechReplayContext] = None):
+        """
+        Args:
+            path: 录制文件路径
+            monitor: 监控器（监控列表与持仓），默认新建；监控列表为空时评估快照中的全部股票
+            signal_engine: 信号引擎，默认新建
+            speed: 回放倍速，None 表示尽快回放
+            fetcher: 回放数据获取器，默认新建
+            tech_context: 科技股信号回放上下文，None 表示不回放 TechSignalGenerator
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError(f"回放倍速必须大于0: {speed}")
+        self.path = Path(path)
+        self.monitor = monitor if monitor is not None else RealtimeMonitor()
+        self.signal_engine = signal_engine if signal_engine is not None else SignalEngine()
+        self.speed = speed
+        self.fetcher = fetcher if fetcher is not None else ReplayDataFetcher(self.monitor.config)
+        self.signal_tracker = SignalTracker(self.signal_engine)
+        self.tech_context = tech_context
+
+    def run(self, on_tick: Optional[Callable[[ReplayTick], None]] = None) -> ReplayReport:
+        """
+        回放整个录制文件
+
+        Args:
+            on_tick: 每个节拍处理完成后的回调
+
+        Returns:
+            回放结果汇总
+        """
+        report = ReplayReport()
+        latency = {'fetch': LatencyStats(), 'signals': LatencyStats(), 'tick': LatencyStats()}
+        if self.tech_context is not None:
+            latency['tech'] = LatencyStats()
+        first_ts: Optional[float] = None
+        last_ts: Optional[float] = None
+        wall_start = monotonic()
+
+        for chunk in read_ticks(self.path):
+            self.fetcher.apply(chunk)
+            if chunk.kind != KIND_QUOTES:
+                continue
+
+            if first_ts is None:
+                first_ts = chunk.timestamp
+            last_ts = chunk.timestamp
+            if self.speed is not None:
+                delay = wall_start + (chunk.timestamp - first_ts) / self.speed - monotonic()
+                if delay > 0:
+                    sleep(delay)
+
+            tick = self._process_tick(chunk.recorded_at, latency)
+            report.ticks += 1
+            report.buy_signals += len(tick.buy_signals)
+            report.sell_signals += len(tick.sell_signals)
+            report.tech_signals += len(tick.tech_signals)
+            report.events.extend((tick.recorded_at, t.side, t.kind, t.code) for t in tick.transitions)
+            if on_tick is not None:
+                on_tick(tick)
+
+        report.wall_seconds = monotonic() - wall_start
+        report.recorded_seconds = (last_ts - first_ts) if first_ts is not None else 0.0
+        report.latency = {stage: stats.stats for stage, stats in latency.items()}
+        logger.info(
+            f"回放完成: {report.ticks} 个节拍, 买入信号 {report.buy_signals}, "
+            f"卖出信号 {report.sell_signals}, 耗时 {report.wall_seconds:.2f}s"
+        )
+        return report
+
+    def _process_tick(self, recorded_at: datetime, latency: Dict[str, LatencyStats]) -> ReplayTick:
+        """处理一个节拍：获取数据 → 评估买卖信号（与 MonitorService.refresh_now 相同的流程）"""
+        tick_start = perf_counter()
+        watchlist = self.monitor.watchlist or self.fetcher.quoted_codes
+        codes = list(dict.fromkeys(watchlist + list(self.monitor.positions)))
+
+        stock_data = self.fetcher.fetch_stock_data_batch(codes)
+        latency['fetch'].record(perf_counter() - tick_start)
+
+        # 卖出评估会更新持仓现价与峰值价格
+        signals_start = perf_counter()
+        evaluation = self.signal_tracker.evaluate(
+            watchlist, self.monitor.positions, stock_data, today=recorded_at.date()
+        )
+        latency['signals'].record(perf_counter() - signals_start)
+
+        # 科技股尾盘信号（与 8_Tech_Stock 页面相同的 generate_signals 流程，数据取自录制内容）
+        tech_signals = []
+        context = self.tech_context
+        if context is not None:
+            tech_start = perf_counter()
+            tech_signals = context.generator.generate_signals(
+                stock_pool=watchlist,
+                market_status=context.market_status,
+                sector_rankings=context.sector_rankings,
+                hard_filter_results=context.hard_filter_results,
+                stock_data=self.fetcher.daily_frames(watchlist),
+                current_time=recorded_at,
+            )
+            latency['tech'].record(perf_counter() - tech_start)
+
+        tick = ReplayTick(
+            recorded_at=recorded_at,
+            stock_data=stock_data,
+            buy_signals=evaluation.buy_signals,
+            sell_signals=evaluation.sell_signals,
+            transitions=evaluation.transitions,
+            tech_signals=tech_signals,
+            latency=perf_counter() - tick_start,
+        )
+        latency['tick'].record(tick.latency)
+        return tick
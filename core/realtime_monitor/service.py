@@ -0,0 +1,336 @@
+"""
+Realtime Monitor Background Service
+
+实时监控后台刷新服务，与 Streamlit 页面重跑解耦。
+
+后台守护线程持有 DataFetcher、SignalEngine 与 RealtimeMonitor，
+仅在交易时间内按 MonitorConfig.refresh_interval 刷新，
+每次刷新发布一个不可变快照（MonitorSnapshot），页面直接读取最新快照。
+
+设计原则：
+- 全局单例共享，无论多少页面会话连接，每个刷新周期只获取一次数据
+- 监控列表/持仓的修改经服务加锁执行，并唤醒后台线程立即刷新
+- 快照中的持仓为副本，容器为只读视图，页面无法修改服务内部状态
+"""
+
+import copy
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from .bulk_fetcher import BulkDataFetcher
+from .config import BULK_MONITOR_CONFIG, MONITOR_CONFIG, MonitorConfig
+from .data_fetcher import DataFetcher
+from .models import BuySignal, Position, SellSignal, StockData
+from .monitor import RealtimeMonitor
+from .signal_engine import SignalEngine
+from .signal_tracker import SignalTracker, SignalTransition
+from .tick_recorder import TickRecorder
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MonitorSnapshot:
+    """一次刷新结果的不可变快照"""
+    version: int = 0
+    refreshed_at: Optional[datetime] = None
+    is_trading: bool = False
+    watchlist: Tuple[str, ...] = ()
+    positions: Mapping[str, Position] = field(default_factory=lambda: MappingProxyType({}))
+    stock_data: Mapping[str, StockData] = field(default_factory=lambda: MappingProxyType({}))
+    buy_signals: Tuple[BuySignal, ...] = ()
+    sell_signals: Tuple[SellSignal, ...] = ()
+    transitions: Tuple[SignalTransition, ...] = ()   # 本次刷新的信号状态迁移
+    error: Optional[str] = None
+
+    @property
+    def position_summary(self) -> Dict:
+        """持仓汇总（与 RealtimeMonitor.get_position_summary 口径一致）"""
+        positions = list(self.positions.values())
+        total_market_value = sum(p.market_value for p in positions)
+        total_cost_value = sum(p.cost_value for p in positions)
+        total_pnl = total_market_value - total_cost_value
+        return {
+            'position_count': len(positions),
+            'total_market_value': total_market_value,
+            'total_cost_value': total_cost_value,
+            'total_pnl': total_pnl,
+            'total_pnl_pct': total_pnl / total_cost_value if total_cost_value > 0 else 0.0,
+        }
+
+
+class MonitorService:
+    """
+    实时监控后台刷新服务
+
+    使用方式：
+        service = get_monitor_service()
+        service.start()
+        snapshot = service.get_snapshot()   # 页面每次重跑直接读取
+    """
+
+    IDLE_CHECK_INTERVAL = 60  # 非交易时间检查间隔（秒）
+
+    def __init__(self,
+                 config: Optional[MonitorConfig] = None,
+                 monitor: Optional[RealtimeMonitor] = None,
+                 data_fetcher: Optional[DataFetcher] = None,
+                 signal_engine: Optional[SignalEngine] = None):
+        """
+        Args:
+            config: 监控配置，默认使用MONITOR_CONFIG
+            monitor: 监控器（监控列表与持仓），默认新建
+            data_fetcher: 数据获取器，默认新建（config.bulk_mode 时使用 BulkDataFetcher；
+                config.record_ticks 时挂载 TickRecorder 录制行情）
+            signal_engine: 信号引擎，默认新建
+        """
+        self.config = config or MONITOR_CONFIG
+        self.monitor = monitor if monitor is not None else RealtimeMonitor(self.config)
+        if data_fetcher is None:
+            data_fetcher = BulkDataFetcher(self.config) if self.config.bulk_mode else DataFetcher(self.config)
+        if self.config.record_ticks and data_fetcher.recorder is None:
+            data_fetcher.recorder = TickRecorder()
+        self.data_fetcher = data_fetcher
+        self.signal_engine = signal_engine if signal_engine is not None else SignalEngine()
+        self.signal_tracker = SignalTracker(self.signal_engine)
+        self._listeners: List[Callable[[Tuple[SignalTransition, ...]], None]] = []
+
+        self._lock = threading.RLock()            # 保护 monitor 状态
+        self._refresh_lock = threading.Lock()     # 串行化刷新
+        self._snapshot = MonitorSnapshot()
+        self._dirty = False                        # 监控列表/持仓已修改，待刷新
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refresh_count = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ========== 生命周期 ==========
+
+    def start(self) -> bool:
+        """
+        启动后台刷新线程（已在运行时不重复启动）
+
+        Returns:
+            是否新启动了线程
+        """
+        with self._lock:
+            if self.is_running:
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='realtime-monitor-refresh', daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """停止后台刷新线程"""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        recorder = getattr(self.data_fetcher, 'recorder', None)
+        if recorder is not None:
+            recorder.close()
+
+    def _run(self) -> None:
+        """后台循环：交易时间按刷新间隔刷新，状态修改后立即刷新"""
+        while not self._stop.is_set():
+            trading = self.data_fetcher.is_trading_time()
+            if trading or self._dirty or self._snapshot.version == 0:
+                try:
+                    self.refresh_now()
+                except Exception as e:
+                    logger.error(f"后台刷新失败: {e}")
+            interval = self.config.refresh_interval if trading else self.IDLE_CHECK_INTERVAL
+            self._wake.wait(interval)
+            self._wake.clear()
+
+    # ========== 刷新 ==========
+
+    def refresh_now(self) -> MonitorSnapshot:
+        """
+        立即执行一次刷新并发布新快照
+
+        Returns:
+            新发布的快照
+        """
+        with self._refresh_lock:
+            with self._lock:
+                self._dirty = False
+                codes = list(dict.fromkeys(self.monitor.watchlist + list(self.monitor.positions)))
+
+            # 网络获取不持有状态锁，页面修改监控列表/持仓不被阻塞
+            error = None
+            stock_data: Dict[str, StockData] = {}
+            if codes:
+                try:
+                    stock_data = self.data_fetcher.fetch_stock_data_batch(codes)
+                except Exception as e:
+                    error = str(e)
+                    logger.error(f"获取监控数据失败: {e}")
+                    stock_data = dict(self._snapshot.stock_data)
+
+            with self._lock:
+                watchlist = self.monitor.watchlist
+                # 只对输入变化的股票重新评估；卖出评估会更新持仓现价与峰值价格
+                evaluation = self.signal_tracker.evaluate(watchlist, self.monitor.positions, stock_data)
+                positions = {c: copy.copy(p) for c, p in self.monitor.positions.items()}
+
+            self.refresh_count += 1
+            snapshot = MonitorSnapshot(
+                version=self._snapshot.version + 1,
+                refreshed_at=datetime.now(),
+                is_trading=self.data_fetcher.is_trading_time(),
+                watchlist=tuple(watchlist),
+                positions=MappingProxyType(positions),
+                stock_data=MappingProxyType(dict(stock_data)),
+                buy_signals=tuple(evaluation.buy_signals),
+                sell_signals=tuple(evaluation.sell_signals),
+                transitions=tuple(evaluation.transitions),
+                error=error,
+            )
+            self._snapshot = snapshot
+
+        if snapshot.transitions:
+            self._notify(snapshot.transitions)
+        return snapshot
+
+    def add_listener(self, callback: Callable[[Tuple[SignalTransition, ...]], None]) -> None:
+        """
+        注册信号事件监听器
+
+        每次刷新产生状态迁移时，以本次迁移元组调用 callback（在刷新线程中执行）。
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Tuple[SignalTransition, ...]], None]) -> None:
+        """移除信号事件监听器"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, transitions: Tuple[SignalTransition, ...]) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(transitions)
+            except Exception as e:
+                logger.error(f"信号事件监听器执行失败: {e}")
+
+    def get_snapshot(self) -> MonitorSnapshot:
+        """获取最新快照（不触发数据获取）"""
+        return self._snapshot
+
+    # ========== 监控列表与持仓修改 ==========
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        self._wake.set()
+
+    def add_to_watchlist(self, code: str) -> bool:
+        """添加股票到监控列表"""
+        with self._lock:
+            added = self.monitor.add_to_watchlist(code)
+        if added:
+            self._mark_dirty()
+        return added
+
+    def remove_from_watchlist(self, code: str) -> bool:
+        """从监控列表移除股票"""
+        with self._lock:
+            removed = self.monitor.remove_from_watchlist(code)
+        if removed:
+            self._mark_dirty()
+        return removed
+
+    def add_position(self,
+                     code: str,
+                     name: str,
+                     cost_price: float,
+                     quantity: int,
+                     buy_date: Optional[date] = None) -> bool:
+        """添加持仓"""
+        with self._lock:
+            added = self.monitor.add_position(code, name, cost_price, quantity, buy_date)
+        if added:
+            self._mark_dirty()
+        return added
+
+    def remove_position(self, code: str) -> bool:
+        """删除持仓"""
+        with self._lock:
+            removed = self.monitor.remove_position(code)
+        if removed:
+            self._mark_dirty()
+        return removed
+
+
+# 全局共享实例
+_monitor_service: Optional[MonitorService] = None
+_monitor_service_lock = threading.Lock()
+
+
+def get_monitor_service() -> MonitorService:
+    """获取全局共享的实时监控服务"""
+    global _monitor_service
+    if _monitor_service is None:
+        with _monitor_service_lock:
+            if _monitor_service is None:
+                _monitor_service = MonitorService()
+    return _monitor_service
+
+
+def set_monitor_mode(bulk_mode: bool) -> MonitorService:
+    """
+    切换全局实时监控服务的数据获取模式
+
+    模式与当前服务相同时直接返回；否则停止当前服务，以 BULK_MONITOR_CONFIG（大容量）
+    或 MONITOR_CONFIG（普通）新建服务，沿用原监控列表、持仓与信号事件监听器，
+    原服务在运行时新服务随即启动。监控列表超出新模式容量上限时，保留最先加入的股票，
+    其余移出并记录日志。
+
+    Args:
+        bulk_mode: True 使用大容量数据获取器（行情快照 + 本地历史增量指标）
+
+    Returns:
+        当前全局服务
+    """
+    global _monitor_service
+    config = BULK_MONITOR_CONFIG if bulk_mode else MONITOR_CONFIG
+    with _monitor_service_lock:
+        current = _monitor_service
+        if current is not None and current.config.bulk_mode == bulk_mode:
+            return current
+        if current is None:
+            _monitor_service = MonitorService(config)
+            return _monitor_service
+
+        was_running = current.is_running
+        current.stop()
+        monitor = current.monitor
+        monitor.config = config
+        # 大容量切回普通模式时，超出容量上限的股票（最后加入的）移出监控列表
+        dropped = monitor.watchlist[config.max_watchlist_size:]
+        for code in dropped:
+            monitor.remove_from_watchlist(code)
+        if dropped:
+            logger.warning(
+                f"监控列表超出普通模式上限 {config.max_watchlist_size} 只，"
+                f"移除 {len(dropped)} 只: {', '.join(dropped)}"
+            )
+        service = MonitorService(config, monitor=monitor)
+        service._listeners = list(current._listeners)
+        _monitor_service = service
+    logger.info(f"实时监控切换为{'大容量' if bulk_mode else '普通'}模式")
+    if was_running:
+        service.start()
+    return service
@@ -0,0 +1,219 @@
+"""
+Signal Tracker Module
+
+事件驱动的信号评估：按代码跟踪信号输入版本，只对输入发生变化的股票重新评估，
+并输出信号状态迁移（新增 / 升级 / 清除）而非每次的完整信号列表。
+
+输入版本：
+- 买入：行情价格与技术指标（MA5/MA20/MA60、RSI、量比、MA20斜率）
+- 卖出：上述行情指标 + 持仓成本、数量、买入日期、峰值价格，以及当前日期（持仓天数）
+
+状态迁移：
+- new: 新出现的信号
+- upgraded: 买入信号强度提高 / 卖出信号紧急程度提高
+- cleared: 信号消失，或股票移出监控列表/持仓
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+from .models import BuySignal, Position, SellSignal, StockData
+from .signal_engine import SignalEngine
+
+
+URGENCY_RANK = {
+    SellSignal.URGENCY_LOW: 0,
+    SellSignal.URGENCY_MEDIUM: 1,
+    SellSignal.URGENCY_HIGH: 2,
+}
+
+
+@dataclass(frozen=True)
+class SignalTransition:
+    """信号状态迁移事件"""
+    side: str                                   # buy / sell
+    kind: str                                   # new / upgraded / cleared
+    code: str
+    signal: Optional[object] = None             # 当前信号（cleared 时为 None）
+    previous: Optional[object] = None           # 迁移前的信号
+
+    SIDE_BUY = 'buy'
+    SIDE_SELL = 'sell'
+    KIND_NEW = 'new'
+    KIND_UPGRADED = 'upgraded'
+    KIND_CLEARED = 'cleared'
+
+
+@dataclass
+class SignalEvaluation:
+    """一次评估的结果"""
+    buy_signals: List[BuySignal] = field(default_factory=list)
+    sell_signals: List[SellSignal] = field(default_factory=list)
+    transitions: List[SignalTransition] = field(default_factory=list)
+    evaluated: List[str] = field(default_factory=list)      # 本次重新评估的代码
+
+
+@dataclass
+class _CodeState:
+    """单只股票（单侧）的输入与最近信号"""
+    key: Hashable
+    version: int
+    signals: Tuple = ()
+
+
+def buy_input_key(stock_data: StockData) -> Hashable:
+    """买入信号依赖的输入"""
+    return (
+        stock_data.name, stock_data.current_price,
+        stock_data.ma5, stock_data.ma20, stock_data.ma60,
+        stock_data.rsi, stock_data.volume_ratio, stock_data.ma20_slope,
+    )
+
+
+def sell_input_key(position: Position, stock_data: StockData, today: date) -> Hashable:
+    """卖出信号依赖的输入"""
+    return (
+        position.name, position.cost_price, position.quantity, position.buy_date,
+        position.peak_price, stock_data.current_price,
+        stock_data.rsi, stock_data.ma5, stock_data.ma20, today,
+    )
+
+
+class SignalTracker:
+    """
+    增量信号评估器
+
+    使用方式：
+        tracker = SignalTracker(signal_engine)
+        result = tracker.evaluate(watchlist, positions, stock_data)
+        result.transitions  # 去重后的信号事件流
+    """
+
+    def __init__(self, signal_engine: Optional[SignalEngine] = None):
+        self.signal_engine = signal_engine if signal_engine is not None else SignalEngine()
+        self._buy: Dict[str, _CodeState] = {}
+        self._sell: Dict[str, _CodeState] = {}
+
+    def input_version(self, code: str, side: str = SignalTransition.SIDE_BUY) -> int:
+        """获取代码的输入版本号（未跟踪时为 0）"""
+        states = self._buy if side == SignalTransition.SIDE_BUY else self._sell
+        state = states.get(code)
+        return state.version if state is not None else 0
+
+    def reset(self) -> None:
+        """清空跟踪状态，下次评估全部重新计算"""
+        self._buy.clear()
+        self._sell.clear()
+
+    # ========== 评估 ==========
+
+    def evaluate(self,
+                 watchlist: Iterable[str],
+                 positions: Mapping[str, Position],
+                 stock_data: Mapping[str, StockData],
+                 today: Optional[date] = None) -> SignalEvaluation:
+        """
+        评估监控列表与持仓，只重新计算输入发生变化的股票
+
+        卖出信号检查会更新持仓现价与峰值价格（与 SignalEngine.generate_sell_signals 一致）。
+
+        Args:
+            watchlist: 监控列表
+            positions: 持仓字典
+            stock_data: 最新股票数据，缺失数据的股票保留上次信号
+            today: 当前日期（用于持仓天数），默认今天
+
+        Returns:
+            SignalEvaluation: 当前全部信号、状态迁移与本次重新评估的代码
+        """
+        today = today or date.today()
+        result = SignalEvaluation()
+        evaluated = set()
+
+        # 买入信号
+        watchlist = list(dict.fromkeys(watchlist))
+        for code in watchlist:
+            data = stock_data.get(code)
+            state = self._buy.get(code)
+            if data is not None:
+                key = buy_input_key(data)
+                if state is None or state.key != key:
+                    signal = self.signal_engine.generate_buy_signal(data)
+                    signals = (signal,) if signal is not None else ()
+                    previous = state.signals if state is not None else ()
+                    state = _CodeState(key, (state.version if state else 0) + 1, signals)
+                    self._buy[code] = state
+                    evaluated.add(code)
+                    result.transitions.extend(self._buy_transitions(code, previous, signals))
+            if state is not None:
+                result.buy_signals.extend(state.signals)
+
+        watched = set(watchlist)
+        for code in [c for c in self._buy if c not in watched]:
+            result.transitions.extend(self._buy_transitions(code, self._buy.pop(code).signals, ()))
+
+        # 卖出信号
+        for code, position in positions.items():
+            data = stock_data.get(code)
+            state = self._sell.get(code)
+            if data is not None:
+                key = sell_input_key(position, data, today)
+                if state is None or state.key != key:
+                    signals = tuple(self.signal_engine.generate_sell_signals(position, data))
+                    previous = state.signals if state is not None else ()
+                    # 评估会更新峰值价格，记录评估后的输入，避免下次无变化时重复评估
+                    key = sell_input_key(position, data, today)
+                    state = _CodeState(key, (state.version if state else 0) + 1, signals)
+                    self._sell[code] = state
+                    evaluated.add(code)
+                    result.transitions.extend(self._sell_transitions(code, previous, signals))
+            if state is not None:
+                result.sell_signals.extend(state.signals)
+
+        for code in [c for c in self._sell if c not in positions]:
+            result.transitions.extend(self._sell_transitions(code, self._sell.pop(code).signals, ()))
+
+        result.buy_signals.sort(key=lambda s: s.signal_strength, reverse=True)
+        result.evaluated = [c for c in dict.fromkeys(watchlist + list(positions)) if c in evaluated]
+        return result
+
+    # ========== 状态迁移 ==========
+
+    @staticmethod
+    def _buy_transitions(code: str,
+                         previous: Tuple[BuySignal, ...],
+                         current: Tuple[BuySignal, ...]) -> List[SignalTransition]:
+        old = previous[0] if previous else None
+        new = current[0] if current else None
+        side = SignalTransition.SIDE_BUY
+
+        if old is None and new is not None:
+            return [SignalTransition(side, SignalTransition.KIND_NEW, code, new)]
+        if old is not None and new is None:
+            return [SignalTransition(side, SignalTransition.KIND_CLEARED, code, None, old)]
+        if old is not None and new.signal_strength > old.signal_strength:
+            return [SignalTransition(side, SignalTransition.KIND_UPGRADED, code, new, old)]
+        return []
+
+    @staticmethod
+    def _sell_transitions(code: str,
+                          previous: Tuple[SellSignal, ...],
+                          current: Tuple[SellSignal, ...]) -> List[SignalTransition]:
+        old = {s.signal_type: s for s in previous}
+        new = {s.signal_type: s for s in current}
+        side = SignalTransition.SIDE_SELL
+        transitions = []
+
+        for signal_type, signal in new.items():
+            before = old.get(signal_type)
+            if before is None:
+                transitions.append(SignalTransition(side, SignalTransition.KIND_NEW, code, signal))
+            elif URGENCY_RANK.get(signal.urgency, 0) > URGENCY_RANK.get(before.urgency, 0):
+                transitions.append(SignalTransition(side, SignalTransition.KIND_UPGRADED, code, signal, before))
+
+        for signal_type, signal in old.items():
+            if signal_type not in new:
+                transitions.append(SignalTransition(side, SignalTransition.KIND_CLEARED, code, None, signal))
+
+        return transitions
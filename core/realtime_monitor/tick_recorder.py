@@ -0,0 +1,230 @@
+"""
+Tick Recorder Module
+
+行情录制模块，将 DataFetcher 收到的数据写入只追加的录制文件，供离线回放（见 replay.py）。
+
+文件格式：
+- 由连续的数据块组成，每块 = 8 字节块头（4 字节标识 + 4 字节长度）+ zlib 压缩的 JSON
+- 每块带时间戳，按列存储（{列名: [值, ...]}）
+- 块类型：
+  - quotes: 一次行情快照（每次刷新一块）
+  - history: 单只股票的日线历史（每只股票只记录一次）
+  - fund_flow: 资金流向（只记录相比上次有变化的股票）
+- 只追加写入；进程中断导致的不完整尾块在读取时忽略
+"""
+
+import json
+import logging
+import struct
+import zlib
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== 文件格式 ====================
+
+CHUNK_MAGIC = b'MQTK'
+CHUNK_HEADER = struct.Struct('<4sI')
+
+KIND_QUOTES = 'quotes'
+KIND_HISTORY = 'history'
+KIND_FUND_FLOW = 'fund_flow'
+
+QUOTE_COLUMNS = (
+    'code', 'name', 'current_price', 'change_pct', 'volume', 'turnover',
+    'high', 'low', 'open', 'prev_close',
+)
+HISTORY_COLUMNS = ('date', 'open', 'close', 'high', 'low', 'volume')
+FUND_FLOW_COLUMNS = ('code', 'name', 'main_net_inflow', 'main_net_inflow_5d')
+
+
+@dataclass
+class TickChunk:
+    """
+    录制文件中的一个数据块
+
+    Attributes:
+        kind: 块类型（quotes / history / fund_flow）
+        timestamp: 录制时间（Unix 时间戳）
+        columns: 按列存储的数据
+        code: history 块对应的股票代码
+    """
+    kind: str
+    timestamp: float
+    columns: Dict[str, List[Any]] = field(default_factory=dict)
+    code: Optional[str] = None
+
+    @property
+    def recorded_at(self) -> datetime:
+        """录制时间"""
+        return datetime.fromtimestamp(self.timestamp)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """按行展开"""
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+    def to_frame(self) -> pd.DataFrame:
+        """转换为 DataFrame（history 块的日期列转换为 datetime）"""
+        df = pd.DataFrame(self.columns)
+        if 'date' in df.columns:
+            df['date'] = pd.to_datetime(df['date'])
+        return df
+
+
+def _encode(chunk: TickChunk) -> bytes:
+    payload = {'kind': chunk.kind, 'ts': chunk.timestamp, 'columns': chunk.columns}
+    if chunk.code is not None:
+        payload['code'] = chunk.code
+    body = zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    return CHUNK_HEADER.pack(CHUNK_MAGIC, len(body)) + body
+
+
+def read_ticks(path: Path) -> Iterator[TickChunk]:
+    """
+    按写入顺序读取录制文件
+
+    遇到不完整或损坏的块时停止读取（只追加写入时只可能出现在文件末尾）。
+    """
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(CHUNK_HEADER.size)
+            if not header:
+                return
+            if len(header) < CHUNK_HEADER.size:
+                logger.warning(f"录制文件尾块不完整，已忽略: {path}")
+                return
+            magic, length = CHUNK_HEADER.unpack(header)
+            body = f.read(length)
+            if magic != CHUNK_MAGIC or len(body) < length:
+                logger.warning(f"录制文件数据块损坏，停止读取: {path}")
+                return
+            try:
+                payload = json.loads(zlib.decompress(body))
+            except (zlib.error, ValueError) as e:
+                logger.warning(f"录制文件数据块解码失败，停止读取: {path}, 错误: {e}")
+                return
+            yield TickChunk(
+                kind=payload['kind'],
+                timestamp=payload['ts'],
+                columns=payload.get('columns', {}),
+                code=payload.get('code'),
+            )
+
+
+# ==================== 录制器 ====================
+
+class TickRecorder:
+    """
+    行情录制器
+
+    由 DataFetcher 在收到行情快照、历史数据与资金流向时调用，线程安全。
+
+    使用示例:
+        fetcher.recorder = TickRecorder()
+        ...
+        fetcher.recorder.close()
+    """
+
+    DEFAULT_DIR = Path("data/realtime_ticks")
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: 录制文件路径，默认 data/realtime_ticks/<当日日期>.ticks
+        """
+        if path is None:
+            path = self.DEFAULT_DIR / f"{date.today():%Y%m%d}.ticks"
+        self.path = Path(path)
+        self._lock = Lock()
+        self._file = None
+        self._history_codes = set()
+        self._fund_flows: Dict[str, tuple] = {}
+        self.chunks_written = 0
+        self.bytes_written = 0
+
+    def record_quotes(self, quotes: Dict[str, Dict], timestamp: Optional[float] = None) -> None:
+        """记录一次行情快照 {code: 行情}"""
+        if not quotes:
+            return
+        columns = {name: [quote.get(name) for quote in quotes.values()] for name in QUOTE_COLUMNS}
+        columns['code'] = list(quotes)
+        self._write(TickChunk(KIND_QUOTES, self._timestamp(timestamp), columns))
+
+    def record_history(self, code: str, df: pd.DataFrame, timestamp: Optional[float] = None) -> None:
+        """记录单只股票的日线历史（每只股票只记录一次）"""
+        with self._lock:
+            if code in self._history_codes or df is None or df.empty:
+                return
+            self._history_codes.add(code)
+
+        columns = {}
+        for name in HISTORY_COLUMNS:
+            if name not in df.columns:
+                continue
+            if name == 'date':
+                columns[name] = [str(value.date()) for value in pd.to_datetime(df[name])]
+            else:
+                columns[name] = df[name].astype(float).tolist()
+        self._write(TickChunk(KIND_HISTORY, self._timestamp(timestamp), columns, code=code))
+
+    def record_fund_flows(self, flows: Dict[str, Any], timestamp: Optional[float] = None) -> None:
+        """记录资金流向 {code: FundFlowData}，只写入有变化的股票"""
+        with self._lock:
+            changed = {}
+            for code, flow in flows.items():
+                if flow is None:
+                    continue
+                key = (flow.main_net_inflow, flow.main_net_inflow_5d)
+                if self._fund_flows.get(code) != key:
+                    self._fund_flows[code] = key
+                    changed[code] = flow
+        if not changed:
+            return
+
+        columns = {
+            'code': list(changed),
+            'name': [flow.name for flow in changed.values()],
+            'main_net_inflow': [flow.main_net_inflow for flow in changed.values()],
+            'main_net_inflow_5d': [flow.main_net_inflow_5d for flow in changed.values()],
+        }
+        self._write(TickChunk(KIND_FUND_FLOW, self._timestamp(timestamp), columns))
+
+    def close(self) -> None:
+        """关闭录制文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> 'TickRecorder':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def _timestamp(timestamp: Optional[float]) -> float:
+        return timestamp if timestamp is not None else datetime.now().timestamp()
+
+    def _write(self, chunk: TickChunk) -> None:
+        data = _encode(chunk)
+        with self._lock:
+            try:
+                if self._file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, 'ab')
+                self._file.write(data)
+                self._file.flush()
+            except OSError as e:
+                logger.error(f"写入录制文件失败: {self.path}, 错误: {e}")
+                return
+            self.chunks_written += 1
+            self.bytes_written += len(data)
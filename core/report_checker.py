@@ -12,6 +12,8 @@ from typing import Optional, Tuple, List, Dict
 from dataclasses import dataclass
 import logging
 
+from core.disclosure_calendar import DisclosureCalendar, get_disclosure_calendar
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,16 +51,16 @@ class ReportChecker:
         '年报': '12-31'
     }
     
-    def __init__(self, window_days: int = 3):
+    def __init__(self, window_days: int = 3, calendar: Optional[DisclosureCalendar] = None):
         """
         初始化财报检测器
         
         Args:
             window_days: 窗口期天数（前后各 N 天），默认 3 天
+            calendar: 财报披露日历，默认使用全局共享日历
         """
         self.window_days = window_days
-        self._cache: Dict[str, List[ReportInfo]] = {}  # 缓存财报信息
-        self._cache_date: Optional[date] = None  # 缓存日期
+        self.calendar = calendar if calendar is not None else get_disclosure_calendar()
     
     def check_report_window(
         self, 
@@ -68,6 +70,9 @@ class ReportChecker:
         """
         检查是否处于财报披露窗口期
         
+        日历中有该股票时为内存二分查找 O(log n)；
+        日历中没有时使用法定披露期估算窗口。
+        
         Args:
             code: 股票代码（6位数字，如 '000001'）
             check_date: 检查日期，默认为今天
@@ -84,39 +89,23 @@ class ReportChecker:
             check_date = date.today()
         
         try:
-            # 获取财报披露日期
-            report_dates = self._get_report_dates(code)
+            self.calendar.ensure_loaded()
             
-            if not report_dates:
-                logger.debug(f"股票 {code} 无财报披露日期信息")
-                return False, None
+            if code in self.calendar:
+                found = self.calendar.find_in_window(code, check_date, self.window_days)
+                if found is None:
+                    return False, None
+                disclosure_date, report_type, _ = found
+                warning = self._format_window_warning(report_type, disclosure_date, check_date)
+                logger.info(f"股票 {code} 处于财报窗口期: {warning}")
+                return True, warning
             
-            # 检查是否在任一财报的窗口期内
-            for report_info in report_dates:
-                days_diff = (report_info.disclosure_date - check_date).days
-                
-                # 在窗口期内：披露日前后 window_days 天
-                if abs(days_diff) <= self.window_days:
-                    if days_diff > 0:
-                        # 披露日在未来
-                        warning = (
-                            f"⚠️ 财报窗口期：{report_info.report_type}将于 "
-                            f"{report_info.disclosure_date.strftime('%Y-%m-%d')} 披露"
-                            f"（{days_diff}天后）"
-                        )
-                    elif days_diff < 0:
-                        # 披露日已过
-                        warning = (
-                            f"⚠️ 财报窗口期：{report_info.report_type}已于 "
-                            f"{report_info.disclosure_date.strftime('%Y-%m-%d')} 披露"
-                            f"（{abs(days_diff)}天前）"
-                        )
-                    else:
-                        # 今天就是披露日
-                        warning = (
-                            f"⚠️ 财报窗口期：{report_info.report_type}今日披露"
-                        )
-                    
+            # 日历中没有该股票：使用估算窗口
+            for report_info in self._estimate_report_windows(code, check_date):
+                if abs((report_info.disclosure_date - check_date).days) <= self.window_days:
+                    warning = self._format_window_warning(
+                        report_info.report_type, report_info.disclosure_date, check_date
+                    )
                     logger.info(f"股票 {code} 处于财报窗口期: {warning}")
                     return True, warning
             
@@ -127,11 +116,37 @@ class ReportChecker:
             # 获取失败时不阻止交易，但记录日志
             return False, None
     
+    def _format_window_warning(
+        self,
+        report_type: str,
+        disclosure_date: date,
+        check_date: date
+    ) -> str:
+        """生成窗口期警告信息"""
+        days_diff = (disclosure_date - check_date).days
+        
+        if days_diff > 0:
+            # 披露日在未来
+            return (
+                f"⚠️ 财报窗口期：{report_type}将于 "
+                f"{disclosure_date.strftime('%Y-%m-%d')} 披露"
+                f"（{days_diff}天后）"
+            )
+        elif days_diff < 0:
+            # 披露日已过
+            return (
+                f"⚠️ 财报窗口期：{report_type}已于 "
+                f"{disclosure_date.strftime('%Y-%m-%d')} 披露"
+                f"（{abs(days_diff)}天前）"
+            )
+        # 今天就是披露日
+        return f"⚠️ 财报窗口期：{report_type}今日披露"
+    
     def _get_report_dates(self, code: str) -> List[ReportInfo]:
         """
         获取股票的财报披露日期
         
-        使用 AkShare 获取财报预约披露日期
+        从财报披露日历读取（纯内存）；日历中没有该股票时使用估算窗口
         
         Args:
             code: 股票代码
@@ -139,85 +154,22 @@ class ReportChecker:
         Returns:
             财报信息列表
         """
-        # 检查缓存是否有效（当天有效）
         today = date.today()
-        if self._cache_date == today and code in self._cache:
-            return self._cache[code]
+        self.calendar.ensure_loaded(today)
         
-        # 清除过期缓存
-        if self._cache_date != today:
-            self._cache.clear()
-            self._cache_date = today
+        if code not in self.calendar:
+            return self._estimate_report_windows(code, today)
         
-        try:
-            import akshare as ak
-            
-            report_infos: List[ReportInfo] = []
-            
-            # 尝试获取业绩预告/快报日期
-            try:
-                # 获取最新一期的业绩预告
-                df = ak.stock_yjyg_em(date="")
-                if df is not None and not df.empty:
-                    # 筛选该股票的记录
-                    stock_df = df[df['股票代码'] == code]
-                    if not stock_df.empty:
-                        for _, row in stock_df.iterrows():
-                            disclosure_date_str = row.get('公告日期', '')
-                            if disclosure_date_str:
-                                try:
-                                    disclosure_date = self._parse_date(disclosure_date_str)
-                                    if disclosure_date:
-                                        report_infos.append(ReportInfo(
-                                            code=code,
-                                            report_type='业绩预告',
-                                            report_period=str(row.get('报告期', '')),
-                                            disclosure_date=disclosure_date,
-                                            days_to_disclosure=(disclosure_date - today).days
-                                        ))
-                                except Exception:
-                                    pass
-            except Exception as e:
-                logger.debug(f"获取业绩预告失败: {code}, {e}")
-            
-            # 尝试获取财报预约披露日期
-            try:
-                # 获取财报预约披露时间表
-                # 注意：AkShare 的接口可能会变化，需要适配
-                df = ak.stock_report_disclosure(symbol=code)
-                if df is not None and not df.empty:
-                    for _, row in df.iterrows():
-                        disclosure_date_str = row.get('首次预约时间', '') or row.get('披露日期', '')
-                        report_type = row.get('报告类型', '财报')
-                        
-                        if disclosure_date_str:
-                            try:
-                                disclosure_date = self._parse_date(disclosure_date_str)
-                                if disclosure_date:
-                                    report_infos.append(ReportInfo(
-                                        code=code,
-                                        report_type=report_type,
-                                        report_period=str(row.get('报告期', '')),
-                                        disclosure_date=disclosure_date,
-                                        days_to_disclosure=(disclosure_date - today).days
-                                    ))
-                            except Exception:
-                                pass
-            except Exception as e:
-                logger.debug(f"获取财报预约披露日期失败: {code}, {e}")
-            
-            # 如果没有获取到具体日期，使用估算的财报窗口期
-            if not report_infos:
-                report_infos = self._estimate_report_windows(code, today)
-            
-            # 缓存结果
-            self._cache[code] = report_infos
-            
-            return report_infos
-            
-        except Exception as e:
-            logger.warning(f"获取财报日期失败: {code}, 错误: {e}")
-            return []
+        return [
+            ReportInfo(
+                code=code,
+                report_type=report_type,
+                report_period=report_period,
+                disclosure_date=disclosure_date,
+                days_to_disclosure=(disclosure_date - today).days
+            )
+            for disclosure_date, report_type, report_period in self.calendar.get_reports(code)
+        ]
     
     def _parse_date(self, date_str: str) -> Optional[date]:
         """
@@ -307,6 +259,9 @@ class ReportChecker:
         """
         获取即将披露财报的股票列表
         
+        日历内的股票通过按日期排序的全局索引二分定位区间，
+        不在日历内的股票使用估算窗口。
+        
         Args:
             codes: 股票代码列表
             days_ahead: 提前天数，默认 7 天
@@ -315,13 +270,27 @@ class ReportChecker:
             即将披露财报的股票信息列表
         """
         today = date.today()
-        upcoming: List[ReportInfo] = []
+        self.calendar.ensure_loaded(today)
         
-        for code in codes:
-            report_dates = self._get_report_dates(code)
-            for report_info in report_dates:
-                days_diff = (report_info.disclosure_date - today).days
-                if 0 <= days_diff <= days_ahead:
+        code_set = set(codes)
+        upcoming: List[ReportInfo] = [
+            ReportInfo(
+                code=code,
+                report_type=report_type,
+                report_period=report_period,
+                disclosure_date=disclosure_date,
+                days_to_disclosure=(disclosure_date - today).days
+            )
+            for code, disclosure_date, report_type, report_period in self.calendar.upcoming(
+                today, today + timedelta(days=days_ahead), code_set
+            )
+        ]
+        
+        for code in code_set:
+            if code in self.calendar:
+                continue
+            for report_info in self._estimate_report_windows(code, today):
+                if 0 <= report_info.days_to_disclosure <= days_ahead:
                     upcoming.append(report_info)
         
         # 按披露日期排序
@@ -330,9 +299,8 @@ class ReportChecker:
         return upcoming
     
     def clear_cache(self) -> None:
-        """清除缓存"""
-        self._cache.clear()
-        self._cache_date = None
+        """清除缓存（下次查询时重新加载披露日历）"""
+        self.calendar.invalidate()
         logger.debug("财报信息缓存已清除")
 
 
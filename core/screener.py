@@ -19,6 +19,8 @@ import logging
 import concurrent.futures  # 引入并发库
 from tqdm import tqdm  # <--- 新增这行进度条插件
 
+from core.industry_map import get_industry_map
+
 logger = logging.getLogger(__name__)
 
 
@@ -231,7 +233,10 @@ class Screener:
         self.trend_safety_filter = TrendSafetyFilter()    # 新增趋势安全过滤
         self.strategy_prefilter = StrategyPrefilter()     # 新增策略预筛
         
-        # 行业缓存（避免重复查询）
+        # 行业映射表（全局共享，批量下载的板块成分）
+        self.industry_map = get_industry_map()
+        
+        # 行业缓存（映射表缺失时逐只查询的兜底结果）
         self._industry_cache: Dict[str, str] = {}
     
     def add_condition(self, condition: ScreenerCondition) -> 'Screener':
@@ -438,7 +443,18 @@ class Screener:
         return ma60_today > ma60_yesterday
     
     def _get_stock_industry(self, code: str) -> str:
-        """获取股票所属行业（带缓存）"""
+        """
+        获取股票所属行业
+        
+        优先查共享的行业映射表（纯内存）；映射表尚未建立时才逐只联网查询。
+        """
+        industry = self.industry_map.get(code)
+        if industry is not None:
+            return industry
+        
+        if self.industry_map.is_loaded:
+            return "未知"
+        
         if code in self._industry_cache:
             return self._industry_cache[code]
         
@@ -481,6 +497,14 @@ class Screener:
         if not results:
             return results
         
+        # 行业未知的结果用映射表批量补全（纯内存，无网络请求）
+        unknown_codes = [r.code for r in results if not r.industry or r.industry == '未知']
+        if unknown_codes and self.industry_map.is_loaded:
+            industries = self.industry_map.get_many(unknown_codes)
+            for result in results:
+                if result.code in industries:
+                    result.industry = industries[result.code]
+        
         # =======================================================
         # 核心修改：排序
         # key=lambda x: x.turnover_rate  --> 指定按换手率排
@@ -545,7 +569,55 @@ class Screener:
             logger.debug(f"检查财报窗口期失败: {code}, {e}")
             return False
     
-    def _check_technical_conditions(self, df: pd.DataFrame) -> bool:
+    @staticmethod
+    def _is_clean_data(df: Optional[pd.DataFrame]) -> bool:
+        """判断数据是否已是 clean_data 输出的标准格式（无需再次清洗）"""
+        if df is None or df.empty:
+            return False
+        if not all(col in df.columns for col in ('date', 'open', 'high', 'low', 'close', 'volume')):
+            return False
+        return pd.api.types.is_datetime64_any_dtype(df['date'])
+    
+    @staticmethod
+    def _build_snapshot_index(
+        snapshot_data: Optional[pd.DataFrame],
+        codes: Optional[List[str]] = None
+    ) -> Dict[str, pd.Series]:
+        """
+        将快照按股票代码建立索引
+        
+        预剪枝后只建一次：先建 代码 -> 行号 映射，再只为需要精筛的股票取出快照行，
+        精筛线程直接拿到自己的快照行，单只股票的开销与快照规模无关。
+        重复代码保留第一行。
+        
+        Args:
+            snapshot_data: 预剪枝后的快照
+            codes: 需要取行的股票代码，None 表示全部
+        
+        Returns:
+            {股票代码: 快照行}
+        """
+        if snapshot_data is None or snapshot_data.empty or 'code' not in snapshot_data.columns:
+            return {}
+        
+        positions: Dict[str, int] = {}
+        for pos, code in enumerate(snapshot_data['code'].astype(str)):
+            positions.setdefault(code, pos)
+        
+        if codes is None:
+            codes = list(positions.keys())
+        
+        return {
+            code: snapshot_data.iloc[positions[code]]
+            for code in codes
+            if code in positions
+        }
+    
+    def _check_technical_conditions(
+        self,
+        df: pd.DataFrame,
+        df_with_indicators: Optional[pd.DataFrame] = None
+    ) -> bool:
         """检查技术指标条件"""
         if not self._conditions:
             return True
@@ -553,7 +625,8 @@ class Screener:
         if df is None or df.empty:
             return False
         
-        df_with_indicators = self.calculate_indicators(df)
+        if df_with_indicators is None:
+            df_with_indicators = self.calculate_indicators(df)
         
         if df_with_indicators.empty:
             return False
@@ -851,13 +924,21 @@ class Screener:
         self, 
         code: str, 
         df: pd.DataFrame,
-        snapshot_row: Optional[pd.Series] = None
+        snapshot_row: Optional[pd.Series] = None,
+        df_with_indicators: Optional[pd.DataFrame] = None,
+        natr: Optional[float] = None,
+        rsi: Optional[float] = None
     ) -> Optional[ScreenerResult]:
-        """构建筛选结果对象"""
+        """
+        构建筛选结果对象
+        
+        df_with_indicators / natr / rsi 可由精筛阶段传入已计算的值，避免重复计算
+        """
         if df is None or df.empty:
             return None
         
-        df_with_indicators = self.calculate_indicators(df)
+        if df_with_indicators is None:
+            df_with_indicators = self.calculate_indicators(df)
         if df_with_indicators.empty:
             return None
         
@@ -884,11 +965,13 @@ class Screener:
         in_report_window = self._check_report_window(code)
         
         # 计算波动率和风险指标
-        natr = self._calculate_natr(df)
+        if natr is None:
+            natr = self._calculate_natr(df)
         gain_5d, volume_ratio, risk_warnings = self._calculate_risk_metrics(df)
         
         # 计算策略预筛指标
-        rsi = self._calculate_rsi(df)
+        if rsi is None:
+            rsi = self._calculate_rsi(df)
         history_days = len(df)
         ma60_distance = self._calculate_ma60_distance(df)
         
@@ -916,6 +999,167 @@ class Screener:
             ma60_distance=ma60_distance
         )
     
+    def get_liquidity_snapshot(self) -> Optional[pd.DataFrame]:
+        """
+        获取按流动性过滤（市值、换手率、ST、上市天数）后的全市场快照
+
+        Returns:
+            预剪枝后的快照，获取失败或无候选时返回 None / 空表
+        """
+        from core.data_feed import LiquidityFilter as DFLiquidityFilter
+        df_filter = DFLiquidityFilter(
+            min_market_cap=self.liquidity_filter.min_market_cap,
+            max_market_cap=self.liquidity_filter.max_market_cap,
+            min_turnover_rate=self.liquidity_filter.min_turnover_rate,
+            max_turnover_rate=self.liquidity_filter.max_turnover_rate,
+            exclude_st=self.liquidity_filter.exclude_st,
+            min_listing_days=self.liquidity_filter.min_listing_days
+        )
+        return self.data_feed.get_market_snapshot(liquidity_filter=df_filter)
+
+    def screen_stock(
+        self,
+        code: str,
+        raw_df: pd.DataFrame,
+        snapshot_row: Optional[pd.Series] = None,
+        check_listing: bool = False,
+        df_with_indicators: Optional[pd.DataFrame] = None
+    ) -> Optional[ScreenerResult]:
+        """
+        对单只股票执行完整的精筛过滤链
+
+        依次检查：上市天数/ST（check_listing 时）、NATR 波动率、趋势安全、策略预筛、
+        MA60 趋势、技术指标条件，全部通过后构建结果（含财报窗口期标记）。
+
+        Args:
+            code: 股票代码
+            raw_df: 日线数据
+            snapshot_row: 该股票的快照行（市值、换手率、名称）
+            check_listing: 是否补查上市天数与 ST（未经过快照预剪枝的自选池需要）
+            df_with_indicators: 已计算好的指标数据，None 时在此计算
+
+        Returns:
+            通过筛选返回 ScreenerResult，否则返回 None
+        """
+        try:
+            # 清洗数据（已是标准格式的数据不再重复清洗）
+            df = raw_df if self._is_clean_data(raw_df) else self.data_feed.clean_data(raw_df)
+            if df is None or df.empty: return None
+            
+            # 上市天数过滤 (自选池模式补查)
+            if check_listing:
+                if not self._check_listing_days(code, self.liquidity_filter.min_listing_days): return None
+                if snapshot_row is not None and self._check_st_stock(snapshot_row.get('name', '')): return None
+            
+            # 财报窗口期检查（不再强制剔除，只标记）
+            # 注：财报窗口期的股票会在结果中标记 in_report_window=True
+            # 由信号生成器决定是否过滤
+            
+            # 波动率过滤（NATR）- 硬性剔除"织布机"和"妖股"
+            natr = self._calculate_natr(df)
+            if self.volatility_filter.enabled:
+                if natr > 0:  # 只有计算成功才过滤
+                    if natr < self.volatility_filter.min_natr:
+                        logger.debug(f"股票 {code} NATR={natr:.2f}% < {self.volatility_filter.min_natr}%，波动率过低（织布机），剔除")
+                        return None
+                    if natr > self.volatility_filter.max_natr:
+                        logger.debug(f"股票 {code} NATR={natr:.2f}% > {self.volatility_filter.max_natr}%，波动率过高（妖股），剔除")
+                        return None
+            
+            # 趋势安全过滤 - 防止在极端下跌趋势中抄底
+            is_trend_safe, trend_warning = self._check_trend_safety(df)
+            if not is_trend_safe:
+                logger.debug(f"股票 {code} {trend_warning}，剔除")
+                return None
+            
+            # 策略预筛 - 根据策略类型进行针对性预筛
+            pass_prefilter, rsi_value, history_days = self._check_strategy_prefilter(df)
+            if not pass_prefilter:
+                logger.debug(f"股票 {code} 未通过策略预筛，剔除")
+                return None
+            
+            # MA60 趋势过滤（可选，RSI策略不需要）
+            if self.liquidity_filter.require_ma60_uptrend:
+                if not self._check_ma60_trend(df): return None
+            
+            # 技术指标条件过滤（指标只计算一次，供构建结果复用）
+            if df_with_indicators is None:
+                df_with_indicators = self.calculate_indicators(df)
+            if not self._check_technical_conditions(df, df_with_indicators): return None
+            
+            # 构建结果
+            result = self._build_screener_result(
+                code, df, snapshot_row,
+                df_with_indicators=df_with_indicators,
+                natr=natr,
+                rsi=rsi_value if self.strategy_prefilter.enabled else None
+            )
+            if result:
+                logger.debug(f"股票 {code} 通过筛选 (RSI={rsi_value:.1f}, 历史天数={history_days})")
+            return result
+            
+        except Exception as e:
+            logger.error(f"处理股票 {code} 时出错: {e}")
+            return None
+
+    def screen_frames(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        snapshot_data: Optional[pd.DataFrame] = None,
+        check_listing: bool = False,
+        indicator_panel: Optional[Dict[str, pd.DataFrame]] = None,
+        max_workers: int = 8
+    ) -> List[ScreenerResult]:
+        """
+        对已加载的日线数据执行精筛与行业互斥
+
+        screen() 下载数据后调用本方法；每日流水线直接传入本地已加载的数据。
+
+        Args:
+            frames: {股票代码: 日线数据}
+            snapshot_data: 预剪枝后的快照（提供市值、换手率、名称）
+            check_listing: 是否逐只补查上市天数与 ST
+            indicator_panel: {股票代码: 已计算指标的数据}，缺失的股票在精筛时计算
+            max_workers: 精筛线程数
+
+        Returns:
+            行业互斥后的筛选结果
+        """
+        indicator_panel = indicator_panel or {}
+        
+        # 一次性建立 代码 -> 快照行 索引，避免每只股票全表扫描快照
+        snapshot_rows = self._build_snapshot_index(snapshot_data, list(frames.keys()))
+        
+        # ========== 多线程并行筛选 (带进度条) ==========
+        logger.info(f"启动多线程分析，正在处理 {len(frames)} 只股票...")
+        results: List[ScreenerResult] = []
+        
+        # 使用线程池 + tqdm 进度条
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 提交任务
+            futures = [
+                executor.submit(
+                    self.screen_stock, code, raw_df, snapshot_rows.get(code),
+                    check_listing, indicator_panel.get(code)
+                )
+                for code, raw_df in frames.items()
+            ]
+            
+            # 使用 tqdm 包裹 as_completed，显示进度条
+            # ncols=100 控制宽度，desc 是前缀文字
+            for future in tqdm(concurrent.futures.as_completed(futures), total=len(futures), desc="正在精筛", ncols=100):
+                try:
+                    res = future.result()
+                    if res:
+                        results.append(res)
+                except Exception:
+                    pass
+
+        logger.info(f"精筛完成: {len(results)} 只股票通过")
+        
+        # ========== 行业互斥 ==========
+        return self._apply_industry_diversification(results)
+
     def screen(self, stock_pool: Optional[List[str]] = None) -> List[ScreenerResult]:
         """
         执行筛选（两阶段优化 + 多线程并发加速）
@@ -927,6 +1171,10 @@ class Screener:
         """
         logger.info("开始执行选股筛选 (多线程加速版)...")
         
+        # 行业映射表过期时后台刷新，本次筛选继续使用旧表
+        if self.industry_diversification.enabled:
+            self.industry_map.refresh_if_stale(background=True)
+        
         # ========== 第零阶段：大盘滤网检查 ==========
         if not self._check_market_condition():
             logger.warning("大盘环境不佳（沪深300 < MA20），建议空仓观望，返回空列表")
@@ -938,17 +1186,7 @@ class Screener:
         if stock_pool is None:
             logger.info("第一阶段：获取全市场快照进行预剪枝...")
             
-            from core.data_feed import LiquidityFilter as DFLiquidityFilter
-            df_filter = DFLiquidityFilter(
-                min_market_cap=self.liquidity_filter.min_market_cap,
-                max_market_cap=self.liquidity_filter.max_market_cap,
-                min_turnover_rate=self.liquidity_filter.min_turnover_rate,
-                max_turnover_rate=self.liquidity_filter.max_turnover_rate,
-                exclude_st=self.liquidity_filter.exclude_st,
-                min_listing_days=self.liquidity_filter.min_listing_days
-            )
-            
-            snapshot_data = self.data_feed.get_market_snapshot(liquidity_filter=df_filter)
+            snapshot_data = self.get_liquidity_snapshot()
             
             if snapshot_data is None or snapshot_data.empty:
                 logger.warning("预剪枝后无候选股票")
@@ -981,92 +1219,12 @@ class Screener:
             logger.warning("无法获取历史数据")
             return []
         
-        # ========== 第三阶段：多线程并行筛选 (带进度条) ==========
-        logger.info(f"启动多线程分析，正在处理 {len(historical_data)} 只股票...")
-        results: List[ScreenerResult] = []
-        
-        # 定义单只股票的处理逻辑（闭包函数）
-        def process_single_stock(item):
-            code, raw_df = item
-            try:
-                # 清洗数据
-                df = self.data_feed.clean_data(raw_df)
-                if df is None or df.empty: return None
-                
-                # 获取快照行
-                snapshot_row = None
-                if snapshot_data is not None and not snapshot_data.empty:
-                    match = snapshot_data[snapshot_data['code'] == code]
-                    if not match.empty: snapshot_row = match.iloc[0]
-                
-                # 上市天数过滤 (自选池模式补查)
-                if stock_pool is not None:
-                    if not self._check_listing_days(code, self.liquidity_filter.min_listing_days): return None
-                    if snapshot_row is not None and self._check_st_stock(snapshot_row.get('name', '')): return None
-                
-                # 财报窗口期检查（不再强制剔除，只标记）
-                # 注：财报窗口期的股票会在结果中标记 in_report_window=True
-                # 由信号生成器决定是否过滤
-                
-                # 波动率过滤（NATR）- 硬性剔除"织布机"和"妖股"
-                if self.volatility_filter.enabled:
-                    natr = self._calculate_natr(df)
-                    if natr > 0:  # 只有计算成功才过滤
-                        if natr < self.volatility_filter.min_natr:
-                            logger.debug(f"股票 {code} NATR={natr:.2f}% < {self.volatility_filter.min_natr}%，波动率过低（织布机），剔除")
-                            return None
-                        if natr > self.volatility_filter.max_natr:
-                            logger.debug(f"股票 {code} NATR={natr:.2f}% > {self.volatility_filter.max_natr}%，波动率过高（妖股），剔除")
-                            return None
-                
-                # 趋势安全过滤 - 防止在极端下跌趋势中抄底
-                is_trend_safe, trend_warning = self._check_trend_safety(df)
-                if not is_trend_safe:
-                    logger.debug(f"股票 {code} {trend_warning}，剔除")
-                    return None
-                
-                # 策略预筛 - 根据策略类型进行针对性预筛
-                pass_prefilter, rsi_value, history_days = self._check_strategy_prefilter(df)
-                if not pass_prefilter:
-                    logger.debug(f"股票 {code} 未通过策略预筛，剔除")
-                    return None
-                
-                # MA60 趋势过滤（可选，RSI策略不需要）
-                if self.liquidity_filter.require_ma60_uptrend:
-                    if not self._check_ma60_trend(df): return None
-                
-                # 技术指标条件过滤
-                if not self._check_technical_conditions(df): return None
-                
-                # 构建结果
-                result = self._build_screener_result(code, df, snapshot_row)
-                if result:
-                    logger.debug(f"股票 {code} 通过筛选 (RSI={rsi_value:.1f}, 历史天数={history_days})")
-                return result
-                
-            except Exception as e:
-                logger.error(f"处理股票 {code} 时出错: {e}")
-                return None
-
-        # 使用线程池 + tqdm 进度条
-        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-            # 提交任务
-            futures = [executor.submit(process_single_stock, item) for item in historical_data.items()]
-            
-            # 使用 tqdm 包裹 as_completed，显示进度条
-            # ncols=100 控制宽度，desc 是前缀文字
-            for future in tqdm(concurrent.futures.as_completed(futures), total=len(futures), desc="正在精筛", ncols=100):
-                try:
-                    res = future.result()
-                    if res:
-                        results.append(res)
-                except Exception:
-                    pass
-
-        logger.info(f"精筛完成: {len(results)} 只股票通过")
-        
-        # ========== 第四阶段：行业互斥 ==========
-        final_results = self._apply_industry_diversification(results)
+        # ========== 第三、四阶段：多线程精筛 + 行业互斥 ==========
+        final_results = self.screen_frames(
+            historical_data,
+            snapshot_data=snapshot_data,
+            check_listing=stock_pool is not None
+        )
         
         logger.info(f"筛选完成: 最终 {len(final_results)} 只股票")
         
@@ -11,13 +11,14 @@ Requirements: 3.1, 3.2, 3.3, 3.4, 3.5
 
 import logging
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import date
 import numpy as np
 import pandas as pd
 
 from core.position_tracker import Holding, PositionTracker
 from core.data_feed import DataFeed
+from core.exit_features import PortfolioBars, load_frames
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +47,30 @@ class SellSignal:
     urgency: str  # high, medium, low
     indicator_value: float
 
+    def to_trading_signal(self):
+        """
+        转换为卖出方向的 TradingSignal（用于与买入信号一起推送通知）
+
+        Returns:
+            TradingSignal
+        """
+        from core.signal_generator import SignalType, TradingSignal
+
+        return TradingSignal(
+            code=self.code,
+            name=self.name,
+            signal_type=SignalType.SELL,
+            price_range=(self.current_price, self.current_price),
+            limit_cap=self.current_price,
+            reason=self.exit_reason,
+            generated_at=date.today(),
+            trade_amount=self.current_price * self.holding.quantity,
+            high_fee_warning=False,
+            actual_fee_rate=0.0,
+            news_url="",
+            in_report_window=False,
+        )
+
 
 class SellSignalChecker:
     """
@@ -73,31 +98,30 @@ class SellSignalChecker:
     RSRS_M_PERIOD = 600              # 标准化窗口
     RSRS_MIN_HISTORY = 50            # 最小历史数据
     
-    def __init__(self, data_feed: DataFeed):
+    def __init__(self, data_feed: DataFeed, max_workers: int = 8):
         """
         初始化卖出信号检查器
         
         Args:
             data_feed: 数据源
+            max_workers: 并行加载持仓数据的线程数
         """
         self.data_feed = data_feed
+        self.max_workers = max_workers
     
-    def check_all_positions(self, positions: List[Holding]) -> List[SellSignal]:
+    def check_all_positions(self, positions: List[Holding],
+                            frames: Optional[Dict[str, pd.DataFrame]] = None) -> List[SellSignal]:
         """
         检查所有持仓的卖出信号
         
         Args:
             positions: 持仓列表
+            frames: 已加载的行情数据 {code: DataFrame}，提供时不再从数据源读取
         
         Returns:
             卖出信号列表
         """
-        signals = []
-        
-        for holding in positions:
-            signal = self.check_single_position(holding)
-            if signal:
-                signals.append(signal)
+        signals = [s for s in self.evaluate_positions(positions, frames) if s is not None]
         
         # 按紧急程度排序：high > medium > low
         urgency_order = {'high': 0, 'medium': 1, 'low': 2}
@@ -105,6 +129,89 @@ class SellSignalChecker:
         
         return signals
     
+    def evaluate_positions(self, positions: List[Holding],
+                           frames: Optional[Dict[str, pd.DataFrame]] = None) -> List[Optional[SellSignal]]:
+        """
+        批量评估所有持仓的卖出信号
+        
+        一次并行加载全部持仓数据，ATR / RSI / RSRS 按持仓矩阵向量化计算，
+        止损与策略规则以数组掩码应用；结果与逐只调用 check_single_position 一致。
+        
+        Args:
+            positions: 持仓列表
+            frames: 已加载的行情数据 {code: DataFrame}，不在其中的持仓从数据源加载
+        
+        Returns:
+            与 positions 一一对应的 SellSignal 或 None
+        """
+        results: List[Optional[SellSignal]] = [None] * len(positions)
+        if not positions:
+            return results
+        
+        given = {code: df for code, df in (frames or {}).items() if df is not None and not df.empty}
+        missing = [h.code for h in positions if h.code not in given]
+        frames = {**given, **load_frames(self.data_feed, missing, self.max_workers)}
+        indices = []
+        for i, holding in enumerate(positions):
+            if holding.code in frames:
+                indices.append(i)
+            else:
+                logger.warning(f"无法加载股票数据: {holding.code}")
+        if not indices:
+            return results
+        
+        held = [positions[i] for i in indices]
+        bars = PortfolioBars([frames[h.code] for h in held])
+        
+        # 持仓特征
+        current_price = bars.last('close')
+        buy_price = np.array([h.buy_price for h in held], dtype=float)
+        pnl_pct = (current_price - buy_price) / buy_price
+        strategy = np.array([h.strategy for h in held])
+        atr = bars.atr(self.ATR_PERIOD)
+        avg_gain, avg_loss = bars.rsi_averages(14)
+        rsi = 100 - (100 / (1 + avg_gain / np.where(avg_loss == 0, 0.000001, avg_loss)))
+        rsrs = np.full(len(held), np.nan)
+        if (strategy == "RSRS").any():
+            rsrs = bars.rsrs_scores(self.RSRS_N_PERIOD, self.RSRS_M_PERIOD, self.RSRS_MIN_HISTORY)
+        
+        # 规则掩码（按优先级互斥）
+        with np.errstate(invalid='ignore'):
+            hard_stop = pnl_pct <= self.HARD_STOP_LOSS
+            atr_stop = (
+                ~hard_stop
+                & (bars.lengths >= self.ATR_PERIOD + 1)
+                & (atr > 0)
+                & (current_price <= buy_price - atr * self.ATR_MULTIPLIER)
+            )
+            remaining = ~hard_stop & ~atr_stop
+            rsrs_sell = (
+                remaining & (strategy == "RSRS")
+                & (bars.lengths >= self.RSRS_MIN_HISTORY)
+                & (rsrs < self.RSRS_SELL_THRESHOLD)
+            )
+            rsi_sell = (
+                remaining & (strategy == "RSI")
+                & (bars.lengths >= 20)
+                & (rsi > self.RSI_SELL_THRESHOLD)
+            )
+        
+        for j, holding in enumerate(held):
+            price, pnl = float(current_price[j]), float(pnl_pct[j])
+            if hard_stop[j]:
+                signal = self._check_hard_stop_loss(holding, price, pnl)
+            elif atr_stop[j]:
+                signal = self._atr_stop_signal(holding, price, pnl, float(atr[j]))
+            elif rsrs_sell[j]:
+                signal = self._rsrs_sell_signal(holding, price, pnl, float(rsrs[j]))
+            elif rsi_sell[j]:
+                signal = self._rsi_sell_signal(holding, price, pnl, float(rsi[j]))
+            else:
+                signal = None
+            results[indices[j]] = signal
+        
+        return results
+    
     def check_single_position(self, holding: Holding) -> Optional[SellSignal]:
         """
         检查单个持仓的卖出信号
@@ -213,6 +320,16 @@ class SellSignalChecker:
         if atr is None or atr <= 0:
             return None
         
+        return self._atr_stop_signal(holding, current_price, pnl_pct, atr)
+    
+    def _atr_stop_signal(
+        self,
+        holding: Holding,
+        current_price: float,
+        pnl_pct: float,
+        atr: float
+    ) -> Optional[SellSignal]:
+        """价格跌破 ATR 止损价时生成信号"""
         # 计算 ATR 止损价
         atr_stop_price = holding.buy_price - (atr * self.ATR_MULTIPLIER)
         atr_stop_pct = (atr_stop_price / holding.buy_price - 1) * 100
@@ -294,6 +411,16 @@ class SellSignalChecker:
         if rsrs_score is None:
             return None
         
+        return self._rsrs_sell_signal(holding, current_price, pnl_pct, rsrs_score)
+    
+    def _rsrs_sell_signal(
+        self,
+        holding: Holding,
+        current_price: float,
+        pnl_pct: float,
+        rsrs_score: float
+    ) -> Optional[SellSignal]:
+        """RSRS 标准分低于阈值时生成信号"""
         if rsrs_score < self.RSRS_SELL_THRESHOLD:
             return SellSignal(
                 code=holding.code,
@@ -338,6 +465,16 @@ class SellSignalChecker:
         if rsi is None:
             return None
         
+        return self._rsi_sell_signal(holding, current_price, pnl_pct, rsi)
+    
+    def _rsi_sell_signal(
+        self,
+        holding: Holding,
+        current_price: float,
+        pnl_pct: float,
+        rsi: float
+    ) -> Optional[SellSignal]:
+        """RSI 超买时生成止盈信号"""
         if rsi > self.RSI_SELL_THRESHOLD:
             return SellSignal(
                 code=holding.code,
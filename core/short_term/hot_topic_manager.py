@@ -19,6 +19,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 
+from core.keyword_matcher import KeywordMatcher
+
 
 @dataclass
 class HotTopic:
@@ -138,6 +140,8 @@ class HotTopicManager:
         """
         self.config_path = config_path or self.DEFAULT_CONFIG_PATH
         self.topics: List[HotTopic] = []
+        self._matcher: Optional[KeywordMatcher] = None
+        self._matcher_keywords: Optional[tuple] = None
         self._load_or_init_config()
     
     def _load_or_init_config(self):
@@ -192,6 +196,15 @@ class HotTopicManager:
         with open(self.config_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
     
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """全部题材关键词编译的匹配器（标签为题材序号，题材关键词变化后重建）"""
+        keywords = tuple(tuple(t.keywords) for t in self.topics)
+        if self._matcher is None or keywords != self._matcher_keywords:
+            self._matcher = KeywordMatcher(dict(enumerate(keywords)))
+            self._matcher_keywords = keywords
+        return self._matcher
+    
     def get_active_topics(self) -> List[HotTopic]:
         """获取当前有效的热点题材"""
         return [t for t in self.topics if t.is_active()]
@@ -304,19 +317,44 @@ class HotTopicManager:
             匹配到的热点列表
         """
         search_text = f"{stock_name} {sector} {' '.join(concepts or [])}"
+        return self._topics_from_hits(self.keyword_matcher.match(search_text))
+    
+    def match_stock_topics_batch(self,
+                                 stock_names: List[str],
+                                 sectors: List[str],
+                                 concepts: List[List[str]] = None) -> List[List[Dict]]:
+        """
+        批量匹配股票所属的热点题材（结果同逐只调用 match_stock_topics）
+        
+        Args:
+            stock_names: 股票名称列
+            sectors: 所属板块列
+            concepts: 概念标签列
+        
+        Returns:
+            每只股票匹配到的热点列表
+        """
+        concepts = concepts if concepts is not None else [None] * len(stock_names)
+        search_texts = [
+            f"{name} {sector} {' '.join(stock_concepts or [])}"
+            for name, sector, stock_concepts in zip(stock_names, sectors, concepts)
+        ]
+        return [self._topics_from_hits(hits) for hits in self.keyword_matcher.match_many(search_texts)]
+    
+    def _topics_from_hits(self, hits: Dict[int, List[str]]) -> List[Dict]:
+        """由匹配器命中结果生成有效题材列表（每个题材取其第一个命中关键词）"""
         matched = []
         
-        for topic in self.get_active_topics():
-            for keyword in topic.keywords:
-                if keyword in search_text:
-                    matched.append({
-                        'name': topic.name,
-                        'keyword': keyword,
-                        'weight': topic.weight,
-                        'heat_score': topic.heat_score,
-                        'days_remaining': topic.days_remaining()
-                    })
-                    break
+        for i, keywords in hits.items():
+            topic = self.topics[i]
+            if topic.is_active():
+                matched.append({
+                    'name': topic.name,
+                    'keyword': keywords[0],
+                    'weight': topic.weight,
+                    'heat_score': topic.heat_score,
+                    'days_remaining': topic.days_remaining()
+                })
         
         # 按热度排序
         matched.sort(key=lambda x: x['heat_score'], reverse=True)
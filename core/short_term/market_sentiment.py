@@ -81,6 +81,23 @@ class MarketSentimentAnalyzer:
         self.sentiment_data = data
         self.last_update = datetime.now()
     
+    def update_from_limit_events(self, limit_index, trade_date=None) -> bool:
+        """
+        从全市场涨跌停索引更新市场数据（core.limit_events.LimitEventIndex）
+        
+        Args:
+            limit_index: 涨跌停事件索引
+            trade_date: 交易日，默认索引中最新交易日
+        
+        Returns:
+            索引中是否有该交易日数据
+        """
+        data = limit_index.sentiment_data(trade_date)
+        if data is None:
+            return False
+        self.update_data(data)
+        return True
+    
     def calculate_limit_ratio(self) -> Tuple[float, str]:
         """
         计算涨跌停比
@@ -18,11 +18,14 @@ Requirements: 6.1, 6.2, 6.3, 6.4, 6.5, 6.6, 12.1, 12.2
 """
 
 import logging
-from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple, Dict
 from enum import Enum
 from datetime import date, datetime
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 try:
     import backtrader as bt
@@ -98,6 +101,26 @@ class TradingSignal:
     signal_strength: float = 50.0     # 信号强度评分（0-100，默认50）
 
 
+@dataclass
+class SignalRunContext:
+    """
+    单次信号生成的运行上下文
+
+    generate_signals 开始时快照一次全局配置与策略参数，
+    所有股票共享同一份，避免逐只股票重复读取配置文件。
+
+    Attributes:
+        settings: 全局配置快照（get_settings()）
+        strategy_params: 策略参数快照（load_strategy_params()）
+        frames: 已加载的历史数据 {code: DataFrame}
+        rsrs_scores: 批量计算的 RSRS 标准分 {code: score}
+    """
+    settings: Any
+    strategy_params: Any
+    frames: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    rsrs_scores: Dict[str, float] = field(default_factory=dict)
+
+
 class SignalGenerator:
     """
     每日交易信号生成器
@@ -130,7 +153,8 @@ class SignalGenerator:
         self, 
         data_feed: DataFeed, 
         strategy_class: Optional[type] = None,
-        strategy_type: StrategyType = StrategyType.RSRS
+        strategy_type: StrategyType = StrategyType.RSRS,
+        max_workers: int = 8
     ):
         """
         初始化信号生成器
@@ -139,10 +163,12 @@ class SignalGenerator:
             data_feed: 数据获取模块实例
             strategy_class: 策略类（可选，用于获取策略参数）
             strategy_type: 策略类型，默认为趋势滤网 MACD 策略
+            max_workers: 并行加载与分析的线程数
         """
         self.data_feed = data_feed
         self.strategy_class = strategy_class
         self.strategy_type = strategy_type
+        self.max_workers = max_workers
         self.report_checker = ReportChecker()
         
         # 缓存股票名称，避免重复查询
@@ -152,21 +178,24 @@ class SignalGenerator:
         self, 
         stock_pool: List[str],
         current_cash: float = None,
-        current_positions: int = 0
+        current_positions: int = 0,
+        frames: Optional[Dict[str, pd.DataFrame]] = None
     ) -> List[TradingSignal]:
         """
         生成每日交易信号
         
         流程：
-        1. 获取股票名称（批量查询，提高效率）
-        2. 对每只股票：
-           a. 加载历史数据
-           b. 检查财报窗口期（硬风控）
-           c. 计算技术指标，判断信号
-           d. 计算资金和费率
-           e. 生成辅助信息（新闻链接、限价上限）
-        3. 计算信号质量评分
-        4. 按质量评分排序返回
+        1. 快照全局配置与策略参数（每次运行只读取一次）
+        2. 获取股票名称（批量查询，提高效率）
+        3. 线程池并行加载历史数据
+        4. 全股票池批量计算技术指标（RSRS 标准分）
+        5. 线程池并行分析每只股票：
+           a. 检查财报窗口期（硬风控）
+           b. 判断信号
+           c. 计算资金和费率
+           d. 生成辅助信息（新闻链接、限价上限）
+        6. 计算信号质量评分
+        7. 按质量评分排序返回
         
         设计原则：把决策权还给人，系统只做硬风控
         
@@ -174,6 +203,8 @@ class SignalGenerator:
             stock_pool: 候选股票池（通常来自 Screener 的输出）
             current_cash: 当前可用现金，默认使用配置的初始资金
             current_positions: 当前持仓只数，默认为 0
+            frames: 已加载的历史数据 {code: DataFrame}，提供时不再从数据源读取
+                    （不在其中的股票仍从数据源加载）
         
         Returns:
             交易信号列表（按质量评分排序）
@@ -188,28 +219,54 @@ class SignalGenerator:
         
         logger.info(f"开始生成交易信号，候选股票数: {len(stock_pool)}")
         
+        # 快照配置与策略参数，本次运行所有股票共享
+        context = SignalRunContext(
+            settings=get_settings(),
+            strategy_params=load_strategy_params()
+        )
+        
         # 使用配置的初始资金作为默认值
         if current_cash is None:
-            settings = get_settings()
-            current_cash = settings.fund.initial_capital
+            current_cash = context.settings.fund.initial_capital
         
         # 批量获取股票名称
         self._stock_names_cache = self.data_feed.get_stock_names_batch(stock_pool)
-
-        for code in stock_pool:
+        
+        codes = list(dict.fromkeys(stock_pool))
+        
+        # 并行加载历史数据（调用方已加载的数据直接校验使用）
+        def load(code: str) -> Optional[pd.DataFrame]:
+            if frames is not None and code in frames:
+                return self._check_signal_data(code, frames[code])
+            return self._load_signal_data(code)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            loaded = list(executor.map(load, codes))
+        context.frames = {code: df for code, df in zip(codes, loaded) if df is not None}
+        
+        # 批量计算指标（使用 T-1 及之前的数据）
+        if self.strategy_type != StrategyType.RSI_REVERSAL:
+            context.rsrs_scores = self._compute_rsrs_scores(
+                {code: df.iloc[:-1] for code, df in context.frames.items()},
+                context.strategy_params
+            )
+        
+        def analyze(code: str) -> Optional[TradingSignal]:
             try:
-                signal = self._analyze_stock(
+                return self._analyze_stock(
                     code=code,
                     current_cash=current_cash,
-                    current_positions=current_positions
+                    current_positions=current_positions,
+                    context=context
                 )
-                
-                if signal is not None:
-                    signals.append(signal)
-                    
             except Exception as e:
                 logger.error(f"生成信号失败 {code}: {e}")
-                continue
+                return None
+        
+        # 并行分析，结果保持股票池顺序
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(analyze, context.frames.keys()))
+        signals = [signal for signal in results if signal is not None]
         
         # 优化排序：按信号质量综合评分排序
         signals = self._sort_signals_by_quality(signals)
@@ -217,11 +274,45 @@ class SignalGenerator:
         logger.info(f"信号生成完成: 共 {len(signals)} 个信号")
         return signals
 
+    def _load_signal_data(self, code: str) -> Optional[pd.DataFrame]:
+        """
+        加载单只股票历史数据并检查数据量
+        
+        Returns:
+            DataFrame 或 None（无数据、数据不足或加载失败时）
+        """
+        try:
+            df = self.data_feed.load_processed_data(code)
+        except Exception as e:
+            logger.error(f"生成信号失败 {code}: {e}")
+            return None
+        
+        return self._check_signal_data(code, df)
+
+    def _check_signal_data(self, code: str, df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """
+        检查单只股票历史数据是否可用于生成信号
+        
+        Returns:
+            DataFrame 或 None（无数据或数据不足时）
+        """
+        if df is None or df.empty:
+            logger.warning(f"无法加载数据，跳过: {code}")
+            return None
+        
+        # 确保数据足够（至少需要 61 天，因为要用 T-1 数据）
+        if len(df) < 61:
+            logger.warning(f"数据不足（{len(df)} 条），跳过: {code}")
+            return None
+        
+        return df
+
     def _analyze_stock(
         self,
         code: str,
         current_cash: float,
-        current_positions: int
+        current_positions: int,
+        context: Optional[SignalRunContext] = None
     ) -> Optional[TradingSignal]:
         """
         分析单只股票，生成交易信号
@@ -235,20 +326,23 @@ class SignalGenerator:
             code: 股票代码
             current_cash: 当前可用现金
             current_positions: 当前持仓只数
+            context: 运行上下文（已加载数据与批量指标），为 None 时单独加载
         
         Returns:
             TradingSignal 或 None（无信号时）
         """
-        # 1. 加载历史数据
-        df = self.data_feed.load_processed_data(code)
-        if df is None or df.empty:
-            logger.warning(f"无法加载数据，跳过: {code}")
-            return None
+        if context is None:
+            context = SignalRunContext(
+                settings=get_settings(),
+                strategy_params=load_strategy_params()
+            )
         
-        # 确保数据足够（至少需要 61 天，因为要用 T-1 数据）
-        if len(df) < 61:
-            logger.warning(f"数据不足（{len(df)} 条），跳过: {code}")
-            return None
+        # 1. 加载历史数据
+        df = context.frames.get(code)
+        if df is None:
+            df = self._load_signal_data(code)
+            if df is None:
+                return None
         
         # 2. 【重要】使用 T-1 日数据生成信号，避免未来函数
         # df.iloc[-1] 是最新数据（T日），df.iloc[-2] 是前一天数据（T-1日）
@@ -269,14 +363,18 @@ class SignalGenerator:
         is_in_window, report_warning = self.report_checker.check_report_window(code)
         
         # 5. 计算技术指标，判断信号（使用 T-1 及之前的数据）
-        signal_type, reason, signal_strength = self._check_signal_conditions(signal_df)
+        signal_type, reason, signal_strength = self._check_signal_conditions(
+            signal_df,
+            strategy_params=context.strategy_params,
+            rsrs_score=context.rsrs_scores.get(code)
+        )
         
         if signal_type is None:
             logger.debug(f"无交易信号: {code}")
             return None
         
         # 6. 计算资金和费率（使用最新价格）
-        settings = get_settings()
+        settings = context.settings
         max_shares, high_fee_warning, reject_reason = calculate_max_shares(
             cash=current_cash,
             price=latest_price,
@@ -342,7 +440,9 @@ class SignalGenerator:
 
     def _check_signal_conditions(
         self, 
-        df: pd.DataFrame
+        df: pd.DataFrame,
+        strategy_params: Any = None,
+        rsrs_score: Optional[float] = None
     ) -> Tuple[Optional[SignalType], str, float]:
         """
         检查技术指标条件，判断信号类型
@@ -351,87 +451,120 @@ class SignalGenerator:
         
         Args:
             df: 股票历史数据 DataFrame
+            strategy_params: 策略参数快照，为 None 时从共享配置加载
+            rsrs_score: 已批量计算的 RSRS 标准分（可选）
         
         Returns:
             (信号类型, 信号依据, 信号强度) 或 (None, "", 0.0) 无信号时
         """
         if self.strategy_type == StrategyType.RSI_REVERSAL:
-            return self._check_rsi_reversal_conditions(df)
+            return self._check_rsi_reversal_conditions(df, strategy_params)
         else:
-            return self._check_rsrs_conditions(df)
+            return self._check_rsrs_conditions(df, strategy_params, rsrs_score)
 
-    def _check_rsrs_conditions(
-        self, 
-        df: pd.DataFrame
-    ) -> Tuple[Optional[SignalType], str, float]:
+    def _compute_rsrs_scores(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        strategy_params: Any = None
+    ) -> Dict[str, float]:
         """
-        RSRS 阻力支撑相对强度策略
+        批量计算 RSRS 标准分
         
         计算步骤：
         1. 取过去 N 天的 High/Low 数据，做线性回归，得到斜率 Beta
-        2. 将 Beta 标准化（Z-Score），与过去 M 天的历史比较
-        3. RSRS 标准分 > buy_threshold 买入，< sell_threshold 卖出
+        2. 将最近 M 个 Beta 标准化（Z-Score）
         
-        参数从共享配置加载，与回测页面保持一致
+        标准分只依赖最近 M 个 Beta，因此每只股票只截取最后 M+N-1 行；
+        截取长度相同的股票堆叠为 codes × days 矩阵，用滑动窗口一次算出全部 Beta。
+        
+        Args:
+            frames: {code: 历史数据}，需包含 high/low 列
+            strategy_params: 策略参数快照，为 None 时从共享配置加载
         
         Returns:
-            (信号类型, 信号依据, 信号强度)
-            信号强度基于 RSRS 标准分的绝对值，范围 0-100
+            {code: RSRS 标准分}，数据不足的股票不在结果中
         """
-        # 从共享配置加载参数
-        strategy_params = load_strategy_params()
+        if strategy_params is None:
+            strategy_params = load_strategy_params()
         n_period = strategy_params.rsrs_n_period      # 斜率计算窗口
         m_period = strategy_params.rsrs_m_period      # 标准化窗口
-        buy_threshold = strategy_params.rsrs_buy_threshold
-        sell_threshold = strategy_params.rsrs_sell_threshold
+        min_rows = max(n_period, 100)                 # 至少需要 100 天数据
+        max_rows = m_period + n_period - 1
         
-        if len(df) < max(n_period, 100):  # 至少需要 100 天数据
-            return None, "", 0.0
-        
-        import numpy as np
-        
-        high = df['high'].values
-        low = df['low'].values
+        # 按截取长度分组
+        groups: Dict[int, List[str]] = {}
+        for code, df in frames.items():
+            if len(df) < min_rows:
+                continue
+            groups.setdefault(min(len(df), max_rows), []).append(code)
         
-        # 计算所有历史的 beta 值
-        betas = []
-        for i in range(n_period, len(df) + 1):
-            h = high[i-n_period:i]
-            l = low[i-n_period:i]
+        scores: Dict[str, float] = {}
+        for rows, codes in groups.items():
+            if rows - n_period + 1 < 2:
+                continue
+            
+            high = np.vstack([frames[code]['high'].to_numpy(dtype=float)[-rows:] for code in codes])
+            low = np.vstack([frames[code]['low'].to_numpy(dtype=float)[-rows:] for code in codes])
+            
+            # (codes, windows, n_period)
+            h = sliding_window_view(high, n_period, axis=1)
+            l = sliding_window_view(low, n_period, axis=1)
             
             # 线性回归：Y = High, X = Low
-            x_mean = np.mean(l)
-            y_mean = np.mean(h)
+            x_dev = l - l.mean(axis=2, keepdims=True)
+            y_dev = h - h.mean(axis=2, keepdims=True)
+            numerator = (x_dev * y_dev).sum(axis=2)
+            denominator = (x_dev ** 2).sum(axis=2)
             
-            numerator = np.sum((l - x_mean) * (h - y_mean))
-            denominator = np.sum((l - x_mean) ** 2)
+            valid = denominator != 0
+            betas = np.where(valid, numerator / np.where(valid, denominator, 1.0), 1.0)
             
-            if denominator != 0:
-                beta = numerator / denominator
-            else:
-                beta = 1.0
+            # 标准化（Z-Score）
+            mean_beta = betas.mean(axis=1)
+            std_beta = betas.std(axis=1)
+            positive = std_beta > 0
+            group_scores = np.where(
+                positive,
+                (betas[:, -1] - mean_beta) / np.where(positive, std_beta, 1.0),
+                0.0
+            )
             
-            betas.append(beta)
+            scores.update(zip(codes, group_scores.tolist()))
         
-        if len(betas) < 2:
-            return None, "", 0.0
+        return scores
+
+    def _check_rsrs_conditions(
+        self, 
+        df: pd.DataFrame,
+        strategy_params: Any = None,
+        rsrs_score: Optional[float] = None
+    ) -> Tuple[Optional[SignalType], str, float]:
+        """
+        RSRS 阻力支撑相对强度策略
         
-        # 当前 beta
-        current_beta = betas[-1]
+        RSRS 标准分 > buy_threshold 买入，< sell_threshold 卖出
+        （标准分计算见 _compute_rsrs_scores）
         
-        # 标准化（Z-Score）
-        if len(betas) >= m_period:
-            recent_betas = betas[-m_period:]
-        else:
-            recent_betas = betas
+        参数从共享配置加载，与回测页面保持一致
         
-        mean_beta = np.mean(recent_betas)
-        std_beta = np.std(recent_betas)
+        Args:
+            df: 股票历史数据 DataFrame
+            strategy_params: 策略参数快照，为 None 时从共享配置加载
+            rsrs_score: 已批量计算的标准分，为 None 时单独计算
         
-        if std_beta > 0:
-            rsrs_score = (current_beta - mean_beta) / std_beta
-        else:
-            rsrs_score = 0
+        Returns:
+            (信号类型, 信号依据, 信号强度)
+            信号强度基于 RSRS 标准分的绝对值，范围 0-100
+        """
+        if strategy_params is None:
+            strategy_params = load_strategy_params()
+        buy_threshold = strategy_params.rsrs_buy_threshold
+        sell_threshold = strategy_params.rsrs_sell_threshold
+        
+        if rsrs_score is None:
+            rsrs_score = self._compute_rsrs_scores({'': df}, strategy_params).get('')
+            if rsrs_score is None:
+                return None, "", 0.0
         
         # 计算信号强度（基于 RSRS 标准分的绝对值）
         # RSRS 标准分范围通常在 -3 到 3 之间
@@ -586,7 +719,8 @@ class SignalGenerator:
 
     def _check_rsi_reversal_conditions(
         self, 
-        df: pd.DataFrame
+        df: pd.DataFrame,
+        strategy_params: Any = None
     ) -> Tuple[Optional[SignalType], str, float]:
         """
         RSI 超卖反弹策略（增强版）
@@ -608,7 +742,8 @@ class SignalGenerator:
             return None, "", 0.0
         
         # 从共享配置加载参数
-        strategy_params = load_strategy_params()
+        if strategy_params is None:
+            strategy_params = load_strategy_params()
         rsi_buy_threshold = strategy_params.rsi_buy_threshold
         rsi_sell_threshold = strategy_params.rsi_sell_threshold
         
@@ -1,22 +1,24 @@
 """
 MiniQuant-Lite 历史信号存储模块
 
-负责将交易信号持久化到单一 CSV 文件，支持：
+负责将交易信号持久化到嵌入式 SQLite 数据库，支持：
 - 幂等覆盖更新（每日多次生成只保留最后一次）
-- 按日期范围、股票代码、信号类型筛选
+- 按日期范围、股票代码、信号类型筛选（索引查询），分页读取
 - 统计计算和 CSV 导出
 
 设计原则：
-- 单文件存储，简单粗暴
-- 幂等写入，每日覆盖更新
-- Pandas 读取 2.6 万行仅需 0.01 秒
+- 单文件数据库，按日删除+插入在一个事务内完成，写入成本与历史总量无关
+- 索引 (generated_date, code, signal_type) 与 (code, generated_date)，查询只读取命中行
+- 旧版 CSV（data/signal_history.csv）在数据库为空时自动迁移一次
 
 Requirements: 1.1-1.5, 2.1-2.5, 4.2-4.4, 5.2
 """
 
 import logging
+import sqlite3
+import threading
 from dataclasses import dataclass
-from typing import List, Optional, TYPE_CHECKING
+from typing import List, Optional, Tuple, TYPE_CHECKING
 from datetime import date
 from pathlib import Path
 import pandas as pd
@@ -33,7 +35,7 @@ class SignalRecord:
     """
     历史信号记录数据类
     
-    用于表示存储在 CSV 中的单条信号记录
+    用于表示存储的单条信号记录
     
     Requirements: 1.2
     """
@@ -55,45 +57,109 @@ class SignalStore:
     信号存储模块
     
     设计原则：
-    - 单文件存储，简单粗暴
+    - 单文件 SQLite 数据库，带索引
     - 幂等写入，每日覆盖更新
     
     Requirements: 1.1-1.5, 2.1-2.5, 4.2-4.4, 5.2
     """
     
-    DEFAULT_PATH = Path("data/signal_history.csv")
+    DEFAULT_PATH = Path("data/signal_history.db")
     
-    # CSV 列定义
+    # 列定义（数据库表与导出 CSV 一致）
     COLUMNS = [
         'generated_date', 'code', 'name', 'signal_type',
         'price_low', 'price_high', 'limit_cap', 'reason',
         'in_report_window', 'high_fee_warning', 'market_status'
     ]
+    BOOL_COLUMNS = ['in_report_window', 'high_fee_warning']
     
-    def __init__(self, file_path: Path = None):
+    def __init__(self, file_path: Path = None, csv_path: Path = None):
         """
         初始化信号存储
         
         Args:
-            file_path: CSV 文件路径，默认为 data/signal_history.csv
+            file_path: 数据库文件路径，默认为 data/signal_history.db；
+                       传入 .csv 路径时数据库建在同目录同名 .db，该 CSV 作为迁移来源
+            csv_path: 待迁移的旧版 CSV 路径，默认为数据库同目录同名 .csv
             
         Requirements: 1.4
         """
-        self.file_path = file_path or self.DEFAULT_PATH
+        file_path = Path(file_path) if file_path is not None else self.DEFAULT_PATH
+        if file_path.suffix == '.csv':
+            csv_path = csv_path or file_path
+            file_path = file_path.with_suffix('.db')
+        self.file_path = file_path
+        self.csv_path = Path(csv_path) if csv_path is not None else file_path.with_suffix('.csv')
+        self._lock = threading.Lock()
         self._ensure_file_exists()
+        self._migrate_csv()
     
     def _ensure_file_exists(self) -> None:
         """
-        确保 CSV 文件存在，不存在则创建空文件并写入表头
+        确保数据库与索引存在
         
         Requirements: 1.4
         """
-        if not self.file_path.exists():
-            self.file_path.parent.mkdir(parents=True, exist_ok=True)
-            pd.DataFrame(columns=self.COLUMNS).to_csv(
-                self.file_path, index=False
+        created = not self.file_path.exists()
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.file_path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS signals ("
+                "id INTEGER PRIMARY KEY, generated_date TEXT NOT NULL, code TEXT NOT NULL, "
+                "name TEXT, signal_type TEXT, price_low REAL, price_high REAL, limit_cap REAL, "
+                "reason TEXT, in_report_window INTEGER, high_fee_warning INTEGER, market_status TEXT)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_signals_date_code_type "
+                "ON signals (generated_date, code, signal_type)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_signals_code_date ON signals (code, generated_date)"
+            )
+        if created:
+            logger.info(f"创建信号历史数据库: {self.file_path}")
+    
+    def _migrate_csv(self) -> int:
+        """
+        数据库为空时导入旧版 CSV 历史
+        
+        Returns:
+            导入的信号数量
+        """
+        if not self.csv_path.exists() or self._count() > 0:
+            return 0
+        try:
+            df = pd.read_csv(self.csv_path, dtype={'code': str})
+        except pd.errors.EmptyDataError:
+            return 0
+        if df.empty:
+            return 0
+        
+        df['generated_date'] = pd.to_datetime(df['generated_date']).dt.date.astype(str)
+        df = df.reindex(columns=self.COLUMNS)
+        self._insert(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+        logger.info(f"从 CSV 迁移 {len(df)} 条历史信号: {self.csv_path}")
+        return len(df)
+    
+    def _count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0]
+    
+    def _insert(self, rows, delete_date: Optional[str] = None) -> None:
+        """单个事务内（可选先删除某日数据）批量插入"""
+        placeholders = ', '.join('?' * len(self.COLUMNS))
+        with self._lock, self._conn:
+            if delete_date is not None:
+                self._conn.execute("DELETE FROM signals WHERE generated_date = ?", (delete_date,))
+            self._conn.executemany(
+                f"INSERT INTO signals ({', '.join(self.COLUMNS)}) VALUES ({placeholders})", rows
             )
-            logger.info(f"创建信号历史文件: {self.file_path}")
+    
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
     
     def save_signals(
         self, 
@@ -104,11 +170,7 @@ class SignalStore:
         """
         保存信号（幂等覆盖更新）
         
-        逻辑：
-        1. 读取现有数据
-        2. 删除该日期的旧数据
-        3. 追加新数据
-        4. 写回文件
+        在一个事务内删除该日期的旧数据并插入新数据。
         
         Args:
             signals: 交易信号列表
@@ -125,56 +187,67 @@ class SignalStore:
             logger.info(f"无信号需要保存: {generated_date}")
             return 0
         
-        # 1. 读取现有数据
-        try:
-            # 指定 code 列为字符串类型，保留前导零
-            existing_df = pd.read_csv(self.file_path, parse_dates=['generated_date'], dtype={'code': str})
-        except (pd.errors.EmptyDataError, FileNotFoundError):
-            existing_df = pd.DataFrame(columns=self.COLUMNS)
-        
-        # 2. 删除该日期的旧数据（幂等覆盖更新）
         date_str = generated_date.isoformat()
-        if not existing_df.empty and 'generated_date' in existing_df.columns:
-            # 转换为字符串进行比较
-            existing_df['generated_date'] = pd.to_datetime(existing_df['generated_date']).dt.date.astype(str)
-            existing_df = existing_df[existing_df['generated_date'] != date_str]
-        
-        # 3. 转换新信号为 DataFrame 记录
-        new_records = []
-        for signal in signals:
-            record = {
-                'generated_date': date_str,
-                'code': signal.code,
-                'name': signal.name,
-                'signal_type': signal.signal_type.value,  # SignalType enum -> str
-                'price_low': signal.price_range[0],
-                'price_high': signal.price_range[1],
-                'limit_cap': signal.limit_cap,
-                'reason': signal.reason,
-                'in_report_window': signal.in_report_window,
-                'high_fee_warning': signal.high_fee_warning,
-                'market_status': market_status
-            }
-            new_records.append(record)
-        
-        new_df = pd.DataFrame(new_records, columns=self.COLUMNS)
-        
-        # 4. 合并并写回文件
-        if existing_df.empty:
-            combined_df = new_df
-        else:
-            combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-        combined_df.to_csv(self.file_path, index=False)
+        rows = [
+            (
+                date_str,
+                signal.code,
+                signal.name,
+                signal.signal_type.value,  # SignalType enum -> str
+                signal.price_range[0],
+                signal.price_range[1],
+                signal.limit_cap,
+                signal.reason,
+                bool(signal.in_report_window),
+                bool(signal.high_fee_warning),
+                market_status,
+            )
+            for signal in signals
+        ]
+        self._insert(rows, delete_date=date_str)
         
         logger.info(f"保存 {len(signals)} 条信号: {generated_date}")
         return len(signals)
     
+    def _where(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        code: Optional[str],
+        signal_type: Optional[str]
+    ) -> Tuple[str, list]:
+        """
+        构造筛选条件
+        
+        完整6位代码走索引精确匹配，部分代码按子串匹配（与原 str.contains 口径一致）。
+        """
+        clauses, params = [], []
+        if start_date is not None:
+            clauses.append("generated_date >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            clauses.append("generated_date <= ?")
+            params.append(end_date.isoformat())
+        if code is not None and code.strip():
+            code = code.strip()
+            if len(code) == 6 and code.isdigit():
+                clauses.append("code = ?")
+            else:
+                clauses.append("instr(code, ?) > 0")
+            params.append(code)
+        if signal_type is not None and signal_type.strip():
+            clauses.append("signal_type = ?")
+            params.append(signal_type.strip())
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+    
     def load_signals(
         self,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         code: Optional[str] = None,
-        signal_type: Optional[str] = None
+        signal_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> pd.DataFrame:
         """
         加载历史信号
@@ -184,44 +257,75 @@ class SignalStore:
             end_date: 结束日期（含）
             code: 股票代码筛选
             signal_type: 信号类型筛选（买入/卖出）
+            limit: 分页大小，None 为全部
+            offset: 分页偏移
         
         Returns:
-            筛选后的信号 DataFrame
+            筛选后的信号 DataFrame（按日期降序，最新的在前）
             
         Requirements: 2.1, 2.2, 2.3, 2.4, 2.5
         """
-        try:
-            # 指定 code 列为字符串类型，保留前导零
-            df = pd.read_csv(self.file_path, dtype={'code': str})
-        except (pd.errors.EmptyDataError, FileNotFoundError):
-            logger.warning(f"信号文件为空或不存在: {self.file_path}")
-            return pd.DataFrame(columns=self.COLUMNS)
+        where, params = self._where(start_date, end_date, code, signal_type)
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM signals{where} ORDER BY generated_date DESC, id"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [int(limit), int(offset)]
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
         
+        df = pd.DataFrame(rows, columns=self.COLUMNS)
         if df.empty:
             return df
         
-        # 转换日期列
+        # 转换日期与布尔列
         df['generated_date'] = pd.to_datetime(df['generated_date']).dt.date
+        for column in self.BOOL_COLUMNS:
+            df[column] = df[column].astype(bool)
         
-        # 应用日期范围筛选
-        if start_date is not None:
-            df = df[df['generated_date'] >= start_date]
-        
-        if end_date is not None:
-            df = df[df['generated_date'] <= end_date]
-        
-        # 应用股票代码筛选
-        if code is not None and code.strip():
-            df = df[df['code'].astype(str).str.contains(code.strip(), na=False)]
-        
-        # 应用信号类型筛选
-        if signal_type is not None and signal_type.strip():
-            df = df[df['signal_type'] == signal_type.strip()]
-        
-        # 按日期降序排列（最新的在前）
-        df = df.sort_values('generated_date', ascending=False)
+        return df
+    
+    def count_signals(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        code: Optional[str] = None,
+        signal_type: Optional[str] = None
+    ) -> int:
+        """
+        筛选条件下的信号总数（用于分页）
+        """
+        where, params = self._where(start_date, end_date, code, signal_type)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM signals{where}", params).fetchone()[0]
+    
+    def query_statistics(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        code: Optional[str] = None,
+        signal_type: Optional[str] = None
+    ) -> dict:
+        """
+        在数据库中直接计算筛选条件下的统计指标（字段同 get_statistics）
         
-        return df.reset_index(drop=True)
+        Requirements: 4.2, 4.3, 4.4
+        """
+        where, params = self._where(start_date, end_date, code, signal_type)
+        with self._lock:
+            total, buy, sell, stocks = self._conn.execute(
+                "SELECT COUNT(*), "
+                "COALESCE(SUM(signal_type = '买入'), 0), "
+                "COALESCE(SUM(signal_type = '卖出'), 0), "
+                f"COUNT(DISTINCT code) FROM signals{where}",
+                params
+            ).fetchone()
+        return {
+            'total_count': int(total),
+            'buy_count': int(buy),
+            'sell_count': int(sell),
+            'stock_count': int(stocks)
+        }
     
     def get_statistics(self, df: pd.DataFrame) -> dict:
         """
@@ -255,16 +359,18 @@ class SignalStore:
             'stock_count': df['code'].nunique()
         }
     
-    def export_csv(self, df: pd.DataFrame) -> bytes:
+    def export_csv(self, df: Optional[pd.DataFrame] = None) -> bytes:
         """
         导出 CSV 数据
         
         Args:
-            df: 要导出的 DataFrame
+            df: 要导出的 DataFrame，None 时导出全部历史
         
         Returns:
             CSV 文件的字节内容
             
         Requirements: 5.2
         """
+        if df is None:
+            df = self.load_signals()
         return df.to_csv(index=False).encode('utf-8-sig')
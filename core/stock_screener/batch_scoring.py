@@ -0,0 +1,94 @@
+"""
+列式批量评分工具
+
+为财务、市场、综合评分等模块提供按整列计算的分段评分函数，
+口径与各模块逐行评分（if/elif 阶梯 + 有效指标权重归一化）一致：
+- 缺失值以 NaN 表示，对应单行评分中的 None
+- 分段阈值按顺序判断，首个满足的区间生效
+- 仅对有数据的指标归一化权重，全部缺失时取默认分
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def column_values(df: pd.DataFrame, *names: str, scale_large: bool = False) -> np.ndarray:
+    """
+    提取数值列（口径同 _safe_float）
+
+    按 row.get(a, row.get(b)) 的口径取第一个存在的列，无法转换为数值的记为 NaN。
+
+    Args:
+        df: 股票数据
+        names: 候选列名（按优先级）
+        scale_large: 是否将大于 1e10 的值视为元并换算为亿元
+
+    Returns:
+        float 数组，缺失为 NaN
+    """
+    column = next((name for name in names if name in df.columns), None)
+    if column is None:
+        return np.full(len(df), np.nan)
+    values = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float, copy=True)
+    if scale_large:
+        values = np.where(values > 1e10, values / 1e8, values)
+    return values
+
+
+def text_values(df: pd.DataFrame, name: str, default: str = '') -> pd.Series:
+    """提取文本列（口径同 str(row.get(name, default))）"""
+    if name in df.columns:
+        return df[name].map(str)
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def step_score(
+    values: np.ndarray,
+    bounds: Sequence[float],
+    scores: Sequence[Any],
+    otherwise: Any,
+    higher_is_better: bool = True
+) -> np.ndarray:
+    """
+    阶梯分段评分
+
+    higher_is_better 时依次判断 values >= bound，否则依次判断 values <= bound，
+    首个满足的区间取对应得分，都不满足取 otherwise。得分可以是标量或数组。
+    """
+    compare = np.greater_equal if higher_is_better else np.less_equal
+    with np.errstate(invalid='ignore'):
+        conditions = [compare(values, bound) for bound in bounds]
+    return np.select(conditions, list(scores), default=otherwise).astype(float)
+
+
+def weighted_score(
+    components: List[Tuple[np.ndarray, np.ndarray, float]],
+    default: float
+) -> np.ndarray:
+    """
+    有效指标加权得分
+
+    Args:
+        components: [(得分数组, 有效掩码, 权重)]，按单行评分中的指标顺序
+        default: 全部指标缺失时的得分
+
+    Returns:
+        按有效指标归一化权重后的加权得分数组
+    """
+    n = len(components[0][0])
+    total_weight = np.zeros(n)
+    for _, valid, weight in components:
+        total_weight = total_weight + np.where(valid, weight, 0.0)
+
+    result = np.zeros(n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for score, valid, weight in components:
+            result = result + np.where(valid, score * (weight / total_weight), 0.0)
+    return np.where(total_weight > 0, result, default)
+
+
+def optional_float(value: float) -> Optional[float]:
+    """NaN 转为 None，其余转为 Python float（用于构造指标数据类）"""
+    return None if np.isnan(value) else float(value)
@@ -34,6 +34,8 @@ from .industry_screener import (
     TechIndustry, 
     IndustryMatchResult
 )
+from .batch_scoring import column_values, optional_float, text_values
+from core.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -156,6 +158,27 @@ class QualitativeEvaluator:
             'medium': ['研发', '技术', '创新', '升级'],
             'low': ['代工', '组装', '贸易']
         }
+        
+        # 行业龙头关键词
+        self.leader_keywords = ['龙头', '领先', '第一', '头部']
+        
+        self._matcher: Optional[KeywordMatcher] = None
+        self._matcher_key: Optional[Tuple] = None
+    
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """批量评估用的关键词匹配器（关键词列表变化后重建）"""
+        groups = {
+            'competitive_high': self.competitive_keywords['high'],
+            'competitive_medium': self.competitive_keywords['medium'],
+            'tech_moat_high': self.tech_moat_keywords['high'],
+            'leader': self.leader_keywords,
+        }
+        key = tuple(tuple(keywords) for keywords in groups.values())
+        if self._matcher is None or self._matcher_key != key:
+            self._matcher = KeywordMatcher(groups)
+            self._matcher_key = key
+        return self._matcher
     
     def evaluate(
         self, 
@@ -256,7 +279,7 @@ class QualitativeEvaluator:
         notes = []
         
         # 行业龙头关键词
-        if any(kw in text for kw in ['龙头', '领先', '第一', '头部']):
+        if any(kw in text for kw in self.leader_keywords):
             score = min(100, score + 25)
             notes.append("行业龙头地位")
         
@@ -287,6 +310,56 @@ class QualitativeEvaluator:
             factors.industry_position_score * weights['industry'] +
             factors.management_score * weights['management']
         )
+    
+    def score_batch(
+        self,
+        names: List[str],
+        business_descs: List[str],
+        industries: List[TechIndustry],
+        rd_ratios: np.ndarray
+    ) -> np.ndarray:
+        """
+        批量计算定性评估综合得分（口径同 evaluate + get_overall_qualitative_score）
+        
+        Args:
+            names: 股票名称
+            business_descs: 主营业务描述
+            industries: 所属行业
+            rd_ratios: 研发投入占比，缺失为 NaN
+        
+        Returns:
+            定性评估综合得分数组
+        """
+        texts = [(name or "") + " " + (desc or "") for name, desc in zip(names, business_descs)]
+        matches = self.keyword_matcher.match_many(texts)
+        
+        def hit_count(label: str) -> np.ndarray:
+            return np.array([len(m.get(label, ())) for m in matches], dtype=float)
+        
+        # 竞争优势
+        comp_score = np.minimum(100, 50.0 + hit_count('competitive_high') * 15)
+        comp_score = np.minimum(100, comp_score + hit_count('competitive_medium') * 8)
+        
+        # 技术护城河（含研发投入加分）
+        tech_score = np.minimum(100, 50.0 + hit_count('tech_moat_high') * 12)
+        with np.errstate(invalid='ignore'):
+            rd_bonus = np.select([rd_ratios >= 10, rd_ratios >= 5], [20, 10], default=0)
+        tech_score = np.minimum(100, tech_score + rd_bonus)
+        
+        # 行业地位
+        industry_score = np.where(hit_count('leader') > 0, 75.0, 50.0)
+        known = np.array([industry is not None and industry != TechIndustry.UNKNOWN for industry in industries])
+        industry_score = np.where(known, np.minimum(100, industry_score + 10), industry_score)
+        
+        # 管理质量（简化评估，固定中等评分）
+        mgmt_score = 50.0
+        
+        return (
+            comp_score * 0.30 +
+            tech_score * 0.30 +
+            industry_score * 0.25 +
+            mgmt_score * 0.15
+        )
 
 
 class ComprehensiveScorer:
@@ -298,6 +371,17 @@ class ComprehensiveScorer:
     Requirements: 3.5, 4.1, 4.3, 4.4
     """
     
+    # 综合评分使用的市场指标 -> 候选列名（同 _extract_market_indicators，其余指标视为缺失）
+    MARKET_COLUMNS = {
+        'total_market_cap': ('total_market_cap',),
+        'float_market_cap': ('float_market_cap',),
+        'daily_turnover': ('daily_turnover', 'turnover'),
+        'turnover_rate': ('turnover_rate',),
+        'volume_ratio': ('volume_ratio',),
+        'volatility_annual': ('volatility_annual',),
+        'max_drawdown': ('max_drawdown',),
+    }
+    
     def __init__(
         self, 
         weights: Optional[ScoringWeightsConfig] = None
@@ -334,24 +418,17 @@ class ComprehensiveScorer:
         code = str(row.get('code', ''))
         name = str(row.get('name', ''))
         
-        # 1. 财务评分
         financial_indicators = self._extract_financial_indicators(row)
-        financial_result = self.financial_screener.evaluate_stock(financial_indicators)
-        financial_score = financial_result.total_score
-        
-        # 2. 市场表现评分
         market_indicators = self._extract_market_indicators(row)
-        market_result = self.market_screener.evaluate_stock(market_indicators)
-        market_score = market_result.total_score
         
-        # 3. 行业匹配评分
+        # 行业匹配评分
         industry, industry_confidence, _ = self.industry_screener.match_industry(
             name=name,
             business_desc=str(row.get('business_desc', ''))
         )
         industry_score = industry_confidence * 100 if industry != TechIndustry.UNKNOWN else 30
         
-        # 4. 定性评估
+        # 定性评估
         if include_qualitative:
             qualitative_factors = self.qualitative_evaluator.evaluate(
                 name=name,
@@ -363,7 +440,31 @@ class ComprehensiveScorer:
         else:
             qualitative_score = 50.0
         
-        # 5. 计算综合得分
+        return self._build_score(
+            code, name, financial_indicators, market_indicators,
+            industry, industry_score, qualitative_score
+        )
+    
+    def _build_score(
+        self,
+        code: str,
+        name: str,
+        financial_indicators: FinancialIndicators,
+        market_indicators: MarketIndicators,
+        industry: TechIndustry,
+        industry_score: float,
+        qualitative_score: float
+    ) -> ComprehensiveScore:
+        """由指标与行业/定性得分构造综合评分结果"""
+        # 1. 财务评分
+        financial_result = self.financial_screener.evaluate_stock(financial_indicators)
+        financial_score = financial_result.total_score
+        
+        # 2. 市场表现评分
+        market_result = self.market_screener.evaluate_stock(market_indicators)
+        market_score = market_result.total_score
+        
+        # 3. 计算综合得分
         total_score = (
             financial_score * self.weights.financial_health +
             market_score * self.weights.market_performance +
@@ -371,10 +472,10 @@ class ComprehensiveScorer:
             qualitative_score * self.weights.competitive_advantage
         )
         
-        # 6. 确定评级
+        # 4. 确定评级
         rating = self._determine_rating(total_score)
         
-        # 7. 生成评分解释
+        # 5. 生成评分解释
         score_breakdown = {
             '财务健康度': financial_score,
             '市场表现': market_score,
@@ -540,6 +641,105 @@ class ComprehensiveScorer:
         except (ValueError, TypeError):
             return None
     
+    # ========== 列式批量评分 ==========
+    
+    def _score_columns(
+        self,
+        df: pd.DataFrame,
+        include_qualitative: bool = True
+    ) -> Tuple[pd.DataFrame, Dict[str, np.ndarray], Dict[str, np.ndarray], List[TechIndustry]]:
+        """
+        按列计算各维度得分
+        
+        Returns:
+            Tuple[得分表, 财务指标数组, 市场指标数组, 匹配的行业列表]
+        """
+        codes = text_values(df, 'code')
+        names = text_values(df, 'name')
+        business_descs = text_values(df, 'business_desc')
+        
+        # 1. 财务评分
+        financial_ind = self.financial_screener.indicator_arrays(df, scale_large=True)
+        financial = self.financial_screener.evaluate_batch(financial_ind)
+        
+        # 2. 市场表现评分（取数口径同 _extract_market_indicators）
+        market_ind = {
+            field_name: column_values(df, *self.MARKET_COLUMNS.get(field_name, ()), scale_large=True)
+            for field_name in self.market_screener.INDICATOR_COLUMNS
+        }
+        market = self.market_screener.evaluate_batch(market_ind)
+        
+        # 3. 行业匹配评分
+        matched = self.industry_screener.match_industry_batch(names, business_descs)
+        industries = [industry for industry, _, _ in matched]
+        industry_score = np.array([
+            confidence * 100 if industry != TechIndustry.UNKNOWN else 30
+            for industry, confidence, _ in matched
+        ], dtype=float)
+        
+        # 4. 定性评估
+        if include_qualitative:
+            qualitative_score = self.qualitative_evaluator.score_batch(
+                names.tolist(), business_descs.tolist(), industries, financial_ind['rd_ratio']
+            )
+        else:
+            qualitative_score = np.full(len(df), 50.0)
+        
+        # 5. 计算综合得分
+        financial_score = financial['total_score'].to_numpy()
+        market_score = market['total_score'].to_numpy()
+        total_score = (
+            financial_score * self.weights.financial_health +
+            market_score * self.weights.market_performance +
+            industry_score * self.weights.growth_potential +
+            qualitative_score * self.weights.competitive_advantage
+        )
+        
+        # 6. 确定评级
+        rating = np.select(
+            [total_score >= 90, total_score >= 80, total_score >= 70,
+             total_score >= 60, total_score >= 50, total_score >= 40],
+            [OverallRating.AAA.value, OverallRating.AA.value, OverallRating.A.value,
+             OverallRating.BBB.value, OverallRating.BB.value, OverallRating.B.value],
+            default=OverallRating.C.value
+        )
+        
+        frame = pd.DataFrame({
+            'code': codes,
+            'name': names,
+            'financial_score': financial_score,
+            'market_score': market_score,
+            'industry_score': industry_score,
+            'qualitative_score': qualitative_score,
+            'total_score': total_score,
+            'rating': rating,
+            'tech_industry': pd.Series([
+                industry.value if industry != TechIndustry.UNKNOWN else None for industry in industries
+            ], index=df.index, dtype=object),
+            'passed': total_score >= 60,
+        }, index=df.index)
+        return frame, financial_ind, market_ind, industries
+    
+    def score_frame(
+        self,
+        df: pd.DataFrame,
+        include_qualitative: bool = True
+    ) -> pd.DataFrame:
+        """
+        按列批量评分（口径与 score_stock 一致，不构造评分结果对象）
+        
+        Args:
+            df: 股票数据DataFrame
+            include_qualitative: 是否包含定性评估
+        
+        Returns:
+            与 df 同索引的得分表：code, name, 各维度得分, total_score, rating（评级值）,
+            tech_industry（行业名称，未分类为 None）, passed
+        """
+        if df is None or df.empty:
+            return pd.DataFrame()
+        return self._score_columns(df, include_qualitative)[0]
+    
     def score_stocks(
         self, 
         df: pd.DataFrame,
@@ -549,45 +749,61 @@ class ComprehensiveScorer:
         """
         批量评分股票
         
+        全部股票按列评分排名，只为前 top_n 名构造评分结果（含评分解释）。
+        
         Args:
             df: 股票数据DataFrame
             min_score: 最低综合得分
             top_n: 返回前N名
         
         Returns:
-            Tuple[筛选后的DataFrame, 评分结果列表]
+            Tuple[筛选后的DataFrame, 评分结果列表（按得分降序；指定 top_n 时只含前N名）]
         """
         if df is None or df.empty:
             return pd.DataFrame(), []
         
-        results: List[ComprehensiveScore] = []
-        
-        for idx, row in df.iterrows():
-            score = self.score_stock(row)
-            results.append(score)
+        frame, financial_ind, market_ind, industries = self._score_columns(df)
+        total_score = frame['total_score'].to_numpy()
         
-        # 按得分排序
-        results.sort(key=lambda x: x.total_score, reverse=True)
+        # 按得分排序（同分保持原顺序），排名覆盖全部股票
+        order = np.argsort(-total_score, kind='stable')
+        ranks = np.empty(len(order), dtype=int)
+        ranks[order] = np.arange(1, len(order) + 1)
         
-        # 添加排名
-        for i, result in enumerate(results):
-            result.rank = i + 1
+        # 只为最终结果构造评分对象
+        results: List[ComprehensiveScore] = []
+        for i in (order[:top_n] if top_n else order):
+            code, name = frame['code'].iat[i], frame['name'].iat[i]
+            result = self._build_score(
+                code,
+                name,
+                FinancialIndicators(code=code, name=name, **{
+                    field_name: optional_float(values[i]) for field_name, values in financial_ind.items()
+                }),
+                MarketIndicators(code=code, name=name, **{
+                    field_name: optional_float(values[i]) for field_name, values in market_ind.items()
+                }),
+                industries[i],
+                float(frame['industry_score'].iat[i]),
+                float(frame['qualitative_score'].iat[i])
+            )
+            result.rank = int(ranks[i])
+            results.append(result)
         
         # 筛选通过的股票
-        passed_results = [r for r in results if r.total_score >= min_score]
-        
+        passed_positions = order[total_score[order] >= min_score]
         if top_n:
-            passed_results = passed_results[:top_n]
+            passed_positions = passed_positions[:top_n]
+        passed = frame.iloc[passed_positions]
         
         # 构建结果DataFrame
-        passed_codes = [r.code for r in passed_results]
-        passed_df = df[df['code'].isin(passed_codes)].copy()
+        passed_df = df[df['code'].isin(passed['code'])].copy()
         
         # 添加评分列
         if len(passed_df) > 0:
-            score_map = {r.code: r.total_score for r in passed_results}
-            rating_map = {r.code: r.rating.value for r in passed_results}
-            rank_map = {r.code: r.rank for r in passed_results}
+            score_map = dict(zip(passed['code'], passed['total_score']))
+            rating_map = dict(zip(passed['code'], passed['rating']))
+            rank_map = dict(zip(passed['code'], ranks[passed_positions]))
             
             passed_df['comprehensive_score'] = passed_df['code'].map(score_map)
             passed_df['rating'] = passed_df['code'].map(rating_map)
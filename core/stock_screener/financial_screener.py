@@ -17,6 +17,8 @@ import logging
 import pandas as pd
 import numpy as np
 
+from .batch_scoring import column_values, optional_float, step_score, text_values, weighted_score
+
 logger = logging.getLogger(__name__)
 
 
@@ -661,6 +663,69 @@ class FinancialScorer:
         normalized_weights = [w / total_weight for w in weights]
         
         return sum(s * w for s, w in zip(scores, normalized_weights))
+    
+    # ========== 列式批量评分（口径与逐行评分一致） ==========
+    
+    def score_profitability_batch(self, ind: Dict[str, np.ndarray]) -> np.ndarray:
+        """批量计算盈利能力得分，ind 为 {指标名: 数组}，缺失为 NaN"""
+        roe, roa = ind['roe'], ind['roa']
+        gm, nm = ind['gross_margin'], ind['net_margin']
+        return weighted_score([
+            (step_score(roe, [20, 15, 10, self.config.min_roe, 0], [100, 85, 70, 55, np.maximum(0, roe * 5)], 0),
+             ~np.isnan(roe), 0.30),
+            (step_score(roa, [10, 7, 5, self.config.min_roa, 0], [100, 85, 70, 55, np.maximum(0, roa * 10)], 0),
+             ~np.isnan(roa), 0.20),
+            (step_score(gm, [50, 40, 30, self.config.min_gross_margin, 0], [100, 85, 70, 55, np.maximum(0, gm * 2)], 0),
+             ~np.isnan(gm), 0.25),
+            (step_score(nm, [20, 15, 10, self.config.min_net_margin, 0], [100, 85, 70, 55, np.maximum(0, nm * 8)], 0),
+             ~np.isnan(nm), 0.25),
+        ], default=0.0)
+    
+    def score_growth_batch(self, ind: Dict[str, np.ndarray]) -> np.ndarray:
+        """批量计算成长性得分"""
+        rg3, pg3 = ind['revenue_growth_3y'], ind['profit_growth_3y']
+        rd, rg1 = ind['rd_ratio'], ind['revenue_growth_1y']
+        return weighted_score([
+            (step_score(rg3, [30, 20, 15, self.config.min_revenue_growth_3y, 0],
+                        [100, 85, 70, 55, np.maximum(0, rg3 * 4)], 0), ~np.isnan(rg3), 0.30),
+            (step_score(pg3, [40, 30, 20, self.config.min_profit_growth_3y, 0],
+                        [100, 85, 70, 55, np.maximum(0, pg3 * 2.5)], 0), ~np.isnan(pg3), 0.35),
+            (step_score(rd, [10, 7, 5, self.config.min_rd_ratio, 0],
+                        [100, 85, 70, 55, np.maximum(0, rd * 15)], 0), ~np.isnan(rd), 0.20),
+            (step_score(rg1, [25, 15, 10, self.config.min_revenue_growth_1y, 0],
+                        [100, 85, 70, 55, np.maximum(0, rg1 * 8)], 0), ~np.isnan(rg1), 0.15),
+        ], default=0.0)
+    
+    def score_stability_batch(self, ind: Dict[str, np.ndarray]) -> np.ndarray:
+        """批量计算财务稳健性得分"""
+        dr, cr = ind['debt_ratio'], ind['current_ratio']
+        qr, cf = ind['quick_ratio'], ind['cash_flow_ratio']
+        return weighted_score([
+            (step_score(dr, [30, 40, 50, self.config.max_debt_ratio, 80], [100, 85, 70, 55, 30], 0,
+                        higher_is_better=False), ~np.isnan(dr), 0.35),
+            (step_score(cr, [2.5, 2.0, 1.5, self.config.min_current_ratio, 1.0], [100, 85, 70, 55, 40],
+                        np.maximum(0, cr * 30)), ~np.isnan(cr), 0.25),
+            (step_score(qr, [2.0, 1.5, 1.0, self.config.min_quick_ratio, 0.5], [100, 85, 70, 55, 40],
+                        np.maximum(0, qr * 50)), ~np.isnan(qr), 0.20),
+            (step_score(cf, [0.5, 0.3, 0.2, self.config.min_cash_flow_ratio, 0],
+                        [100, 85, 70, 55, np.maximum(0, cf * 400)], 0), ~np.isnan(cf), 0.20),
+        ], default=0.0)
+    
+    def score_valuation_batch(self, ind: Dict[str, np.ndarray]) -> np.ndarray:
+        """批量计算估值合理性得分（只统计大于0的估值指标）"""
+        pe, pb = ind['pe_ratio'], ind['pb_ratio']
+        peg, ps = ind['peg_ratio'], ind['ps_ratio']
+        with np.errstate(invalid='ignore'):
+            return weighted_score([
+                (step_score(pe, [15, 25, 35, self.config.max_pe, 80], [100, 85, 70, 55, 30], 10,
+                            higher_is_better=False), pe > 0, 0.35),
+                (step_score(pb, [2, 4, 6, self.config.max_pb, 15], [100, 85, 70, 55, 30], 10,
+                            higher_is_better=False), pb > 0, 0.25),
+                (step_score(peg, [0.5, 1.0, 1.5, self.config.max_peg, 3.0], [100, 85, 70, 55, 30], 10,
+                            higher_is_better=False), peg > 0, 0.25),
+                (step_score(ps, [2, 5, 8, self.config.max_ps, 20], [100, 85, 70, 55, 30], 10,
+                            higher_is_better=False), ps > 0, 0.15),
+            ], default=50.0)
 
 
 class FinancialScreener:
@@ -672,6 +737,14 @@ class FinancialScreener:
     Requirements: 3.1, 3.2, 3.4, 3.5
     """
     
+    # 财务指标字段（与 DataFrame 列名一致）
+    INDICATOR_FIELDS = [
+        'roe', 'roa', 'gross_margin', 'net_margin',
+        'revenue_growth_1y', 'revenue_growth_3y', 'profit_growth_1y', 'profit_growth_3y', 'rd_ratio',
+        'debt_ratio', 'current_ratio', 'quick_ratio', 'cash_flow_ratio',
+        'pe_ratio', 'pb_ratio', 'peg_ratio', 'ps_ratio',
+    ]
+    
     def __init__(
         self, 
         config: Optional[FinancialCriteriaConfig] = None,
@@ -788,19 +861,118 @@ class FinancialScreener:
         passed = len(failed_criteria) == 0
         return passed, failed_criteria
     
+    # ========== 列式批量评估 ==========
+    
+    def indicator_arrays(self, df: pd.DataFrame, scale_large: bool = False) -> Dict[str, np.ndarray]:
+        """
+        按列提取财务指标（口径同 _extract_indicators）
+        
+        Args:
+            df: 股票数据DataFrame
+            scale_large: 是否将大于 1e10 的值换算为亿元（综合评分的取数口径）
+        
+        Returns:
+            {指标名: float 数组}，缺失为 NaN
+        """
+        return {
+            name: column_values(df, name, scale_large=scale_large)
+            for name in self.INDICATOR_FIELDS
+        }
+    
+    def evaluate_batch(self, ind: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """
+        批量评估财务健康状况（口径与 evaluate_stock 一致）
+        
+        Args:
+            ind: {指标名: 数组}，见 indicator_arrays
+        
+        Returns:
+            DataFrame，列为各维度得分、total_score、health_level（等级值）、criteria_passed
+        """
+        profitability_score = self.scorer.score_profitability_batch(ind)
+        growth_score = self.scorer.score_growth_batch(ind)
+        stability_score = self.scorer.score_stability_batch(ind)
+        valuation_score = self.scorer.score_valuation_batch(ind)
+        
+        total_score = (
+            profitability_score * self.weights['profitability'] +
+            growth_score * self.weights['growth'] +
+            stability_score * self.weights['stability'] +
+            valuation_score * self.weights['valuation']
+        )
+        health_level = np.select(
+            [total_score >= 85, total_score >= 70, total_score >= 55, total_score >= 40],
+            [FinancialHealthLevel.EXCELLENT.value, FinancialHealthLevel.GOOD.value,
+             FinancialHealthLevel.ACCEPTABLE.value, FinancialHealthLevel.POOR.value],
+            default=FinancialHealthLevel.RISKY.value
+        )
+        
+        # 筛选标准（缺失指标不判定失败，同 _check_criteria）
+        failed = (
+            (ind['roe'] < self.config.min_roe) |
+            (ind['gross_margin'] < self.config.min_gross_margin) |
+            (ind['revenue_growth_3y'] < self.config.min_revenue_growth_3y) |
+            (ind['debt_ratio'] > self.config.max_debt_ratio) |
+            (ind['pe_ratio'] > self.config.max_pe) |
+            (ind['pb_ratio'] > self.config.max_pb)
+        )
+        
+        return pd.DataFrame({
+            'profitability_score': profitability_score,
+            'growth_score': growth_score,
+            'stability_score': stability_score,
+            'valuation_score': valuation_score,
+            'total_score': total_score,
+            'health_level': health_level,
+            'criteria_passed': ~failed,
+        })
+    
+    def _build_result(
+        self,
+        code: str,
+        name: str,
+        ind: Dict[str, np.ndarray],
+        scores: pd.DataFrame,
+        i: int
+    ) -> FinancialScreeningResult:
+        """由批量评估结果的第 i 行构造筛选结果"""
+        indicators = FinancialIndicators(
+            code=code,
+            name=name,
+            **{field_name: optional_float(ind[field_name][i]) for field_name in self.INDICATOR_FIELDS}
+        )
+        passed, failed_criteria = self._check_criteria(indicators)
+        return FinancialScreeningResult(
+            code=code,
+            name=name,
+            indicators=indicators,
+            profitability_score=float(scores['profitability_score'].iat[i]),
+            growth_score=float(scores['growth_score'].iat[i]),
+            stability_score=float(scores['stability_score'].iat[i]),
+            valuation_score=float(scores['valuation_score'].iat[i]),
+            total_score=float(scores['total_score'].iat[i]),
+            health_level=FinancialHealthLevel(scores['health_level'].iat[i]),
+            passed=passed,
+            failed_criteria=failed_criteria
+        )
+    
     def screen_stocks(
         self, 
         df: pd.DataFrame,
         min_score: float = 55.0,
-        strict_mode: bool = False
+        strict_mode: bool = False,
+        with_results: bool = True
     ) -> Tuple[pd.DataFrame, List[FinancialScreeningResult]]:
         """
         批量筛选股票
         
+        按列计算全部股票的得分，只在需要时构造逐只的筛选结果。
+        
         Args:
             df: 股票数据DataFrame
             min_score: 最低综合得分
             strict_mode: 严格模式（必须通过所有标准）
+            with_results: 是否构造全部股票的筛选结果列表（只需筛选后的数据时传 False）
         
         Returns:
             Tuple[筛选后的DataFrame, 筛选结果列表]
@@ -808,33 +980,27 @@ class FinancialScreener:
         if df is None or df.empty:
             return pd.DataFrame(), []
         
+        ind = self.indicator_arrays(df)
+        scores = self.evaluate_batch(ind)
+        
+        # 判断是否通过筛选
+        mask = scores['total_score'].to_numpy() >= min_score
+        if strict_mode:
+            mask &= scores['criteria_passed'].to_numpy()
+        
         results: List[FinancialScreeningResult] = []
-        passed_indices = []
-        
-        for idx, row in df.iterrows():
-            # 构建财务指标
-            indicators = self._extract_indicators(row)
-            
-            # 评估股票
-            result = self.evaluate_stock(indicators)
-            results.append(result)
-            
-            # 判断是否通过筛选
-            if result.total_score >= min_score:
-                if strict_mode and not result.passed:
-                    continue
-                passed_indices.append(idx)
+        if with_results:
+            codes = text_values(df, 'code').tolist()
+            names = text_values(df, 'name').tolist()
+            results = [self._build_result(codes[i], names[i], ind, scores, i) for i in range(len(df))]
         
         # 筛选通过的股票
-        passed_df = df.loc[passed_indices].copy()
+        passed_df = df[mask].copy()
         
         # 添加评分列
         if len(passed_df) > 0:
-            score_map = {r.code: r.total_score for r in results if r.code in passed_df['code'].values}
-            level_map = {r.code: r.health_level.value for r in results if r.code in passed_df['code'].values}
-            
-            passed_df['financial_score'] = passed_df['code'].map(score_map)
-            passed_df['financial_health'] = passed_df['code'].map(level_map)
+            passed_df['financial_score'] = scores['total_score'].to_numpy()[mask]
+            passed_df['financial_health'] = scores['health_level'].to_numpy()[mask]
         
         logger.info(f"财务筛选: 从 {len(df)} 只股票中筛选出 {len(passed_df)} 只")
         
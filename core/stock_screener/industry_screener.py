@@ -17,6 +17,8 @@ import re
 import logging
 import pandas as pd
 
+from core.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -161,6 +163,14 @@ class IndustryScreener:
             TechIndustry.BIOTECH.value: TechIndustry.BIOTECH,
             TechIndustry.SMART_MANUFACTURING.value: TechIndustry.SMART_MANUFACTURING,
         }
+        self._matcher: Optional[KeywordMatcher] = None
+
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """全部行业关键词编译的匹配器（关键词变化后重建）"""
+        if self._matcher is None:
+            self._matcher = KeywordMatcher(self._keyword_dict)
+        return self._matcher
 
     def match_industry(
         self, 
@@ -189,24 +199,59 @@ class IndustryScreener:
         if not text_to_match.strip():
             return TechIndustry.UNKNOWN, 0.0, []
         
-        # 统计各行业的匹配情况
-        industry_scores: Dict[str, Tuple[int, List[str]]] = {}
+        return self._classify(name, self.keyword_matcher.match(text_to_match))
+    
+    def match_industry_batch(
+        self,
+        names: pd.Series,
+        business_descs: Optional[pd.Series] = None,
+        industry_names: Optional[pd.Series] = None
+    ) -> List[Tuple[TechIndustry, float, List[str]]]:
+        """
+        批量匹配科技行业（口径同 match_industry）
         
-        for industry_name_key, keywords in self._keyword_dict.items():
-            matched_keywords = []
-            for keyword in keywords:
-                if keyword in text_to_match:
-                    matched_keywords.append(keyword)
-            
-            if matched_keywords:
-                industry_scores[industry_name_key] = (len(matched_keywords), matched_keywords)
+        按列拼接匹配文本，相同文本只匹配一次。
+        
+        Args:
+            names: 股票名称（字符串Series）
+            business_descs: 主营业务描述，与 names 同索引
+            industry_names: 行业分类名称，与 names 同索引
+        
+        Returns:
+            每只股票的 (匹配的行业, 置信度, 匹配的关键词列表)
+        """
+        text = names
+        if business_descs is not None:
+            text = text.where(business_descs == '', text + ' ' + business_descs)
+        if industry_names is not None:
+            text = text.where(industry_names == '', text + ' ' + industry_names)
+        blank = text.str.strip() == ''
+        matches = self.keyword_matcher.match_many(text.where(~blank, ''))
+        
+        return [
+            (TechIndustry.UNKNOWN, 0.0, []) if is_blank else self._classify(name, industry_keywords)
+            for name, is_blank, industry_keywords in zip(names.tolist(), blank.tolist(), matches)
+        ]
+    
+    def _classify(
+        self,
+        name: Optional[str],
+        industry_keywords: Dict[str, List[str]]
+    ) -> Tuple[TechIndustry, float, List[str]]:
+        """
+        由各行业命中的关键词确定行业与置信度
         
-        if not industry_scores:
+        Args:
+            name: 股票名称
+            industry_keywords: {行业: 命中关键词}，按行业配置顺序
+        """
+        if not industry_keywords:
             return TechIndustry.UNKNOWN, 0.0, []
         
         # 找到匹配最多的行业
-        best_industry = max(industry_scores.keys(), key=lambda x: industry_scores[x][0])
-        match_count, matched_keywords = industry_scores[best_industry]
+        best_industry = max(industry_keywords.keys(), key=lambda x: len(industry_keywords[x]))
+        matched_keywords = industry_keywords[best_industry]
+        match_count = len(matched_keywords)
         
         # 计算置信度
         # 基础置信度：匹配关键词数量
@@ -252,27 +297,24 @@ class IndustryScreener:
         match_results: List[IndustryMatchResult] = []
         tech_indices = []
         
-        for idx, row in df.iterrows():
-            code = str(row.get('code', ''))
-            name = str(row.get(name_col, ''))
-            business_desc = str(row.get(business_col, '')) if business_col and business_col in df.columns else None
-            industry_name = str(row.get(industry_col, '')) if industry_col and industry_col in df.columns else None
-            
-            industry, confidence, matched_keywords = self.match_industry(
-                name=name,
-                business_desc=business_desc,
-                industry_name=industry_name
-            )
+        names = df[name_col].map(str) if name_col in df.columns else pd.Series('', index=df.index)
+        business_descs = df[business_col].map(str) if business_col and business_col in df.columns else None
+        industry_names = df[industry_col].map(str) if industry_col and industry_col in df.columns else None
+        matched = self.match_industry_batch(names, business_descs, industry_names)
+        codes = df['code'].map(str) if 'code' in df.columns else pd.Series('', index=df.index)
+        
+        for i, idx in enumerate(df.index):
+            industry, confidence, matched_keywords = matched[i]
             
             if industry != TechIndustry.UNKNOWN and confidence >= min_confidence:
                 tech_indices.append(idx)
                 match_results.append(IndustryMatchResult(
-                    code=code,
-                    name=name,
+                    code=codes.iat[i],
+                    name=names.iat[i],
                     matched_industry=industry,
                     confidence=confidence,
                     matched_keywords=matched_keywords,
-                    business_description=business_desc
+                    business_description=business_descs.iat[i] if business_descs is not None else None
                 ))
         
         # 筛选出科技股
@@ -328,6 +370,7 @@ class IndustryScreener:
         
         if keyword not in self._keyword_dict[industry_name]:
             self._keyword_dict[industry_name].append(keyword)
+            self._matcher = None
             logger.info(f"已添加关键词 '{keyword}' 到行业 '{industry_name}'")
             return True
         
@@ -413,8 +456,7 @@ class BusinessAnalyzer:
         )
         
         # 计算科技相关度得分
-        all_keywords = self.industry_screener.keyword_config.get_all_keywords()
-        keyword_count = sum(1 for kw in all_keywords if kw in business_desc)
+        keyword_count = len(self.industry_screener.keyword_matcher.find(business_desc))
         tech_relevance_score = min(1.0, keyword_count / 5)
         
         return {
@@ -16,6 +16,8 @@ import logging
 import pandas as pd
 import numpy as np
 
+from .batch_scoring import column_values, optional_float, step_score, text_values, weighted_score
+
 logger = logging.getLogger(__name__)
 
 
@@ -226,6 +228,44 @@ class LiquidityEvaluator:
             level = LiquidityLevel.ILLIQUID
         
         return total_score, level, warnings
+    
+    def evaluate_batch(self, ind: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量评估流动性（口径与 evaluate 一致）
+        
+        Args:
+            ind: {指标名: 数组}，缺失为 NaN
+        
+        Returns:
+            Tuple[流动性得分数组, 流动性等级值数组]
+        """
+        cap, turnover = ind['total_market_cap'], ind['daily_turnover']
+        rate, days = ind['turnover_rate'], ind['trading_days_ratio']
+        
+        with np.errstate(invalid='ignore'):
+            rate_score = np.select(
+                [(rate >= 1.0) & (rate <= 5.0), (rate >= 0.5) & (rate <= 8.0),
+                 rate >= self.config.min_turnover_rate, rate > self.config.max_turnover_rate],
+                [100, 80, 60, 40], default=30
+            ).astype(float)
+        
+        total_score = weighted_score([
+            (step_score(cap, [500, 200, 100, self.config.min_total_market_cap, 30], [100, 85, 70, 55, 40], 20),
+             ~np.isnan(cap), 0.30),
+            (step_score(turnover, [5, 2, 1, self.config.min_daily_turnover, 0.2], [100, 85, 70, 55, 35], 15),
+             ~np.isnan(turnover), 0.35),
+            (rate_score, ~np.isnan(rate), 0.20),
+            (step_score(days, [95, 90, self.config.min_trading_days_ratio, 60], [100, 85, 70, 40], 20),
+             ~np.isnan(days), 0.15),
+        ], default=0.0)
+        
+        level = np.select(
+            [total_score >= 85, total_score >= 70, total_score >= 55, total_score >= 40],
+            [LiquidityLevel.EXCELLENT.value, LiquidityLevel.GOOD.value,
+             LiquidityLevel.ACCEPTABLE.value, LiquidityLevel.POOR.value],
+            default=LiquidityLevel.ILLIQUID.value
+        )
+        return total_score, level
 
 
 class StabilityEvaluator:
@@ -326,6 +366,37 @@ class StabilityEvaluator:
             level = VolatilityLevel.EXTREME
         
         return total_score, level, warnings
+    
+    def evaluate_batch(self, ind: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量评估价格稳定性（口径与 evaluate 一致）
+        
+        Args:
+            ind: {指标名: 数组}，缺失为 NaN
+        
+        Returns:
+            Tuple[稳定性得分数组, 波动性等级值数组]
+        """
+        vol, dd = ind['volatility_annual'], ind['max_drawdown']
+        limit = ind['limit_up_down_freq']
+        
+        total_score = weighted_score([
+            (step_score(vol, [25, 35, 45, self.config.max_volatility_annual, 80], [100, 85, 70, 55, 35], 15,
+                        higher_is_better=False), ~np.isnan(vol), 0.40),
+            (step_score(dd, [15, 25, 35, self.config.max_max_drawdown, 70], [100, 85, 70, 55, 35], 15,
+                        higher_is_better=False), ~np.isnan(dd), 0.35),
+            (step_score(limit, [2, 5, self.config.max_limit_up_down_freq, 20], [100, 85, 70, 45], 20,
+                        higher_is_better=False), ~np.isnan(limit), 0.25),
+        ], default=50.0)
+        
+        level = np.select(
+            [total_score >= 80, total_score >= 60, total_score >= 40],
+            [VolatilityLevel.LOW.value, VolatilityLevel.MODERATE.value, VolatilityLevel.HIGH.value],
+            default=VolatilityLevel.EXTREME.value
+        )
+        # 无稳定性数据时按中等波动处理
+        no_data = np.isnan(vol) & np.isnan(dd) & np.isnan(limit)
+        return total_score, np.where(no_data, VolatilityLevel.MODERATE.value, level)
 
 
 class MarketScreener:
@@ -337,6 +408,24 @@ class MarketScreener:
     Requirements: 3.3, 6.2, 6.3
     """
     
+    # 市场指标字段 -> 候选列名（按优先级，同 _extract_indicators）
+    INDICATOR_COLUMNS = {
+        'total_market_cap': ('total_market_cap',),
+        'float_market_cap': ('float_market_cap',),
+        'daily_turnover': ('daily_turnover', 'turnover'),
+        'turnover_rate': ('turnover_rate',),
+        'volume_ratio': ('volume_ratio',),
+        'trading_days_ratio': ('trading_days_ratio',),
+        'volatility_annual': ('volatility_annual', 'volatility'),
+        'max_drawdown': ('max_drawdown',),
+        'limit_up_down_freq': ('limit_up_down_freq',),
+        'price_amplitude': ('price_amplitude', 'amplitude'),
+        'change_1m': ('change_1m',),
+        'change_3m': ('change_3m',),
+        'change_6m': ('change_6m',),
+        'change_1y': ('change_1y', 'change_ytd'),
+    }
+    
     def __init__(
         self, 
         config: Optional[MarketCriteriaConfig] = None,
@@ -431,6 +520,18 @@ class MarketScreener:
         else:
             return 30
     
+    def _score_market_cap_batch(self, cap: np.ndarray) -> np.ndarray:
+        """批量计算市值得分（口径同 _score_market_cap）"""
+        with np.errstate(invalid='ignore'):
+            return np.select(
+                [np.isnan(cap),
+                 (cap >= 100) & (cap <= 1000),
+                 ((cap >= 50) & (cap < 100)) | ((cap > 1000) & (cap <= 2000)),
+                 cap >= self.config.min_total_market_cap,
+                 cap >= 30],
+                [50.0, 100, 85, 70, 50], default=30
+            ).astype(float)
+    
     def _check_criteria(
         self, 
         indicators: MarketIndicators
@@ -474,19 +575,76 @@ class MarketScreener:
         passed = len(failed_criteria) == 0
         return passed, failed_criteria
     
+    # ========== 列式批量评估 ==========
+    
+    def indicator_arrays(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        按列提取市场指标（口径同 _extract_indicators，含列名别名与市值单位换算）
+        
+        Returns:
+            {指标名: float 数组}，缺失为 NaN
+        """
+        return {
+            name: column_values(df, *columns, scale_large=True)
+            for name, columns in self.INDICATOR_COLUMNS.items()
+        }
+    
+    def evaluate_batch(self, ind: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """
+        批量评估市场表现（口径与 evaluate_stock 一致）
+        
+        Args:
+            ind: {指标名: 数组}，见 indicator_arrays
+        
+        Returns:
+            DataFrame，列为各维度得分、total_score、liquidity_level / volatility_level（等级值）、criteria_passed
+        """
+        liquidity_score, liquidity_level = self.liquidity_evaluator.evaluate_batch(ind)
+        stability_score, volatility_level = self.stability_evaluator.evaluate_batch(ind)
+        market_cap_score = self._score_market_cap_batch(ind['total_market_cap'])
+        
+        total_score = (
+            liquidity_score * self.weights['liquidity'] +
+            stability_score * self.weights['stability'] +
+            market_cap_score * self.weights['market_cap']
+        )
+        
+        # 筛选标准（缺失指标不判定失败，同 _check_criteria）
+        failed = (
+            (ind['total_market_cap'] < self.config.min_total_market_cap) |
+            (ind['daily_turnover'] < self.config.min_daily_turnover) |
+            (ind['turnover_rate'] < self.config.min_turnover_rate) |
+            (ind['volatility_annual'] > self.config.max_volatility_annual) |
+            (ind['max_drawdown'] > self.config.max_max_drawdown)
+        )
+        
+        return pd.DataFrame({
+            'liquidity_score': liquidity_score,
+            'stability_score': stability_score,
+            'market_cap_score': market_cap_score,
+            'total_score': total_score,
+            'liquidity_level': liquidity_level,
+            'volatility_level': volatility_level,
+            'criteria_passed': ~failed,
+        })
+    
     def screen_stocks(
         self, 
         df: pd.DataFrame,
         min_score: float = 55.0,
-        strict_mode: bool = False
+        strict_mode: bool = False,
+        with_results: bool = True
     ) -> Tuple[pd.DataFrame, List[MarketScreeningResult]]:
         """
         批量筛选股票
         
+        按列计算全部股票的得分，只在需要时构造逐只的筛选结果（含风险警告）。
+        
         Args:
             df: 股票数据DataFrame
             min_score: 最低综合得分
             strict_mode: 严格模式（必须通过所有标准）
+            with_results: 是否构造全部股票的筛选结果列表（只需筛选后的数据时传 False）
         
         Returns:
             Tuple[筛选后的DataFrame, 筛选结果列表]
@@ -494,33 +652,34 @@ class MarketScreener:
         if df is None or df.empty:
             return pd.DataFrame(), []
         
+        ind = self.indicator_arrays(df)
+        scores = self.evaluate_batch(ind)
+        
+        # 判断是否通过筛选
+        mask = scores['total_score'].to_numpy() >= min_score
+        if strict_mode:
+            mask &= scores['criteria_passed'].to_numpy()
+        
         results: List[MarketScreeningResult] = []
-        passed_indices = []
-        
-        for idx, row in df.iterrows():
-            # 构建市场指标
-            indicators = self._extract_indicators(row)
-            
-            # 评估股票
-            result = self.evaluate_stock(indicators)
-            results.append(result)
-            
-            # 判断是否通过筛选
-            if result.total_score >= min_score:
-                if strict_mode and not result.passed:
-                    continue
-                passed_indices.append(idx)
+        if with_results:
+            codes = text_values(df, 'code').tolist()
+            names = text_values(df, 'name').tolist()
+            results = [
+                self.evaluate_stock(MarketIndicators(
+                    code=codes[i],
+                    name=names[i],
+                    **{name: optional_float(values[i]) for name, values in ind.items()}
+                ))
+                for i in range(len(df))
+            ]
         
         # 筛选通过的股票
-        passed_df = df.loc[passed_indices].copy()
+        passed_df = df[mask].copy()
         
         # 添加评分列
         if len(passed_df) > 0:
-            score_map = {r.code: r.total_score for r in results if r.code in passed_df['code'].values}
-            liquidity_map = {r.code: r.liquidity_level.value for r in results if r.code in passed_df['code'].values}
-            
-            passed_df['market_score'] = passed_df['code'].map(score_map)
-            passed_df['liquidity_level'] = passed_df['code'].map(liquidity_map)
+            passed_df['market_score'] = scores['total_score'].to_numpy()[mask]
+            passed_df['liquidity_level'] = scores['liquidity_level'].to_numpy()[mask]
         
         logger.info(f"市场表现筛选: 从 {len(df)} 只股票中筛选出 {len(passed_df)} 只")
         
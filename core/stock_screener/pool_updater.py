@@ -203,7 +203,7 @@ class CandidateScreener:
             
             # 阶段3: 行业筛选
             report_progress(ScreeningStage.INDUSTRY_SCREEN, 0, "正在进行行业筛选...")
-            df = self.industry_screener.screen_tech_stocks(df)
+            df, _ = self.industry_screener.screen_tech_stocks(df)
             summary['after_industry'] = len(df)
             report_progress(ScreeningStage.INDUSTRY_SCREEN, 100, f"科技股{len(df)}只", len(df))
             
@@ -212,7 +212,7 @@ class CandidateScreener:
             
             # 阶段4: 财务筛选
             report_progress(ScreeningStage.FINANCIAL_SCREEN, 0, "正在进行财务筛选...")
-            df, _ = self.financial_screener.screen_stocks(df)
+            df, _ = self.financial_screener.screen_stocks(df, with_results=False)
             summary['after_financial'] = len(df)
             report_progress(ScreeningStage.FINANCIAL_SCREEN, 100, f"财务合格{len(df)}只", len(df))
             
@@ -221,7 +221,7 @@ class CandidateScreener:
             
             # 阶段5: 市场表现筛选
             report_progress(ScreeningStage.MARKET_SCREEN, 0, "正在进行市场筛选...")
-            df, _ = self.market_screener.screen_stocks(df)
+            df, _ = self.market_screener.screen_stocks(df, with_results=False)
             summary['after_market'] = len(df)
             report_progress(ScreeningStage.MARKET_SCREEN, 100, f"市场合格{len(df)}只", len(df))
             
@@ -18,6 +18,8 @@ import logging
 import pandas as pd
 import numpy as np
 
+from .batch_scoring import column_values, step_score, text_values, weighted_score
+
 logger = logging.getLogger(__name__)
 
 
@@ -423,6 +425,75 @@ class StockQualityComparator:
         except (ValueError, TypeError):
             return None
     
+    def calculate_quality_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        按列批量计算股票质量得分（口径与 calculate_stock_quality 一致）
+        
+        Args:
+            df: 股票数据DataFrame
+        
+        Returns:
+            与 df 同索引的得分表：code, name, financial_health_score, growth_score,
+            liquidity_score, overall_quality_score
+        """
+        # 财务健康度
+        roe = column_values(df, 'roe')
+        debt_ratio = column_values(df, 'debt_ratio')
+        gross_margin = column_values(df, 'gross_margin')
+        net_margin = column_values(df, 'net_margin')
+        financial_health_score = weighted_score([
+            (step_score(roe, [20, 15, 10, 8, 0], [100, 85, 70, 55, np.maximum(0, roe * 5)], 0),
+             ~np.isnan(roe), 0.30),
+            (step_score(debt_ratio, [30, 40, 50, 60, 80], [100, 85, 70, 55, 30], 0, higher_is_better=False),
+             ~np.isnan(debt_ratio), 0.25),
+            (step_score(gross_margin, [50, 40, 30, 20, 0], [100, 85, 70, 55, np.maximum(0, gross_margin * 2)], 0),
+             ~np.isnan(gross_margin), 0.25),
+            (step_score(net_margin, [20, 15, 10, 5, 0], [100, 85, 70, 55, np.maximum(0, net_margin * 8)], 0),
+             ~np.isnan(net_margin), 0.20),
+        ], default=50.0)
+        
+        # 成长性（负增长按幅度扣分）
+        revenue_growth = column_values(df, 'revenue_growth_1y', 'revenue_growth_3y')
+        profit_growth = column_values(df, 'profit_growth_1y', 'profit_growth_3y')
+        rd_ratio = column_values(df, 'rd_ratio')
+        growth_score = weighted_score([
+            (step_score(revenue_growth, [30, 20, 10, 5, 0], [100, 85, 70, 55, np.maximum(0, revenue_growth * 8)],
+                        np.maximum(0, 40 + revenue_growth)), ~np.isnan(revenue_growth), 0.40),
+            (step_score(profit_growth, [40, 25, 15, 5, 0], [100, 85, 70, 55, np.maximum(0, profit_growth * 6)],
+                        np.maximum(0, 40 + profit_growth * 0.5)), ~np.isnan(profit_growth), 0.40),
+            (step_score(rd_ratio, [10, 7, 5, 3, 0], [100, 85, 70, 55, np.maximum(0, rd_ratio * 15)], 0),
+             ~np.isnan(rd_ratio), 0.20),
+        ], default=50.0)
+        
+        # 流动性（市值、成交额按元/亿元自动换算）
+        market_cap = column_values(df, 'total_market_cap', 'market_cap', scale_large=True)
+        daily_turnover = column_values(df, 'daily_turnover', 'turnover')
+        daily_turnover = np.where(daily_turnover > 1e8, daily_turnover / 1e8, daily_turnover)
+        turnover_rate = column_values(df, 'turnover_rate')
+        liquidity_score = weighted_score([
+            (step_score(market_cap, [500, 200, 100, 50, 30], [100, 85, 70, 55, 40], np.maximum(0, market_cap)),
+             ~np.isnan(market_cap), 0.40),
+            (step_score(daily_turnover, [10, 5, 2, 0.5, 0.1], [100, 85, 70, 55, 40],
+                        np.maximum(0, daily_turnover * 200)), ~np.isnan(daily_turnover), 0.35),
+            (step_score(turnover_rate, [3, 2, 1, 0.5, 0.2], [100, 85, 70, 55, 40],
+                        np.maximum(0, turnover_rate * 100)), ~np.isnan(turnover_rate), 0.25),
+        ], default=50.0)
+        
+        overall_quality_score = (
+            financial_health_score * self.QUALITY_WEIGHTS['financial_health'] +
+            growth_score * self.QUALITY_WEIGHTS['growth'] +
+            liquidity_score * self.QUALITY_WEIGHTS['liquidity']
+        )
+        
+        return pd.DataFrame({
+            'code': text_values(df, 'code'),
+            'name': text_values(df, 'name'),
+            'financial_health_score': financial_health_score,
+            'growth_score': growth_score,
+            'liquidity_score': liquidity_score,
+            'overall_quality_score': overall_quality_score,
+        }, index=df.index)
+    
     def compare_quality(
         self,
         df: pd.DataFrame,
@@ -447,48 +518,39 @@ class StockQualityComparator:
         
         existing_codes = existing_codes or self.original_codes
         
-        # 分离现有股票和新增股票
-        existing_metrics: List[StockQualityMetrics] = []
-        new_metrics: List[StockQualityMetrics] = []
-        
-        for _, row in df.iterrows():
-            code = str(row.get('code', ''))
-            is_new = code not in existing_codes
-            
-            metrics = self.calculate_stock_quality(row, is_new=is_new)
-            
-            if is_new:
-                new_metrics.append(metrics)
-            else:
-                existing_metrics.append(metrics)
+        # 按列计算质量得分，分离现有股票和新增股票
+        quality = self.calculate_quality_frame(df)
+        is_new = ~quality['code'].isin(existing_codes)
+        existing_quality = quality[~is_new]
+        new_quality = quality[is_new]
         
         # 检查数据充足性
-        if len(existing_metrics) == 0:
+        if len(existing_quality) == 0:
             return QualityComparisonResult(
                 timestamp=datetime.now(),
                 status=QualityComparisonStatus.INSUFFICIENT_DATA,
                 warnings=["没有找到现有股票数据"]
             )
         
-        if len(new_metrics) == 0:
+        if len(new_quality) == 0:
             return QualityComparisonResult(
                 timestamp=datetime.now(),
                 status=QualityComparisonStatus.INSUFFICIENT_DATA,
-                existing_stock_count=len(existing_metrics),
+                existing_stock_count=len(existing_quality),
                 warnings=["没有找到新增股票数据"]
             )
         
         # 计算现有股票平均质量
-        existing_avg_financial = np.mean([m.financial_health_score for m in existing_metrics])
-        existing_avg_growth = np.mean([m.growth_score for m in existing_metrics])
-        existing_avg_liquidity = np.mean([m.liquidity_score for m in existing_metrics])
-        existing_avg_overall = np.mean([m.overall_quality_score for m in existing_metrics])
+        existing_avg_financial = np.mean(existing_quality['financial_health_score'].to_numpy())
+        existing_avg_growth = np.mean(existing_quality['growth_score'].to_numpy())
+        existing_avg_liquidity = np.mean(existing_quality['liquidity_score'].to_numpy())
+        existing_avg_overall = np.mean(existing_quality['overall_quality_score'].to_numpy())
         
         # 计算新增股票平均质量
-        new_avg_financial = np.mean([m.financial_health_score for m in new_metrics])
-        new_avg_growth = np.mean([m.growth_score for m in new_metrics])
-        new_avg_liquidity = np.mean([m.liquidity_score for m in new_metrics])
-        new_avg_overall = np.mean([m.overall_quality_score for m in new_metrics])
+        new_avg_financial = np.mean(new_quality['financial_health_score'].to_numpy())
+        new_avg_growth = np.mean(new_quality['growth_score'].to_numpy())
+        new_avg_liquidity = np.mean(new_quality['liquidity_score'].to_numpy())
+        new_avg_overall = np.mean(new_quality['overall_quality_score'].to_numpy())
         
         # 计算差异
         financial_diff = new_avg_financial - existing_avg_financial
@@ -504,10 +566,12 @@ class StockQualityComparator:
         passed_overall = new_avg_overall >= existing_avg_overall * threshold
         
         # 找出低于平均水平的新增股票
+        below_average = new_quality[new_quality['overall_quality_score'] < existing_avg_overall * threshold]
         below_average_stocks = [
-            f"{m.code} {m.name} ({m.overall_quality_score:.1f}分)"
-            for m in new_metrics
-            if m.overall_quality_score < existing_avg_overall * threshold
+            f"{code} {name} ({score:.1f}分)"
+            for code, name, score in zip(
+                below_average['code'], below_average['name'], below_average['overall_quality_score']
+            )
         ]
         
         # 生成警告和建议
@@ -535,12 +599,12 @@ class StockQualityComparator:
         return QualityComparisonResult(
             timestamp=datetime.now(),
             status=status,
-            existing_stock_count=len(existing_metrics),
+            existing_stock_count=len(existing_quality),
             existing_avg_financial_health=existing_avg_financial,
             existing_avg_growth=existing_avg_growth,
             existing_avg_liquidity=existing_avg_liquidity,
             existing_avg_overall=existing_avg_overall,
-            new_stock_count=len(new_metrics),
+            new_stock_count=len(new_quality),
             new_avg_financial_health=new_avg_financial,
             new_avg_growth=new_avg_growth,
             new_avg_liquidity=new_avg_liquidity,
@@ -25,10 +25,12 @@ from dataclasses import dataclass, field
 from datetime import datetime, date
 from enum import IntEnum
 from typing import List, Optional, Dict, Tuple, Any
+import numpy as np
 import pandas as pd
 import logging
 
 from config.tech_stock_config import get_tech_config
+from core.exit_features import PortfolioBars, load_frames
 from core.tech_stock.market_filter import MarketStatus
 from core.position_tracker import Holding
 
@@ -125,15 +127,17 @@ class TechExitManager:
         SignalPriority.TREND_BREAK: "blue",   # 趋势断裂 - 蓝色
     }
     
-    def __init__(self, data_feed=None):
+    def __init__(self, data_feed=None, max_workers: int = 8):
         """
         初始化卖出信号管理器
         
         Args:
             data_feed: 数据获取模块实例
+            max_workers: 并行加载持仓数据的线程数
         """
         self.config = get_tech_config()
         self._data_feed = data_feed
+        self.max_workers = max_workers
         
         # RSI 周期
         self.RSI_PERIOD = self.config.indicator.rsi_period  # 14
@@ -170,89 +174,89 @@ class TechExitManager:
         """
         signals = []
         
+        # 获取股票数据：优先使用传入数据，其余并行加载
+        frames = {
+            code: df for code, df in (stock_data or {}).items()
+            if df is not None and not df.empty
+        }
+        if self._data_feed:
+            missing = [h.code for h in holdings if not (stock_data and h.code in stock_data)]
+            frames.update(load_frames(self._data_feed, missing, self.max_workers))
+        
+        held = []
         for holding in holdings:
-            code = holding.code
-            
-            # 获取股票数据
-            df = None
-            if stock_data and code in stock_data:
-                df = stock_data[code]
-            elif self._data_feed:
-                try:
-                    df = self._data_feed.load_processed_data(code)
-                except Exception as e:
-                    logger.warning(f"获取 {code} 数据失败: {e}")
-            
-            if df is None or df.empty:
-                logger.warning(f"{code} 无法获取数据，跳过卖出信号检查")
-                continue
-            
-            # 确保数据按日期排序
-            if 'date' in df.columns:
-                df = df.sort_values('date').reset_index(drop=True)
-            
-            # 计算技术指标
-            df = self._calculate_indicators(df)
-            
-            # 获取最新数据
-            latest = df.iloc[-1]
-            
-            # 获取当前价格
-            if current_prices and code in current_prices:
-                current_price = current_prices[code]
+            if holding.code in frames:
+                held.append(holding)
             else:
-                current_price = float(latest['close'])
-            
-            # 计算盈亏百分比
-            pnl_pct = (current_price - holding.buy_price) / holding.buy_price if holding.buy_price > 0 else 0
-            
-            # 获取技术指标
-            rsi = float(latest.get('rsi', 0)) if pd.notna(latest.get('rsi')) else 0
-            ma5 = float(latest.get('ma5', 0)) if pd.notna(latest.get('ma5')) else 0
-            ma20 = float(latest.get('ma20', 0)) if pd.notna(latest.get('ma20')) else 0
-            
-            # 计算 MA20 跌破天数
-            ma20_break_days = self._calculate_ma20_break_days(df)
-            
-            # 计算止损价
-            stop_loss_price = self.calculate_stop_loss_price(holding, current_price, ma5)
-            
-            # 检查各类卖出信号
-            
-            # 1. 紧急避险信号
-            emergency_signal = self._check_emergency_exit(
-                holding, market_status, current_price, pnl_pct,
-                rsi, ma5, ma20, ma20_break_days, stop_loss_price
-            )
-            if emergency_signal:
-                signals.append(emergency_signal)
-                continue  # 紧急避险优先级最高，不再检查其他信号
-            
-            # 2. 硬止损信号
-            stop_loss_signal = self._check_stop_loss(
-                holding, current_price, pnl_pct,
-                rsi, ma5, ma20, ma20_break_days, stop_loss_price
-            )
-            if stop_loss_signal:
-                signals.append(stop_loss_signal)
-                continue  # 止损优先级次高
+                logger.warning(f"{holding.code} 无法获取数据，跳过卖出信号检查")
+        if not held:
+            return signals
+        
+        # 确保数据按日期排序
+        ordered = {}
+        for holding in held:
+            df = frames[holding.code]
+            if holding.code not in ordered and 'date' in df.columns:
+                df = df.sort_values('date').reset_index(drop=True)
+            ordered[holding.code] = df
+        bars = PortfolioBars([ordered[h.code] for h in held])
+        
+        # 批量计算技术指标
+        ma5 = bars.ma(self.MA5_PERIOD)
+        ma20 = bars.ma(self.MA20_PERIOD)
+        ma20_break_days = bars.below_streak(ma20)
+        ma5 = np.nan_to_num(ma5[:, -1], nan=0.0)
+        ma20 = np.nan_to_num(ma20[:, -1], nan=0.0)
+        avg_gain, avg_loss = bars.rsi_averages(self.RSI_PERIOD)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = np.where(avg_loss == 0, 0.0, avg_gain / avg_loss)
+        rsi = np.nan_to_num(100 - (100 / (1 + rs)), nan=0.0)
+        
+        # 当前价格与盈亏
+        current_price = bars.last('close')
+        if current_prices:
+            for j, holding in enumerate(held):
+                if holding.code in current_prices:
+                    current_price[j] = current_prices[holding.code]
+        cost_price = np.array([h.buy_price for h in held], dtype=float)
+        shares = np.array([h.quantity for h in held])
+        safe_cost = np.where(cost_price > 0, cost_price, np.nan)
+        pnl_pct = np.where(cost_price > 0, (current_price - cost_price) / safe_cost, 0.0)
+        
+        # 规则掩码（按优先级）
+        emergency = np.full(len(held), not market_status.is_green) & (pnl_pct < 0)
+        stop_loss = ~emergency & (pnl_pct <= self.HARD_STOP_LOSS)
+        remaining = ~emergency & ~stop_loss
+        take_profit = (
+            remaining & (rsi > self.RSI_OVERBOUGHT)
+            & ((shares == self.MIN_POSITION_SHARES) | (shares >= 200))
+        )
+        trend_break = remaining & ~take_profit & (ma20_break_days >= self.MA20_BREAK_DAYS)
+        
+        for j, holding in enumerate(held):
+            if not (emergency[j] or stop_loss[j] or take_profit[j] or trend_break[j]):
+                continue
             
-            # 3. RSI 分仓止盈信号
-            rsi_signal = self._check_rsi_partial_sell(
-                holding, current_price, pnl_pct,
-                rsi, ma5, ma20, ma20_break_days, stop_loss_price
+            price = float(current_price[j])
+            values = dict(
+                current_price=price,
+                pnl_pct=float(pnl_pct[j]),
+                rsi=float(rsi[j]),
+                ma5=float(ma5[j]),
+                ma20=float(ma20[j]),
+                ma20_break_days=int(ma20_break_days[j]),
+                stop_loss_price=self.calculate_stop_loss_price(holding, price, float(ma5[j])),
             )
-            if rsi_signal:
-                signals.append(rsi_signal)
-                # RSI 止盈不阻止趋势断裂检查
             
-            # 4. 趋势断裂信号
-            trend_signal = self._check_trend_break(
-                holding, current_price, pnl_pct,
-                rsi, ma5, ma20, ma20_break_days, stop_loss_price
-            )
-            if trend_signal and not rsi_signal:  # 避免重复信号
-                signals.append(trend_signal)
+            if emergency[j]:
+                signal = self._check_emergency_exit(holding, market_status, **values)
+            elif stop_loss[j]:
+                signal = self._check_stop_loss(holding, **values)
+            elif take_profit[j]:
+                signal = self._check_rsi_partial_sell(holding, **values)
+            else:
+                signal = self._check_trend_break(holding, **values)
+            signals.append(signal)
         
         # 按优先级排序
         return self.sort_signals_by_priority(signals)
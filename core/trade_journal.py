@@ -2,19 +2,29 @@
 Trade Journal Module - 交易记录管理
 
 提供交易记录的数据模型、持久化存储和统计分析功能。
+
+存储设计：
+- 单文件 SQLite 数据库，交易表按日期、代码、策略、信号ID建索引，查询与分页只读取命中行
+- 汇总表 trade_stats 按 全部/策略/月份/股票 四个维度维护交易统计与已平仓盈亏，
+  增删交易时在同一事务内只重算该股票的 FIFO 配对并增量更新，不再全量重算
+- 旧版 CSV（data/trade_journal.csv）在数据库为空时自动迁移一次
 """
 
 import csv
 import logging
-import os
+import sqlite3
+import threading
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from enum import Enum
-from typing import List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import uuid
 
-logger = logging.getLogger(__name__)
+import pandas as pd
 
+logger = logging.getLogger(__name__)
 
 class TradeAction(Enum):
     """交易动作枚举"""
@@ -100,59 +110,153 @@ class TradePerformance:
     signal_execution_rate: float = 0.0  # 信号执行率
 
 
+def _match_fifo(trades: Iterable[TradeRecord]) -> Iterator[Tuple[TradeRecord, TradeRecord, int]]:
+    """
+    按股票代码分组，以 FIFO（先进先出）方式匹配买卖对
+    
+    每只股票内按成交日期升序（同日保持传入顺序），卖出依次消耗最早买入的剩余数量。
+    
+    Args:
+        trades: 交易记录
+        
+    Yields:
+        (买入记录, 卖出记录, 匹配数量) 元组
+    """
+    trades_by_code: Dict[str, List[TradeRecord]] = {}
+    for trade in trades:
+        trades_by_code.setdefault(trade.code, []).append(trade)
+    
+    for code_trades in trades_by_code.values():
+        code_trades.sort(key=lambda t: t.trade_date)
+        buy_queue: deque = deque()  # [买入记录, 剩余数量]
+        
+        for trade in code_trades:
+            if trade.action == TradeAction.BUY:
+                buy_queue.append([trade, trade.quantity])
+                continue
+            
+            remaining_sell_qty = trade.quantity
+            while remaining_sell_qty > 0 and buy_queue:
+                buy_trade, buy_remaining = buy_queue[0]
+                match_qty = min(buy_remaining, remaining_sell_qty)
+                yield buy_trade, trade, match_qty
+                
+                remaining_sell_qty -= match_qty
+                if match_qty >= buy_remaining:
+                    buy_queue.popleft()
+                else:
+                    buy_queue[0][1] = buy_remaining - match_qty
+
+
 class TradeJournal:
     """
     交易日志管理器
     
-    负责交易记录的增删改查和持久化存储。
+    负责交易记录的增删改查、持久化存储和增量统计。
     """
     
-    # CSV 文件的列名（顺序很重要）
+    DEFAULT_PATH = Path("data/trade_journal.db")
+    
+    # CSV 文件的列名（顺序很重要，数据库交易表列顺序一致）
     CSV_COLUMNS = [
         'id', 'code', 'name', 'action', 'price', 'quantity', 'trade_date',
         'signal_id', 'signal_date', 'signal_price', 'strategy', 'reason',
         'commission', 'note'
     ]
     
-    def __init__(self, file_path: str = "data/trade_journal.csv"):
+    # 汇总维度与统计列
+    STAT_DIMENSIONS = ['strategy', 'month', 'code']
+    STAT_COLUMNS = [
+        'total_trades', 'buy_trades', 'sell_trades', 'total_amount', 'total_commission',
+        'closed_trades', 'profitable_trades', 'total_profit', 'holding_days'
+    ]
+    
+    def __init__(self, file_path: str = None, csv_path: str = None):
         """
         初始化交易日志管理器
         
         Args:
-            file_path: CSV 文件路径，默认为 data/trade_journal.csv
+            file_path: 数据库文件路径，默认为 data/trade_journal.db；
+                       传入 .csv 路径时数据库建在同目录同名 .db，该 CSV 作为迁移来源
+            csv_path: 待迁移的旧版 CSV 路径，默认为数据库同目录同名 .csv
         """
+        file_path = Path(file_path) if file_path is not None else self.DEFAULT_PATH
+        if file_path.suffix == '.csv':
+            csv_path = csv_path or file_path
+            file_path = file_path.with_suffix('.db')
         self.file_path = file_path
-        self._records: List[TradeRecord] = []
-        self._load_from_csv()
+        self.csv_path = Path(csv_path) if csv_path is not None else file_path.with_suffix('.csv')
+        self._lock = threading.Lock()
+        self._ensure_db()
+        self._migrate_csv()
     
-    def _load_from_csv(self) -> None:
+    def _ensure_db(self) -> None:
+        """确保数据库、索引与汇总表存在"""
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.file_path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS trades ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, "
+                "code TEXT NOT NULL, name TEXT, action TEXT NOT NULL, price REAL, quantity INTEGER, "
+                "trade_date TEXT NOT NULL, signal_id TEXT, signal_date TEXT, signal_price REAL, "
+                "strategy TEXT, reason TEXT, commission REAL, note TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_date ON trades (trade_date)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_code_date ON trades (code, trade_date)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_trades_strategy_date ON trades (strategy, trade_date)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_signal ON trades (signal_id)")
+            columns = ', '.join(
+                f"{c} INTEGER NOT NULL DEFAULT 0" if c.endswith('trades') or c == 'holding_days'
+                else f"{c} REAL NOT NULL DEFAULT 0"
+                for c in self.STAT_COLUMNS
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS trade_stats ("
+                f"dimension TEXT NOT NULL, key TEXT NOT NULL, {columns}, "
+                "PRIMARY KEY (dimension, key))"
+            )
+    
+    def _migrate_csv(self) -> int:
         """
-        从 CSV 文件加载交易记录
+        数据库为空时导入旧版 CSV 交易记录
         
-        如果文件不存在，创建空列表。
-        如果文件存在但有错误行，跳过错误行并记录警告。
-        """
-        self._records = []
+        解析错误的行跳过并记录警告（与原 CSV 加载口径一致），导入后重建汇总表。
         
-        if not os.path.exists(self.file_path):
-            logger.info(f"交易记录文件不存在，将在首次添加时创建: {self.file_path}")
-            return
+        Returns:
+            导入的交易记录数量
+        """
+        if not self.csv_path.exists() or self.count_trades() > 0:
+            return 0
         
+        records = []
         try:
-            with open(self.file_path, 'r', encoding='utf-8', newline='') as f:
+            with open(self.csv_path, 'r', encoding='utf-8', newline='') as f:
                 reader = csv.DictReader(f)
                 for row_num, row in enumerate(reader, start=2):  # 从2开始，因为第1行是表头
                     try:
-                        record = self._row_to_record(row)
-                        self._records.append(record)
+                        records.append(self._row_to_record(row))
                     except Exception as e:
                         logger.warning(f"跳过第 {row_num} 行，解析错误: {e}")
-                        continue
-            
-            logger.info(f"成功加载 {len(self._records)} 条交易记录")
         except Exception as e:
             logger.error(f"加载交易记录文件失败: {e}")
-            self._records = []
+            return 0
+        
+        if not records:
+            return 0
+        
+        with self._lock, self._conn:
+            self._conn.executemany(self._insert_sql("INSERT OR IGNORE"), map(self._to_db_row, records))
+        self.rebuild_stats()
+        logger.info(f"从 CSV 迁移 {len(records)} 条交易记录: {self.csv_path}")
+        return len(records)
+    
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
     
     def _row_to_record(self, row: dict) -> TradeRecord:
         """
@@ -258,57 +362,168 @@ class TradeJournal:
             'note': record.note
         }
     
-    def _save_to_csv(self) -> None:
-        """
-        将所有交易记录保存到 CSV 文件
-        
-        如果目录不存在，会自动创建。
+    def _insert_sql(self, verb: str = "INSERT") -> str:
+        placeholders = ', '.join('?' * len(self.CSV_COLUMNS))
+        return f"{verb} INTO trades ({', '.join(self.CSV_COLUMNS)}) VALUES ({placeholders})"
+    
+    @staticmethod
+    def _to_db_row(record: TradeRecord) -> tuple:
+        """将 TradeRecord 对象转换为数据库行（列顺序同 CSV_COLUMNS）"""
+        return (
+            record.id,
+            record.code,
+            record.name,
+            record.action.value,
+            float(record.price),
+            int(record.quantity),
+            record.trade_date.isoformat(),
+            record.signal_id or None,
+            record.signal_date.isoformat() if record.signal_date else None,
+            record.signal_price,
+            record.strategy or '',
+            record.reason or '',
+            float(record.commission or 0.0),
+            record.note or ''
+        )
+    
+    @staticmethod
+    def _from_db_row(row: tuple) -> TradeRecord:
+        """将数据库行转换为 TradeRecord 对象"""
+        (record_id, code, name, action, price, quantity, trade_date, signal_id,
+         signal_date, signal_price, strategy, reason, commission, note) = row
+        return TradeRecord(
+            code=code,
+            name=name,
+            action=TradeAction(action),
+            price=price,
+            quantity=quantity,
+            trade_date=date.fromisoformat(trade_date),
+            signal_id=signal_id or None,
+            signal_date=date.fromisoformat(signal_date) if signal_date else None,
+            signal_price=signal_price,
+            strategy=strategy or '',
+            reason=reason or '',
+            commission=commission or 0.0,
+            note=note or '',
+            id=record_id
+        )
+    
+    def _where(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        code: Optional[str] = None,
+        action: Optional[TradeAction] = None,
+        strategy: Optional[str] = None,
+        extra: Optional[List[str]] = None
+    ) -> Tuple[str, list]:
+        """构造筛选条件（均为精确匹配，与原内存筛选口径一致）"""
+        clauses, params = [], []
+        if start_date is not None:
+            clauses.append("trade_date >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            clauses.append("trade_date <= ?")
+            params.append(end_date.isoformat())
+        if code is not None:
+            clauses.append("code = ?")
+            params.append(code)
+        if action is not None:
+            clauses.append("action = ?")
+            params.append(action.value)
+        if strategy is not None:
+            clauses.append("strategy = ?")
+            params.append(strategy)
+        clauses.extend(extra or [])
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+    
+    def _select(self, where: str, params: list, order: str, limit: Optional[int] = None,
+                offset: int = 0) -> List[TradeRecord]:
+        """按条件读取交易记录（调用方负责加锁）"""
+        sql = f"SELECT {', '.join(self.CSV_COLUMNS)} FROM trades{where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = params + [int(limit), int(offset)]
+        return [self._from_db_row(row) for row in self._conn.execute(sql, params)]
+    
+    @staticmethod
+    def _stat_keys(record: TradeRecord) -> List[Tuple[str, str]]:
+        """记录所属的汇总键：全部 / 策略 / 月份 / 股票"""
+        return [
+            ('all', ''),
+            ('strategy', record.strategy or ''),
+            ('month', record.trade_date.strftime('%Y-%m')),
+            ('code', record.code),
+        ]
+    
+    def _stat_deltas(
+        self,
+        trades: Iterable[TradeRecord],
+        lots: Iterable[Tuple[TradeRecord, TradeRecord, int]],
+        sign: int = 1,
+        deltas: Optional[dict] = None
+    ) -> dict:
         """
-        # 确保目录存在
-        dir_path = os.path.dirname(self.file_path)
-        if dir_path and not os.path.exists(dir_path):
-            os.makedirs(dir_path)
+        计算交易与已平仓配对对汇总表的增量
         
-        with open(self.file_path, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=self.CSV_COLUMNS)
-            writer.writeheader()
-            for record in self._records:
-                writer.writerow(self._record_to_row(record))
+        已平仓配对的盈亏计入卖出记录所属的策略和月份。
         
-        logger.debug(f"保存 {len(self._records)} 条交易记录到 {self.file_path}")
+        Returns:
+            {(dimension, key): [STAT_COLUMNS 对应增量]}
+        """
+        if deltas is None:
+            deltas = defaultdict(lambda: [0] * len(self.STAT_COLUMNS))
+        for trade in trades:
+            is_buy = trade.action == TradeAction.BUY
+            values = (1, int(is_buy), int(not is_buy), trade.total_amount, trade.commission or 0.0)
+            for key in self._stat_keys(trade):
+                row = deltas[key]
+                for i, value in enumerate(values):
+                    row[i] += sign * value
+        for buy_trade, sell_trade, match_qty in lots:
+            profit = (sell_trade.price - buy_trade.price) * match_qty
+            holding_days = (sell_trade.trade_date - buy_trade.trade_date).days
+            for key in self._stat_keys(sell_trade):
+                row = deltas[key]
+                row[5] += sign
+                row[6] += sign * int(profit > 0)
+                row[7] += sign * profit
+                row[8] += sign * holding_days
+        return deltas
+    
+    def _apply_stat_deltas(self, deltas: dict) -> None:
+        """将增量写入汇总表（调用方负责加锁与事务）"""
+        columns = ', '.join(self.STAT_COLUMNS)
+        updates = ', '.join(f"{c} = {c} + excluded.{c}" for c in self.STAT_COLUMNS)
+        self._conn.executemany(
+            f"INSERT INTO trade_stats (dimension, key, {columns}) "
+            f"VALUES (?, ?, {', '.join('?' * len(self.STAT_COLUMNS))}) "
+            f"ON CONFLICT (dimension, key) DO UPDATE SET {updates}",
+            [(dimension, key, *values) for (dimension, key), values in deltas.items()]
+        )
+        self._conn.execute("DELETE FROM trade_stats WHERE total_trades <= 0")
     
-    def _append_to_csv(self, record: TradeRecord) -> None:
+    def _code_trades(self, code: str) -> List[TradeRecord]:
+        """某只股票的全部交易（按录入顺序，调用方负责加锁）"""
+        return self._select(" WHERE code = ?", [code], "seq")
+    
+    def rebuild_stats(self) -> None:
         """
-        追加单条交易记录到 CSV 文件
-        
-        如果文件不存在，会创建新文件并写入表头。
+        全量重建汇总表
         
-        Args:
-            record: 要追加的交易记录
+        用于旧数据迁移或汇总表修复，日常增删交易只做增量更新。
         """
-        # 确保目录存在
-        dir_path = os.path.dirname(self.file_path)
-        if dir_path and not os.path.exists(dir_path):
-            os.makedirs(dir_path)
-        
-        file_exists = os.path.exists(self.file_path)
-        
-        with open(self.file_path, 'a', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=self.CSV_COLUMNS)
-            
-            # 如果文件不存在或为空，写入表头
-            if not file_exists or os.path.getsize(self.file_path) == 0:
-                writer.writeheader()
-            
-            writer.writerow(self._record_to_row(record))
-        
-        logger.debug(f"追加交易记录: {record.id}")
+        with self._lock, self._conn:
+            trades = self._select("", [], "seq")
+            self._conn.execute("DELETE FROM trade_stats")
+            self._apply_stat_deltas(self._stat_deltas(trades, _match_fifo(trades)))
     
     def add_trade(self, record: TradeRecord) -> Tuple[bool, str]:
         """
         添加交易记录
         
-        验证必填字段、价格、数量和日期后，追加到 CSV 文件。
+        验证必填字段、价格、数量和日期后写入数据库，并在同一事务内
+        增量更新汇总表（只重算该股票的 FIFO 配对）。
         
         Args:
             record: 要添加的交易记录
@@ -342,17 +557,16 @@ class TradeJournal:
         if record.trade_date > date.today():
             return False, "成交日期不能是未来日期"
         
-        # 添加到内存列表
-        self._records.append(record)
-        
-        # 追加到 CSV 文件
         try:
-            self._append_to_csv(record)
+            with self._lock, self._conn:
+                before = self._code_trades(record.code)
+                self._conn.execute(self._insert_sql(), self._to_db_row(record))
+                deltas = self._stat_deltas([], _match_fifo(before), sign=-1)
+                self._stat_deltas([record], _match_fifo(before + [record]), deltas=deltas)
+                self._apply_stat_deltas(deltas)
             logger.info(f"添加交易记录成功: {record.id} - {record.code} {record.action.value}")
             return True, f"交易记录添加成功: {record.id}"
         except Exception as e:
-            # 如果写入失败，从内存中移除
-            self._records.remove(record)
             logger.error(f"添加交易记录失败: {e}")
             return False, f"保存交易记录失败: {e}"
     
@@ -361,14 +575,15 @@ class TradeJournal:
         获取所有交易记录
         
         Returns:
-            所有交易记录列表
+            所有交易记录列表（按录入顺序）
         """
-        return list(self._records)
+        with self._lock:
+            return self._select("", [], "seq")
     
     @property
     def records(self) -> List[TradeRecord]:
         """获取所有交易记录（只读）"""
-        return list(self._records)
+        return self.get_all_trades()
     
     def get_trades(
         self,
@@ -376,10 +591,12 @@ class TradeJournal:
         end_date: Optional[date] = None,
         code: Optional[str] = None,
         action: Optional[TradeAction] = None,
-        strategy: Optional[str] = None
+        strategy: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[TradeRecord]:
         """
-        查询交易记录，支持多种筛选条件
+        查询交易记录，支持多种筛选条件与分页
         
         Args:
             start_date: 开始日期（包含），None 表示不限制
@@ -387,43 +604,50 @@ class TradeJournal:
             code: 股票代码筛选，None 表示不限制
             action: 交易动作筛选（买入/卖出），None 表示不限制
             strategy: 策略名称筛选，None 表示不限制
+            limit: 分页大小，None 为全部
+            offset: 分页偏移
             
         Returns:
-            符合条件的交易记录列表，按 trade_date 降序排序（最新的在前）
+            符合条件的交易记录列表，按 trade_date 降序排序（最新的在前，同日按录入顺序）
         """
-        result = []
-        
-        for record in self._records:
-            # 日期范围筛选
-            if start_date is not None and record.trade_date < start_date:
-                continue
-            if end_date is not None and record.trade_date > end_date:
-                continue
-            
-            # 股票代码筛选
-            if code is not None and record.code != code:
-                continue
-            
-            # 交易动作筛选
-            if action is not None and record.action != action:
-                continue
-            
-            # 策略名称筛选
-            if strategy is not None and record.strategy != strategy:
-                continue
-            
-            result.append(record)
-        
-        # 按 trade_date 降序排序（最新的在前）
-        result.sort(key=lambda r: r.trade_date, reverse=True)
-        
-        return result
+        where, params = self._where(start_date, end_date, code, action, strategy)
+        with self._lock:
+            return self._select(where, params, "trade_date DESC, seq", limit, offset)
+    
+    def count_trades(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        code: Optional[str] = None,
+        action: Optional[TradeAction] = None,
+        strategy: Optional[str] = None
+    ) -> int:
+        """筛选条件下的交易总数（用于分页）"""
+        where, params = self._where(start_date, end_date, code, action, strategy)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM trades{where}", params).fetchone()[0]
+    
+    def get_strategies(self) -> List[str]:
+        """交易记录中出现过的策略名称（不含空策略）"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM trade_stats WHERE dimension = 'strategy' AND key != '' ORDER BY key"
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def date_range(self) -> Optional[Tuple[date, date]]:
+        """交易记录的日期范围 (最早, 最晚)，无记录时返回 None"""
+        with self._lock:
+            first, last = self._conn.execute("SELECT MIN(trade_date), MAX(trade_date) FROM trades").fetchone()
+        if first is None:
+            return None
+        return date.fromisoformat(first), date.fromisoformat(last)
     
     def delete_trade(self, trade_id: str) -> Tuple[bool, str]:
         """
         删除交易记录
         
-        根据 trade_id 删除记录，并更新 CSV 文件。
+        根据 trade_id 删除记录，并在同一事务内增量更新汇总表。
         
         Args:
             trade_id: 要删除的交易记录 ID
@@ -431,30 +655,46 @@ class TradeJournal:
         Returns:
             (成功, 消息) 元组
         """
-        # 查找要删除的记录
-        record_to_delete = None
-        for record in self._records:
-            if record.id == trade_id:
-                record_to_delete = record
-                break
-        
-        if record_to_delete is None:
-            return False, f"未找到交易记录: {trade_id}"
-        
-        # 从内存中移除
-        self._records.remove(record_to_delete)
-        
-        # 重新保存整个 CSV 文件
         try:
-            self._save_to_csv()
+            with self._lock, self._conn:
+                found = self._select(" WHERE id = ?", [trade_id], "seq")
+                if not found:
+                    return False, f"未找到交易记录: {trade_id}"
+                
+                record = found[0]
+                before = self._code_trades(record.code)
+                after = [t for t in before if t.id != trade_id]
+                self._conn.execute("DELETE FROM trades WHERE id = ?", (trade_id,))
+                deltas = self._stat_deltas([record], _match_fifo(before), sign=-1)
+                self._stat_deltas([], _match_fifo(after), deltas=deltas)
+                self._apply_stat_deltas(deltas)
             logger.info(f"删除交易记录成功: {trade_id}")
             return True, f"交易记录删除成功: {trade_id}"
         except Exception as e:
-            # 如果保存失败，恢复内存中的记录
-            self._records.append(record_to_delete)
             logger.error(f"删除交易记录失败: {e}")
             return False, f"删除交易记录失败: {e}"
     
+    def _performance_from_stats(self, values) -> TradePerformance:
+        """由汇总值构造 TradePerformance"""
+        (total_trades, buy_trades, sell_trades, _, total_commission,
+         closed_trades, profitable_trades, total_profit, holding_days) = values
+        performance = TradePerformance(
+            total_trades=int(total_trades),
+            buy_trades=int(buy_trades),
+            sell_trades=int(sell_trades),
+            closed_trades=int(closed_trades),
+            profitable_trades=int(profitable_trades),
+            total_profit=total_profit,
+            total_commission=total_commission,
+            net_profit=total_profit - total_commission
+        )
+        
+        # 计算胜率（如果没有已平仓交易，胜率为 0）
+        if closed_trades > 0:
+            performance.win_rate = profitable_trades / closed_trades
+            performance.average_holding_days = holding_days / closed_trades
+        return performance
+    
     def calculate_performance(
         self,
         start_date: Optional[date] = None,
@@ -465,6 +705,7 @@ class TradeJournal:
         
         通过匹配买卖对来计算已平仓交易的盈亏。
         匹配逻辑：对于每只股票，按时间顺序匹配买入和卖出记录（FIFO）。
+        不限日期时直接读取汇总表；限定日期时只读取区间内的交易并在区间内配对。
         
         Args:
             start_date: 开始日期（包含），None 表示不限制
@@ -475,123 +716,66 @@ class TradeJournal:
             
         Requirements: 4.1, 4.2, 4.3, 4.4, 4.5, 4.6, 4.7
         """
-        # 获取指定日期范围内的交易记录
-        trades = self.get_trades(start_date=start_date, end_date=end_date)
-        
-        # 初始化统计数据
-        performance = TradePerformance()
+        if start_date is None and end_date is None:
+            with self._lock:
+                row = self._conn.execute(
+                    f"SELECT {', '.join(self.STAT_COLUMNS)} FROM trade_stats "
+                    "WHERE dimension = 'all' AND key = ''"
+                ).fetchone()
+            return self._performance_from_stats(row) if row else TradePerformance()
         
+        trades = self.get_trades(start_date=start_date, end_date=end_date)
         if not trades:
-            return performance
-        
-        # 基础统计
-        performance.total_trades = len(trades)
-        performance.buy_trades = sum(1 for t in trades if t.action == TradeAction.BUY)
-        performance.sell_trades = sum(1 for t in trades if t.action == TradeAction.SELL)
-        performance.total_commission = sum(t.commission for t in trades)
-        
-        # 按股票代码分组，用于匹配买卖对
-        # 使用 FIFO（先进先出）方式匹配买入和卖出
-        trades_by_code: dict = {}
-        for trade in trades:
-            if trade.code not in trades_by_code:
-                trades_by_code[trade.code] = []
-            trades_by_code[trade.code].append(trade)
-        
-        # 计算已平仓交易的盈亏
-        closed_trades = 0
-        profitable_trades = 0
-        total_profit = 0.0
-        total_holding_days = 0
-        
-        for code, code_trades in trades_by_code.items():
-            # 按交易日期升序排序（用于 FIFO 匹配）
-            code_trades.sort(key=lambda t: t.trade_date)
-            
-            # 分离买入和卖出记录
-            buy_queue: List[TradeRecord] = []
-            
-            for trade in code_trades:
-                if trade.action == TradeAction.BUY:
-                    buy_queue.append(trade)
-                elif trade.action == TradeAction.SELL:
-                    # 尝试匹配买入记录
-                    remaining_sell_qty = trade.quantity
-                    
-                    while remaining_sell_qty > 0 and buy_queue:
-                        buy_trade = buy_queue[0]
-                        
-                        # 计算可匹配的数量
-                        match_qty = min(buy_trade.quantity, remaining_sell_qty)
-                        
-                        # 计算这笔匹配的盈亏
-                        profit = (trade.price - buy_trade.price) * match_qty
-                        total_profit += profit
-                        
-                        # 计算持仓天数
-                        holding_days = (trade.trade_date - buy_trade.trade_date).days
-                        total_holding_days += holding_days
-                        
-                        # 记录已平仓交易
-                        closed_trades += 1
-                        if profit > 0:
-                            profitable_trades += 1
-                        
-                        # 更新剩余数量
-                        remaining_sell_qty -= match_qty
-                        
-                        if match_qty >= buy_trade.quantity:
-                            # 买入记录完全匹配，移除
-                            buy_queue.pop(0)
-                        else:
-                            # 买入记录部分匹配，更新剩余数量
-                            # 创建新的买入记录替换原记录
-                            buy_queue[0] = TradeRecord(
-                                code=buy_trade.code,
-                                name=buy_trade.name,
-                                action=buy_trade.action,
-                                price=buy_trade.price,
-                                quantity=buy_trade.quantity - match_qty,
-                                trade_date=buy_trade.trade_date,
-                                signal_id=buy_trade.signal_id,
-                                signal_date=buy_trade.signal_date,
-                                signal_price=buy_trade.signal_price,
-                                strategy=buy_trade.strategy,
-                                reason=buy_trade.reason,
-                                commission=buy_trade.commission,
-                                note=buy_trade.note,
-                                id=buy_trade.id
-                            )
-        
-        # 填充统计结果
-        performance.closed_trades = closed_trades
-        performance.profitable_trades = profitable_trades
-        performance.total_profit = total_profit
-        performance.net_profit = total_profit - performance.total_commission
+            return TradePerformance()
+        deltas = self._stat_deltas(trades, _match_fifo(trades))
+        return self._performance_from_stats(deltas[('all', '')])
+    
+    def get_performance_breakdown(self, by: str = 'strategy') -> pd.DataFrame:
+        """
+        按维度读取交易表现汇总
         
-        # 计算胜率（如果没有已平仓交易，胜率为 0）
-        if closed_trades > 0:
-            performance.win_rate = profitable_trades / closed_trades
-            performance.average_holding_days = total_holding_days / closed_trades
-        else:
-            performance.win_rate = 0.0
-            performance.average_holding_days = 0.0
+        已平仓盈亏计入卖出记录所属的策略和月份。
         
-        return performance
+        Args:
+            by: 汇总维度，'strategy' / 'month' / 'code'
+            
+        Returns:
+            DataFrame，列为维度值、STAT_COLUMNS、net_profit、win_rate、average_holding_days
+        """
+        if by not in self.STAT_DIMENSIONS:
+            raise ValueError(f"不支持的汇总维度: {by}，可选: {self.STAT_DIMENSIONS}")
+        
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, {', '.join(self.STAT_COLUMNS)} FROM trade_stats "
+                "WHERE dimension = ? ORDER BY key",
+                (by,)
+            ).fetchall()
+        
+        df = pd.DataFrame(rows, columns=[by] + self.STAT_COLUMNS)
+        closed = df['closed_trades'].where(df['closed_trades'] > 0)
+        df['net_profit'] = df['total_profit'] - df['total_commission']
+        df['win_rate'] = (df['profitable_trades'] / closed).fillna(0.0)
+        df['average_holding_days'] = (df['holding_days'] / closed).fillna(0.0)
+        return df
     
     def get_signal_execution_stats(
         self,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
+        end_date: Optional[date] = None,
+        signal_store=None
     ) -> dict:
         """
         获取信号执行统计
         
         计算信号执行率、平均滑点，并返回未执行信号列表。
+        已执行信号与滑点在数据库中按 signal_id 索引汇总，
+        与信号存储按 "日期_代码" 键做集合关联。
         
         Args:
             start_date: 开始日期（包含），None 表示不限制
             end_date: 结束日期（包含），None 表示不限制
+            signal_store: 信号存储实例，None 时使用默认 SignalStore
             
         Returns:
             {
@@ -604,18 +788,18 @@ class TradeJournal:
             
         Requirements: 5.2, 5.3, 5.5
         """
-        # 获取指定日期范围内的交易记录
-        trades = self.get_trades(start_date=start_date, end_date=end_date)
-        
-        # 统计有信号关联的交易
-        trades_with_signal = [t for t in trades if t.signal_id]
-        
-        # 计算平均滑点（只计算有滑点数据的交易）
-        slippages = [t.slippage for t in trades_with_signal if t.slippage is not None]
-        average_slippage = sum(slippages) / len(slippages) if slippages else 0.0
-        
-        # 获取已执行的信号ID集合
-        executed_signal_ids = {t.signal_id for t in trades_with_signal}
+        where, params = self._where(
+            start_date, end_date, extra=["signal_id IS NOT NULL", "signal_id != ''"]
+        )
+        with self._lock:
+            executed_signal_ids = {
+                row[0] for row in self._conn.execute(f"SELECT DISTINCT signal_id FROM trades{where}", params)
+            }
+            # 平均滑点（只计算有信号价格的交易）
+            average_slippage = self._conn.execute(
+                f"SELECT AVG((price - signal_price) / signal_price) FROM trades{where} AND signal_price > 0",
+                params
+            ).fetchone()[0] or 0.0
         
         # 尝试从 SignalStore 获取总信号数
         # 如果 SignalStore 不可用，则只基于交易记录计算
@@ -623,20 +807,19 @@ class TradeJournal:
         unexecuted_signals: List[str] = []
         
         try:
-            from core.signal_store import SignalStore
-            signal_store = SignalStore()
+            if signal_store is None:
+                from core.signal_store import SignalStore
+                signal_store = SignalStore()
             signals_df = signal_store.load_signals(
                 start_date=start_date,
                 end_date=end_date
             )
             
             if not signals_df.empty:
-                # 生成信号ID（使用日期+代码作为唯一标识）
-                all_signal_ids = set()
-                for _, row in signals_df.iterrows():
-                    signal_id = f"{row['generated_date']}_{row['code']}"
-                    all_signal_ids.add(signal_id)
-                
+                # 信号ID（使用日期+代码作为唯一标识）
+                all_signal_ids = set(
+                    signals_df['generated_date'].map(str) + '_' + signals_df['code'].map(str)
+                )
                 total_signals = len(all_signal_ids)
                 unexecuted_signals = list(all_signal_ids - executed_signal_ids)
         except Exception as e:
@@ -739,7 +922,7 @@ class TradeJournal:
         Returns:
             (收益率, 交易次数) 元组
         """
-        # 获取指定策略和日期范围内的交易记录
+        # 获取指定策略和日期范围内的交易记录（索引查询）
         trades = self.get_trades(
             start_date=start_date,
             end_date=end_date,
@@ -749,71 +932,21 @@ class TradeJournal:
         if not trades:
             return 0.0, 0
         
-        # 按股票代码分组，计算已平仓交易的盈亏
-        trades_by_code: dict = {}
-        for trade in trades:
-            if trade.code not in trades_by_code:
-                trades_by_code[trade.code] = []
-            trades_by_code[trade.code].append(trade)
-        
         total_investment = 0.0  # 总投入资金
         total_profit = 0.0      # 总盈亏
         trade_count = 0
         
-        for code, code_trades in trades_by_code.items():
-            # 按交易日期升序排序（用于 FIFO 匹配）
-            code_trades.sort(key=lambda t: t.trade_date)
-            
-            # 分离买入和卖出记录
-            buy_queue: List[TradeRecord] = []
-            
-            for trade in code_trades:
-                if trade.action == TradeAction.BUY:
-                    buy_queue.append(trade)
-                elif trade.action == TradeAction.SELL:
-                    # 尝试匹配买入记录
-                    remaining_sell_qty = trade.quantity
-                    
-                    while remaining_sell_qty > 0 and buy_queue:
-                        buy_trade = buy_queue[0]
-                        
-                        # 计算可匹配的数量
-                        match_qty = min(buy_trade.quantity, remaining_sell_qty)
-                        
-                        # 计算这笔匹配的投入和盈亏
-                        investment = buy_trade.price * match_qty
-                        profit = (trade.price - buy_trade.price) * match_qty
-                        
-                        # 扣除手续费
-                        profit -= (buy_trade.commission + trade.commission) * (match_qty / trade.quantity)
-                        
-                        total_investment += investment
-                        total_profit += profit
-                        trade_count += 1
-                        
-                        # 更新剩余数量
-                        remaining_sell_qty -= match_qty
-                        
-                        if match_qty >= buy_trade.quantity:
-                            buy_queue.pop(0)
-                        else:
-                            # 部分匹配，更新剩余数量
-                            buy_queue[0] = TradeRecord(
-                                code=buy_trade.code,
-                                name=buy_trade.name,
-                                action=buy_trade.action,
-                                price=buy_trade.price,
-                                quantity=buy_trade.quantity - match_qty,
-                                trade_date=buy_trade.trade_date,
-                                signal_id=buy_trade.signal_id,
-                                signal_date=buy_trade.signal_date,
-                                signal_price=buy_trade.signal_price,
-                                strategy=buy_trade.strategy,
-                                reason=buy_trade.reason,
-                                commission=buy_trade.commission,
-                                note=buy_trade.note,
-                                id=buy_trade.id
-                            )
+        for buy_trade, sell_trade, match_qty in _match_fifo(trades):
+            # 计算这笔匹配的投入和盈亏
+            investment = buy_trade.price * match_qty
+            profit = (sell_trade.price - buy_trade.price) * match_qty
+            
+            # 扣除手续费
+            profit -= (buy_trade.commission + sell_trade.commission) * (match_qty / sell_trade.quantity)
+            
+            total_investment += investment
+            total_profit += profit
+            trade_count += 1
         
         # 计算收益率
         if total_investment > 0:
@@ -957,7 +1090,7 @@ class TradeJournal:
         import io
         
         if trades is None:
-            trades = self._records
+            trades = self.get_all_trades()
         
         if not trades:
             # 返回只有表头的 CSV
@@ -0,0 +1,178 @@
+"""
+列式批量评分测试
+
+测试：
+- 财务 / 市场批量评估与逐只评估得分、等级、筛选标准一致（含缺失值与阈值边界）
+- 综合评分按列评分与 score_stock 一致，score_stocks 排名与只构造前N名结果
+- 股票质量比较批量得分与逐只计算一致
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.stock_screener.financial_screener import FinancialScreener
+from core.stock_screener.market_screener import MarketScreener
+from core.stock_screener.comprehensive_scorer import ComprehensiveScorer
+from core.stock_screener.stock_quality_comparator import ORIGINAL_STOCK_CODES, StockQualityComparator
+
+
+# 覆盖各评分阈值边界、负值与元为单位的大数
+GRID = [-50, -10, 0, 0.1, 0.2, 0.5, 1, 1.5, 2, 2.5, 3, 5, 7, 8, 10, 15, 20, 25, 30, 35, 40, 45,
+        50, 60, 70, 80, 90, 95, 100, 200, 500, 1000, 2000, 3e8, 5e10]
+
+NAMES = ['芯片龙头', 'AI领先科技', '普通贸易', '半导体第一', '国产替代软件', '光伏储能', '银行', '']
+DESCS = ['自主研发核心技术专利', 'GPU处理器', '代工组装', np.nan, '云计算 大数据 SaaS', '', '品牌优势 技术创新']
+
+
+def _random_frame(columns, n=600, seed=0, codes=None):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'code': codes if codes is not None else [f"{i:06d}" for i in range(n)],
+        'name': rng.choice(NAMES, n),
+        'business_desc': rng.choice(np.array(DESCS, dtype=object), n),
+    })
+    for column in columns:
+        values = rng.choice(GRID, n) + rng.choice([0, 0, 0.3], n)
+        values[rng.random(n) < 0.2] = np.nan
+        df[column] = values
+    return df
+
+
+class TestFinancialBatch:
+    """财务批量评估"""
+
+    def test_matches_evaluate_stock(self):
+        screener = FinancialScreener()
+        df = _random_frame(FinancialScreener.INDICATOR_FIELDS)
+        batch = screener.evaluate_batch(screener.indicator_arrays(df))
+
+        for i, (_, row) in enumerate(df.iterrows()):
+            result = screener.evaluate_stock(screener._extract_indicators(row))
+            assert result.total_score == batch['total_score'].iat[i]
+            assert result.valuation_score == batch['valuation_score'].iat[i]
+            assert result.health_level.value == batch['health_level'].iat[i]
+            assert result.passed == batch['criteria_passed'].iat[i]
+
+    def test_screen_stocks(self):
+        screener = FinancialScreener()
+        df = _random_frame(FinancialScreener.INDICATOR_FIELDS)
+        passed_df, results = screener.screen_stocks(df, min_score=50, strict_mode=True)
+
+        expected = [r.code for r in results if r.total_score >= 50 and r.passed]
+        assert passed_df['code'].tolist() == expected
+        assert passed_df['financial_score'].tolist() == [r.total_score for r in results if r.code in expected]
+
+        lean_df, lean_results = screener.screen_stocks(df, min_score=50, strict_mode=True, with_results=False)
+        assert lean_results == []
+        pd.testing.assert_frame_equal(lean_df, passed_df)
+
+
+class TestMarketBatch:
+    """市场表现批量评估"""
+
+    COLUMNS = ['total_market_cap', 'float_market_cap', 'turnover', 'turnover_rate', 'trading_days_ratio',
+               'volatility', 'max_drawdown', 'limit_up_down_freq']
+
+    def test_matches_evaluate_stock(self):
+        screener = MarketScreener()
+        df = _random_frame(self.COLUMNS, seed=1)
+        # 稳定性指标全部缺失时按中等波动处理
+        df.loc[:20, ['volatility', 'max_drawdown', 'limit_up_down_freq']] = np.nan
+        batch = screener.evaluate_batch(screener.indicator_arrays(df))
+
+        for i, (_, row) in enumerate(df.iterrows()):
+            result = screener.evaluate_stock(screener._extract_indicators(row))
+            assert result.liquidity_score == batch['liquidity_score'].iat[i]
+            assert result.stability_score == batch['stability_score'].iat[i]
+            assert result.market_cap_score == batch['market_cap_score'].iat[i]
+            assert result.liquidity_level.value == batch['liquidity_level'].iat[i]
+            assert result.volatility_level.value == batch['volatility_level'].iat[i]
+            assert result.passed == batch['criteria_passed'].iat[i]
+
+    def test_screen_stocks(self):
+        screener = MarketScreener()
+        df = _random_frame(self.COLUMNS, seed=1)
+        passed_df, results = screener.screen_stocks(df)
+
+        assert passed_df['code'].tolist() == [r.code for r in results if r.total_score >= 55]
+        assert passed_df['liquidity_level'].tolist() == [
+            r.liquidity_level.value for r in results if r.total_score >= 55
+        ]
+
+
+class TestComprehensiveBatch:
+    """综合评分批量评分"""
+
+    COLUMNS = FinancialScreener.INDICATOR_FIELDS + [
+        'total_market_cap', 'turnover', 'turnover_rate', 'volatility_annual', 'max_drawdown',
+        'trading_days_ratio',  # 综合评分不使用
+    ]
+
+    @pytest.fixture(scope='class')
+    def data(self):
+        scorer = ComprehensiveScorer()
+        df = _random_frame(self.COLUMNS, seed=2)
+        legacy = [scorer.score_stock(row) for _, row in df.iterrows()]
+        return scorer, df, legacy
+
+    def test_score_frame_matches_score_stock(self, data):
+        scorer, df, legacy = data
+        frame = scorer.score_frame(df)
+
+        for i, result in enumerate(legacy):
+            for column in ['financial_score', 'market_score', 'industry_score', 'qualitative_score', 'total_score']:
+                assert getattr(result, column) == frame[column].iat[i]
+            assert result.rating.value == frame['rating'].iat[i]
+            assert (result.tech_industry.value if result.tech_industry else None) == frame['tech_industry'].iat[i]
+
+        no_qualitative = scorer.score_frame(df, include_qualitative=False)
+        assert (no_qualitative['qualitative_score'] == 50.0).all()
+
+    def test_score_stocks_top_n(self, data):
+        scorer, df, legacy = data
+        ranked = sorted(legacy, key=lambda r: r.total_score, reverse=True)
+
+        passed_df, results = scorer.score_stocks(df, min_score=60, top_n=30)
+
+        assert len(results) == 30
+        assert [r.rank for r in results] == list(range(1, 31))
+        for expected, result in zip(ranked, results):
+            assert (result.code, result.total_score) == (expected.code, expected.total_score)
+            assert result.recommendations == expected.recommendations
+            assert result.financial_health == expected.financial_health
+
+        expected_codes = [r.code for r in ranked if r.total_score >= 60][:30]
+        assert passed_df['code'].tolist() == expected_codes
+        assert passed_df['rank'].tolist() == [ranked.index(r) + 1 for r in ranked if r.code in expected_codes]
+
+        _, all_results = scorer.score_stocks(df, min_score=0)
+        assert len(all_results) == len(df)
+
+
+class TestQualityBatch:
+    """股票质量批量计算"""
+
+    def test_matches_calculate_stock_quality(self):
+        comparator = StockQualityComparator()
+        codes = sorted(ORIGINAL_STOCK_CODES) + [f"9{i:05d}" for i in range(400)]
+        df = _random_frame(['roe', 'debt_ratio', 'gross_margin', 'net_margin', 'revenue_growth_3y',
+                            'profit_growth_1y', 'rd_ratio', 'market_cap', 'turnover', 'turnover_rate'],
+                           n=len(codes), seed=3, codes=codes)
+        quality = comparator.calculate_quality_frame(df)
+
+        for i, (_, row) in enumerate(df.iterrows()):
+            metrics = comparator.calculate_stock_quality(row)
+            assert metrics.financial_health_score == quality['financial_health_score'].iat[i]
+            assert metrics.growth_score == quality['growth_score'].iat[i]
+            assert metrics.liquidity_score == quality['liquidity_score'].iat[i]
+            assert metrics.overall_quality_score == quality['overall_quality_score'].iat[i]
+
+        result = comparator.compare_quality(df)
+        assert (result.existing_stock_count, result.new_stock_count) == (len(ORIGINAL_STOCK_CODES), 400)
+        new = quality.iloc[len(ORIGINAL_STOCK_CODES):]
+        assert result.new_avg_overall == pytest.approx(new['overall_quality_score'].mean())
@@ -0,0 +1,139 @@
+"""
+MiniQuant-Lite 财报披露日历测试
+
+测试 DisclosureCalendar 与 ReportChecker：
+- 报告期推算
+- 本地缓存加载（不发起网络请求）
+- 二分查找窗口期与即将披露区间查询
+"""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.disclosure_calendar import DisclosureCalendar, recent_report_periods
+from core.report_checker import ReportChecker
+
+
+TODAY = date.today()
+
+
+def _write_period(cache_dir, period: date, rows, fetched_at: datetime = None):
+    fetched_at = fetched_at or datetime.now()
+    df = pd.DataFrame(rows, columns=['code', 'report_type', 'disclosure_date'])
+    df['report_period'] = period.isoformat()
+    df['fetched_at'] = fetched_at.strftime('%Y-%m-%d %H:%M:%S')
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    df[DisclosureCalendar.COLUMNS].to_csv(cache_dir / f"{period.strftime('%Y%m%d')}.csv", index=False)
+
+
+@pytest.fixture
+def calendar(tmp_path):
+    cache_dir = tmp_path / 'calendar'
+    latest, previous = recent_report_periods(TODAY)
+    _write_period(cache_dir, latest, [
+        ('000001', '年报', (TODAY + timedelta(days=2)).isoformat()),
+        ('000001', '业绩预告', (TODAY - timedelta(days=30)).isoformat()),
+        ('600000', '年报', (TODAY + timedelta(days=10)).isoformat()),
+    ])
+    _write_period(cache_dir, previous, [
+        ('300750', '三季报', (TODAY - timedelta(days=1)).isoformat()),
+    ])
+    return DisclosureCalendar(cache_dir)
+
+
+class TestReportPeriods:
+    """报告期推算"""
+
+    def test_recent_periods_in_april(self):
+        assert recent_report_periods(date(2026, 4, 15)) == [date(2026, 3, 31), date(2025, 12, 31)]
+
+    def test_recent_periods_on_quarter_end(self):
+        assert recent_report_periods(date(2026, 9, 30)) == [date(2026, 9, 30), date(2026, 6, 30)]
+
+
+class TestDisclosureCalendar:
+    """日历索引"""
+
+    def test_loads_from_disk_without_network(self, calendar):
+        with patch('akshare.stock_yysj_em') as mock_yysj, patch('akshare.stock_yjyg_em') as mock_yjyg:
+            assert calendar.ensure_loaded(TODAY)
+            mock_yysj.assert_not_called()
+            mock_yjyg.assert_not_called()
+
+        assert '000001' in calendar
+        assert '300750' in calendar
+
+    def test_reports_sorted_by_date(self, calendar):
+        calendar.ensure_loaded(TODAY)
+        reports = calendar.get_reports('000001')
+
+        assert [r[1] for r in reports] == ['业绩预告', '年报']
+
+    def test_find_in_window(self, calendar):
+        calendar.ensure_loaded(TODAY)
+
+        found = calendar.find_in_window('000001', TODAY, window_days=3)
+        assert found is not None
+        assert found[0] == TODAY + timedelta(days=2)
+
+        assert calendar.find_in_window('600000', TODAY, window_days=3) is None
+        assert calendar.find_in_window('999999', TODAY, window_days=3) is None
+
+    def test_upcoming_range(self, calendar):
+        calendar.ensure_loaded(TODAY)
+
+        upcoming = calendar.upcoming(TODAY, TODAY + timedelta(days=14))
+        assert [u[0] for u in upcoming] == ['000001', '600000']
+
+        filtered = calendar.upcoming(TODAY, TODAY + timedelta(days=14), codes={'600000'})
+        assert [u[0] for u in filtered] == ['600000']
+
+    def test_stale_cache_refetched(self, tmp_path):
+        cache_dir = tmp_path / 'calendar'
+        latest, _ = recent_report_periods(TODAY)
+        _write_period(cache_dir, latest, [('000001', '年报', TODAY.isoformat())],
+                      fetched_at=datetime.now() - timedelta(days=10))
+        calendar = DisclosureCalendar(cache_dir, max_age_days=3)
+
+        fresh = pd.DataFrame({
+            'code': ['000002'], 'report_type': ['年报'], 'report_period': [latest.isoformat()],
+            'disclosure_date': [TODAY.isoformat()],
+            'fetched_at': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+        })
+        with patch.object(calendar, 'fetch_period', side_effect=lambda p: fresh if p == latest else None):
+            calendar.ensure_loaded(TODAY)
+
+        assert '000002' in calendar
+        assert '000001' not in calendar
+
+
+class TestReportCheckerWithCalendar:
+    """ReportChecker 使用披露日历"""
+
+    def test_check_report_window(self, calendar):
+        checker = ReportChecker(window_days=3, calendar=calendar)
+
+        in_window, warning = checker.check_report_window('000001')
+        assert in_window
+        assert '2天后' in warning
+
+        in_window, warning = checker.check_report_window('300750')
+        assert in_window
+        assert '1天前' in warning
+
+        assert checker.check_report_window('600000') == (False, None)
+
+    def test_get_upcoming_reports(self, calendar):
+        checker = ReportChecker(window_days=3, calendar=calendar)
+
+        upcoming = checker.get_upcoming_reports(['000001', '600000', '300750'], days_ahead=7)
+
+        assert [r.code for r in upcoming] == ['000001']
+        assert upcoming[0].days_to_disclosure == 2
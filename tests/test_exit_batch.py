@@ -0,0 +1,219 @@
+"""
+持仓卖出信号批量评估测试
+
+测试：
+- PortfolioBars 矩阵特征与逐只 pandas 计算一致
+- SellSignalChecker.evaluate_positions 与逐只 check_single_position 一致
+- TechExitManager.check_exit_signals 与逐只计算的规则结果一致
+- 持仓数据只加载一次
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.exit_features import PortfolioBars
+from core.position_tracker import Holding
+from core.sell_signal_checker import SellSignalChecker
+from core.tech_stock.exit_manager import TechExitManager
+from core.tech_stock.market_filter import MarketStatus
+
+
+LENGTHS = [10, 16, 19, 25, 70, 120, 300, 700]
+
+
+def _frame(days, seed, drift=0.0):
+    rng = np.random.default_rng(seed)
+    close = 20 * np.exp(np.cumsum(rng.normal(drift, 0.025, days)))
+    spread = np.abs(rng.normal(0, 0.01, days)) * close
+    return pd.DataFrame({
+        'date': pd.bdate_range('2022-01-03', periods=days),
+        'open': close,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(1_000, 50_000, days).astype(float),
+    })
+
+
+class _StubDataFeed:
+    def __init__(self, frames):
+        self.frames = frames
+        self.loads = []
+
+    def load_processed_data(self, code, use_cache=True):
+        self.loads.append(code)
+        df = self.frames.get(code)
+        return None if df is None else df.copy()
+
+
+def _portfolio(count=40):
+    frames, holdings = {}, []
+    for i in range(count):
+        code = f"{600000 + i:06d}"
+        frames[code] = _frame(LENGTHS[i % len(LENGTHS)], seed=i, drift=(-1) ** (i // 2) * 0.004)
+        last = float(frames[code]['close'].iloc[-1])
+        buy_price = last / (1 + [-0.12, -0.05, 0.0, 0.08, 0.2][i % 5])
+        holdings.append(Holding(code, f"股票{code}", buy_price, date(2024, 1, 2),
+                                [100, 200, 300, 150][i % 4], ["RSRS", "RSI"][i % 2]))
+    # 持续上涨（偶有小幅回调）：RSI 超买
+    steps = np.where(np.arange(80) % 7 == 0, -0.002, 0.012)
+    rising = _frame(80, seed=99)
+    rising['close'] = 10 * np.exp(np.cumsum(steps))
+    rising['high'], rising['low'] = rising['close'] * 1.005, rising['close'] * 0.995
+    frames['300001'] = rising
+    holdings.append(Holding("300001", "连续上涨", float(rising['close'].iloc[-1]) * 0.9,
+                            date(2024, 1, 2), 200, "RSI"))
+    holdings.append(Holding("000404", "无数据", 10.0, date(2024, 1, 2), 100, "RSI"))
+    return frames, holdings
+
+
+class TestPortfolioBars:
+    """矩阵特征"""
+
+    def test_matches_pandas_per_frame(self):
+        frames = [_frame(n, seed=n) for n in LENGTHS]
+        bars = PortfolioBars(frames)
+
+        ma20 = bars.ma(20)
+        atr = bars.atr(14)
+        avg_gain, avg_loss = bars.rsi_averages(14)
+
+        for i, df in enumerate(frames):
+            expected_ma20 = df['close'].rolling(20).mean()
+            assert ma20[i, -1] == pytest.approx(expected_ma20.iloc[-1], rel=1e-12, nan_ok=True)
+
+            tr = pd.concat([
+                df['high'] - df['low'],
+                (df['high'] - df['close'].shift(1)).abs(),
+                (df['low'] - df['close'].shift(1)).abs(),
+            ], axis=1).max(axis=1)
+            assert atr[i] == pytest.approx(tr.rolling(14).mean().iloc[-1], rel=1e-12, nan_ok=True)
+
+            delta = df['close'].diff()
+            gain = delta.where(delta > 0, 0).rolling(14).mean().iloc[-1]
+            loss = (-delta.where(delta < 0, 0)).rolling(14).mean().iloc[-1]
+            assert avg_gain[i] == pytest.approx(gain, rel=1e-12, abs=1e-12, nan_ok=True)
+            assert avg_loss[i] == pytest.approx(loss, rel=1e-12, abs=1e-12, nan_ok=True)
+
+    def test_below_streak(self):
+        close = [10, 12, 11, 9, 8, 7]
+        bars = PortfolioBars([pd.DataFrame({'close': close}), pd.DataFrame({'close': [5.0, 4.0]})])
+        reference = np.array([[np.nan, 10, 10, 10, 10, 10], [np.nan] * 4 + [4.5, 4.5]])
+
+        assert bars.below_streak(reference).tolist() == [3, 1]
+
+
+class TestSellSignalCheckerBatch:
+    """SellSignalChecker 批量评估"""
+
+    def test_matches_single_position_checks(self):
+        frames, holdings = _portfolio()
+        checker = SellSignalChecker(_StubDataFeed(frames))
+
+        batch = checker.evaluate_positions(holdings)
+        expected = [checker.check_single_position(h) for h in holdings]
+
+        assert any(s is not None for s in expected)
+        assert {s.urgency for s in expected if s} >= {'high', 'medium'}
+        for got, want in zip(batch, expected):
+            if want is None:
+                assert got is None
+                continue
+            assert (got.code, got.exit_reason, got.urgency) == (want.code, want.exit_reason, want.urgency)
+            assert got.holding is want.holding
+            assert got.pnl_pct == pytest.approx(want.pnl_pct)
+            assert got.indicator_value == pytest.approx(want.indicator_value)
+
+    def test_each_code_loaded_once(self):
+        frames, holdings = _portfolio(10)
+        feed = _StubDataFeed(frames)
+
+        SellSignalChecker(feed).check_all_positions(holdings + holdings[:3])
+
+        assert sorted(feed.loads) == sorted(set(feed.loads))
+        assert len(feed.loads) == len(holdings)
+
+    def test_preloaded_frames_not_reloaded(self):
+        frames, holdings = _portfolio(10)
+        feed = _StubDataFeed(frames)
+        checker = SellSignalChecker(feed)
+        expected = checker.evaluate_positions(holdings)
+        feed.loads.clear()
+
+        preloaded = {h.code: frames[h.code] for h in holdings[:6]}
+        batch = checker.evaluate_positions(holdings, frames=preloaded)
+
+        assert sorted(feed.loads) == sorted(h.code for h in holdings[6:])
+        assert [s and s.exit_reason for s in batch] == [s and s.exit_reason for s in expected]
+        signal = next(s for s in batch if s is not None)
+        assert signal.to_trading_signal().reason == signal.exit_reason
+
+
+class TestTechExitManagerBatch:
+    """TechExitManager 批量评估"""
+
+    @staticmethod
+    def _reference(manager, holdings, market_status, frames, current_prices):
+        """逐只计算的原始流程"""
+        signals = []
+        for holding in holdings:
+            df = frames.get(holding.code)
+            if df is None or df.empty:
+                continue
+            df = manager._calculate_indicators(df.sort_values('date').reset_index(drop=True))
+            latest = df.iloc[-1]
+            price = current_prices.get(holding.code, float(latest['close']))
+            pnl = (price - holding.buy_price) / holding.buy_price
+            rsi = float(latest['rsi']) if pd.notna(latest['rsi']) else 0
+            ma5 = float(latest['ma5']) if pd.notna(latest['ma5']) else 0
+            ma20 = float(latest['ma20']) if pd.notna(latest['ma20']) else 0
+            days = manager._calculate_ma20_break_days(df)
+            stop = manager.calculate_stop_loss_price(holding, price, ma5)
+            args = (holding, price, pnl, rsi, ma5, ma20, days, stop)
+
+            signal = manager._check_emergency_exit(holding, market_status, *args[1:])
+            if signal is None:
+                signal = manager._check_stop_loss(*args)
+            if signal is None:
+                signal = manager._check_rsi_partial_sell(*args) or manager._check_trend_break(*args)
+            if signal is not None:
+                signals.append(signal)
+        return manager.sort_signals_by_priority(signals)
+
+    @pytest.mark.parametrize('is_green', [True, False])
+    def test_matches_per_holding_rules(self, is_green):
+        frames, holdings = _portfolio()
+        market_status = MarketStatus(is_green=is_green, gem_close=2000.0, gem_ma20=1950.0,
+                                     macd_status="golden_cross", check_date=date.today(), reason="")
+        current_prices = {holdings[3].code: float(frames[holdings[3].code]['close'].iloc[-1]) * 1.5}
+        manager = TechExitManager(data_feed=_StubDataFeed(frames))
+
+        batch = manager.check_exit_signals(holdings, market_status, current_prices=current_prices)
+        expected = self._reference(manager, holdings, market_status, frames, current_prices)
+
+        assert expected
+        assert [(s.code, s.exit_type) for s in batch] == [(s.code, s.exit_type) for s in expected]
+        for got, want in zip(batch, expected):
+            assert got.suggested_action == want.suggested_action
+            assert got.ma20_break_days == want.ma20_break_days
+            assert got.rsi == pytest.approx(want.rsi)
+            assert got.stop_loss_price == pytest.approx(want.stop_loss_price)
+
+    def test_stock_data_takes_precedence(self):
+        frames, holdings = _portfolio(4)
+        feed = _StubDataFeed(frames)
+        manager = TechExitManager(data_feed=feed)
+        market_status = MarketStatus(is_green=False, gem_close=2000.0, gem_ma20=2100.0,
+                                     macd_status="death_cross", check_date=date.today(), reason="")
+
+        manager.check_exit_signals(holdings[:4], market_status,
+                                   stock_data={h.code: frames[h.code] for h in holdings[:2]})
+
+        assert sorted(feed.loads) == [h.code for h in holdings[2:4]]
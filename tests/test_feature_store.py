@@ -0,0 +1,186 @@
+"""
+隔夜选股特征库测试
+
+测试：
+- 增量更新与全量构建结果一致，新股票计算全部历史，复权改写的股票重建
+- 按列投影、日期与代码过滤读取
+- 选股器查表评分与现算评分一致
+- 回测引擎查表数据与加载K线计算一致
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.overnight_picker import OvernightBacktestEngine, OvernightStockPicker
+from core.overnight_picker.feature_store import FeatureStore, compute_features
+from core.overnight_picker.scorer_v6 import ScorerV6
+from tests.test_overnight_picker_pipeline import HOT_TOPICS, _OfflineFundFlowStore, _daily
+
+
+POOL = [f"{600000 + i:06d}" for i in range(12)] + ['300001']
+
+
+@pytest.fixture
+def frames():
+    frames = {code: _daily(150, seed=i) for i, code in enumerate(POOL)}
+    frames['600099'] = _daily(30, seed=99)  # 数据不足60日
+    return frames
+
+
+def _slice(frames, end):
+    """截取到 end（含）为止的日线"""
+    return {code: df[pd.to_datetime(df['date']) <= pd.Timestamp(end)].reset_index(drop=True)
+            for code, df in frames.items()}
+
+
+class TestUpdate:
+    """写入"""
+
+    def test_incremental_matches_full_build(self, frames, tmp_path):
+        full = FeatureStore(tmp_path / 'full')
+        full.update(frames)
+
+        incremental = FeatureStore(tmp_path / 'incremental')
+        incremental.update(_slice(frames, '2025-09-30'))
+        incremental.update(_slice(frames, '2025-10-15'))
+        assert incremental.update(_slice(frames, '2025-10-15')) == 0
+        incremental.update(frames)
+
+        assert full.months == incremental.months
+        pd.testing.assert_frame_equal(full.load(), incremental.load())
+        assert full.latest_date() == date(2025, 12, 26)
+
+    def test_new_stock_gets_full_history(self, frames, tmp_path):
+        store = FeatureStore(tmp_path)
+        store.update({code: df for code, df in frames.items() if code != '600003'})
+        store.update(frames)
+
+        rows = store.load(['close'], codes=['600003'])
+        assert len(rows) == len(frames['600003'])
+
+    def test_rewritten_history_rebuilds_stock(self, frames, tmp_path):
+        store = FeatureStore(tmp_path)
+        store.update(_slice(frames, '2025-10-15'))
+
+        # 除权后前复权价格整体改写，且最早的一个月数据不再提供
+        adjusted = {code: df.copy() for code, df in frames.items()}
+        df = adjusted['600003']
+        df[['open', 'high', 'low', 'close']] *= 0.8
+        adjusted['600003'] = df[pd.to_datetime(df['date']) >= pd.Timestamp('2025-07-01')].reset_index(drop=True)
+        store.update(adjusted)
+
+        expected = FeatureStore(tmp_path / 'full')
+        expected.update(adjusted)
+        pd.testing.assert_frame_equal(
+            store.load(codes=['600003']), expected.load(codes=['600003']),
+        )
+        pd.testing.assert_frame_equal(
+            store.load(codes=['600004']), expected.load(codes=['600004']),
+        )
+
+    def test_features_match_picker_indicators(self, frames):
+        picker = OvernightStockPicker(data_path='.', stock_pool=['600005'])
+        features = compute_features(frames['600005'], '600005')
+        df = picker.calculate_technical_indicators(frames['600005'])
+
+        for name in ('ma5', 'ma20', 'ma60', 'ma5_vol', 'ma10_vol'):
+            np.testing.assert_allclose(features[name], df[name], rtol=1e-12, err_msg=name)
+        np.testing.assert_array_equal(features['prev_close'], df['close'].shift(1))
+        assert features['kline_bars'].tolist() == list(range(1, 151))
+
+    def test_limit_up_threshold_by_board(self):
+        df = _daily(30, seed=1)
+        df.loc[20, 'close'] = round(df.loc[19, 'close'] * 1.15, 2)
+
+        assert compute_features(df, '600001')['is_limit_up'][20]
+        assert not compute_features(df, '300001')['is_limit_up'][20]
+
+    def test_main_board_st_threshold_uses_name(self):
+        df = _daily(30, seed=1)
+        df.loc[20, 'close'] = round(df.loc[19, 'close'] * 1.06, 2)
+
+        assert not compute_features(df, '600001')['is_limit_up'][20]
+        assert compute_features(df, '600001', name='*ST某某')['is_limit_up'][20]
+        assert not compute_features(df, '300001', name='ST某某')['is_limit_up'][20]
+
+
+class TestLoad:
+    """读取"""
+
+    def test_projection_and_filters(self, frames, tmp_path):
+        store = FeatureStore(tmp_path)
+        store.update(frames)
+
+        df = store.load(['ma20', 'is_breakout'], start=date(2025, 8, 1), end=date(2025, 8, 31),
+                        codes=['600001', '600002'])
+        assert list(df.columns) == ['date', 'code', 'ma20', 'is_breakout']
+        assert set(df['code']) == {'600001', '600002'}
+        assert df['date'].min() >= pd.Timestamp('2025-08-01')
+        assert df['date'].max() <= pd.Timestamp('2025-08-31')
+        assert df['is_breakout'].dtype == bool
+
+        section = store.cross_section(date(2025, 8, 15), ['close'])
+        assert section.loc['600001', 'close'] == frames['600001'].set_index('date').loc['2025-08-15', 'close']
+        assert list(store.load([]).columns) == ['date', 'code']
+
+    def test_unknown_column(self, tmp_path):
+        with pytest.raises(ValueError):
+            FeatureStore(tmp_path).load(['foo'])
+
+
+class TestIntegration:
+    """选股器与回测引擎查表"""
+
+    def test_picker_store_scores_match_computed(self, frames, tmp_path):
+        data_dir = tmp_path / 'processed'
+        data_dir.mkdir()
+        for code, df in frames.items():
+            df.to_csv(data_dir / f"{code}.csv", index=False)
+        fund_flow = _OfflineFundFlowStore(tmp_path / 'fund_flow')
+
+        def picker(store=None):
+            picker = OvernightStockPicker(data_path=str(data_dir), stock_pool=list(frames),
+                                          feature_store=store)
+            picker.scorer = ScorerV6(enable_logging=False, fund_flow_store=fund_flow)
+            return picker
+
+        store = FeatureStore(tmp_path / 'features')
+        store.update(_slice(frames, '2025-11-28'))
+        expected = picker()._score_all_stocks(HOT_TOPICS)
+        actual = picker(store)._score_all_stocks(HOT_TOPICS)
+
+        assert [s['code'] for s in actual] == [s['code'] for s in expected]
+        assert [s['score'] for s in actual] == [s['score'] for s in expected]
+        assert store.latest_date() == date(2025, 12, 26)
+
+    def test_backtester_lookup_matches_loaded(self, frames, tmp_path):
+        data_dir = tmp_path / 'processed'
+        data_dir.mkdir()
+        for code in POOL:
+            frames[code].to_csv(data_dir / f"{code}.csv", index=False)
+        store = FeatureStore(tmp_path / 'features')
+        store.update({code: frames[code] for code in POOL})
+
+        loaded = OvernightBacktestEngine(data_path=str(data_dir), stock_pool=POOL)
+        stored = OvernightBacktestEngine(data_path=str(data_dir), stock_pool=POOL, feature_store=store)
+
+        assert stored._build_trading_calendar() == loaded._build_trading_calendar()
+        for code in ('600001', '300001'):
+            for day in ('2025-06-02', '2025-07-01', '2025-12-26'):
+                expected = loaded._get_stock_data_on_date(code, day)
+                actual = stored._get_stock_data_on_date(code, day)
+                assert list(actual) == list(expected)
+                for key, value in expected.items():
+                    if isinstance(value, str):
+                        assert actual[key] == value
+                    else:
+                        assert actual[key] == pytest.approx(value, nan_ok=True), (code, day, key)
+        assert stored._get_stock_data_on_date('600001', '2025-06-01') is None
+        assert not stored._stock_data_cache
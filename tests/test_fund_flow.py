@@ -0,0 +1,238 @@
+"""
+MiniQuant-Lite 全市场资金流向库测试
+
+测试 FundFlowStore：
+- 快照写入、持久化与重新加载
+- 5 日累计（本地历史 / 排行榜 / 历史缺口）
+- 按交易日查询（历史评分不读取最新快照）
+- 过期判断
+- 实时监控与评分器从资金流向库读取（无逐只请求）
+"""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.fund_flow import FundFlowStore, snapshot_trade_date
+from core.overnight_picker.scorer import TomorrowPotentialScorer
+from core.overnight_picker.scorer_v6 import CapitalStrengthScorer
+from core.realtime_monitor.data_fetcher import DataFetcher
+
+
+def _snapshot(inflows, sum_5d=None):
+    df = pd.DataFrame({
+        'code': list(inflows),
+        'name': [f"股票{code}" for code in inflows],
+        'main_net_inflow': [v for v in inflows.values()],
+        'main_net_inflow_pct': [6.0 if v > 0 else -3.0 for v in inflows.values()],
+    })
+    if sum_5d is not None:
+        df['main_net_inflow_5d'] = df['code'].map(sum_5d)
+    return df
+
+
+def _trading_days(count, end=date(2026, 3, 13)):
+    days = []
+    day = end
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= timedelta(days=1)
+    return sorted(days)
+
+
+class _OfflineFundFlowStore(FundFlowStore):
+    """不发起网络刷新的资金流向库"""
+
+    def refresh_if_stale(self, background=True):
+        return False
+
+
+@pytest.fixture
+def store(tmp_path):
+    return _OfflineFundFlowStore(tmp_path / 'fund_flow')
+
+
+class TestSnapshotTradeDate:
+    """快照交易日推算"""
+
+    def test_weekday_after_open(self):
+        assert snapshot_trade_date(datetime(2026, 3, 11, 10, 0)) == date(2026, 3, 11)
+
+    def test_before_open_uses_previous_day(self):
+        assert snapshot_trade_date(datetime(2026, 3, 11, 8, 0)) == date(2026, 3, 10)
+
+    def test_monday_morning_and_weekend_use_friday(self):
+        assert snapshot_trade_date(datetime(2026, 3, 16, 8, 0)) == date(2026, 3, 13)
+        assert snapshot_trade_date(datetime(2026, 3, 15, 12, 0)) == date(2026, 3, 13)
+
+
+class TestFundFlowStore:
+    """资金流向库"""
+
+    def test_update_and_get(self, store):
+        store.update(_snapshot({'000001': 2e7, '600000': -1e7}, {'000001': 5e7}), date(2026, 3, 13))
+
+        record = store.get('000001')
+        assert record.main_net_inflow == 2e7
+        assert record.main_net_inflow_pct == 6.0
+        assert record.main_net_inflow_5d == 5e7  # 历史不足，使用排行榜 5 日累计
+        assert store.get('600000').main_net_inflow_5d == -1e7  # 无 5 日数据时退化为当日
+        assert store.get('999999') is None
+
+    def test_five_day_sum_from_local_history(self, store):
+        for i, day in enumerate(_trading_days(6)):
+            store.update(_snapshot({'000001': float(i + 1)}, {'000001': 999.0}), day)
+
+        # 最近 5 个交易日: 2+3+4+5+6
+        assert store.get('000001').main_net_inflow_5d == 20.0
+        assert store.get_history('000001').tolist() == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        assert store.get_history('000001', days=2).tolist() == [5.0, 6.0]
+
+    def test_gap_in_history_not_summed(self, store):
+        days = _trading_days(6)
+        for i, day in enumerate(days):
+            if i != 3:  # 缺少一个交易日的快照
+                store.update(_snapshot({'000001': float(i + 1)}, {'000001': 999.0}), day)
+
+        # 窗口内有缺口：不跨缺口累加更早的快照，使用排行榜 5 日累计
+        assert store.get('000001').main_net_inflow_5d == 999.0
+
+    def test_get_on_trade_date(self, store):
+        days = _trading_days(6)
+        for i, day in enumerate(days):
+            store.update(_snapshot({'000001': float(i + 1)}, {'000001': 999.0}), day)
+
+        record = store.get('000001', days[-2])
+        assert record.trade_date == days[-2]
+        assert record.main_net_inflow == 5.0
+        assert record.main_net_inflow_5d == 15.0  # 1+2+3+4+5，不含之后的快照
+        assert store.get('000001', days[-1].isoformat()).main_net_inflow == 6.0
+        assert store.get('000001', date(2026, 1, 5)) is None
+        assert store.get_many(['000001', '600000'], days[0]) == {'000001': store.get('000001', days[0])}
+
+    def test_same_day_overwritten(self, store):
+        store.update(_snapshot({'000001': 1.0}), date(2026, 3, 13))
+        store.update(_snapshot({'000001': 3.0}), date(2026, 3, 13))
+
+        assert store.get('000001').main_net_inflow == 3.0
+        assert len(store.get_history('000001')) == 1
+
+    def test_persisted_and_reloaded(self, tmp_path, store):
+        for i, day in enumerate(_trading_days(3)):
+            store.update(_snapshot({'000001': float(i + 1)}), day)
+
+        reloaded = FundFlowStore(tmp_path / 'fund_flow', history_days=2)
+
+        assert reloaded.latest_date == date(2026, 3, 13)
+        assert reloaded.get('000001').main_net_inflow == 3.0
+        assert reloaded.get_history('000001').tolist() == [2.0, 3.0]
+
+    def test_staleness(self, store):
+        assert store.is_stale()
+
+        store.update(_snapshot({'000001': 1.0}), snapshot_trade_date(datetime.now()))
+        assert not store.is_stale()
+
+        # 盘中快照超过有效期
+        store._updated_at = datetime(2026, 3, 13, 10, 0)
+        store._latest_date = date(2026, 3, 13)
+        assert store.is_stale(now=datetime(2026, 3, 13, 10, 10))
+        assert not store.is_stale(now=datetime(2026, 3, 13, 10, 2))
+
+        # 收盘后快照当日不再刷新，次日需要刷新
+        store._updated_at = datetime(2026, 3, 13, 15, 30)
+        assert not store.is_stale(now=datetime(2026, 3, 13, 20, 0))
+        assert store.is_stale(now=datetime(2026, 3, 16, 10, 0))
+
+    def test_refresh_from_rank_table(self, tmp_path):
+        today = pd.DataFrame({
+            '代码': ['000001', '600000'], '名称': ['平安银行', '浦发银行'],
+            '今日主力净流入-净额': [1.5e7, -2e6], '今日主力净流入-净占比': [8.2, -1.1],
+        })
+        five_day = pd.DataFrame({'代码': ['000001'], '5日主力净流入-净额': [4e7]})
+        store = FundFlowStore(tmp_path / 'fund_flow')
+
+        with patch('akshare.stock_individual_fund_flow_rank',
+                   side_effect=lambda indicator: today if indicator == '今日' else five_day) as mock_rank:
+            count = store.refresh(now=datetime(2026, 3, 13, 16, 0))
+
+        assert count == 2
+        assert mock_rank.call_count == 2
+        assert store.get('000001').main_net_inflow_5d == 4e7
+        assert (tmp_path / 'fund_flow' / '20260313.csv').exists()
+
+
+class TestFundFlowConsumers:
+    """监控与评分器读取资金流向库"""
+
+    @pytest.fixture
+    def loaded_store(self, store):
+        store.update(_snapshot({'000001': 6e7, '600000': -2e7}, {'000001': 1e8}), date(2026, 3, 13))
+        return store
+
+    def test_data_fetcher_reads_store(self, loaded_store):
+        fetcher = DataFetcher(fund_flow_store=loaded_store)
+
+        with patch('akshare.stock_individual_fund_flow') as mock_individual:
+            fund_flow = fetcher.fetch_fund_flow('000001')
+            batch = fetcher.fetch_fund_flow_batch(['000001', '600000'])
+            mock_individual.assert_not_called()
+
+        assert fund_flow.main_net_inflow == 6000.0  # 万元
+        assert fund_flow.main_net_inflow_5d == 10000.0
+        assert batch['600000'].main_net_inflow == -2000.0
+
+    def test_capital_strength_scorer_uses_store_ratio(self, loaded_store):
+        scorer = CapitalStrengthScorer(loaded_store)
+
+        score, details, _ = scorer.score(main_net_inflow=None, turnover_amount=0, code='000001')
+
+        assert details['inflow_ratio'] == 6.0
+        assert details['main_net_inflow'] == 6e7
+        assert score == 12
+
+    def test_capital_strength_scorer_explicit_values(self, loaded_store):
+        scorer = CapitalStrengthScorer(loaded_store)
+
+        score, details, _ = scorer.score(main_net_inflow=1e6, turnover_amount=1e7, code='000001')
+
+        assert details['inflow_ratio'] == 10.0
+        assert score == 12
+
+    def test_scorers_read_store_on_trade_date(self, loaded_store):
+        loaded_store.update(_snapshot({'000001': -6e7}), date(2026, 3, 16))
+        capital = CapitalStrengthScorer(loaded_store)
+
+        _, details, _ = capital.score(None, 0, code='000001', trade_date='2026-03-13')
+        assert details['main_net_inflow'] == 6e7
+
+        _, details, _ = capital.score(None, 1e7, code='000001', trade_date=date(2026, 3, 12))
+        assert details['main_net_inflow'] == 0  # 该日无快照，不使用最新数据
+
+        scores, batch, _ = capital.score_batch(
+            np.full(3, np.nan), np.full(3, 1e8), ['000001', '000001', '600000'],
+            [date(2026, 3, 13), None, date(2026, 3, 13)],
+        )
+        assert batch['main_net_inflow'].tolist() == [6e7, -6e7, -2e7]
+
+        _, details = TomorrowPotentialScorer(fund_flow_store=loaded_store).score_capital_flow(
+            code='000001', trade_date=date(2026, 3, 13))
+        assert details['main_net_inflow'] == 6000.0
+
+    def test_tomorrow_potential_scorer_reads_store(self, loaded_store):
+        scorer = TomorrowPotentialScorer(fund_flow_store=loaded_store)
+
+        score, details = scorer.score_capital_flow(code='000001')
+        assert details['main_net_inflow'] == 6000.0
+        assert score == 15
+
+        score, _ = scorer.score_capital_flow(code='999999')
+        assert score == 8
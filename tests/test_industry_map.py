@@ -0,0 +1,119 @@
+"""
+MiniQuant-Lite 行业映射表测试
+
+测试 IndustryMap：
+- 板块成分表持久化与加载
+- 过期判断
+- Screener 行业互斥使用映射表（无网络请求）
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.industry_map import IndustryMap
+from core.screener import Screener, ScreenerResult, IndustryDiversification
+
+
+@pytest.fixture
+def membership():
+    return pd.DataFrame({
+        'code': ['000001', '600036', '300750', '000001'],
+        'name': ['平安银行', '招商银行', '宁德时代', '平安银行'],
+        'industry': ['银行', '银行', '电池', '保险']
+    })
+
+
+@pytest.fixture
+def industry_map(tmp_path, membership):
+    imap = IndustryMap(tmp_path / 'industry_map.csv')
+    imap.update(membership)
+    return imap
+
+
+class TestIndustryMap:
+    """映射表基本功能"""
+
+    def test_update_and_lookup(self, industry_map):
+        assert industry_map.get('600036') == '银行'
+        assert industry_map.get('000001') == '银行'  # 重复代码保留第一行
+        assert industry_map.get('999999') is None
+        assert len(industry_map) == 3
+
+    def test_get_many_defaults_to_unknown(self, industry_map):
+        result = industry_map.get_many(['300750', '999999'])
+        assert result == {'300750': '电池', '999999': '未知'}
+
+    def test_persisted_and_reloaded(self, tmp_path, industry_map):
+        reloaded = IndustryMap(tmp_path / 'industry_map.csv')
+
+        assert reloaded.is_loaded
+        assert reloaded.get('300750') == '电池'
+        assert not reloaded.is_stale()
+
+    def test_stale_after_max_age(self, industry_map):
+        assert not industry_map.is_stale()
+        assert industry_map.is_stale(now=datetime.now() + timedelta(days=8))
+
+    def test_empty_map_is_stale(self, tmp_path):
+        imap = IndustryMap(tmp_path / 'missing.csv')
+        assert not imap.is_loaded
+        assert imap.is_stale()
+
+    def test_refresh_from_boards(self, tmp_path):
+        boards = pd.DataFrame({'板块名称': ['银行', '半导体']})
+        cons = {
+            '银行': pd.DataFrame({'代码': ['000001'], '名称': ['平安银行']}),
+            '半导体': pd.DataFrame({'代码': ['688981'], '名称': ['中芯国际']}),
+        }
+        imap = IndustryMap(tmp_path / 'industry_map.csv')
+
+        with patch('akshare.stock_board_industry_name_em', return_value=boards), \
+             patch('akshare.stock_board_industry_cons_em', side_effect=lambda symbol: cons[symbol]):
+            count = imap.refresh()
+
+        assert count == 2
+        assert imap.get('688981') == '半导体'
+
+    def test_refresh_if_stale_skips_fresh_map(self, industry_map):
+        with patch.object(industry_map, 'refresh') as mock_refresh:
+            assert industry_map.refresh_if_stale(background=False) is False
+            mock_refresh.assert_not_called()
+
+
+class TestScreenerIndustryMap:
+    """Screener 使用共享映射表"""
+
+    @pytest.fixture
+    def screener(self, industry_map):
+        screener = Screener(data_feed=None)
+        screener.industry_map = industry_map
+        return screener
+
+    def test_get_stock_industry_without_network(self, screener):
+        with patch('akshare.stock_individual_info_em') as mock_info:
+            assert screener._get_stock_industry('600036') == '银行'
+            assert screener._get_stock_industry('999999') == '未知'
+            mock_info.assert_not_called()
+
+    def test_diversification_fills_unknown_industry(self, screener):
+        results = [
+            ScreenerResult(code='000001', name='平安银行', price=10.0, market_cap=10e9,
+                           turnover_rate=0.05, ma60_trend='上升', industry='未知'),
+            ScreenerResult(code='600036', name='招商银行', price=30.0, market_cap=30e9,
+                           turnover_rate=0.03, ma60_trend='上升', industry='未知'),
+            ScreenerResult(code='300750', name='宁德时代', price=200.0, market_cap=80e9,
+                           turnover_rate=0.02, ma60_trend='上升', industry='未知'),
+        ]
+        screener.industry_diversification = IndustryDiversification(enabled=True, max_same_industry=1)
+
+        diversified = screener._apply_industry_diversification(results)
+
+        assert [r.code for r in diversified] == ['000001', '300750']
+        assert diversified[0].industry == '银行'
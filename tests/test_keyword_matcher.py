@@ -0,0 +1,178 @@
+"""
+编译关键词匹配器测试
+
+测试：
+- 匹配结果与逐关键词 `in` 判断一致（重叠、互为前缀、重复关键词）
+- 行业筛选、热点题材、题材风口评分使用匹配器后结果不变
+- 关键词集合变化后匹配器重建
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.keyword_matcher import KeywordMatcher
+from core.overnight_picker.scorer_v6 import ThemeWindScorer
+from core.short_term.hot_topic_manager import HotTopic, HotTopicManager
+from core.stock_screener.industry_screener import IndustryScreener, TechIndustry
+
+
+def _random_texts(keywords, n, seed=0):
+    """由关键词片段与干扰字符随机拼接的文本"""
+    rng = random.Random(seed)
+    pieces = list(keywords) + ['科技', '股份', ' ', 'A', '集团', '有限']
+    return [''.join(rng.choice(pieces) for _ in range(rng.randint(0, 6))) for _ in range(n)]
+
+
+class TestKeywordMatcher:
+    """匹配器"""
+
+    def test_matches_in_loop(self):
+        groups = {
+            'a': ['机器人', '人形机器人', 'AI', 'AIGC', '大数据', '机器'],
+            'b': ['大数据', '数据', 'A', '机器人视觉', 'AI'],
+            'c': ['C++', '(特)', 'a.b'],
+        }
+        matcher = KeywordMatcher(groups)
+        keywords = {k for ks in groups.values() for k in ks}
+
+        for text in _random_texts(keywords, 500) + ['C++ a.b (特)', 'axb', '']:
+            assert matcher.find(text) == {k for k in keywords if k in text}, text
+            expected = {label: [k for k in ks if k in text] for label, ks in groups.items()}
+            assert matcher.match(text) == {label: ks for label, ks in expected.items() if ks}, text
+
+    def test_label_order_and_duplicates(self):
+        matcher = KeywordMatcher({'x': ['芯片', '半导体', '芯片'], 'y': ['芯片']})
+        result = matcher.match('半导体芯片')
+
+        assert list(result) == ['x', 'y']
+        assert result['x'] == ['芯片', '半导体', '芯片']
+
+    def test_empty_keyword_matches_everything(self):
+        matcher = KeywordMatcher.from_keywords(['', 'AI'])
+        assert matcher.find('') == {''}
+        assert matcher.find('AI') == {'', 'AI'}
+        assert KeywordMatcher({}).find('AI') == set()
+
+    def test_many_matches_single(self):
+        matcher = KeywordMatcher.from_keywords(['AI', '芯片'])
+        texts = ['AI芯片', '银行', 'AI芯片', 'AI']
+        assert matcher.match_many(texts) == [matcher.match(t) for t in texts]
+        assert matcher.find_many(texts) == [matcher.find(t) for t in texts]
+
+
+def _loop_match_industry(keyword_dict, name, text):
+    """逐关键词循环的行业匹配（原实现）"""
+    scores = {}
+    for industry, keywords in keyword_dict.items():
+        matched = [k for k in keywords if k in text]
+        if matched:
+            scores[industry] = (len(matched), matched)
+    if not scores:
+        return None, 0.0, []
+    best = max(scores, key=lambda x: scores[x][0])
+    count, matched = scores[best]
+    bonus = 0.2 if any(k in (name or '') for k in matched) else 0.0
+    return best, min(1.0, min(1.0, count / 3) + bonus), matched
+
+
+class TestIndustryScreener:
+    """行业筛选"""
+
+    @pytest.fixture
+    def stocks(self):
+        screener = IndustryScreener()
+        keywords = screener.keyword_config.get_all_keywords()
+        rng = np.random.default_rng(1)
+        n = 300
+        return pd.DataFrame({
+            'code': [f"{600000 + i:06d}" for i in range(n)],
+            'name': _random_texts(keywords, n, seed=1),
+            'business': _random_texts(keywords, n, seed=2),
+            'industry': rng.choice(['半导体', '银行', '', '通信设备', np.nan], n),
+        })
+
+    def test_match_industry_matches_loop(self, stocks):
+        screener = IndustryScreener()
+        for _, row in stocks.iterrows():
+            text = ' '.join(str(row[c]) for c in ('name', 'business', 'industry') if str(row[c]))
+            industry, confidence, matched = screener.match_industry(
+                row['name'], str(row['business']), str(row['industry']))
+            best, expected_confidence, expected = _loop_match_industry(screener._keyword_dict, row['name'], text)
+            assert industry.value == (best or TechIndustry.UNKNOWN.value)
+            assert confidence == expected_confidence
+            assert matched == expected
+
+    def test_screen_matches_per_row(self, stocks):
+        screener = IndustryScreener()
+        tech_df, results = screener.screen_tech_stocks(
+            stocks, business_col='business', industry_col='industry')
+
+        expected = []
+        for _, row in stocks.iterrows():
+            industry, confidence, matched = screener.match_industry(
+                row['name'], str(row['business']), str(row['industry']))
+            if industry != TechIndustry.UNKNOWN and confidence >= 0.3:
+                expected.append((row['code'], industry, confidence, matched))
+
+        assert [(r.code, r.matched_industry, r.confidence, r.matched_keywords) for r in results] == expected
+        assert tech_df['code'].tolist() == [e[0] for e in expected]
+
+    def test_add_keyword_rebuilds_matcher(self):
+        screener = IndustryScreener()
+        assert screener.match_industry('量子科技')[0] == TechIndustry.UNKNOWN
+        screener.add_keyword(TechIndustry.AI, '量子')
+        assert screener.match_industry('量子科技')[0] == TechIndustry.AI
+
+
+class TestHotTopics:
+    """热点题材与题材风口"""
+
+    def test_hot_topic_matches_loop(self, tmp_path):
+        manager = HotTopicManager(str(tmp_path / 'hot_topics.json'))
+        keywords = {k for t in manager.topics for k in t.keywords}
+        names = _random_texts(keywords, 200, seed=3)
+        sectors = _random_texts(keywords, 200, seed=4)
+
+        batch = manager.match_stock_topics_batch(names, sectors, [['AI眼镜'], None] * 100)
+        for i, (name, sector) in enumerate(zip(names, sectors)):
+            concepts = ['AI眼镜'] if i % 2 == 0 else None
+            text = f"{name} {sector} {' '.join(concepts or [])}"
+            expected = []
+            for topic in manager.get_active_topics():
+                keyword = next((k for k in topic.keywords if k in text), None)
+                if keyword is not None:
+                    expected.append((topic.name, keyword))
+            actual = manager.match_stock_topics(name, sector, concepts)
+            assert [(m['name'], m['keyword']) for m in actual] == \
+                sorted(expected, key=lambda m: -manager.get_topic_by_name(m[0]).heat_score)
+            assert batch[i] == actual
+
+    def test_hot_topic_rebuilds_on_change(self, tmp_path):
+        manager = HotTopicManager(str(tmp_path / 'hot_topics.json'))
+        assert manager.match_stock_topics('某某', '量子计算') == []
+
+        manager.add_topic(HotTopic(name='量子', keywords=['量子'], weight=1.2, start_date='2020-01-01'))
+        assert [m['name'] for m in manager.match_stock_topics('某某', '量子计算')] == ['量子']
+
+    def test_theme_wind_matches_loop(self):
+        scorer = ThemeWindScorer()
+        hot_topics = ['人工智能', 'AI', '机器人', '低空经济', '芯片']
+        concepts = [['AI芯片', '人形机器人'], ['经济'], [], ['人工'], ['银行'], ['芯片', '芯片']]
+
+        for stock_concepts in concepts:
+            expected = {t for c in stock_concepts for t in hot_topics if c in t or t in c}
+            matched, _ = scorer._match_hot_topics(stock_concepts, hot_topics)
+            assert set(matched) == expected
+
+        _, details, _ = scorer.score_batch(concepts, hot_topics, 3, np.zeros(len(concepts), dtype=bool))
+        for i, stock_concepts in enumerate(concepts):
+            score, single, _ = scorer.score(stock_concepts, hot_topics, 3, False)
+            assert set(details['matched_topics'][i]) == set(single['matched_topics'])
+            assert details['score'][i] == score
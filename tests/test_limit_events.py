@@ -0,0 +1,245 @@
+"""
+全市场涨跌停事件索引测试
+
+测试：
+- 板块涨跌幅限制与涨停阈值
+- 向量化连板计数与逐日循环一致（停牌不中断连板）
+- 索引的个股事件、近20日统计、市场汇总与逐只计算一致
+- 股性活跃度评分、情绪分析器从索引读取
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.limit_events import LimitEventIndex, consecutive_counts, limit_ratio, limit_threshold
+from core.overnight_picker.scorer_v6 import ScorerV6, StockActivityScorer
+from core.overnight_picker.sentiment_predictor import SentimentCyclePredictor
+from core.short_term.market_sentiment import MarketSentimentAnalyzer
+from tests.test_overnight_picker_pipeline import _OfflineFundFlowStore, _daily
+
+
+CODES = [f"{600000 + i:06d}" for i in range(8)] + ['300001', '688001']
+
+
+def _limit_run(df, start, days, pct=0.1):
+    """从 start 起连续 days 日按 pct 上涨"""
+    df = df.copy()
+    close = df['close'].to_numpy(dtype=float, copy=True)
+    for i in range(start, start + days):
+        target = round(close[i - 1] * (1 + pct), 2)
+        close[i + 1:] = np.round(close[i + 1:] * target / close[i], 2)
+        close[i] = target
+    df['close'] = close
+    df['high'] = np.maximum(df['high'], close)
+    df['low'] = np.minimum(df['low'], close)
+    return df
+
+
+@pytest.fixture
+def frames():
+    frames = {code: _daily(80, seed=i) for i, code in enumerate(CODES)}
+    frames['600001'] = _limit_run(frames['600001'], 70, 3)          # 3连板
+    frames['300001'] = _limit_run(frames['300001'], 74, 2, 0.2)     # 创业板2连板
+    frames['600002'] = frames['600002'].drop(index=[72, 73]).reset_index(drop=True)  # 停牌两日
+    frames['600003'] = frames['600003'].iloc[10:].reset_index(drop=True)             # 晚上市
+    return frames
+
+
+def _loop_streak(pcts, threshold):
+    """逐日循环的连板计数（原实现）"""
+    best = current = 0
+    for pct in pcts:
+        if pd.isna(pct):
+            continue
+        current = current + 1 if pct >= threshold else 0
+        best = max(best, current)
+    return best
+
+
+class TestThresholds:
+    """板块涨跌幅限制"""
+
+    @pytest.mark.parametrize('code,name,ratio', [
+        ('600000', '浦发银行', 0.10),
+        ('000001', '平安银行', 0.10),
+        ('300750', '宁德时代', 0.20),
+        ('688981', '中芯国际', 0.20),
+        ('830799', '艾融软件', 0.30),
+        ('600001', '*ST某某', 0.05),
+        ('000002', 'ST某某', 0.05),
+        ('300001', 'ST某某', 0.20),
+        ('688001', '*ST某某', 0.20),
+        ('830001', 'ST某某', 0.30),
+    ])
+    def test_limit_ratio(self, code, name, ratio):
+        assert limit_ratio(code, name) == ratio
+        assert limit_threshold(code, name) == pytest.approx(ratio * 100 - 0.5)
+
+
+class TestConsecutiveCounts:
+    """向量化连板计数"""
+
+    def test_matches_loop(self):
+        rng = np.random.default_rng(0)
+        pcts = rng.choice([11.0, 10.0, 2.0, -3.0, np.nan], size=(50, 30))
+        streaks = consecutive_counts(pcts >= 9.5, ~np.isnan(pcts), axis=1)
+
+        assert streaks.max(axis=1).tolist() == [_loop_streak(row, 9.5) for row in pcts]
+
+    def test_activity_scorer_matches_loop(self, frames):
+        scorer = StockActivityScorer()
+        for code, df in frames.items():
+            pcts = df['close'].tail(20).pct_change() * 100
+            assert scorer.count_consecutive_limit_ups(df, 20, code) == _loop_streak(pcts, limit_threshold(code))
+
+
+class TestLimitEventIndex:
+    """涨跌停事件索引"""
+
+    def test_stock_events(self, frames):
+        index = LimitEventIndex.from_frames(frames)
+        last = frames['600001']['date'].iloc[-1]
+
+        events = index.stock('600001', frames['600001']['date'].iloc[72])
+        assert events['is_limit_up'] and events['limit_streak'] == 3
+        assert index.stock('600001', last)['max_streak_20d'] == 3
+        assert index.stock('300001', frames['300001']['date'].iloc[75])['limit_streak'] == 2
+        assert index.stock('600099', last) is None
+        assert index.stock('600001', '2000-01-03') is None
+        assert index.stock('600001') == index.stock('600001', index.latest_date)
+
+    def test_matches_per_stock_calculation(self, frames):
+        index = LimitEventIndex.from_frames(frames)
+        scorer = StockActivityScorer()
+
+        for code, df in frames.items():
+            threshold = limit_threshold(code)
+            pcts = df['close'].pct_change() * 100
+            events = index.stock(code, df['date'].iloc[-1])
+            assert events['change_pct'] == pytest.approx(pcts.iloc[-1])
+            if code == '600002':
+                continue  # 停牌：近20日按市场交易日计
+            has_limit_up, consecutive = scorer.limit_up_stats(df, 20, code)
+            assert (events['limit_up_20d'] > 0) == has_limit_up, code
+            assert events['max_streak_20d'] == consecutive, code
+            assert events['limit_up_20d'] == int((pcts.tail(20) >= threshold).sum()), code
+
+    def test_suspension_does_not_break_streak(self):
+        df = _daily(30, seed=3)
+        df = _limit_run(df, 20, 4)
+        index = LimitEventIndex.from_frames({
+            '600000': df.drop(index=[22]).reset_index(drop=True),
+            '600001': _daily(30, seed=4),
+        })
+
+        assert index.stock('600000', df['date'].iloc[22]) is not None
+        assert index.stock('600000', df['date'].iloc[23])['limit_streak'] == 3
+
+    def test_market_summary(self, frames):
+        index = LimitEventIndex.from_frames(frames)
+        day = frames['600000']['date'].iloc[72]
+
+        pcts = {
+            code: (df['close'].pct_change() * 100).set_axis(df['date']) for code, df in frames.items()
+        }
+        today = {code: s.get(day, np.nan) for code, s in pcts.items()}
+        limit_ups = [code for code, pct in today.items() if pct >= limit_threshold(code)]
+        limit_downs = [code for code, pct in today.items() if pct <= -limit_threshold(code)]
+
+        summary = index.market(day)
+        assert summary['limit_up_count'] == len(limit_ups)
+        assert summary['limit_down_count'] == len(limit_downs)
+        assert summary['up_count'] == sum(pct > 0 for pct in today.values())
+        assert summary['highest_board'] == 3
+        assert summary['continuous_limit_up'] == {3: 1}
+        assert summary['continuous_board_count'] == 1
+
+    def test_failed_limit_up(self):
+        df = _daily(30, seed=5)
+        df.loc[25, 'high'] = round(df.loc[24, 'close'] * 1.1, 2)
+        df.loc[25, 'close'] = round(df.loc[24, 'close'] * 1.03, 2)
+        index = LimitEventIndex.from_frames({'600000': df})
+
+        assert index.stock('600000', df['date'].iloc[25])['failed_limit_up']
+        assert index.market(df['date'].iloc[25])['failed_limit_up'] == 1
+
+    def test_st_threshold(self):
+        df = _limit_run(_daily(30, seed=6), 25, 1, 0.05)
+        index = LimitEventIndex.from_frames({'600000': df, '600001': df}, names={'600001': '*ST测试'})
+
+        day = df['date'].iloc[25]
+        assert not index.stock('600000', day)['is_limit_up']
+        assert index.stock('600001', day)['is_limit_up']
+
+    def test_lookup(self, frames):
+        index = LimitEventIndex.from_frames(frames)
+        day = frames['600001']['date'].iloc[72]
+
+        values = index.lookup(['600001', '600099', '600000'], [day, day, '2000-01-03'], 'limit_streak')
+        assert values[0] == 3
+        assert np.isnan(values[1:]).all()
+
+
+class TestConsumers:
+    """评分器与情绪分析读取索引"""
+
+    def test_activity_score_reads_index(self, frames, tmp_path):
+        index = LimitEventIndex.from_frames(frames)
+        store = _OfflineFundFlowStore(tmp_path)
+        with_index = ScorerV6(enable_logging=False, fund_flow_store=store, limit_index=index)
+        without_index = ScorerV6(enable_logging=False, fund_flow_store=store)
+
+        stock_data_list = []
+        for code in ('600000', '600001', '300001', '688001'):
+            df = frames[code]
+            latest = df.iloc[-1]
+            stock_data_list.append({
+                'code': code, 'name': code, 'close': latest['close'], 'open': latest['open'],
+                'high': latest['high'], 'low': latest['low'], 'prev_close': df['close'].iloc[-2],
+                'volume': latest['volume'], 'kline_df': df,
+            })
+
+        batch = with_index.score_batch(with_index.batch_frame(stock_data_list))
+        for i, stock_data in enumerate(stock_data_list):
+            total, details = with_index.score_stock(stock_data, log_score=False)
+            expected, _ = without_index.score_stock(stock_data, log_score=False)
+            assert total == expected == batch.total[i]
+            assert details['stock_activity'] == batch.details(i)['stock_activity']
+        assert batch.details(1)['stock_activity']['consecutive_limit_ups'] == 3
+
+    def test_features_batch_board_thresholds(self, frames):
+        scorer = StockActivityScorer()
+        codes = ['600001', '300001']
+        tails = [frames[code].tail(61) for code in codes]
+        matrix = lambda name: np.vstack([t[name].to_numpy(dtype=float)[1:] for t in tails])
+        change = np.vstack([(t['close'].pct_change() * 100).to_numpy()[1:] for t in tails])
+
+        batch = scorer.features_batch(
+            matrix('close'), matrix('high'), matrix('low'), change, np.array([80, 80]),
+            np.array([limit_threshold(code) for code in codes]),
+        )
+        for i, code in enumerate(codes):
+            expected = scorer.features(frames[code], code)
+            assert batch['has_limit_up_20d'][i] == expected['has_limit_up_20d']
+            assert batch['consecutive_limit_ups'][i] == expected['consecutive_limit_ups']
+
+    def test_sentiment_consumers(self, frames):
+        index = LimitEventIndex.from_frames(frames)
+        day = frames['600000']['date'].iloc[72]
+
+        result = SentimentCyclePredictor().analyze_limit_events(index, day)
+        inputs = index.sentiment_inputs(day)
+        assert result.limit_up_count == index.market(day)['limit_up_count']
+        assert result.continuous_board_count == 1
+        assert 0 <= inputs['market_profit_rate'] <= 1
+
+        analyzer = MarketSentimentAnalyzer()
+        assert analyzer.update_from_limit_events(index, day)
+        assert analyzer.sentiment_data.highest_board == 3
+        assert not analyzer.update_from_limit_events(index, '2000-01-03')
+        assert SentimentCyclePredictor().analyze_limit_events(index, '2000-01-03') is None
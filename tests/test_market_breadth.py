@@ -0,0 +1,192 @@
+"""
+隔夜选股市场宽度历史库测试
+
+测试：
+- 向量化大盘环境判断与选股器逐日判断一致
+- 情绪回放与逐日运行情绪周期预判器一致
+- 保存/读取往返，情绪分析器与指数分析器输入
+- 回测引擎按历史大盘环境跳过选股并记录情绪阶段，评分传入当日市场环境，收益按仓位系数加权
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.limit_events import LimitEventIndex
+from core.overnight_picker import MarketEnvironment, OvernightBacktestEngine, OvernightStockPicker
+from core.overnight_picker.backtester import BacktestConfig
+from core.overnight_picker.market_breadth import MarketBreadthStore, classify_market_environment
+from core.overnight_picker.sentiment_predictor import SentimentCyclePredictor
+from core.short_term.market_sentiment import MarketSentimentAnalyzer
+from tests.test_limit_events import _limit_run
+from tests.test_overnight_picker_pipeline import _daily
+
+
+POOL = [f"{600000 + i:06d}" for i in range(10)]
+
+
+def _index(days=120):
+    """上证指数：先涨后跌，末段急跌"""
+    df = _daily(days, seed=42)
+    trend = np.concatenate([np.linspace(0, 0.3, days // 2), np.linspace(0.3, -0.2, days - days // 2)])
+    df['close'] = np.round(3000 * np.exp(trend + np.log(df['close'] / df['close'].iloc[0]) * 0.1), 2)
+    df.loc[days - 3, 'close'] = round(df.loc[days - 4, 'close'] * 0.96, 2)
+    df['open'] = df['high'] = df['low'] = df['close']
+    return df
+
+
+@pytest.fixture
+def frames():
+    frames = {code: _daily(120, seed=i) for i, code in enumerate(POOL)}
+    frames['600001'] = _limit_run(frames['600001'], 100, 3)
+    return frames
+
+
+class TestVectorized:
+    """向量化计算"""
+
+    def test_environment_matches_picker(self):
+        index_df = _index()
+        picker = OvernightStockPicker(data_path='.', stock_pool=[])
+        env = classify_market_environment(index_df)
+
+        for end in range(2, len(index_df) + 1):
+            expected = picker.analyze_market_environment(index_df.iloc[:end].reset_index(drop=True))
+            row = env.iloc[end - 1]
+            assert row['market_env'] == expected['env'], end
+            assert row['ma_status'] == expected['ma_status'], end
+            assert row['should_empty'] == expected['should_empty'], end
+            assert row['index_change'] == pytest.approx(expected['index_change'])
+            assert row['change_5d'] == pytest.approx(expected['change_5d'])
+        assert set(env['market_env']) >= {MarketEnvironment.STRONG, MarketEnvironment.EXTREME_WEAK}
+
+    def test_sentiment_replay_matches_predictor(self, frames, tmp_path):
+        store = MarketBreadthStore(tmp_path)
+        history = store.build(frames, save=False)
+        index = LimitEventIndex.from_frames(frames)
+
+        predictor = SentimentCyclePredictor()
+        for day, row in history.iterrows():
+            today = predictor.analyze_today_sentiment(**index.sentiment_inputs(day))
+            prediction = predictor.predict_tomorrow(today)
+            assert row['sentiment_phase'] == today.phase.value, day
+            assert row['sentiment_score'] == pytest.approx(today.score)
+            assert row['position_multiplier'] == pytest.approx(prediction.position_multiplier)
+
+        assert (history['market_env'] == MarketEnvironment.NEUTRAL).all()
+        assert store.is_tradable(history.index[-1]) == (True, "市场环境正常")
+
+
+class TestStore:
+    """读写与查询"""
+
+    def test_save_load_roundtrip(self, frames, tmp_path):
+        built = MarketBreadthStore(tmp_path).build(frames, _index())
+        loaded = MarketBreadthStore(tmp_path).load()
+
+        pd.testing.assert_frame_equal(built, loaded, check_dtype=False, check_freq=False)
+        assert loaded['should_empty'].dtype == bool
+        day = pd.Timestamp(frames['600001']['date'].iloc[102])
+        assert loaded.loc[day, 'continuous_limit_up'] == {3: 1}
+
+    def test_build_from_dir(self, frames, tmp_path):
+        data_dir = tmp_path / 'processed'
+        data_dir.mkdir()
+        for code, df in frames.items():
+            df.to_csv(data_dir / f"{code}.csv", index=False)
+        _index().to_csv(data_dir / '000001.csv', index=False)
+
+        from_dir = MarketBreadthStore(tmp_path / 'a').build_from_dir(str(data_dir), save=False)
+        expected = MarketBreadthStore(tmp_path / 'b').build(frames, _index(), save=False)
+        pd.testing.assert_frame_equal(from_dir, expected)
+
+    def test_analyzer_inputs(self, frames, tmp_path):
+        store = MarketBreadthStore(tmp_path)
+        store.build(frames, _index())
+        index = LimitEventIndex.from_frames(frames)
+        day = frames['600001']['date'].iloc[102]
+
+        data = store.sentiment_data(day)
+        assert data.highest_board == 3
+        assert data.limit_up_count == index.market(day)['limit_up_count']
+        analyzer = MarketSentimentAnalyzer()
+        analyzer.update_data(data)
+        assert analyzer.sentiment_data.continuous_limit_up == {3: 1}
+
+        index_data = store.index_data(day)
+        closes = _index()['close']
+        assert index_data.price == closes.iloc[102]
+        assert index_data.recent_changes[-1] == pytest.approx((closes.iloc[102] / closes.iloc[101] - 1) * 100)
+        assert len(index_data.recent_changes) == 5
+        assert store.sentiment_data('2000-01-03') is None
+        assert store.index_data('2000-01-03') is None
+
+    def test_is_tradable(self, frames, tmp_path):
+        store = MarketBreadthStore(tmp_path)
+        history = store.build(frames, _index())
+
+        crash_day = history.index[117]
+        assert history.loc[crash_day, 'market_env'] == MarketEnvironment.EXTREME_WEAK
+        assert not store.is_tradable(crash_day)[0]
+        assert store.is_tradable('2000-01-03') == (True, "无市场宽度数据")
+
+
+class TestBacktester:
+    """回测引擎查表"""
+
+    def test_skips_untradable_days(self, frames, tmp_path):
+        data_dir = tmp_path / 'processed'
+        data_dir.mkdir()
+        for code, df in frames.items():
+            df.to_csv(data_dir / f"{code}.csv", index=False)
+        store = MarketBreadthStore(tmp_path / 'breadth')
+        history = store.build(frames, _index())
+
+        config = BacktestConfig(min_score=0)
+        engine = OvernightBacktestEngine(config, data_path=str(data_dir), stock_pool=POOL,
+                                         breadth_store=store)
+        engine._trading_days = engine._build_trading_calendar()
+
+        tradable = next(d for d in history.index[80:] if store.is_tradable(d)[0])
+        results = engine.run_single_day(tradable.strftime('%Y-%m-%d'))
+        assert results
+        assert {r.sentiment_phase for r in results} == {history.loc[tradable, 'sentiment_phase']}
+
+        assert engine.run_single_day(history.index[117].strftime('%Y-%m-%d')) == []
+
+    def test_position_multiplier_without_changing_scores(self, frames, tmp_path):
+        data_dir = tmp_path / 'processed'
+        data_dir.mkdir()
+        for code, df in frames.items():
+            df.to_csv(data_dir / f"{code}.csv", index=False)
+        store = MarketBreadthStore(tmp_path / 'breadth')
+        history = store.build(frames, _index())
+        engine = OvernightBacktestEngine(BacktestConfig(min_score=0), data_path=str(data_dir),
+                                         stock_pool=POOL, breadth_store=store)
+        engine._trading_days = engine._build_trading_calendar()
+
+        day = next(d for d in history.index[80:]
+                   if store.is_tradable(d)[0] and history.loc[d, 'position_multiplier'] != 1.0)
+        pick_date = day.strftime('%Y-%m-%d')
+        multiplier = history.loc[day, 'position_multiplier']
+        assert engine._sentiment_on_date(pick_date) == (history.loc[day, 'sentiment_phase'], multiplier)
+
+        # 市场环境只决定是否选股与仓位系数，评分输入与实盘一致
+        with patch('core.overnight_picker.scorer.TomorrowPotentialScorer.score_stock',
+                   return_value=(80.0, {})) as score_stock:
+            results = engine.run_single_day(pick_date)
+        assert all(call.args[1] == {} for call in score_stock.call_args_list)
+
+        executed = [r for r in results if r.is_executed]
+        assert executed
+        assert {r.position_multiplier for r in results} == {multiplier}
+        metrics = engine._calculate_metrics(results, 1, 1)
+        expected = sum(r.return_pct for r in executed) * multiplier \
+            / max(1, len(executed) / engine.config.max_recommendations)
+        assert metrics.total_return == pytest.approx(expected)
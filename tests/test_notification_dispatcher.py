@@ -0,0 +1,286 @@
+"""
+MiniQuant-Lite 异步通知分发器测试
+
+使用本地 Webhook 桩服务测试 NotificationDispatcher：
+- 提交立即返回，不被慢请求阻塞
+- 合并窗口内的提交合并为一条汇总消息
+- 失败后指数退避重试
+- 发件箱在重启后继续发送
+- 复用 HTTP 连接
+"""
+
+import json
+import threading
+import time
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.notification import NotificationConfig, auto_send_notification
+from core.notification_dispatcher import NotificationDispatcher, NotificationHandle
+from core.signal_generator import SignalType, TradingSignal
+
+
+class _StubWebhook:
+    """本地飞书 Webhook 桩服务：按脚本返回状态码，记录请求内容与客户端连接"""
+
+    def __init__(self):
+        self.requests = []          # (时间, 客户端地址, 消息文本)
+        self.statuses = []          # 依次返回的状态码，用完后返回 200
+        self.delay = 0.0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length))
+                stub.requests.append((time.monotonic(), self.client_address, body['content']['text']))
+                if stub.delay:
+                    time.sleep(stub.delay)
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                payload = json.dumps({"code": 0, "msg": "success"} if status == 200 else {}).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def webhook(monkeypatch):
+    monkeypatch.setenv('NO_PROXY', '127.0.0.1')
+    stub = _StubWebhook()
+    yield stub
+    stub.close()
+
+
+def _config(url, max_retries=3, retry_interval=0):
+    return NotificationConfig(webhook_url=url, enabled=True, timeout=5,
+                              max_retries=max_retries, retry_interval=retry_interval)
+
+
+def _signal(code, signal_type=SignalType.BUY):
+    return TradingSignal(
+        code=code, name=f"股票{code}", signal_type=signal_type,
+        price_range=(9.5, 10.0), limit_cap=10.1, reason="RSI超卖反弹",
+        generated_at=date.today(), trade_amount=10000.0, high_fee_warning=False,
+        actual_fee_rate=0.0003, news_url="", in_report_window=False,
+    )
+
+
+@pytest.fixture
+def make_dispatcher(tmp_path):
+    created = []
+
+    def factory(config, **kwargs):
+        kwargs.setdefault('outbox_path', tmp_path / 'outbox.json')
+        kwargs.setdefault('coalesce_window', 0.05)
+        dispatcher = NotificationDispatcher(config, **kwargs)
+        created.append(dispatcher)
+        return dispatcher
+
+    yield factory
+    for dispatcher in created:
+        dispatcher.stop()
+
+
+class TestSubmit:
+    """提交"""
+
+    def test_submit_returns_immediately(self, webhook, make_dispatcher):
+        webhook.delay = 0.5
+        dispatcher = make_dispatcher(_config(webhook.url), coalesce_window=0)
+
+        start = time.perf_counter()
+        handle = dispatcher.submit([_signal('000001')])
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.2
+        assert handle.status == NotificationHandle.STATUS_QUEUED
+        assert handle.wait(timeout=5)
+        assert handle.status == NotificationHandle.STATUS_SENT
+        assert '000001' in webhook.requests[0][2]
+
+    def test_disabled_or_filtered_is_skipped(self, webhook, make_dispatcher):
+        disabled = make_dispatcher(NotificationConfig(webhook_url=webhook.url, enabled=False))
+        assert disabled.submit([_signal('000001')]).status == NotificationHandle.STATUS_SKIPPED
+
+        config = _config(webhook.url)
+        config.notify_on_sell = False
+        dispatcher = make_dispatcher(config)
+        handle = dispatcher.submit([_signal('000001', SignalType.SELL)])
+
+        assert handle.status == NotificationHandle.STATUS_SKIPPED
+        assert handle.wait(timeout=0)
+        assert dispatcher.pending_count == 0
+
+    def test_unserializable_signal_reported_as_failed(self, webhook, make_dispatcher):
+        dispatcher = make_dispatcher(_config(webhook.url))
+        bad = SimpleNamespace(code='000001', signal_type='买入')
+
+        with patch('core.notification.NotificationService._filter_signals', return_value=[bad]):
+            handle = dispatcher.submit([bad])
+
+        assert handle.status == NotificationHandle.STATUS_FAILED
+        assert not handle.wait(timeout=0)
+        assert dispatcher.pending_count == 0
+
+    def test_auto_send_reports_submit_failure(self, webhook):
+        config = _config(webhook.url)
+        failed = NotificationHandle(None, NotificationHandle.STATUS_FAILED, "序列化失败")
+
+        with patch('core.notification.NotificationConfigStore.load', return_value=config):
+            with patch('core.notification.dispatch_notification', return_value=failed):
+                assert auto_send_notification([_signal('000001')]) is False
+            with patch('core.notification.dispatch_notification', side_effect=RuntimeError("无法启动线程")):
+                assert auto_send_notification([_signal('000001')]) is False
+            with patch('core.notification.dispatch_notification',
+                       return_value=NotificationHandle('id')):
+                assert auto_send_notification([_signal('000001')]) is True
+
+
+class TestCoalescing:
+    """合并窗口"""
+
+    def test_burst_coalesced_into_one_message(self, webhook, make_dispatcher):
+        dispatcher = make_dispatcher(_config(webhook.url), coalesce_window=0.3)
+
+        handles = [dispatcher.submit([_signal(f"60000{i}")]) for i in range(5)]
+
+        assert all(h.wait(timeout=5) for h in handles)
+        assert len({h.message_id for h in handles}) == 1
+        assert len(webhook.requests) == 1
+        text = webhook.requests[0][2]
+        assert '信号汇总' in text
+        assert all(f"60000{i}" in text for i in range(5))
+
+    def test_new_window_after_close(self, webhook, make_dispatcher):
+        dispatcher = make_dispatcher(_config(webhook.url))
+
+        dispatcher.submit([_signal('000001')]).wait(timeout=5)
+        dispatcher.submit([_signal('000002')]).wait(timeout=5)
+
+        assert len(webhook.requests) == 2
+
+
+class TestRetry:
+    """重试与退避"""
+
+    def test_exponential_backoff_then_success(self, webhook, make_dispatcher):
+        webhook.statuses = [500, 500]
+        dispatcher = make_dispatcher(_config(webhook.url, max_retries=5, retry_interval=0.1))
+
+        handle = dispatcher.submit([_signal('000001')])
+
+        assert handle.wait(timeout=5)
+        times = [t for t, _, _ in webhook.requests]
+        assert len(times) == 3
+        assert times[1] - times[0] >= 0.1
+        assert times[2] - times[1] >= 0.2
+        assert dispatcher.pending_count == 0
+
+    def test_retries_exhausted(self, webhook, make_dispatcher):
+        webhook.statuses = [500] * 3
+        dispatcher = make_dispatcher(_config(webhook.url, max_retries=3))
+
+        handle = dispatcher.submit([_signal('000001')])
+
+        assert not handle.wait(timeout=5)
+        assert handle.status == NotificationHandle.STATUS_FAILED
+        assert 'HTTP 500' in handle.error
+        assert dispatcher.pending_count == 0
+
+    def test_backoff_capped(self, make_dispatcher):
+        config = _config('http://unused', retry_interval=2)
+        dispatcher = make_dispatcher(config, max_backoff=10)
+
+        assert [dispatcher._backoff(n, config) for n in range(1, 6)] == [2, 4, 8, 10, 10]
+
+
+class TestOutbox:
+    """持久化发件箱"""
+
+    def test_undelivered_message_survives_restart(self, webhook, make_dispatcher, tmp_path):
+        webhook.statuses = [500] * 100
+        first = make_dispatcher(_config(webhook.url, max_retries=100, retry_interval=60))
+        first.submit([_signal('000001'), _signal('000002')])
+
+        deadline = time.monotonic() + 5
+        while not webhook.requests and time.monotonic() < deadline:
+            time.sleep(0.01)
+        first.stop()
+
+        saved = json.loads((tmp_path / 'outbox.json').read_text(encoding='utf-8'))
+        assert len(saved['messages']) == 1
+        assert saved['messages'][0]['attempts'] == 1
+
+        webhook.statuses = []
+        second = make_dispatcher(_config(webhook.url, max_retries=100, retry_interval=60))
+        assert second.pending_count == 1
+        handle = second.handle(saved['messages'][0]['id'])
+
+        assert second.flush(timeout=5)
+        assert handle.wait(timeout=5)
+        assert webhook.requests[-1][2] == webhook.requests[0][2]
+        assert json.loads((tmp_path / 'outbox.json').read_text(encoding='utf-8'))['messages'] == []
+
+    def test_open_window_survives_restart(self, webhook, make_dispatcher):
+        first = make_dispatcher(_config(webhook.url), coalesce_window=60)
+        first.submit([_signal('000001')])
+        first.stop()
+
+        second = make_dispatcher(_config(webhook.url), coalesce_window=60)
+
+        assert second.flush(timeout=5)
+        assert len(webhook.requests) == 1
+        assert '000001' in webhook.requests[0][2]
+
+    def test_restored_messages_sent_without_new_submit(self, webhook, make_dispatcher):
+        first = make_dispatcher(_config(webhook.url), coalesce_window=0.2)
+        first.submit([_signal('000001')])
+        first.stop()
+        assert not webhook.requests
+
+        second = make_dispatcher(_config(webhook.url), coalesce_window=0.2)
+        assert second.is_running()
+
+        deadline = time.monotonic() + 5
+        while second.pending_count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert second.pending_count == 0
+        assert len(webhook.requests) == 1
+        assert '000001' in webhook.requests[0][2]
+
+
+class TestConnectionPooling:
+    """连接复用"""
+
+    def test_connection_reused_across_messages(self, webhook, make_dispatcher):
+        dispatcher = make_dispatcher(_config(webhook.url))
+
+        for code in ('000001', '000002', '000003'):
+            assert dispatcher.submit([_signal(code)]).wait(timeout=5)
+
+        assert len(webhook.requests) == 3
+        assert len({client for _, client, _ in webhook.requests}) == 1
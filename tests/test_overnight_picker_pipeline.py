@@ -0,0 +1,212 @@
+"""
+隔夜选股分阶段流水线测试
+
+测试：
+- 并行加载结果与逐只加载一致，并写入缓存
+- 向量化指标截面与逐只 _v6_stock_data + score_stock 的评分一致
+- 股性特征批量计算与 StockActivityScorer.features 一致
+- 前N只筛选与全排序一致，交易计划记录各阶段耗时
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.fund_flow import FundFlowStore
+from core.overnight_picker import OvernightStockPicker
+from core.overnight_picker.scorer_v6 import BatchScoreResult, ScorerV6, StockActivityScorer
+
+
+HOT_TOPICS = ['人工智能', '机器人']
+
+
+class _OfflineFundFlowStore(FundFlowStore):
+    """不发起网络刷新的资金流向库"""
+
+    def refresh_if_stale(self, background=True):
+        return False
+
+
+def _daily(days, seed):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.002, 0.025, days)
+    returns[rng.integers(0, days, 3)] = 0.1  # 涨停
+    close = np.round(10 * np.exp(np.cumsum(returns)), 2)
+    open_p = np.round(close * (1 + rng.normal(0, 0.01, days)), 2)
+    return pd.DataFrame({
+        'date': pd.date_range('2025-06-02', periods=days, freq='B').strftime('%Y-%m-%d'),
+        'open': open_p,
+        'high': np.round(np.maximum(open_p, close) * (1 + rng.uniform(0, 0.03, days)), 2),
+        'low': np.round(np.minimum(open_p, close) * (1 - rng.uniform(0, 0.03, days)), 2),
+        'close': close,
+        'volume': rng.integers(100_000, 5_000_000, days).astype(float),
+    })
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for i in range(40):
+        _daily(120 + i, seed=i).to_csv(tmp_path / f"{600000 + i:06d}.csv", index=False)
+    _daily(30, seed=99).to_csv(tmp_path / "600099.csv", index=False)  # 数据不足60日
+    return tmp_path
+
+
+@pytest.fixture
+def picker(data_dir, tmp_path_factory):
+    store = _OfflineFundFlowStore(tmp_path_factory.mktemp('fund_flow'))
+    pool = [f"{600000 + i:06d}" for i in range(40)] + ['600099', '600098']  # 600098 无数据文件
+    picker = OvernightStockPicker(data_path=str(data_dir), stock_pool=pool, min_score=30)
+    picker.scorer = ScorerV6(enable_logging=False, fund_flow_store=store)
+    return picker
+
+
+def _serial_scores(picker, hot_topics):
+    """逐只评分（原流程）"""
+    scored = {}
+    for code in picker.stock_pool:
+        df = picker.load_stock_data(code)
+        if df is None or len(df) < 60:
+            continue
+        df = picker.calculate_technical_indicators(df)
+        latest = picker.get_latest_data(df)
+        stock_data = picker._v6_stock_data(code, code, [], df, latest)
+        scored[code] = picker.scorer.score_stock(
+            stock_data, {'hot_topics': hot_topics, 'sector_limit_up_count': 0}, log_score=False,
+        )
+    return scored
+
+
+class TestParallelLoad:
+    """并行加载"""
+
+    def test_matches_serial_load_and_caches(self, picker):
+        frames = picker.load_stock_data_batch(picker.stock_pool)
+
+        assert '600098' not in frames
+        assert len(frames) == 41
+        assert set(picker._stock_data_cache) == set(frames)
+        serial = OvernightStockPicker(data_path=picker.data_path, stock_pool=['600005'])
+        pd.testing.assert_frame_equal(frames['600005'], serial.load_stock_data('600005'))
+
+    def test_preload_all_data(self, picker):
+        assert picker.preload_all_data() == 41
+
+
+class TestVectorizedPass:
+    """向量化指标截面"""
+
+    def test_scores_match_serial(self, picker):
+        serial = _serial_scores(picker, HOT_TOPICS)
+        picker._stock_data_cache.clear()
+
+        timings = {}
+        scored = picker._score_all_stocks(HOT_TOPICS, timings)
+
+        assert [s['code'] for s in scored] == list(serial)
+        for stock in scored:
+            total, details = serial[stock['code']]
+            assert stock['score'] == total, stock['code']
+            assert set(stock['details']['risks']) == set(details['risks'])
+            for dim in BatchScoreResult.DIMENSIONS:
+                for key, expected in details[dim].items():
+                    actual = stock['details'][dim][key]
+                    if isinstance(expected, (float, np.floating)):
+                        assert actual == pytest.approx(expected, nan_ok=True), (stock['code'], dim, key)
+                    else:
+                        assert actual == expected, (stock['code'], dim, key)
+        assert set(timings) == {'load', 'indicators', 'score'}
+
+    def test_activity_features_batch_matches_features(self, picker):
+        frames = picker.load_stock_data_batch(picker.stock_pool)
+        frame = picker._v6_batch_frame(frames)
+        scorer = StockActivityScorer()
+
+        for _, row in frame.iterrows():
+            df = picker.calculate_technical_indicators(frames[row['code']])
+            stock_data = picker._v6_stock_data(row['code'], row['code'], [], df, picker.get_latest_data(df))
+            expected = scorer.features(stock_data['kline_df'], row['code'])
+            for key, value in expected.items():
+                assert row[key] == pytest.approx(value), (row['code'], key)
+        assert frame['has_limit_up_20d'].any()
+
+    def test_invalid_frame_dropped_without_aborting(self, picker):
+        frames = dict(picker.load_stock_data_batch(picker.stock_pool))
+        bad_code = next(iter(frames))
+        bad = frames[bad_code].astype({'close': object})
+        bad.loc[bad.index[-3], 'close'] = '停牌'
+        frames[bad_code] = bad
+
+        frame = picker._v6_batch_frame(frames)
+
+        assert bad_code not in set(frame['code'])
+        expected = picker._v6_batch_frame({c: df for c, df in frames.items() if c != bad_code})
+        pd.testing.assert_frame_equal(frame, expected)
+
+
+class TestLimitUpFeatures:
+    """真实涨停K线的股性特征（涨跌幅与涨停阈值同为百分比口径）"""
+
+    @pytest.fixture
+    def limit_picker(self, tmp_path, tmp_path_factory):
+        pool = []
+        for i in range(6):
+            df = _daily(90, seed=200 + i)
+            streak = i + 1  # 最近 i+1 个交易日连续 +10%
+            base = df['close'].iloc[-streak - 1]
+            df.loc[df.index[-streak:], 'close'] = np.round(base * 1.1 ** np.arange(1, streak + 1), 2)
+            df['high'] = np.maximum(df['high'], df['close'])
+            code = f"{600200 + i:06d}"
+            df.to_csv(tmp_path / f"{code}.csv", index=False)
+            pool.append(code)
+        store = _OfflineFundFlowStore(tmp_path_factory.mktemp('fund_flow'))
+        picker = OvernightStockPicker(data_path=str(tmp_path), stock_pool=pool, min_score=0)
+        picker.scorer = ScorerV6(enable_logging=False, fund_flow_store=store)
+        return picker
+
+    def test_detected_with_and_without_limit_index(self, limit_picker):
+        frames = limit_picker.load_stock_data_batch(limit_picker.stock_pool)
+        without = limit_picker._v6_batch_frame(frames)
+        assert without['has_limit_up_20d'].all()
+        assert without['consecutive_limit_ups'].tolist() == [1, 2, 3, 4, 5, 6]
+        scores_without = limit_picker.scorer.score_batch(without).total
+
+        limit_picker.build_limit_index()
+        with_index = limit_picker._v6_batch_frame(frames)
+        scores_with = limit_picker.scorer.score_batch(with_index).total
+
+        np.testing.assert_array_equal(scores_with, scores_without)
+        serial = _serial_scores(limit_picker, [])
+        assert [serial[code][0] for code in without['code']] == pytest.approx(scores_without.tolist())
+
+
+class TestRunPipeline:
+    """完整流程"""
+
+    def test_top_n_matches_full_sort_and_records_timings(self, picker):
+        picker.max_recommendations = 3
+        captured = {}
+        original = picker._create_recommendations
+
+        def capture(qualified_stocks, **kwargs):
+            captured['qualified'] = qualified_stocks
+            return original(qualified_stocks=qualified_stocks, **kwargs)
+
+        with patch('core.overnight_picker.picker.get_fund_flow_store',
+                   return_value=picker.scorer.capital_strength_scorer.fund_flow_store), \
+                patch.object(picker, 'is_market_tradable', return_value=(True, '')), \
+                patch.object(picker, '_create_recommendations', side_effect=capture):
+            plan = picker.run(hot_topics=HOT_TOPICS, save_plan=False)
+
+        scored = picker._score_all_stocks(HOT_TOPICS)
+        expected = sorted((s for s in scored if s['score'] >= picker.min_score),
+                          key=lambda s: s['score'], reverse=True)[:6]
+        assert [s['code'] for s in captured['qualified']] == [s['code'] for s in expected]
+        assert {'market_env', 'sentiment', 'load', 'indicators', 'score', 'select', 'plan', 'total'} \
+            <= set(plan.stage_timings)
+        assert plan.to_dict()['stage_timings'] == plan.stage_timings
@@ -0,0 +1,448 @@
+"""
+MiniQuant-Lite 每日流水线编排测试
+
+测试 PipelineOrchestrator：
+- 依赖分层与循环依赖检测
+- 互不依赖的阶段并发执行
+- 输入未变化的阶段跳过执行并复用持久化产物
+- 上游失败时下游阶段被阻断
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.pipeline import (
+    ArtifactStore,
+    PipelineOrchestrator,
+    PipelineStage,
+    build_daily_pipeline,
+    content_hash,
+)
+from core.notification_dispatcher import NotificationHandle
+from core.screener import MarketFilter, Screener, ScreenerCondition
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(tmp_path / "pipeline")
+
+
+def _counting(name, calls, fn):
+    def wrapper(**kwargs):
+        calls.append(name)
+        return fn(**kwargs)
+    return wrapper
+
+
+class TestContentHash:
+    """内容哈希测试"""
+
+    def test_dataframe_hash_is_content_based(self):
+        df1 = pd.DataFrame({'close': [1.0, 2.0, 3.0]})
+        df2 = pd.DataFrame({'close': [1.0, 2.0, 3.0]})
+        df3 = pd.DataFrame({'close': [1.0, 2.0, 3.5]})
+
+        assert content_hash(df1) == content_hash(df2)
+        assert content_hash(df1) != content_hash(df3)
+
+    def test_dict_hash_ignores_insertion_order(self):
+        assert content_hash({'a': 1, 'b': 2}) == content_hash({'b': 2, 'a': 1})
+        assert content_hash([1, 2]) != content_hash((1, 2))
+
+
+class TestPipelineStructure:
+    """依赖结构测试"""
+
+    def test_execution_levels(self, store):
+        orchestrator = PipelineOrchestrator(store)
+        orchestrator.add_stage(PipelineStage('a', lambda x: {'a': x}, inputs=['x'], outputs=['a']))
+        orchestrator.add_stage(PipelineStage('b', lambda a: {'b': a}, inputs=['a'], outputs=['b']))
+        orchestrator.add_stage(PipelineStage('c', lambda a: {'c': a}, inputs=['a'], outputs=['c']))
+        orchestrator.add_stage(PipelineStage('d', lambda b, c: {'d': b + c}, inputs=['b', 'c'], outputs=['d']))
+
+        assert orchestrator.execution_levels() == [['a'], ['b', 'c'], ['d']]
+
+    def test_duplicate_output_rejected(self, store):
+        orchestrator = PipelineOrchestrator(store)
+        orchestrator.add_stage(PipelineStage('a', lambda: {'out': 1}, outputs=['out']))
+
+        with pytest.raises(ValueError, match="已由阶段"):
+            orchestrator.add_stage(PipelineStage('b', lambda: {'out': 2}, outputs=['out']))
+
+    def test_cycle_detected(self, store):
+        orchestrator = PipelineOrchestrator(store)
+        orchestrator.add_stage(PipelineStage('a', lambda b: {'a': b}, inputs=['b'], outputs=['a']))
+        orchestrator.add_stage(PipelineStage('b', lambda a: {'b': a}, inputs=['a'], outputs=['b']))
+
+        with pytest.raises(ValueError, match="循环依赖"):
+            orchestrator.run()
+
+    def test_missing_external_input(self, store):
+        orchestrator = PipelineOrchestrator(store)
+        orchestrator.add_stage(PipelineStage('a', lambda x: {'a': x}, inputs=['x'], outputs=['a']))
+
+        with pytest.raises(ValueError, match="缺少外部输入"):
+            orchestrator.run({})
+
+
+class TestPipelineExecution:
+    """执行与缓存测试"""
+
+    def _build(self, store, calls):
+        orchestrator = PipelineOrchestrator(store)
+        orchestrator.add_stage(PipelineStage(
+            'load', _counting('load', calls, lambda codes: {'prices': {c: float(len(c)) for c in codes}}),
+            inputs=['codes'], outputs=['prices']
+        ))
+        orchestrator.add_stage(PipelineStage(
+            'total', _counting('total', calls, lambda prices: {'total': sum(prices.values())}),
+            inputs=['prices'], outputs=['total']
+        ))
+        return orchestrator
+
+    def test_outputs_available(self, store):
+        calls = []
+        result = self._build(store, calls).run({'codes': ['000001', '600000']})
+
+        assert result.success
+        assert result.artifacts['total'] == 12.0
+        assert result.executed_stages == ['load', 'total']
+
+    def test_unchanged_inputs_skip_stages(self, store):
+        calls = []
+        self._build(store, calls).run({'codes': ['000001']})
+
+        # 新的编排器实例，验证跨运行复用磁盘产物
+        calls.clear()
+        result = self._build(store, calls).run({'codes': ['000001']})
+
+        assert calls == []
+        assert result.skipped_stages == ['load', 'total']
+        assert result.artifacts['total'] == 6.0
+
+    def test_changed_inputs_rerun(self, store):
+        calls = []
+        self._build(store, calls).run({'codes': ['000001']})
+
+        calls.clear()
+        result = self._build(store, calls).run({'codes': ['000001', '1']})
+
+        assert calls == ['load', 'total']
+        assert result.artifacts['total'] == 7.0
+
+    def test_successful_run_prunes_replaced_artifacts(self, store):
+        calls = []
+        first = self._build(store, calls).run({'codes': ['000001']})
+        result = self._build(store, calls).run({'codes': ['000001', '1']})
+
+        remaining = {p.stem for p in store.artifact_dir.glob('*.pkl')}
+        assert remaining == set(result.stage_results['load'].output_hashes.values()) | \
+            set(result.stage_results['total'].output_hashes.values())
+        assert not store.has(first.stage_results['load'].output_hashes['prices'])
+
+    def test_unchanged_output_skips_downstream(self, store):
+        """always_run 阶段重跑后产物未变，下游仍然跳过"""
+        calls = []
+
+        def build():
+            orchestrator = PipelineOrchestrator(store)
+            orchestrator.add_stage(PipelineStage(
+                'refresh', _counting('refresh', calls, lambda day: {'data': [1, 2, 3]}),
+                inputs=['day'], outputs=['data'], always_run=True
+            ))
+            orchestrator.add_stage(PipelineStage(
+                'sum', _counting('sum', calls, lambda data: {'sum': sum(data)}),
+                inputs=['data'], outputs=['sum']
+            ))
+            return orchestrator
+
+        build().run({'day': '2026-01-05'})
+        calls.clear()
+        result = build().run({'day': '2026-01-05'})
+
+        assert calls == ['refresh']
+        assert result.skipped_stages == ['sum']
+
+    def test_force_reruns_everything(self, store):
+        calls = []
+        self._build(store, calls).run({'codes': ['000001']})
+
+        calls.clear()
+        self._build(store, calls).run({'codes': ['000001']}, force=True)
+
+        assert calls == ['load', 'total']
+
+    def test_independent_stages_run_concurrently(self, store):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_and_return(name):
+            def fn(x):
+                barrier.wait()
+                return {name: x}
+            return fn
+
+        orchestrator = PipelineOrchestrator(store, max_workers=2)
+        orchestrator.add_stage(PipelineStage('left', wait_and_return('left'), inputs=['x'], outputs=['left']))
+        orchestrator.add_stage(PipelineStage('right', wait_and_return('right'), inputs=['x'], outputs=['right']))
+
+        # 两个阶段必须同时运行才能通过屏障
+        result = orchestrator.run({'x': 1})
+
+        assert result.success
+        assert set(result.executed_stages) == {'left', 'right'}
+
+    def test_failure_blocks_downstream(self, store):
+        def boom(x):
+            raise RuntimeError("数据源异常")
+
+        orchestrator = PipelineOrchestrator(store)
+        orchestrator.add_stage(PipelineStage('bad', boom, inputs=['x'], outputs=['bad']))
+        orchestrator.add_stage(PipelineStage('after', lambda bad: {'after': bad}, inputs=['bad'], outputs=['after']))
+        orchestrator.add_stage(PipelineStage('other', lambda x: {'other': x}, inputs=['x'], outputs=['other']))
+
+        result = orchestrator.run({'x': 1})
+
+        assert not result.success
+        assert result.stage_results['bad'].status == 'failed'
+        assert 'bad' in result.stage_results['after'].error
+        assert result.stage_results['after'].status == 'blocked'
+        assert result.artifacts['other'] == 1
+
+    def test_missing_output_is_failure(self, store):
+        orchestrator = PipelineOrchestrator(store)
+        orchestrator.add_stage(PipelineStage('a', lambda: {'wrong': 1}, outputs=['a']))
+
+        result = orchestrator.run()
+
+        assert result.stage_results['a'].status == 'failed'
+
+
+class _StubFeed:
+    def __init__(self, data):
+        self.data = data
+
+    def load_processed_data(self, code, use_cache=True):
+        return self.data.get(code)
+
+
+def _daily(last_close, spread=0.04, days=30):
+    """标准格式日线：前 days-1 天收盘 10 元，最后一天收盘 last_close，振幅 spread"""
+    close = [10.0] * (days - 1) + [last_close]
+    return pd.DataFrame({
+        'date': pd.bdate_range('2026-01-05', periods=days),
+        'open': close,
+        'high': [c * (1 + spread / 2) for c in close],
+        'low': [c * (1 - spread / 2) for c in close],
+        'close': close,
+        'volume': [1e6] * days,
+    })
+
+
+class _StubIndustryMap:
+    is_loaded = False
+
+    def refresh_if_stale(self, background=True):
+        return False
+
+
+class _StubScreener(Screener):
+    """只替换联网部分（大盘状态、流动性快照、上市天数、行业、财报窗口）的选股器"""
+
+    def __init__(self, snapshot=None, industries=None, statuses=('healthy',)):
+        super().__init__(data_feed=None)
+        self.industry_map = _StubIndustryMap()
+        self.market_filter = MarketFilter(enabled=True)
+        self.strategy_prefilter.enabled = False
+        self.add_condition(ScreenerCondition('close', '>', 10))
+        self.snapshot = snapshot
+        self.industries = industries or {}
+        self.statuses = list(statuses)
+        self.status_calls = 0
+
+    def get_market_status(self):
+        status = self.statuses[min(self.status_calls, len(self.statuses) - 1)]
+        self.status_calls += 1
+        return {'status': status}
+
+    def get_liquidity_snapshot(self):
+        return self.snapshot
+
+    def _check_listing_days(self, code, min_days=60):
+        return True
+
+    def _get_stock_industry(self, code):
+        return self.industries.get(code, '未知')
+
+    def _check_report_window(self, code, window_days=3):
+        return False
+
+
+class _StubSignalGenerator:
+    def __init__(self):
+        self.calls = []
+
+    def generate_signals(self, codes, frames=None):
+        self.calls.append(list(codes))
+        self.frames = frames
+        return [f"BUY:{c}" for c in codes]
+
+
+class _StubSellChecker:
+    def __init__(self, signals=()):
+        self.signals = list(signals)
+        self.frames = None
+
+    def check_all_positions(self, positions, frames=None):
+        self.frames = frames
+        return self.signals
+
+
+class _StubSellSignal:
+    def __init__(self, code):
+        self.code = code
+
+    def to_trading_signal(self):
+        return f"SELL:{self.code}"
+
+
+class TestDailyPipeline:
+    """每日流程流水线测试"""
+
+    def test_daily_pipeline_end_to_end(self, store):
+        data = {
+            '000001': _daily(11.0),
+            '600000': _daily(8.0),
+        }
+        screener = _StubScreener()
+        generator = _StubSignalGenerator()
+
+        def build():
+            return build_daily_pipeline(
+                _StubFeed(data), screener=screener, signal_generator=generator,
+                sell_checker=_StubSellChecker(), store=store, send_notification=False
+            )
+
+        inputs = {'stock_pool': ['000001', '600000'], 'positions': [], 'trade_date': '2026-01-05'}
+        result = build().run(inputs)
+
+        assert result.success
+        assert result.artifacts['screened_codes'] == ['000001']
+        assert result.artifacts['buy_signals'] == ['BUY:000001']
+
+        # 第二次运行：本地数据未变，只重新读取数据，下游全部跳过
+        result = build().run(inputs)
+
+        assert result.executed_stages == ['data_refresh']
+        assert screener.status_calls == 1
+        assert len(generator.calls) == 1
+
+    def test_failed_market_status_not_cached(self, store):
+        data = {'000001': _daily(11.0)}
+        screener = _StubScreener(statuses=('error', 'healthy'))
+        inputs = {'stock_pool': ['000001'], 'positions': [], 'trade_date': '2026-01-05'}
+
+        def build():
+            return build_daily_pipeline(
+                _StubFeed(data), screener=screener, signal_generator=_StubSignalGenerator(),
+                sell_checker=_StubSellChecker(), store=store, send_notification=False
+            )
+
+        result = build().run(inputs)
+        assert result.artifacts['market_status'] == {'status': 'error'}
+        assert store.get_stage_record('market_status') is None
+
+        # 同一交易日再次运行：重新获取大盘状态，成功后才缓存
+        result = build().run(inputs)
+        assert 'market_status' in result.executed_stages
+        assert result.artifacts['market_status'] == {'status': 'healthy'}
+
+        result = build().run(inputs)
+        assert 'market_status' in result.skipped_stages
+        assert screener.status_calls == 2
+
+    def test_screen_stage_runs_full_screener_chain(self, store):
+        data = {
+            '000001': _daily(11.0),
+            '000002': _daily(11.0),
+            '300001': _daily(11.0, spread=0.30),
+            '600000': _daily(11.0),
+        }
+        snapshot = pd.DataFrame({
+            'code': ['000001', '000002', '300001'],
+            'name': ['平安银行', '万科A', '妖股'],
+            'market_cap': [1e10, 1e10, 1e10],
+            'turnover_rate': [5.0, 3.0, 6.0],
+        })
+        screener = _StubScreener(snapshot=snapshot, industries={'000001': '银行', '000002': '银行'})
+        pipeline = build_daily_pipeline(
+            _StubFeed(data), screener=screener, signal_generator=_StubSignalGenerator(),
+            sell_checker=_StubSellChecker(), store=store, send_notification=False
+        )
+
+        result = pipeline.run({'stock_pool': list(data), 'positions': [], 'trade_date': '2026-01-05'})
+
+        # 600000 不在流动性快照中，300001 NATR 过高，000002 同行业换手率较低被互斥剔除
+        assert result.success
+        assert result.artifacts['screened_codes'] == ['000001']
+
+    def test_signals_reuse_price_data_and_notify_both_sides(self, store):
+        data = {
+            '000001': _daily(11.0),
+            '600000': _daily(8.0),
+        }
+        generator = _StubSignalGenerator()
+        checker = _StubSellChecker([_StubSellSignal('600000')])
+        pipeline = build_daily_pipeline(
+            _StubFeed(data), screener=_StubScreener(), signal_generator=generator,
+            sell_checker=checker, store=store, send_notification=True
+        )
+
+        with patch('core.notification.dispatch_notification',
+                   return_value=NotificationHandle('m1', NotificationHandle.STATUS_SENT)) as send:
+            result = pipeline.run({'stock_pool': ['000001', '600000'], 'positions': [],
+                                   'trade_date': '2026-01-05'})
+
+        assert result.success
+        assert result.artifacts['notification_sent'] is True
+        assert generator.frames is result.artifacts['price_data']
+        assert checker.frames is result.artifacts['price_data']
+        send.assert_called_once_with(['BUY:000001', 'SELL:600000'])
+
+    def test_undelivered_notification_not_cached(self, store):
+        data = {'000001': _daily(11.0)}
+        inputs = {'stock_pool': ['000001'], 'positions': [], 'trade_date': '2026-01-05'}
+
+        def build():
+            return build_daily_pipeline(
+                _StubFeed(data), screener=_StubScreener(), signal_generator=_StubSignalGenerator(),
+                sell_checker=_StubSellChecker(), store=store, send_notification=True,
+                notification_timeout=0.01,
+            )
+
+        class _Dispatcher:
+            flushed = []
+
+            def flush(self, timeout=None):
+                self.flushed.append(timeout)
+                return False
+
+        with patch('core.notification.dispatch_notification',
+                   side_effect=lambda signals: NotificationHandle('m1')) as send, \
+                patch('core.notification_dispatcher.get_notification_dispatcher', return_value=_Dispatcher()):
+            result = build().run(inputs)
+
+            assert result.stage_results['notifications'].status == 'failed'
+            assert _Dispatcher.flushed == [0.01]
+            assert store.get_stage_record('notifications') is None
+
+            # 下次运行信号相同，但上次未送达，重新发送
+            build().run(inputs)
+            assert send.call_count == 2
@@ -0,0 +1,256 @@
+"""
+实时监控大容量模式测试
+
+测试 BulkDataFetcher：
+- 增量指标与 TechIndicators.calculate_all_indicators 一致
+- 行情一次批量快照，历史每日只加载一次
+- 资金流向取自全市场资金流向库
+- 500 只股票刷新耗时与内存占用
+"""
+
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.fund_flow import FundFlowStore
+from core.realtime_monitor.bulk_fetcher import BulkDataFetcher, IndicatorState
+from core.realtime_monitor.config import BULK_MONITOR_CONFIG, MONITOR_CONFIG, MonitorConfig
+from core.realtime_monitor.indicators import TechIndicators
+from core.realtime_monitor.monitor import RealtimeMonitor
+from core.realtime_monitor import service as service_module
+from core.realtime_monitor.service import MonitorService, set_monitor_mode
+
+
+TODAY = date.today()
+
+
+def _history(days, seed, end=TODAY):
+    rng = np.random.default_rng(seed)
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    return pd.DataFrame({
+        'date': pd.bdate_range(end=end - timedelta(days=1), periods=days),
+        'close': close,
+        'volume': rng.integers(1_000, 50_000, days).astype(float),
+    })
+
+
+class _StubDataFeed:
+    def __init__(self, frames):
+        self.frames = frames
+        self.loads = 0
+
+    def load_processed_data(self, code, use_cache=True):
+        self.loads += 1
+        df = self.frames.get(code)
+        return None if df is None else df.copy()
+
+
+class _OfflineFundFlowStore(FundFlowStore):
+    def refresh_if_stale(self, background=True):
+        return False
+
+
+class _StubBulkFetcher(BulkDataFetcher):
+    """行情来自固定表的大容量获取器"""
+
+    def __init__(self, frames, quotes, config=None, store=None):
+        store = store if store is not None else _OfflineFundFlowStore(Path(tempfile.mkdtemp()))
+        super().__init__(config or BULK_MONITOR_CONFIG, fund_flow_store=store,
+                         data_feed=_StubDataFeed(frames))
+        self.quotes = quotes
+        self.quote_calls = 0
+        self.online_history_calls = 0
+
+    def fetch_realtime_quotes_batch(self, codes):
+        self.quote_calls += 1
+        return {code: self.quotes[code] for code in codes if code in self.quotes}
+
+    def fetch_historical_data(self, code, days=100):
+        self.online_history_calls += 1
+        return None
+
+
+def _quote(code, price, volume):
+    return {
+        'code': code, 'name': f"股票{code}", 'current_price': price, 'change_pct': 0.01,
+        'volume': volume, 'turnover': price * volume * 100,
+        'high': price, 'low': price, 'open': price, 'prev_close': price,
+    }
+
+
+def _universe(count, lengths=(120,)):
+    frames = {f"{600000 + i:06d}": _history(lengths[i % len(lengths)], seed=i) for i in range(count)}
+    rng = np.random.default_rng(99)
+    quotes = {
+        code: _quote(code, float(df['close'].iloc[-1] * (1 + rng.normal(0, 0.02))),
+                     float(rng.integers(1_000, 80_000)))
+        for code, df in frames.items()
+    }
+    return frames, quotes
+
+
+class TestIndicatorState:
+    """增量指标"""
+
+    @pytest.mark.parametrize('length', [10, 20, 30, 59, 60, 120])
+    def test_matches_full_recompute(self, length):
+        frames, quotes = _universe(20, lengths=(length,))
+        state = IndicatorState()
+        state.set({
+            code: state.build_row(df['close'].to_numpy(), df['volume'].to_numpy())
+            for code, df in frames.items()
+        })
+        codes = list(frames)
+        prices = np.array([quotes[c]['current_price'] for c in codes])
+        volumes = np.array([quotes[c]['volume'] for c in codes])
+
+        result = state.compute(state.rows(codes), prices, volumes)
+
+        for i, code in enumerate(codes):
+            closes = pd.concat([frames[code]['close'], pd.Series([prices[i]])], ignore_index=True)
+            vols = pd.concat([frames[code]['volume'], pd.Series([volumes[i]])], ignore_index=True)
+            expected = TechIndicators.calculate_all_indicators(closes, vols)
+            for name in ('ma5', 'ma10', 'ma20', 'ma60', 'rsi', 'volume_ratio', 'ma20_slope'):
+                assert result[name][i] == pytest.approx(expected[name], rel=1e-9, abs=1e-9, nan_ok=True), name
+
+    def test_flat_prices_rsi_neutral(self):
+        state = IndicatorState()
+        state.set({'000001': state.build_row(np.full(80, 10.0), np.full(80, 100.0))})
+
+        result = state.compute(state.rows(['000001']), np.array([10.0]), np.array([100.0]))
+
+        assert result['rsi'][0] == 50.0
+        assert result['volume_ratio'][0] == 1.0
+        assert result['ma20_slope'][0] == 0.0
+
+
+class TestBulkDataFetcher:
+    """大容量批量获取"""
+
+    def test_single_quote_call_and_history_loaded_once(self):
+        frames, quotes = _universe(50)
+        fetcher = _StubBulkFetcher(frames, quotes)
+        codes = list(frames)
+
+        first = fetcher.fetch_stock_data_batch(codes)
+        second = fetcher.fetch_stock_data_batch(codes)
+
+        assert len(first) == len(second) == 50
+        assert fetcher.quote_calls == 2
+        assert fetcher.data_feed.loads == 50
+
+        # 新增股票只加载新增部分
+        fetcher.fetch_stock_data_batch(codes[:10] + ['600999'])
+        assert fetcher.data_feed.loads == 51
+        assert len(fetcher.state) == 10  # 移除的股票不再保留状态
+
+    def test_today_bar_in_local_history_ignored(self):
+        frames, quotes = _universe(1)
+        code = next(iter(frames))
+        extra = pd.DataFrame({'date': [pd.Timestamp(TODAY)], 'close': [999.0], 'volume': [1.0]})
+        frames[code] = pd.concat([frames[code], extra], ignore_index=True)
+        fetcher = _StubBulkFetcher(frames, quotes)
+
+        data = fetcher.fetch_stock_data_batch([code])[code]
+
+        assert data.ma5 < 100
+
+    def test_short_history_skipped_and_not_reloaded(self):
+        frames, quotes = _universe(3, lengths=(120, 30, 120))
+        fetcher = _StubBulkFetcher(frames, quotes)
+        codes = list(frames) + ['000002']
+
+        results = fetcher.fetch_stock_data_batch(codes)
+        fetcher.fetch_stock_data_batch(codes)
+
+        assert set(results) == {codes[0], codes[2]}
+        assert fetcher.online_history_calls == 1   # 本地缺失的 000002 只在线尝试一次
+
+    def test_fund_flow_from_market_store(self, tmp_path):
+        frames, quotes = _universe(2)
+        codes = list(frames)
+        store = _OfflineFundFlowStore(tmp_path / 'fund_flow')
+        store.update(pd.DataFrame({
+            'code': codes, 'name': ['a', 'b'],
+            'main_net_inflow': [3e7, -1e7], 'main_net_inflow_pct': [5.0, -2.0],
+        }), TODAY)
+        fetcher = _StubBulkFetcher(frames, quotes, store=store)
+
+        results = fetcher.fetch_stock_data_batch(codes)
+
+        assert results[codes[0]].main_fund_flow == 3000.0  # 万元
+        assert results[codes[1]].main_fund_flow == -1000.0
+
+    def test_500_codes_refresh_latency_and_memory(self):
+        frames, quotes = _universe(500)
+        fetcher = _StubBulkFetcher(frames, quotes)
+        codes = list(frames)
+        fetcher.fetch_stock_data_batch(codes)   # 构建状态
+
+        start = time.perf_counter()
+        results = fetcher.fetch_stock_data_batch(codes)
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 500
+        assert elapsed < 0.5, f"500 只股票刷新耗时 {elapsed:.3f}s"
+        memory = fetcher.memory_usage()
+        assert memory['codes'] == 500
+        assert memory['bytes_per_code'] < 1024
+
+
+class TestBulkMode:
+    """大容量监控配置"""
+
+    def test_watchlist_capacity(self):
+        monitor = RealtimeMonitor(BULK_MONITOR_CONFIG)
+
+        added = sum(monitor.add_to_watchlist(f"{600000 + i:06d}") for i in range(520))
+
+        assert added == 500
+
+    def test_service_uses_bulk_fetcher(self):
+        service = MonitorService(MonitorConfig(max_watchlist_size=500, bulk_mode=True))
+
+        assert isinstance(service.data_fetcher, BulkDataFetcher)
+
+    def test_switch_mode_keeps_watchlist(self, monkeypatch):
+        monkeypatch.setattr(service_module, '_monitor_service', MonitorService(MonitorConfig()))
+        normal = service_module.get_monitor_service()
+        normal.add_to_watchlist('600519')
+        events = []
+        normal.add_listener(events.append)
+
+        bulk = set_monitor_mode(True)
+
+        assert bulk is service_module.get_monitor_service() and bulk is not normal
+        assert isinstance(bulk.data_fetcher, BulkDataFetcher)
+        assert bulk.monitor.watchlist == ['600519']
+        assert sum(bulk.add_to_watchlist(f"{600000 + i:06d}") for i in range(30)) == 30
+        assert bulk._listeners == [events.append]
+        assert set_monitor_mode(True) is bulk
+
+        restored = set_monitor_mode(False)
+        assert not isinstance(restored.data_fetcher, BulkDataFetcher)
+        assert '600519' in restored.monitor.watchlist
+
+    def test_switch_back_to_normal_truncates_watchlist(self, monkeypatch):
+        monkeypatch.setattr(service_module, '_monitor_service', MonitorService(MonitorConfig()))
+        bulk = set_monitor_mode(True)
+        codes = [f"{600000 + i:06d}" for i in range(30)]
+        for code in codes:
+            assert bulk.add_to_watchlist(code)
+
+        normal = set_monitor_mode(False)
+
+        limit = MONITOR_CONFIG.max_watchlist_size
+        assert normal.monitor.watchlist == codes[:limit]
+        assert not normal.add_to_watchlist('000001')
@@ -0,0 +1,128 @@
+"""
+实时监控 TTL + LRU 缓存测试
+
+测试 DataCache：
+- 超出上限时淘汰最久未使用的条目
+- 读取时惰性过期与后台过期清理
+- 淘汰数、过期数与命中率统计
+- DataFetcher 按命名空间设置容量
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.realtime_monitor.data_fetcher import CACHE_CONFIG, CacheConfig, DataCache, DataFetcher
+
+
+NO_SWEEP = CacheConfig(sweep_interval=0)
+
+
+class TestLruEviction:
+    """LRU 淘汰"""
+
+    def test_evicts_least_recently_used(self):
+        cache = DataCache(NO_SWEEP, max_entries=3)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key)
+
+        cache.get('a')          # a 变为最近使用
+        cache.set('d', 'd')     # 淘汰 b
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 'a'
+        assert len(cache) == 3
+        assert cache.stats['evictions'] == 1
+
+    def test_overwrite_does_not_evict(self):
+        cache = DataCache(NO_SWEEP, max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('a', 3)
+
+        assert cache.get('a') == 3
+        assert cache.get('b') == 2
+        assert cache.stats['evictions'] == 0
+
+    def test_set_cost_independent_of_size(self):
+        small = DataCache(NO_SWEEP, max_entries=100)
+        large = DataCache(NO_SWEEP, max_entries=100_000)
+        for i in range(100_000):
+            large.set(f"k{i}", i)
+
+        def time_sets(cache):
+            start = time.perf_counter()
+            for i in range(2000):
+                cache.set(f"new{i}", i)
+            return time.perf_counter() - start
+
+        # 满容量时每次写入都会淘汰，耗时不随容量线性增长
+        assert time_sets(large) < time_sets(small) * 5 + 0.05
+
+
+class TestExpiry:
+    """过期"""
+
+    def test_lazy_expiry_on_read(self):
+        cache = DataCache(NO_SWEEP)
+        cache.set('a', 1, ttl=10)
+
+        with patch('core.realtime_monitor.data_fetcher.monotonic', return_value=time.monotonic() + 11):
+            assert cache.get('a') is None
+
+        stats = cache.stats
+        assert stats['expirations'] == 1
+        assert stats['miss_count'] == 1
+
+    def test_sweep_removes_expired_entries(self):
+        cache = DataCache(NO_SWEEP)
+        cache.set('short', 1, ttl=1)
+        cache.set('long', 2, ttl=100)
+
+        with patch('core.realtime_monitor.data_fetcher.monotonic', return_value=time.monotonic() + 2):
+            assert cache.sweep() == 1
+
+        assert len(cache) == 1
+        assert cache.get('long') == 2
+
+    def test_background_sweep(self):
+        cache = DataCache(CacheConfig(sweep_interval=0.05))
+        cache.set('a', 1, ttl=0.01)
+
+        deadline = time.monotonic() + 2
+        while len(cache) and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert len(cache) == 0
+        assert cache.stats['expirations'] == 1
+
+
+class TestNamespaces:
+    """命名空间容量与统计"""
+
+    def test_data_fetcher_namespace_limits(self):
+        fetcher = DataFetcher()
+
+        assert fetcher._realtime_cache.max_entries == CACHE_CONFIG.realtime_max_entries
+        assert fetcher._historical_cache.max_entries == CACHE_CONFIG.historical_max_entries
+        assert fetcher._fund_flow_cache_obj.max_entries == CACHE_CONFIG.fund_flow_max_entries
+        assert fetcher._historical_cache.default_ttl == CACHE_CONFIG.historical_cache_ttl
+
+    def test_cache_stats_report_evictions_and_hit_rate(self):
+        fetcher = DataFetcher()
+        fetcher._historical_cache.max_entries = 2
+        for i in range(5):
+            fetcher._historical_cache.set(f"hist_{i}", i)
+        fetcher._historical_cache.get('hist_4')
+        fetcher._historical_cache.get('hist_0')
+
+        stats = fetcher.cache_stats['historical']
+
+        assert stats['evictions'] == 3
+        assert stats['hit_rate'] == pytest.approx(0.5)
+        assert fetcher.cache_stats['realtime']['evictions'] == 0
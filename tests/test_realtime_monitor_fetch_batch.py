@@ -0,0 +1,196 @@
+"""
+实时监控并发批量获取测试
+
+测试 DataFetcher.fetch_stock_data_batch：
+- 行情来自共享批量快照
+- 历史数据与资金流向有界并发获取
+- 单次调用超时后返回部分结果
+- cache_stats 记录分阶段耗时
+"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.fund_flow import FundFlowStore
+from core.realtime_monitor.config import MonitorConfig
+from core.realtime_monitor.data_fetcher import DataFetcher, FundFlowData
+
+
+def _history(days=80, start=10.0):
+    close = start + np.arange(days) * 0.05
+    return pd.DataFrame({
+        'date': pd.date_range('2026-01-02', periods=days, freq='B'),
+        'close': close,
+        'volume': np.full(days, 1_000_000.0),
+    })
+
+
+def _quote(code, price):
+    return {
+        'code': code, 'name': f"股票{code}", 'current_price': price, 'change_pct': 0.01,
+        'volume': 1000, 'turnover': 1e6, 'high': price, 'low': price, 'open': price, 'prev_close': price,
+    }
+
+
+class _OfflineFundFlowStore(FundFlowStore):
+    """空的资金流向库，不发起网络刷新"""
+
+    def refresh_if_stale(self, background=True):
+        return False
+
+
+class _SlowFetcher(DataFetcher):
+    """以固定延迟模拟网络调用的 DataFetcher"""
+
+    def __init__(self, config, delays=None, price=12.0):
+        super().__init__(config, fund_flow_store=_OfflineFundFlowStore(Path(tempfile.mkdtemp())))
+        self.delays = delays or {}
+        self.price = price
+        self.quote_calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._active_lock = threading.Lock()
+
+    def fetch_realtime_quotes_batch(self, codes):
+        self.quote_calls += 1
+        return {code: _quote(code, self.price) for code in codes}
+
+    def _simulate(self, key):
+        with self._active_lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delays.get(key, 0.05))
+        finally:
+            with self._active_lock:
+                self.active -= 1
+
+    def fetch_historical_data(self, code, days=100):
+        self._simulate(('historical', code))
+        return _history()
+
+    def fetch_fund_flow(self, code):
+        self._simulate(('fund_flow', code))
+        return FundFlowData(code=code, name='', main_net_inflow=100.0, main_net_inflow_5d=500.0)
+
+
+CODES = [f"{600000 + i:06d}" for i in range(20)]
+
+
+class TestConcurrentBatch:
+    """并发批量获取"""
+
+    def test_fetches_concurrently_with_bounded_workers(self):
+        fetcher = _SlowFetcher(MonitorConfig(fetch_max_workers=8))
+
+        start = time.perf_counter()
+        results = fetcher.fetch_stock_data_batch(CODES)
+        elapsed = time.perf_counter() - start
+
+        # 串行需要 20 × 2 × 0.05 = 2 秒
+        assert len(results) == 20
+        assert elapsed < 1.0
+        assert fetcher.quote_calls == 1
+        assert 1 < fetcher.max_active <= 8
+
+    def test_matches_serial_assembly(self):
+        fetcher = _SlowFetcher(MonitorConfig())
+
+        batch = fetcher.fetch_stock_data_batch(CODES[:3])
+        serial = fetcher._build_stock_data(
+            CODES[0], _quote(CODES[0], 12.0), _history(), fetcher.fetch_fund_flow(CODES[0])
+        )
+
+        assert batch[CODES[0]].ma20 == serial.ma20
+        assert batch[CODES[0]].rsi == serial.rsi
+        assert batch[CODES[0]].main_fund_flow == 100.0
+
+    def test_timeout_returns_partial_results(self):
+        config = MonitorConfig(fetch_max_workers=8, fetch_call_timeout=0.3)
+        fetcher = _SlowFetcher(config)
+        previous = fetcher.fetch_stock_data_batch(CODES[:2])
+
+        # 第二次刷新：一只股票历史数据超时，另一只资金流向超时
+        fetcher.delays = {('historical', CODES[0]): 2.0, ('fund_flow', CODES[1]): 2.0}
+        fetcher.price = 13.0
+        fetcher._fund_flow_cache[CODES[1]] = FundFlowData(
+            code=CODES[1], name='', main_net_inflow=-50.0, main_net_inflow_5d=-80.0
+        )
+
+        start = time.perf_counter()
+        results = fetcher.fetch_stock_data_batch(CODES[:2])
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.5
+        # 历史数据超时：沿用上次指标，行情更新
+        assert results[CODES[0]].current_price == 13.0
+        assert results[CODES[0]].ma20 == previous[CODES[0]].ma20
+        # 资金流向超时：沿用上次资金流向
+        assert results[CODES[1]].main_fund_flow == -50.0
+
+        stats = fetcher.cache_stats
+        assert stats['historical']['latency']['timeouts'] == 1
+        assert stats['fund_flow']['latency']['timeouts'] == 1
+
+    def test_timeout_without_previous_data_skips_code(self):
+        config = MonitorConfig(fetch_call_timeout=0.2)
+        fetcher = _SlowFetcher(config, delays={('historical', CODES[0]): 1.0})
+
+        results = fetcher.fetch_stock_data_batch(CODES[:2])
+
+        assert CODES[0] not in results
+        assert CODES[1] in results
+
+    def test_stage_latency_in_cache_stats(self):
+        fetcher = _SlowFetcher(MonitorConfig())
+        fetcher.fetch_stock_data_batch(CODES[:4])
+
+        stats = fetcher.cache_stats
+
+        assert stats['historical']['latency']['count'] == 4
+        assert stats['fund_flow']['latency']['count'] == 4
+        assert stats['historical']['latency']['avg_ms'] >= 40
+        assert stats['realtime']['latency']['count'] == 1
+        assert stats['realtime']['batch_latency']['count'] == 1
+
+        fetcher.clear_cache()
+        assert fetcher.cache_stats['historical']['latency']['count'] == 0
+
+
+class TestQuoteSnapshot:
+    """共享批量行情快照"""
+
+    def test_single_snapshot_indexed_by_code(self):
+        spot = pd.DataFrame({
+            '代码': ['000001', '600000', '300750'],
+            '名称': ['平安银行', '浦发银行', '宁德时代'],
+            '最新价': [10.0, 8.0, 200.0],
+            '涨跌幅': [1.0, -2.0, 3.0],
+            '成交量': [100, 200, 300],
+            '成交额': [1e6, 2e6, 3e6],
+            '最高': [10.5, 8.2, 205.0],
+            '最低': [9.8, 7.9, 195.0],
+            '开盘': [9.9, 8.1, 198.0],
+            '昨收': [9.9, 8.16, 194.0],
+        })
+        fetcher = DataFetcher()
+
+        with patch('akshare.stock_zh_a_spot_em', return_value=spot) as mock_spot:
+            first = fetcher.fetch_realtime_quotes_batch(['300750', '999999'])
+            second = fetcher.fetch_realtime_quotes_batch(['600000'])
+
+        assert mock_spot.call_count == 1
+        assert first['300750']['current_price'] == 200.0
+        assert '999999' not in first
+        assert second['600000']['change_pct'] == pytest.approx(-0.02)
@@ -5,6 +5,8 @@ Realtime Monitor Indicators Tests
 Requirements: 8.1
 """
 
+import warnings
+
 import pytest
 import pandas as pd
 import numpy as np
@@ -309,3 +311,91 @@ class TestEdgeCases:
         ma_series = TechIndicators.calculate_ma(constant_prices, 5)
         slope = TechIndicators.calculate_ma_slope(ma_series, 5)
         assert abs(slope) < 0.0001
+
+
+def _pandas_indicators(prices: pd.Series, volumes: pd.Series) -> dict:
+    """逐项调用 pandas 版指标函数（批量计算的参照口径）"""
+    p = V114G_STRATEGY_PARAMS
+    return {
+        'ma5': TechIndicators.calculate_ma_value(prices, p.MA5_PERIOD),
+        'ma10': TechIndicators.calculate_ma_value(prices, p.MA10_PERIOD),
+        'ma20': TechIndicators.calculate_ma_value(prices, p.MA20_PERIOD),
+        'ma60': TechIndicators.calculate_ma_value(prices, p.MA60_PERIOD),
+        'rsi': TechIndicators.calculate_rsi_value(prices, p.RSI_PERIOD),
+        'volume_ratio': TechIndicators.calculate_volume_ratio(volumes, p.VOLUME_RATIO_PERIOD),
+        'ma20_slope': TechIndicators.calculate_ma_slope_from_prices(prices, p.MA20_PERIOD, p.MA_SLOPE_PERIOD),
+        'current_price': prices.iloc[-1] if len(prices) > 0 else np.nan,
+    }
+
+
+class TestCalculateBatch:
+    """批量指标计算测试"""
+    
+    @staticmethod
+    def _series(n, seed):
+        rng = np.random.default_rng(seed)
+        prices = pd.Series(10 * np.exp(np.cumsum(rng.normal(0, 0.02, n))))
+        volumes = pd.Series(rng.uniform(5e5, 2e6, n))
+        return prices, volumes
+    
+    def test_matches_pandas_per_code(self):
+        """批量结果与逐只 pandas 计算一致（含数据不足的股票）"""
+        lengths = [0, 1, 3, 6, 15, 19, 24, 25, 59, 60, 61, 100, 250]
+        series = [self._series(n, seed) for seed, n in enumerate(lengths)]
+        # 价格不变（RSI 无涨跌）、只涨不跌、成交量为 0
+        series.append((pd.Series([10.0] * 30), pd.Series([1e6] * 30)))
+        series.append((pd.Series(np.linspace(10, 20, 70)), pd.Series([0.0] * 70)))
+        
+        closes, close_lengths = TechIndicators.pad_rows([s[0] for s in series])
+        volumes, volume_lengths = TechIndicators.pad_rows([s[1] for s in series])
+        batch = TechIndicators.calculate_batch(closes, volumes)
+        
+        for i, (prices, vols) in enumerate(series):
+            expected = _pandas_indicators(prices, vols)
+            for name, value in expected.items():
+                assert batch[name][i] == pytest.approx(value, rel=1e-9, abs=1e-9, nan_ok=True), (i, name)
+    
+    def test_interior_nan_matches_pandas(self):
+        """序列中间的缺失值按 pandas 口径处理"""
+        prices, volumes = self._series(80, seed=7)
+        prices.iloc[[70, 76]] = np.nan
+        volumes.iloc[77] = np.nan
+        
+        result = TechIndicators.calculate_all_indicators(prices, volumes)
+        expected = _pandas_indicators(prices, volumes)
+        
+        for name, value in expected.items():
+            assert result[name] == pytest.approx(value, rel=1e-9, nan_ok=True), name
+    
+    def test_lookback_window_is_sufficient(self):
+        """只保留 lookback 天的数据不改变结果"""
+        series = [self._series(n, seed) for seed, n in enumerate([40, 90, 300])]
+        width = TechIndicators.lookback()
+        
+        full = TechIndicators.calculate_batch(*[TechIndicators.pad_rows(x)[0] for x in zip(*series)])
+        closes, lengths = TechIndicators.pad_rows([s[0] for s in series], width)
+        volumes, volume_lengths = TechIndicators.pad_rows([s[1] for s in series], width)
+        trimmed = TechIndicators.calculate_batch(closes, volumes, lengths=lengths, volume_lengths=volume_lengths)
+        
+        assert closes.shape == (3, width)
+        for name in full:
+            np.testing.assert_allclose(trimmed[name], full[name], rtol=1e-12)
+    
+    def test_short_windows_emit_no_warnings(self):
+        """回看窗口为空或过短时按数据不足处理，不产生 RuntimeWarning"""
+        for width in (0, 1, 2):
+            for rows in (0, 3):
+                with warnings.catch_warnings():
+                    warnings.simplefilter('error')
+                    batch = TechIndicators.calculate_batch(np.full((rows, width), 10.0), np.full((rows, width), 1e6))
+                assert batch['rsi'].tolist() == [50.0] * rows
+                assert np.isnan(batch['ma5']).all() == (width < 5)
+                assert batch['ma20_slope'].tolist() == [0.0] * rows
+    
+    def test_scalar_wrapper_returns_floats(self):
+        """calculate_all_indicators 返回 Python float"""
+        prices, volumes = self._series(70, seed=1)
+        
+        indicators = TechIndicators.calculate_all_indicators(prices, volumes)
+        
+        assert all(type(value) is float for value in indicators.values())
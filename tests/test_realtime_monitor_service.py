@@ -0,0 +1,188 @@
+"""
+实时监控后台刷新服务测试
+
+测试 MonitorService：
+- 读取快照不触发数据获取，获取次数与读者数量无关
+- 仅在交易时间内按间隔刷新
+- 快照不可变，持仓为副本
+- 监控列表/持仓修改后立即刷新
+"""
+
+import threading
+import time
+from datetime import date
+from types import MappingProxyType
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.realtime_monitor.config import MonitorConfig
+from core.realtime_monitor.models import StockData
+from core.realtime_monitor.service import MonitorService, MonitorSnapshot
+
+
+def _stock_data(code, price=10.0):
+    return StockData(
+        code=code, name=f"股票{code}", current_price=price, change_pct=0.01,
+        volume=1000, turnover=1e6,
+        ma5=9.9, ma10=9.8, ma20=9.5, ma60=9.0, rsi=55.0, volume_ratio=1.5,
+        ma20_slope=0.01, main_fund_flow=100.0, fund_flow_5d=500.0,
+    )
+
+
+class _StubFetcher:
+    """记录调用次数的数据获取器"""
+
+    def __init__(self, trading=True, price=10.0):
+        self.trading = trading
+        self.price = price
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def is_trading_time(self, check_time=None):
+        return self.trading
+
+    def fetch_stock_data_batch(self, codes):
+        with self._lock:
+            self.calls += 1
+        return {code: _stock_data(code, self.price) for code in codes}
+
+
+def _make_service(trading=True, refresh_interval=1):
+    fetcher = _StubFetcher(trading=trading)
+    service = MonitorService(MonitorConfig(refresh_interval=refresh_interval), data_fetcher=fetcher)
+    return service, fetcher
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+class TestRefresh:
+    """刷新与快照发布"""
+
+    def test_refresh_publishes_snapshot(self):
+        service, fetcher = _make_service()
+        service.monitor.add_to_watchlist('600000')
+        service.monitor.add_position('000001', '平安银行', cost_price=10.0, quantity=100,
+                                     buy_date=date.today())
+
+        snapshot = service.refresh_now()
+
+        assert service.get_snapshot() is snapshot
+        assert snapshot.version == 1
+        assert fetcher.calls == 1
+        assert set(snapshot.stock_data) == {'600000', '000001'}
+        assert snapshot.watchlist == ('600000', '000001')  # 添加持仓自动加入监控列表
+        assert {s.code for s in snapshot.buy_signals} == {'600000', '000001'}
+        assert snapshot.positions['000001'].current_price == 10.0
+        assert snapshot.position_summary['position_count'] == 1
+
+    def test_many_readers_do_not_fetch(self):
+        service, fetcher = _make_service()
+        service.monitor.add_to_watchlist('600000')
+        service.refresh_now()
+
+        def read():
+            for _ in range(200):
+                service.get_snapshot().stock_data.get('600000')
+
+        readers = [threading.Thread(target=read) for _ in range(16)]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+
+        assert fetcher.calls == 1
+
+    def test_fetch_failure_keeps_previous_data(self):
+        service, fetcher = _make_service()
+        service.monitor.add_to_watchlist('600000')
+        service.refresh_now()
+
+        fetcher.fetch_stock_data_batch = lambda codes: (_ for _ in ()).throw(RuntimeError('网络错误'))
+        snapshot = service.refresh_now()
+
+        assert snapshot.error == '网络错误'
+        assert '600000' in snapshot.stock_data
+
+
+class TestSnapshotImmutability:
+    """快照不可变"""
+
+    def test_snapshot_frozen_and_read_only(self):
+        service, _ = _make_service()
+        service.monitor.add_to_watchlist('600000')
+        service.monitor.add_position('000001', '平安银行', 10.0, 100, date.today())
+        snapshot = service.refresh_now()
+
+        assert isinstance(snapshot.stock_data, MappingProxyType)
+        with pytest.raises(TypeError):
+            snapshot.stock_data['999999'] = None
+        with pytest.raises(AttributeError):
+            snapshot.version = 99
+
+        # 快照中的持仓是副本
+        snapshot.positions['000001'].current_price = 1.0
+        assert service.monitor.get_position('000001').current_price == 10.0
+
+    def test_empty_snapshot_before_first_refresh(self):
+        service, _ = _make_service()
+
+        snapshot = service.get_snapshot()
+
+        assert isinstance(snapshot, MonitorSnapshot)
+        assert snapshot.version == 0
+        assert snapshot.refreshed_at is None
+        assert snapshot.position_summary['total_pnl_pct'] == 0.0
+
+
+class TestBackgroundLoop:
+    """后台刷新线程"""
+
+    def test_refreshes_on_interval_during_trading(self):
+        service, fetcher = _make_service(trading=True, refresh_interval=0.1)
+        service.monitor.add_to_watchlist('600000')
+
+        assert service.start()
+        assert not service.start()
+        try:
+            assert _wait_for(lambda: fetcher.calls >= 3)
+        finally:
+            service.stop()
+
+        assert not service.is_running
+        assert service.get_snapshot().version == fetcher.calls
+
+    def test_no_periodic_refresh_outside_trading(self):
+        service, fetcher = _make_service(trading=False, refresh_interval=0.05)
+        service.monitor.add_to_watchlist('600000')
+
+        service.start()
+        try:
+            # 启动时发布一次初始快照，之后不再刷新
+            assert _wait_for(lambda: service.get_snapshot().version == 1)
+            time.sleep(0.3)
+            assert fetcher.calls == 1
+        finally:
+            service.stop()
+
+    def test_watchlist_change_triggers_refresh(self):
+        service, fetcher = _make_service(trading=False)
+
+        service.start()
+        try:
+            assert _wait_for(lambda: service.get_snapshot().version == 1)
+            assert service.add_to_watchlist('600000')
+            assert _wait_for(lambda: '600000' in service.get_snapshot().stock_data)
+            assert not service.add_to_watchlist('600000')
+        finally:
+            service.stop()
@@ -0,0 +1,302 @@
+"""
+实时监控行情录制与回放测试
+
+测试：
+- 录制文件格式往返一致，尾块不完整时忽略
+- DataFetcher 挂载 TickRecorder 后录制行情、历史数据与资金流向
+- ReplayDriver 回放结果确定（两次回放产生相同信号事件）
+- 按倍速回放时遵循录制节奏
+- TechSignalGenerator 按录制时刻与合成日K回放
+"""
+
+import time
+from datetime import date, datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.realtime_monitor.data_fetcher import DataFetcher, FundFlowData
+from core.realtime_monitor.monitor import RealtimeMonitor
+from core.realtime_monitor.replay import ReplayDataFetcher, ReplayDriver, TechReplayContext
+from core.realtime_monitor.tick_recorder import (
+    KIND_FUND_FLOW, KIND_HISTORY, KIND_QUOTES, TickRecorder, read_ticks,
+)
+from config.tech_stock_config import get_stock_sector
+from core.tech_stock.hard_filter import HardFilterResult
+from core.tech_stock.market_filter import MarketStatus as TechMarketStatus
+from core.tech_stock.sector_ranker import SectorRank
+from core.tech_stock.signal_generator import TechSignalGenerator
+
+
+SESSION_START = datetime(2026, 3, 2, 9, 30).timestamp()
+CODES = ['600000', '000001', '300750']
+
+
+def _history(days=80, start=10.0, seed=0):
+    rng = np.random.default_rng(seed)
+    close = start * np.exp(np.cumsum(rng.normal(0.002, 0.02, days)))
+    return pd.DataFrame({
+        'date': pd.date_range('2025-11-03', periods=days, freq='B'),
+        'open': close,
+        'close': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'volume': rng.integers(500_000, 2_000_000, days).astype(float),
+    })
+
+
+def _quote(code, price, volume=1_000_000):
+    return {
+        'code': code, 'name': f"股票{code}", 'current_price': price, 'change_pct': 0.01,
+        'volume': volume, 'turnover': price * volume, 'high': price, 'low': price,
+        'open': price, 'prev_close': price,
+    }
+
+
+def _flow(code, inflow):
+    return FundFlowData(code=code, name=f"股票{code}", main_net_inflow=inflow,
+                        main_net_inflow_5d=inflow * 3, updated_at=datetime.now())
+
+
+def _record_session(path, ticks=20, interval=3.0):
+    """录制一个合成交易时段：价格逐步下跌后反弹"""
+    histories = {code: _history(seed=i) for i, code in enumerate(CODES)}
+    with TickRecorder(path) as recorder:
+        for code, df in histories.items():
+            recorder.record_history(code, df, timestamp=SESSION_START)
+        for i in range(ticks):
+            ts = SESSION_START + i * interval
+            drift = 1 - 0.01 * i if i < ticks // 2 else 0.9 + 0.01 * i
+            quotes = {
+                code: _quote(code, round(float(df['close'].iloc[-1]) * drift, 2), 1_000_000 + i * 50_000)
+                for code, df in histories.items()
+            }
+            recorder.record_quotes(quotes, timestamp=ts)
+            recorder.record_fund_flows({code: _flow(code, 100.0 * (i // 5)) for code in CODES}, timestamp=ts)
+    return histories
+
+
+def _monitor(histories):
+    monitor = RealtimeMonitor()
+    for code in CODES:
+        monitor.add_to_watchlist(code)
+    code = CODES[0]
+    monitor.add_position(code, f"股票{code}", float(histories[code]['close'].iloc[-1]) * 1.02, 1000,
+                         buy_date=date(2026, 2, 20))
+    return monitor
+
+
+class TestTickFile:
+    """录制文件格式"""
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / 'session.ticks'
+        histories = _record_session(path, ticks=6)
+
+        chunks = list(read_ticks(path))
+        kinds = [c.kind for c in chunks]
+
+        assert kinds.count(KIND_HISTORY) == len(CODES)
+        assert kinds.count(KIND_QUOTES) == 6
+        # 资金流向每 5 个节拍变化一次，未变化时不写入
+        assert kinds.count(KIND_FUND_FLOW) == 2
+
+        history = next(c for c in chunks if c.kind == KIND_HISTORY and c.code == '000001')
+        df = history.to_frame()
+        pd.testing.assert_series_equal(df['close'], histories['000001']['close'])
+        assert df['date'].iloc[-1] == histories['000001']['date'].iloc[-1]
+
+        quotes = next(c for c in chunks if c.kind == KIND_QUOTES)
+        assert quotes.recorded_at == datetime.fromtimestamp(SESSION_START)
+        assert [row['code'] for row in quotes.rows()] == CODES
+        assert quotes.rows()[0]['volume'] == 1_000_000
+
+    def test_truncated_tail_ignored(self, tmp_path):
+        path = tmp_path / 'session.ticks'
+        _record_session(path, ticks=4)
+        complete = len(list(read_ticks(path)))
+
+        data = path.read_bytes()
+        path.write_bytes(data[:-5])
+
+        assert len(list(read_ticks(path))) == complete - 1
+
+    def test_appends_across_recorders(self, tmp_path):
+        path = tmp_path / 'session.ticks'
+        for i in range(2):
+            with TickRecorder(path) as recorder:
+                recorder.record_quotes({'600000': _quote('600000', 10.0 + i)}, timestamp=SESSION_START + i)
+
+        prices = [c.rows()[0]['current_price'] for c in read_ticks(path)]
+        assert prices == [10.0, 11.0]
+
+
+class TestFetcherRecording:
+    """DataFetcher 录制挂钩"""
+
+    def test_records_quotes_history_and_fund_flow(self, tmp_path):
+        spot = pd.DataFrame({
+            '代码': ['600000', '000001'], '名称': ['浦发银行', '平安银行'],
+            '最新价': [10.5, 12.0], '涨跌幅': [1.0, -2.0], '成交量': [1000, 2000],
+            '成交额': [1e6, 2e6], '最高': [10.6, 12.1], '最低': [10.4, 11.9],
+            '开盘': [10.4, 12.0], '昨收': [10.4, 12.2],
+        })
+        hist = _history().rename(columns={
+            'date': '日期', 'open': '开盘', 'close': '收盘', 'high': '最高', 'low': '最低', 'volume': '成交量',
+        })
+        fetcher = DataFetcher()
+        fetcher.recorder = TickRecorder(tmp_path / 'live.ticks')
+
+        with patch('akshare.stock_zh_a_spot_em', return_value=spot), \
+                patch('akshare.stock_zh_a_hist', return_value=hist), \
+                patch.object(DataFetcher, '_fund_flows_from_store',
+                             lambda self, codes: {c: _flow(c, 50.0) for c in codes}):
+            first = fetcher.fetch_stock_data_batch(['600000', '000001'])
+        fetcher.recorder.close()
+
+        chunks = list(read_ticks(tmp_path / 'live.ticks'))
+        assert [c.kind for c in chunks].count(KIND_QUOTES) == 1
+        assert sorted(c.code for c in chunks if c.kind == KIND_HISTORY) == ['000001', '600000']
+        flows = next(c for c in chunks if c.kind == KIND_FUND_FLOW)
+        assert sorted(flows.columns['code']) == ['000001', '600000']
+
+        # 回放数据获取器复现相同的股票数据
+        replay = ReplayDataFetcher()
+        for chunk in chunks:
+            replay.apply(chunk)
+        replayed = replay.fetch_stock_data_batch(['600000', '000001'])
+
+        for code, data in first.items():
+            assert replayed[code].current_price == data.current_price
+            assert replayed[code].ma20 == pytest.approx(data.ma20)
+            assert replayed[code].rsi == pytest.approx(data.rsi)
+            assert replayed[code].main_fund_flow == data.main_fund_flow
+
+
+class TestReplayDriver:
+    """回放驱动"""
+
+    def test_replay_is_deterministic(self, tmp_path):
+        path = tmp_path / 'session.ticks'
+        histories = _record_session(path)
+
+        seen = []
+        first = ReplayDriver(path, monitor=_monitor(histories)).run(on_tick=seen.append)
+        second = ReplayDriver(path, monitor=_monitor(histories)).run()
+
+        assert first.ticks == second.ticks == 20
+        assert first.sell_signals > 0
+        assert first.events
+        assert first.events == second.events
+        assert (first.buy_signals, first.sell_signals) == (second.buy_signals, second.sell_signals)
+        assert seen[0].recorded_at == datetime.fromtimestamp(SESSION_START)
+        assert set(seen[0].stock_data) == set(CODES)
+        assert first.latency['tick']['count'] == 20
+        assert first.recorded_seconds == pytest.approx(57.0)
+
+    def test_market_status_follows_recorded_clock(self, tmp_path):
+        path = tmp_path / 'session.ticks'
+        _record_session(path, ticks=2)
+        driver = ReplayDriver(path)
+        driver.run()
+
+        assert driver.fetcher.clock == datetime.fromtimestamp(SESSION_START + 3.0)
+        assert driver.fetcher.is_trading_time(driver.fetcher.clock)
+
+    def test_speed_paces_replay(self, tmp_path):
+        path = tmp_path / 'session.ticks'
+        _record_session(path, ticks=5, interval=1.0)
+
+        start = time.perf_counter()
+        report = ReplayDriver(path, speed=20.0).run()
+        elapsed = time.perf_counter() - start
+
+        # 录制跨度 4 秒，20 倍速约 0.2 秒
+        assert report.ticks == 5
+        assert elapsed >= 0.2
+
+    def test_invalid_speed(self, tmp_path):
+        with pytest.raises(ValueError):
+            ReplayDriver(tmp_path / 'missing.ticks', speed=0)
+
+
+class _OfflineTechSignalGenerator(TechSignalGenerator):
+    """不查询基本面、记录每次调用输入的科技股信号生成器"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def _check_fundamental_condition(self, code):
+        return True, True, False
+
+    def generate_signals(self, *args, **kwargs):
+        self.calls.append((kwargs['current_time'], kwargs['stock_data']))
+        return super().generate_signals(*args, **kwargs)
+
+
+class TestTechSignalReplay:
+    """科技股信号回放"""
+
+    TECH_CODES = ['002371', '300308']
+
+    def _context(self, generator):
+        return TechReplayContext(
+            generator=generator,
+            market_status=TechMarketStatus(
+                is_green=True, gem_close=2000.0, gem_ma20=1900.0, macd_status='golden_cross',
+                check_date=date(2026, 3, 2), reason='绿灯',
+            ),
+            sector_rankings=[
+                SectorRank(sector_name=get_stock_sector(code), index_code='', return_20d=5.0,
+                           rank=i + 1, is_tradable=True, data_source='index')
+                for i, code in enumerate(self.TECH_CODES)
+            ],
+            hard_filter_results=[
+                HardFilterResult(code=code, name=f"股票{code}", passed=True, price=50.0,
+                                 market_cap=200.0, avg_turnover=5.0)
+                for code in self.TECH_CODES
+            ],
+        )
+
+    def _record(self, path, ticks=6):
+        histories = {code: _history(seed=10 + i) for i, code in enumerate(self.TECH_CODES)}
+        with TickRecorder(path) as recorder:
+            for code, df in histories.items():
+                recorder.record_history(code, df, timestamp=SESSION_START)
+            for i in range(ticks):
+                quotes = {code: _quote(code, round(float(df['close'].iloc[-1]) * (1 + 0.01 * i), 2))
+                          for code, df in histories.items()}
+                recorder.record_quotes(quotes, timestamp=SESSION_START + i * 60)
+        return histories
+
+    def test_generator_sees_recorded_clock_and_intraday_bar(self, tmp_path):
+        path = tmp_path / 'session.ticks'
+        histories = self._record(path)
+        generator = _OfflineTechSignalGenerator()
+        monitor = RealtimeMonitor()
+        for code in self.TECH_CODES:
+            monitor.add_to_watchlist(code)
+
+        ticks = []
+        report = ReplayDriver(path, monitor=monitor, tech_context=self._context(generator)).run(on_tick=ticks.append)
+
+        assert len(generator.calls) == report.ticks == 6
+        assert report.latency['tech']['count'] == 6
+        assert report.tech_signals == sum(len(tick.tech_signals) for tick in ticks)
+        for tick, (current_time, frames) in zip(ticks, generator.calls):
+            assert current_time == tick.recorded_at
+            for code in self.TECH_CODES:
+                df = frames[code]
+                assert len(df) == len(histories[code]) + 1
+                assert df['date'].iloc[-1] == pd.Timestamp(tick.recorded_at.date())
+                assert df['close'].iloc[-1] == tick.stock_data[code].current_price
+
+        rerun = ReplayDriver(path, monitor=monitor, tech_context=self._context(_OfflineTechSignalGenerator())).run()
+        assert rerun.tech_signals == report.tech_signals
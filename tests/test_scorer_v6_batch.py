@@ -0,0 +1,243 @@
+"""
+ScorerV6 批量评分测试
+
+测试：
+- score_batch 与逐只 score_stock 的总分、各维度详情、风险标记一致（固定截面）
+- 覆盖各维度的全部评分分支与数据无效的情况
+- 资金净流入缺省时从资金流向库批量读取
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.fund_flow import FundFlowStore
+from core.overnight_picker.scorer_v6 import BatchScoreResult, ScorerV6
+
+
+HOT_TOPICS = ['人工智能', '机器人', '低空经济', '固态电池', '创新药']
+
+
+class _OfflineFundFlowStore(FundFlowStore):
+    """不发起网络刷新的资金流向库"""
+
+    def refresh_if_stale(self, background=True):
+        return False
+
+
+def _kline(closes, change_pct=None):
+    closes = np.asarray(closes, dtype=float)
+    df = pd.DataFrame({'close': closes, 'high': closes * 1.02, 'low': closes * 0.98})
+    if change_pct is not None:
+        df['change_pct'] = change_pct
+    return df
+
+
+def _klines():
+    """覆盖股性活跃度各分支的K线"""
+    flat = _kline(np.full(60, 10.0) + np.tile([0, 0.2], 30))
+    rising = _kline(np.linspace(10, 13, 60))
+    limit_up = np.zeros(60)
+    limit_up[[50, 55]] = 10.0
+    two_boards = np.zeros(60)
+    two_boards[[52, 53]] = 10.0
+    volatile = _kline(np.linspace(10, 13, 60))
+    volatile['high'] = volatile['close'] * 1.025
+    return [
+        None,
+        pd.DataFrame(),
+        flat,
+        _kline(np.linspace(10, 10.5, 8)),
+        rising,
+        _kline(np.linspace(10, 13, 60), change_pct=limit_up),
+        _kline(np.linspace(10, 13, 60), change_pct=two_boards),
+        volatile,
+    ]
+
+
+def _fixture_records():
+    """固定截面：手工构造的分支样例 + 固定随机种子的随机样例"""
+    records = [
+        # 数据无效
+        {'code': '000001', 'close': 0, 'open': 0, 'high': 0, 'low': 0, 'volume': 0, 'turnover_amount': 0},
+        # 低位多头排列 + 涨停 + 缩量涨停
+        {'code': '000002', 'close': 11.0, 'open': 10.1, 'high': 11.0, 'low': 10.0, 'prev_close': 10.0,
+         'ma5': 10.5, 'ma10': 10.3, 'ma20': 10.1, 'ma60': 9.8, 'price_percentile': 40,
+         'volume': 700, 'ma5_vol': 1000, 'change_pct': 10.0, 'turnover_rate': 0.5,
+         'main_net_inflow': 2e6, 'turnover_amount': 1e7, 'concepts': ['人工智能'], 'is_sector_leader': True},
+        # 创业板 9.6% 不算涨停；突破MA20
+        {'code': '300001', 'close': 10.96, 'open': 10.0, 'high': 11.0, 'low': 9.9, 'prev_close': 10.0,
+         'ma5': 10.2, 'ma10': 10.4, 'ma20': 10.5, 'ma60': 11.5, 'price_percentile': 60,
+         'volume': 1800, 'ma5_vol': 1000, 'change_pct': 9.6, 'turnover_rate': 30,
+         'main_net_inflow': -2e6, 'turnover_amount': 1e7},
+        # 高位吊颈线 + 高位巨量滞涨 + 追高
+        {'code': '600001', 'close': 12.1, 'open': 12.0, 'high': 12.12, 'low': 11.7, 'prev_close': 12.0,
+         'ma5': 11.0, 'ma10': 10.5, 'ma20': 10.0, 'ma60': 9.0, 'price_percentile': 95,
+         'volume': 5000, 'ma5_vol': 1000, 'change_pct': 0.8, 'turnover_rate': 10,
+         'main_net_inflow': -1.5e6, 'turnover_amount': 1e7, 'concepts': ['储能']},
+        # 乌云盖顶（prev_high 缺省取当日最高）
+        {'code': '600002', 'close': 10.2, 'open': 11.0, 'high': 11.1, 'low': 10.1, 'prev_close': 10.8,
+         'prev_open': 10.0, 'ma5': 10.3, 'ma10': 10.3, 'ma20': 10.25, 'ma60': 10.0,
+         'volume': 4000, 'ma5_vol': 1000, 'change_pct': -5.6},
+        # 反包 / 多方炮 / 突破前高
+        {'code': '600003', 'close': 10.5, 'open': 9.8, 'high': 10.6, 'low': 9.7, 'prev_close': 10.0,
+         'prev_low': 9.8, 'prev_open': 10.4, 'prev_high': 10.4, 'ma5': 10.1, 'ma10': 10.0,
+         'ma20': 10.6, 'ma60': 10.3, 'volume': 2500, 'ma5_vol': 1000, 'change_pct': 5.0, 'is_breakout': True},
+        {'code': '600004', 'close': 10.5, 'open': 9.9, 'high': 10.6, 'low': 9.85, 'prev_close': 10.0,
+         'prev_open': 10.3, 'ma5': 10.1, 'ma10': 10.0, 'ma20': 9.95, 'ma60': 10.3,
+         'volume': 1000, 'ma5_vol': 1000, 'change_pct': 5.0, 'price_percentile': 10},
+        # 十字星 / 平盘 / 空头排列
+        {'code': '600005', 'close': 10.0, 'open': 10.0, 'high': 10.3, 'low': 9.7, 'prev_close': 10.0,
+         'ma5': 10.1, 'ma10': 10.2, 'ma20': 10.3, 'ma60': 10.4, 'volume': 600, 'ma5_vol': 1000},
+        {'code': '600008', 'close': 10.0, 'open': 10.0, 'high': 10.0, 'low': 10.0, 'prev_close': 10.0,
+         'ma5': 10.0, 'ma10': 10.0, 'ma20': 10.0, 'ma60': 10.0, 'volume': 600, 'ma5_vol': 1000},
+        # 无成交额，资金从资金流向库读取（净占比直接使用）
+        {'code': '600006', 'close': 10.0, 'open': 10.0, 'high': 10.3, 'low': 9.7, 'prev_close': 10.1,
+         'ma5': 10.1, 'ma10': 10.2, 'ma20': 10.3, 'ma60': 10.4, 'turnover_amount': 0},
+        # 资金流向库中没有的股票
+        {'code': '600007', 'close': 10.0, 'open': 9.9, 'high': 10.1, 'low': 9.9, 'prev_close': 9.95,
+         'ma5': 10.0, 'ma10': 10.01, 'ma20': 9.99, 'ma60': 11.0, 'volume': 1200, 'ma5_vol': 0},
+    ]
+
+    rng = np.random.default_rng(20260302)
+    klines = _klines()
+    codes = ['000', '600', '300', '688', '002']
+    for i in range(300):
+        prev_close = float(rng.uniform(5, 50))
+        close = prev_close * float(1 + rng.choice([rng.normal(0, 0.04), 0.1, 0.2, 0.0]))
+        open_p = prev_close * float(1 + rng.normal(0, 0.02))
+        ma20 = close * float(rng.uniform(0.8, 1.2))
+        record = {
+            'code': f"{codes[i % len(codes)]}{i:03d}",
+            'name': f"股票{i}",
+            'close': round(close, 2),
+            'open': round(open_p, 2),
+            'high': round(max(close, open_p) * float(rng.uniform(1.0, 1.03)), 2),
+            'low': round(min(close, open_p) * float(rng.uniform(0.94, 1.0)), 2),
+            'prev_close': round(prev_close, 2),
+            'ma5': close * float(rng.uniform(0.9, 1.1)),
+            'ma10': close * float(rng.uniform(0.9, 1.1)),
+            'ma20': ma20,
+            'ma60': ma20 * float(rng.uniform(0.9, 1.1)),
+            'price_percentile': float(rng.integers(0, 101)),
+            'volume': float(rng.choice([0, rng.uniform(1e5, 1e7)], p=[0.05, 0.95])),
+            'ma5_vol': float(rng.uniform(1e5, 5e6)),
+            'change_pct': (close - prev_close) / prev_close * 100,
+            'turnover_rate': float(rng.uniform(0, 30)),
+            'turnover_amount': float(rng.choice([0, 1e8])),
+            'is_breakout': bool(rng.random() < 0.2),
+            'is_sector_leader': bool(rng.random() < 0.3),
+            'concepts': list(rng.choice(['人工智能', '机器人概念', '电池', '创新药', '银行', '白酒'],
+                                        size=int(rng.integers(0, 3)), replace=False)),
+            'kline_df': klines[i % len(klines)],
+        }
+        if rng.random() < 0.7:
+            record['main_net_inflow'] = float(rng.normal(0, 1.5e7))
+        for key in ('prev_open', 'prev_high', 'prev_low'):
+            if rng.random() < 0.5:
+                record[key] = round(prev_close * float(rng.uniform(0.95, 1.05)), 2)
+        if rng.random() < 0.1:
+            record['ma60'] = 0
+        records.append(record)
+    return records
+
+
+@pytest.fixture
+def scorer(tmp_path):
+    store = _OfflineFundFlowStore(tmp_path / 'fund_flow')
+    codes = ['600006'] + [f"{p}{i:03d}" for i in range(0, 300, 3) for p in ('000', '600', '300', '688', '002')]
+    store.update(pd.DataFrame({
+        'code': codes,
+        'name': codes,
+        'main_net_inflow': [1e6 * ((i % 7) - 3) for i in range(len(codes))],
+        'main_net_inflow_pct': [float((i % 9) * 3 - 12) for i in range(len(codes))],
+    }), date(2026, 3, 2))
+    return ScorerV6(enable_logging=False, fund_flow_store=store)
+
+
+def _assert_details_equal(batch, scalar):
+    assert set(batch) == set(scalar)
+    for key, expected in scalar.items():
+        actual = batch[key]
+        if isinstance(expected, float) or isinstance(actual, float):
+            if expected is None or (isinstance(expected, float) and np.isnan(expected)):
+                assert actual is None or np.isnan(actual), key
+            else:
+                assert actual == pytest.approx(expected), key
+        elif isinstance(expected, list):
+            assert sorted(actual) == sorted(expected), key
+        else:
+            assert actual == expected, key
+
+
+class TestScoreBatchParity:
+    """批量评分与逐只评分一致"""
+
+    @pytest.mark.parametrize('sector_limit_up_count', [0, 2, 5])
+    def test_matches_score_stock(self, scorer, sector_limit_up_count):
+        records = _fixture_records()
+        market_data = {'hot_topics': HOT_TOPICS, 'sector_limit_up_count': sector_limit_up_count}
+
+        result = scorer.score_batch(scorer.batch_frame(records), market_data)
+
+        assert isinstance(result, BatchScoreResult)
+        assert len(result) == len(records)
+        for i, record in enumerate(records):
+            total, details = scorer.score_stock(record, market_data, log_score=False)
+            batch_details = result.details(i)
+
+            assert result.total[i] == total, record['code']
+            assert set(result.risks[i]) == set(details['risks']), record['code']
+            for j, dim in enumerate(BatchScoreResult.DIMENSIONS):
+                assert result.scores[i, j] == details[dim]['score'], (record['code'], dim)
+                _assert_details_equal(batch_details[dim], details[dim])
+
+    def test_fixture_covers_branches(self, scorer):
+        records = _fixture_records()
+        result = scorer.score_batch(scorer.batch_frame(records), {'hot_topics': HOT_TOPICS,
+                                                                  'sector_limit_up_count': 0})
+        b = result.breakdowns
+
+        assert {'数据无效', '空头排列', '高位加速', '低位多头排列', '突破MA20'} <= set(b['trend_position']['trend_type'])
+        assert {'数据无效', '涨停', '吊颈线', '乌云盖顶', '反包', '多方炮', '十字星', '阳线', '平盘', '阴线'} \
+            <= set(b['kline_pattern']['pattern'])
+        assert {'无成交', '高位巨量滞涨', '天量阴线', '缩量涨停', '温和放量上涨', '底部/突破倍量'} \
+            <= set(b['volume_price']['volume_type'])
+        assert {'成交额无效', '主力大幅流入', '主力大幅流出'} <= set(b['capital_strength']['flow_type'])
+        assert {'无概念', '主线题材(退潮)'} <= set(b['theme_wind']['topic_type'])
+        assert {'数据无效', '长期横盘', '涨幅有限', '近期涨停', '连板2次'} <= set(b['stock_activity']['activity_type'])
+
+
+class TestScoreBatch:
+    """批量评分接口"""
+
+    def test_score_frame(self, scorer):
+        records = _fixture_records()[:5]
+        result = scorer.score_batch(scorer.batch_frame(records))
+
+        frame = result.score_frame()
+        assert list(frame.index) == [r['code'] for r in records]
+        assert list(frame.columns) == ['total_score'] + list(BatchScoreResult.DIMENSIONS)
+        assert (frame['total_score'] == frame[list(BatchScoreResult.DIMENSIONS)].sum(axis=1)).all()
+
+    def test_missing_columns_use_defaults(self, scorer):
+        record = {'code': '000002', 'close': 10.0, 'open': 9.9, 'high': 10.1, 'low': 9.8, 'prev_close': 9.9,
+                  'ma5': 9.9, 'ma10': 9.8, 'ma20': 9.7, 'ma60': 9.6}
+
+        result = scorer.score_batch(pd.DataFrame([record]))
+        total, details = scorer.score_stock(record, log_score=False)
+
+        assert result.total[0] == total
+        assert result.details(0)['volume_price'] == details['volume_price']
+
+    def test_empty_frame(self, scorer):
+        result = scorer.score_batch(pd.DataFrame(columns=['code']))
+
+        assert len(result) == 0
+        assert result.scores.shape == (0, 6)
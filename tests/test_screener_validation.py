@@ -556,5 +556,120 @@ class TestScreenerResult:
         assert 'indicators' in d
 
 
+
+class _StubDataFeed:
+    """精筛测试用的桩数据源：快照规模可调，历史数据只覆盖固定候选"""
+    
+    def __init__(self, snapshot: pd.DataFrame, history: dict):
+        self.snapshot = snapshot
+        self.history = history
+        self.clean_calls = 0
+    
+    def get_market_snapshot(self, liquidity_filter=None, use_cache=True):
+        return self.snapshot
+    
+    def download_batch(self, codes, start_date, end_date, adjust='qfq'):
+        return {code: self.history[code] for code in codes if code in self.history}
+    
+    def clean_data(self, df):
+        self.clean_calls += 1
+        return df
+
+
+def _make_snapshot(size: int) -> pd.DataFrame:
+    codes = [f"{i:06d}" for i in range(size)]
+    return pd.DataFrame({
+        'code': codes,
+        'name': [f"股票{c}" for c in codes],
+        'price': 10.0,
+        'market_cap': 10e9 + np.arange(size),
+        'turnover_rate': 0.05
+    })
+
+
+def _make_history(days: int = 120, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 20 * np.cumprod(1 + rng.normal(0, 0.02, days))
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=days, freq='D'),
+        'open': close,
+        'high': close * 1.02,
+        'low': close * 0.98,
+        'close': close,
+        'volume': rng.integers(1_000_000, 5_000_000, days).astype(float)
+    })
+
+
+class TestSnapshotIndex:
+    """验证精筛阶段的快照行索引"""
+    
+    def _make_screener(self, feed) -> Screener:
+        screener = Screener(feed)
+        screener.set_market_filter(MarketFilter(enabled=False))
+        screener.set_industry_diversification(IndustryDiversification(enabled=False))
+        screener.volatility_filter.enabled = False
+        screener.trend_safety_filter.enabled = False
+        screener.strategy_prefilter.enabled = False
+        screener._get_stock_industry = lambda code: '未知'
+        screener._check_report_window = lambda code, window_days=3: False
+        return screener
+    
+    def test_build_snapshot_index(self):
+        """索引按代码取行，重复代码保留第一行"""
+        snapshot = pd.DataFrame({
+            'code': ['000001', '000002', '000001'],
+            'name': ['A', 'B', 'A2'],
+            'market_cap': [1.0, 2.0, 3.0]
+        })
+        
+        index = Screener._build_snapshot_index(snapshot)
+        
+        assert set(index.keys()) == {'000001', '000002'}
+        assert index['000001']['name'] == 'A'
+        assert index['000002']['market_cap'] == 2.0
+    
+    def test_build_snapshot_index_subset(self):
+        """只为指定代码取行，快照中不存在的代码被忽略"""
+        index = Screener._build_snapshot_index(_make_snapshot(100), ['000003', '999999'])
+        
+        assert list(index.keys()) == ['000003']
+    
+    def test_build_snapshot_index_empty(self):
+        """空快照返回空索引"""
+        assert Screener._build_snapshot_index(None) == {}
+        assert Screener._build_snapshot_index(pd.DataFrame()) == {}
+    
+    def test_screen_uses_snapshot_rows(self):
+        """精筛结果使用各自的快照行，已清洗数据不再重复清洗"""
+        snapshot = _make_snapshot(50)
+        history = {code: _make_history(seed=i) for i, code in enumerate(snapshot['code'][:5])}
+        feed = _StubDataFeed(snapshot, history)
+        
+        results = self._make_screener(feed).screen()
+        
+        assert len(results) == 5
+        for result in results:
+            assert result.name == f"股票{result.code}"
+            assert result.market_cap == 10e9 + int(result.code)
+        assert feed.clean_calls == 0
+    
+    def test_per_stock_overhead_independent_of_snapshot_size(self):
+        """单只股票精筛开销不随快照规模增长"""
+        candidates = 20
+        per_stock = {}
+        
+        for size in (100, 5000):
+            snapshot = _make_snapshot(size)
+            history = {code: _make_history(seed=i) for i, code in enumerate(snapshot['code'][:candidates])}
+            screener = self._make_screener(_StubDataFeed(snapshot, history))
+            
+            start = time.perf_counter()
+            results = screener.screen()
+            per_stock[size] = (time.perf_counter() - start) / candidates
+            assert len(results) == candidates
+        
+        print(f"单股开销: 快照100只 {per_stock[100]*1000:.2f}ms, 快照5000只 {per_stock[5000]*1000:.2f}ms")
+        assert per_stock[5000] < per_stock[100] * 3 + 0.005
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '--tb=short'])
@@ -306,7 +306,7 @@ class TestSellSignalCheckerIntegration:
         checker = SellSignalChecker(mock_data_feed)
         
         # 模拟无信号情况
-        with patch.object(checker, 'check_single_position', return_value=None):
+        with patch.object(checker, 'evaluate_positions', return_value=[None]):
             positions = [
                 Holding("600519", "贵州茅台", 1800.0, date(2024, 1, 15), 100, "RSRS")
             ]
@@ -336,7 +336,7 @@ class TestSellSignalCheckerIntegration:
         )
         
         # 模拟有信号情况
-        with patch.object(checker, 'check_single_position', return_value=expected_signal):
+        with patch.object(checker, 'evaluate_positions', return_value=[expected_signal]):
             positions = [holding]
             signals = checker.check_all_positions(positions)
             
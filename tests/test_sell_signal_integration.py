@@ -109,8 +109,9 @@ class TestSellSignalIntegration:
                 )
             return None
         
-        # 使用 patch 模拟 check_single_position 方法
-        with patch.object(checker, 'check_single_position', side_effect=mock_check_single_position):
+        # 使用 patch 模拟批量评估结果（与逐只检查一致）
+        with patch.object(checker, 'evaluate_positions',
+                          side_effect=lambda positions, frames=None: [mock_check_single_position(h) for h in positions]):
             signals = checker.check_all_positions(holdings)
             
             # 验证结果
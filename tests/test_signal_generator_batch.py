@@ -0,0 +1,165 @@
+"""
+MiniQuant-Lite 信号生成批量化测试
+
+测试 SignalGenerator.generate_signals：
+- 批量 RSRS 标准分与逐窗口循环实现一致
+- 策略参数与配置每次运行只读取一次
+- 并行生成结果与逐只分析一致
+"""
+
+import time
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import StrategyParamsConfig, get_settings
+from core.signal_generator import SignalGenerator, StrategyType
+
+
+def _reference_rsrs_score(df, n_period, m_period):
+    """逐窗口循环计算 RSRS 标准分（原始实现）"""
+    high = df['high'].values
+    low = df['low'].values
+    betas = []
+    for i in range(n_period, len(df) + 1):
+        h = high[i - n_period:i]
+        l = low[i - n_period:i]
+        x_mean = np.mean(l)
+        y_mean = np.mean(h)
+        denominator = np.sum((l - x_mean) ** 2)
+        betas.append(np.sum((l - x_mean) * (h - y_mean)) / denominator if denominator != 0 else 1.0)
+    recent = betas[-m_period:] if len(betas) >= m_period else betas
+    std = np.std(recent)
+    return (betas[-1] - np.mean(recent)) / std if std > 0 else 0
+
+
+def _make_history(days, seed):
+    rng = np.random.default_rng(seed)
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    return pd.DataFrame({
+        'date': pd.date_range('2023-01-02', periods=days, freq='B'),
+        'open': close,
+        'high': close * (1 + rng.uniform(0, 0.03, days)),
+        'low': close * (1 - rng.uniform(0, 0.03, days)),
+        'close': close,
+        'volume': rng.integers(1_000_000, 5_000_000, days).astype(float),
+    })
+
+
+class _StubDataFeed:
+    def __init__(self, frames):
+        self.frames = frames
+
+    def load_processed_data(self, code, use_cache=True):
+        df = self.frames.get(code)
+        return None if df is None else df.copy()
+
+    def get_stock_names_batch(self, codes):
+        return {code: f"股票{code}" for code in codes}
+
+
+@pytest.fixture
+def params():
+    return StrategyParamsConfig(rsrs_n_period=18, rsrs_m_period=250,
+                                rsrs_buy_threshold=0.3, rsrs_sell_threshold=-0.3)
+
+
+@pytest.fixture
+def frames():
+    # 混合长度：超过 M+N-1、介于 100 与 M+N-1 之间、不足 100 天
+    lengths = [400, 300, 150, 120, 80, 60]
+    return {f"{600000 + i:06d}": _make_history(lengths[i % len(lengths)], seed=i) for i in range(30)}
+
+
+def _make_generator(frames, strategy_type=StrategyType.RSRS):
+    generator = SignalGenerator(_StubDataFeed(frames), strategy_type=strategy_type)
+    generator.report_checker = Mock()
+    generator.report_checker.check_report_window.return_value = (False, None)
+    return generator
+
+
+class TestBatchRsrsScores:
+    """批量 RSRS 标准分"""
+
+    def test_matches_reference_loop(self, frames, params):
+        generator = _make_generator(frames)
+
+        scores = generator._compute_rsrs_scores(frames, params)
+
+        for code, df in frames.items():
+            if len(df) < 100:
+                assert code not in scores
+            else:
+                expected = _reference_rsrs_score(df, params.rsrs_n_period, params.rsrs_m_period)
+                assert scores[code] == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+    def test_constant_prices_score_zero(self, params):
+        df = pd.DataFrame({'high': np.full(150, 11.0), 'low': np.full(150, 10.0)})
+        generator = _make_generator({})
+
+        assert generator._compute_rsrs_scores({'000001': df}, params) == {'000001': 0.0}
+
+
+class TestGenerateSignals:
+    """并行信号生成"""
+
+    @pytest.mark.parametrize('strategy_type', [StrategyType.RSRS, StrategyType.RSI_REVERSAL])
+    def test_matches_per_stock_analysis(self, frames, params, strategy_type):
+        generator = _make_generator(frames, strategy_type)
+
+        with patch('core.signal_generator.load_strategy_params', return_value=params):
+            signals = generator.generate_signals(list(frames), current_cash=100000.0)
+            expected = [
+                generator._analyze_stock(code, 100000.0, 0) for code in frames
+            ]
+
+        expected = generator._sort_signals_by_quality([s for s in expected if s is not None])
+        assert [(s.code, s.signal_type, s.reason) for s in signals] == \
+               [(s.code, s.signal_type, s.reason) for s in expected]
+
+    def test_params_and_settings_loaded_once(self, frames, params):
+        generator = _make_generator(frames)
+
+        with patch('core.signal_generator.load_strategy_params', return_value=params) as mock_params, \
+             patch('core.signal_generator.get_settings', wraps=get_settings) as mock_settings:
+            generator.generate_signals(list(frames))
+
+        assert mock_params.call_count == 1
+        assert mock_settings.call_count == 1
+
+    def test_missing_data_skipped(self, frames, params):
+        generator = _make_generator(frames)
+        pool = ['999999'] + list(frames)
+
+        with patch('core.signal_generator.load_strategy_params', return_value=params):
+            signals = generator.generate_signals(pool, current_cash=100000.0)
+
+        assert all(s.code in frames for s in signals)
+
+    def test_preloaded_frames_not_reloaded(self, frames, params):
+        generator = _make_generator(frames)
+
+        with patch('core.signal_generator.load_strategy_params', return_value=params):
+            expected = generator.generate_signals(list(frames), current_cash=100000.0)
+            with patch.object(generator.data_feed, 'load_processed_data') as load:
+                signals = generator.generate_signals(list(frames), current_cash=100000.0, frames=frames)
+
+        load.assert_not_called()
+        assert [(s.code, s.reason) for s in signals] == [(s.code, s.reason) for s in expected]
+
+    def test_pool_of_300_under_one_second(self, params):
+        pool_frames = {f"{i:06d}": _make_history(400, seed=i) for i in range(300)}
+        generator = _make_generator(pool_frames)
+
+        with patch('core.signal_generator.load_strategy_params', return_value=params):
+            start = time.perf_counter()
+            generator.generate_signals(list(pool_frames), current_cash=100000.0)
+            elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0, f"300 只股票信号生成耗时 {elapsed:.2f}s"
@@ -0,0 +1,111 @@
+"""
+历史信号存储测试
+
+测试：
+- 按日幂等覆盖写入，不影响其他日期
+- 日期 / 代码（完整与部分）/ 类型筛选，按日期降序分页
+- 数据库统计与 DataFrame 统计一致
+- 旧版 CSV 迁移与 CSV 导出
+"""
+
+import io
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.signal_generator import SignalType, TradingSignal
+from core.signal_store import SignalStore
+
+
+DAY = date(2025, 6, 2)
+
+
+def _signal(code, signal_type=SignalType.BUY, in_report_window=False):
+    return TradingSignal(
+        code=code, name=f"股票{code}", signal_type=signal_type, price_range=(10.0, 10.5),
+        limit_cap=10.6, reason='MACD金叉', generated_at=DAY, trade_amount=50000.0,
+        high_fee_warning=False, actual_fee_rate=0.0003, news_url='', in_report_window=in_report_window,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SignalStore(tmp_path / 'signal_history.db')
+    for i in range(5):
+        store.save_signals(
+            [_signal('000001'), _signal('600036', SignalType.SELL), _signal(f"30000{i}", in_report_window=True)],
+            DAY + timedelta(days=i),
+        )
+    return store
+
+
+class TestSave:
+    """写入"""
+
+    def test_upsert_by_day(self, store):
+        store.save_signals([_signal('000002')], DAY + timedelta(days=1), "不佳")
+
+        day = store.load_signals(DAY + timedelta(days=1), DAY + timedelta(days=1))
+        assert day['code'].tolist() == ['000002']
+        assert day.iloc[0]['market_status'] == '不佳'
+        assert store.count_signals() == 13
+        assert store.save_signals([], DAY) == 0
+        assert store.count_signals() == 13
+
+
+class TestLoad:
+    """查询"""
+
+    def test_filters_and_order(self, store):
+        df = store.load_signals()
+        assert list(df.columns) == SignalStore.COLUMNS
+        assert df['generated_date'].tolist() == sorted(df['generated_date'], reverse=True)
+        assert df['in_report_window'].dtype == bool
+        assert isinstance(df.iloc[0]['generated_date'], date)
+
+        assert len(store.load_signals(code='000001')) == 5
+        assert set(store.load_signals(code='3000')['code']) == {f"30000{i}" for i in range(5)}
+        assert len(store.load_signals(signal_type='卖出')) == 5
+        assert len(store.load_signals(DAY + timedelta(days=1), DAY + timedelta(days=2), code='000001')) == 2
+        assert store.load_signals(code='999999').empty
+
+    def test_paging(self, store):
+        full = store.load_signals()
+        pages = [store.load_signals(limit=4, offset=offset) for offset in range(0, 15, 4)]
+
+        pd.testing.assert_frame_equal(pd.concat(pages, ignore_index=True), full)
+        assert store.count_signals(signal_type='买入') == 10
+
+    def test_statistics_match_dataframe(self, store):
+        for filters in ({}, {'code': '000001'}, {'signal_type': '卖出'}, {'start_date': DAY + timedelta(days=3)}):
+            assert store.query_statistics(**filters) == store.get_statistics(store.load_signals(**filters))
+        assert store.query_statistics(code='999999')['total_count'] == 0
+
+
+class TestMigration:
+    """CSV 迁移与导出"""
+
+    def test_migrates_legacy_csv(self, store, tmp_path):
+        csv_path = tmp_path / 'legacy' / 'signal_history.csv'
+        csv_path.parent.mkdir()
+        csv_path.write_bytes(store.export_csv())
+
+        migrated = SignalStore(csv_path)
+        assert migrated.file_path == csv_path.with_suffix('.db')
+        assert migrated.file_path.exists()
+        pd.testing.assert_frame_equal(migrated.load_signals(), store.load_signals())
+
+        # 已有数据时不再重复导入
+        assert SignalStore(csv_path).count_signals() == 15
+
+    def test_export_csv(self, store):
+        df = store.load_signals(code='000001')
+        exported = pd.read_csv(io.BytesIO(store.export_csv(df)), dtype={'code': str})
+
+        assert exported['code'].tolist() == ['000001'] * 5
+        assert len(pd.read_csv(io.BytesIO(store.export_csv()))) == 15
@@ -0,0 +1,188 @@
+"""
+增量信号评估测试
+
+测试 SignalTracker：
+- 输入未变化的股票不重新评估
+- 信号状态迁移（新增 / 升级 / 清除）
+- 结果与 SignalEngine 全量评估一致
+- MonitorService 发布迁移事件
+"""
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.realtime_monitor.config import MonitorConfig
+from core.realtime_monitor.models import Position, SellSignal, StockData
+from core.realtime_monitor.service import MonitorService
+from core.realtime_monitor.signal_engine import SignalEngine
+from core.realtime_monitor.signal_tracker import SignalTracker, SignalTransition
+
+
+TODAY = date.today()
+
+
+def _stock_data(code, price=10.0, rsi=55.0, volume_ratio=1.5):
+    return StockData(
+        code=code, name=f"股票{code}", current_price=price, change_pct=0.01,
+        volume=1000, turnover=1e6,
+        ma5=9.9, ma10=9.8, ma20=9.5, ma60=9.0, rsi=rsi, volume_ratio=volume_ratio,
+        ma20_slope=0.01,
+    )
+
+
+def _position(code, cost=10.0, buy_date=TODAY):
+    return Position(code=code, name=f"股票{code}", cost_price=cost, quantity=100,
+                    buy_date=buy_date, current_price=cost)
+
+
+def _kinds(transitions):
+    return [(t.side, t.kind, t.code) for t in transitions]
+
+
+class TestIncrementalEvaluation:
+    """增量评估"""
+
+    def test_unchanged_inputs_not_reevaluated(self):
+        tracker = SignalTracker()
+        data = {'600000': _stock_data('600000'), '000001': _stock_data('000001')}
+        tracker.evaluate(['600000', '000001'], {}, data, today=TODAY)
+
+        with patch.object(tracker.signal_engine, 'generate_buy_signal',
+                          wraps=tracker.signal_engine.generate_buy_signal) as mock_buy:
+            data['000001'] = _stock_data('000001', price=10.1)
+            result = tracker.evaluate(['600000', '000001'], {}, data, today=TODAY)
+
+        assert mock_buy.call_count == 1
+        assert result.evaluated == ['000001']
+        assert tracker.input_version('600000') == 1
+        assert tracker.input_version('000001') == 2
+        assert {s.code for s in result.buy_signals} == {'600000', '000001'}
+
+    def test_sell_peak_update_does_not_trigger_repeat(self):
+        tracker = SignalTracker()
+        positions = {'600000': _position('600000')}
+        data = {'600000': _stock_data('600000', price=10.5)}
+
+        tracker.evaluate([], positions, data, today=TODAY)
+        assert positions['600000'].peak_price == 10.5
+
+        result = tracker.evaluate([], positions, data, today=TODAY)
+        assert result.evaluated == []
+        assert tracker.input_version('600000', SignalTransition.SIDE_SELL) == 1
+
+        # 日期变化影响持仓天数，需要重新评估
+        result = tracker.evaluate([], positions, data, today=TODAY + timedelta(days=1))
+        assert result.evaluated == ['600000']
+
+    def test_matches_full_evaluation(self):
+        engine = SignalEngine()
+        tracker = SignalTracker(engine)
+        prices = [10.0, 10.2, 9.0, 9.0, 10.4, 12.5]
+        rsis = [55.0, 30.0, 55.0, 85.0, 55.0, 85.0]
+
+        positions = {'600000': _position('600000', buy_date=TODAY - timedelta(days=3))}
+        reference = {'600000': _position('600000', buy_date=TODAY - timedelta(days=3))}
+
+        for price, rsi in zip(prices, rsis):
+            data = {code: _stock_data(code, price, rsi) for code in ('600000', '000001')}
+            result = tracker.evaluate(['000001'], positions, data, today=TODAY)
+
+            expected_buy = engine.generate_buy_signal(data['000001'])
+            expected_sell = engine.generate_sell_signals(reference['600000'], data['600000'])
+
+            assert [s.signal_strength for s in result.buy_signals] == \
+                   ([expected_buy.signal_strength] if expected_buy else [])
+            assert [s.signal_type for s in result.sell_signals] == [s.signal_type for s in expected_sell]
+
+
+class TestTransitions:
+    """信号状态迁移"""
+
+    def test_buy_new_upgraded_cleared(self):
+        tracker = SignalTracker()
+
+        # 5 个条件满足（量比不足）→ 83 分
+        result = tracker.evaluate(['600000'], {}, {'600000': _stock_data('600000', volume_ratio=1.0)})
+        assert _kinds(result.transitions) == [('buy', 'new', '600000')]
+        assert result.transitions[0].signal.signal_strength == 83
+
+        # 重复相同输入不产生事件
+        result = tracker.evaluate(['600000'], {}, {'600000': _stock_data('600000', volume_ratio=1.0)})
+        assert result.transitions == []
+
+        result = tracker.evaluate(['600000'], {}, {'600000': _stock_data('600000', volume_ratio=1.5)})
+        assert _kinds(result.transitions) == [('buy', 'upgraded', '600000')]
+        assert result.transitions[0].previous.signal_strength == 83
+
+        result = tracker.evaluate(['600000'], {}, {'600000': _stock_data('600000', rsi=20.0, volume_ratio=1.0)})
+        assert _kinds(result.transitions) == [('buy', 'cleared', '600000')]
+        assert result.buy_signals == []
+
+    def test_removed_from_watchlist_clears(self):
+        tracker = SignalTracker()
+        tracker.evaluate(['600000'], {}, {'600000': _stock_data('600000')})
+
+        result = tracker.evaluate([], {}, {})
+
+        assert _kinds(result.transitions) == [('buy', 'cleared', '600000')]
+        assert tracker.input_version('600000') == 0
+
+    def test_missing_data_keeps_previous_signal(self):
+        tracker = SignalTracker()
+        tracker.evaluate(['600000'], {}, {'600000': _stock_data('600000')})
+
+        result = tracker.evaluate(['600000'], {}, {})
+
+        assert result.transitions == []
+        assert [s.code for s in result.buy_signals] == ['600000']
+
+    def test_sell_new_and_cleared(self):
+        tracker = SignalTracker()
+        positions = {'600000': _position('600000')}
+
+        result = tracker.evaluate([], positions, {'600000': _stock_data('600000', price=9.5)}, today=TODAY)
+        assert _kinds(result.transitions) == [('sell', 'new', '600000')]
+        assert result.transitions[0].signal.signal_type == SellSignal.TYPE_STOP_LOSS
+
+        result = tracker.evaluate([], {}, {}, today=TODAY)
+        assert _kinds(result.transitions) == [('sell', 'cleared', '600000')]
+
+
+class TestServiceEvents:
+    """MonitorService 信号事件"""
+
+    class _Fetcher:
+        def __init__(self):
+            self.weak = False
+
+        def is_trading_time(self, check_time=None):
+            return True
+
+        def fetch_stock_data_batch(self, codes):
+            if self.weak:
+                return {code: _stock_data(code, rsi=20.0, volume_ratio=1.0) for code in codes}
+            return {code: _stock_data(code) for code in codes}
+
+    def test_listener_receives_deduplicated_events(self):
+        fetcher = self._Fetcher()
+        service = MonitorService(MonitorConfig(), data_fetcher=fetcher)
+        service.monitor.add_to_watchlist('600000')
+        received = []
+        service.add_listener(received.append)
+
+        service.refresh_now()
+        service.refresh_now()
+        fetcher.weak = True  # RSI 与量比不满足，条件不足
+        snapshot = service.refresh_now()
+
+        assert [_kinds(batch) for batch in received] == [
+            [('buy', 'new', '600000')],
+            [('buy', 'cleared', '600000')],
+        ]
+        assert snapshot.buy_signals == ()
@@ -0,0 +1,128 @@
+"""
+题材数据存储测试
+
+测试：
+- 公司主营业务批量写入、覆盖与点查
+- 龙头记录按题材+日期查询、同日覆盖、过期清理
+- 记录今日龙头为一次批量写入
+- 旧版 JSON 数据导入
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.overnight_picker.topic_matcher import (
+    CompanyBusiness,
+    LeaderRecord,
+    SmartTopicMatcher,
+    TopicStore,
+)
+
+
+def _day(offset):
+    return (datetime.now() - timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+def _record(code, topic='AI人工智能', offset=0, leader_index=60.0):
+    return LeaderRecord(code=code, name=f"股票{code}", topic=topic, date=_day(offset),
+                        leader_index=leader_index, leader_type='真龙头', continuous_boards=2)
+
+
+@pytest.fixture
+def matcher(tmp_path):
+    return SmartTopicMatcher(
+        business_db_path=str(tmp_path / 'company_business.json'),
+        leader_history_path=str(tmp_path / 'leader_history.json'),
+        db_path=str(tmp_path / 'topic_matcher.db'),
+    )
+
+
+class TestTopicStore:
+    """存储"""
+
+    def test_business_roundtrip(self, tmp_path):
+        store = TopicStore(str(tmp_path / 'topics.db'))
+        business = CompanyBusiness(code='000001', name='测试', main_business='AI芯片',
+                                   products=['GPU'], industry='半导体', concepts=['AI', '芯片'])
+        assert store.upsert_businesses([business]) == 1
+        assert store.get_business('000001') == business
+
+        business.main_business = '大模型'
+        store.upsert_businesses([business])
+        assert store.get_business('000001').main_business == '大模型'
+        assert store.count_businesses() == 1
+        assert store.get_business('000002') is None
+
+    def test_leaders_query_and_retention(self, tmp_path):
+        store = TopicStore(str(tmp_path / 'topics.db'))
+        store.upsert_leaders([
+            _record('000001', offset=1, leader_index=50),
+            _record('000002', offset=3, leader_index=80),
+            _record('000003', offset=10, leader_index=90),
+            _record('000004', topic='半导体', offset=1),
+        ])
+        store.upsert_leaders([_record('000001', offset=1, leader_index=70)])  # 同日覆盖
+
+        leaders = store.topic_leaders('AI人工智能', _day(7))
+        assert [(r.code, r.leader_index) for r in leaders] == [('000002', 80), ('000001', 70)]
+        assert store.count_leaders() == 4
+
+        store.upsert_leaders([_record('000005', offset=40)])
+        assert store.count_leaders() == 4
+        assert [r.code for r in store.topic_leaders('半导体')] == ['000004']
+
+
+class TestSmartTopicMatcher:
+    """题材匹配器读写存储"""
+
+    def test_record_today_leaders_single_write(self, matcher, monkeypatch):
+        calls = []
+        upsert = matcher.store.upsert_leaders
+        monkeypatch.setattr(matcher.store, 'upsert_leaders', lambda records: calls.append(1) or upsert(records))
+
+        leaders = [
+            {'stock_code': f"00000{i}", 'stock_name': f"股票{i}", 'leader_index': 90 - i,
+             'leader_type': leader_type, 'details': {'continuous_boards': 2}}
+            for i, leader_type in enumerate(['真龙头', '二线龙头', '跟风股', '二线龙头'])
+        ]
+        assert matcher.record_today_leaders('AI人工智能', leaders) == 3
+        assert len(calls) == 1
+        assert [r.code for r in matcher.get_topic_leaders('AI人工智能')] == ['000000', '000001', '000003']
+        assert matcher.predict_tomorrow_leader('AI人工智能')['predicted_leader']['code'] == '000000'
+
+    def test_persists_across_instances(self, matcher, tmp_path):
+        matcher.add_leader_record(_record('000001'))
+        matcher.add_company_businesses([
+            CompanyBusiness(code='000001', name='测试', main_business='人工智能', products=[],
+                            industry='软件', concepts=['AI']),
+        ])
+
+        reopened = SmartTopicMatcher(db_path=str(tmp_path / 'topic_matcher.db'),
+                                     business_db_path=str(tmp_path / 'none.json'),
+                                     leader_history_path=str(tmp_path / 'none.json'))
+        assert [r.code for r in reopened.get_topic_leaders('AI人工智能')] == ['000001']
+        assert reopened.get_company_business('000001').concepts == ['AI']
+
+    def test_imports_legacy_json(self, tmp_path):
+        (tmp_path / 'company_business.json').write_text(json.dumps({
+            '000001': {'name': '测试', 'main_business': 'AI', 'products': ['GPU'],
+                       'industry': '半导体', 'concepts': ['AI']},
+        }), encoding='utf-8')
+        (tmp_path / 'leader_history.json').write_text(json.dumps({
+            'AI人工智能': [{'code': '000001', 'name': '测试', 'date': _day(1), 'leader_index': 75,
+                        'leader_type': '真龙头'}],
+        }), encoding='utf-8')
+
+        matcher = SmartTopicMatcher(
+            business_db_path=str(tmp_path / 'company_business.json'),
+            leader_history_path=str(tmp_path / 'leader_history.json'),
+            db_path=str(tmp_path / 'topic_matcher.db'),
+        )
+        assert matcher.get_company_business('000001').products == ['GPU']
+        assert matcher.get_topic_leaders('AI人工智能')[0].leader_index == 75
@@ -0,0 +1,220 @@
+"""
+交易日志存储测试
+
+测试：
+- 增删交易后增量汇总表与全量重建一致
+- 汇总表读取的交易表现与逐笔 FIFO 配对计算一致（全部 / 按策略 / 按月份 / 按股票）
+- 按条件查询、分页与删除
+- 信号执行统计（按键关联信号存储）
+- 旧版 CSV 迁移与 CSV 导出
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.signal_generator import SignalType, TradingSignal
+from core.signal_store import SignalStore
+from core.trade_journal import TradeAction, TradeJournal, TradeRecord
+
+
+START = date(2025, 1, 2)
+CODES = ['000001', '600036', '300750']
+STRATEGIES = ['RSRS', 'MACD', '']
+
+
+def _trade(code, action, price, quantity, offset, strategy='RSRS', **kwargs):
+    return TradeRecord(code=code, name=f"股票{code}", action=action, price=price, quantity=quantity,
+                       trade_date=START + timedelta(days=offset), strategy=strategy, **kwargs)
+
+
+def _random_trades(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        _trade(rng.choice(CODES), rng.choice(list(TradeAction)), round(rng.uniform(5, 20), 2),
+               rng.choice([100, 200, 300, 500]), rng.randint(0, 120), strategy=rng.choice(STRATEGIES),
+               commission=rng.choice([0.0, 5.0, 5.5]))
+        for _ in range(n)
+    ]
+
+
+def _legacy_closed(trades):
+    """逐笔 FIFO 配对（原实现口径）：返回 [(卖出记录, 盈亏, 持仓天数)]"""
+    closed = []
+    by_code = {}
+    for trade in sorted(trades, key=lambda t: t.trade_date):
+        by_code.setdefault(trade.code, []).append(trade)
+    for code_trades in by_code.values():
+        queue = []
+        for trade in code_trades:
+            if trade.action == TradeAction.BUY:
+                queue.append([trade, trade.quantity])
+                continue
+            remaining = trade.quantity
+            while remaining > 0 and queue:
+                qty = min(queue[0][1], remaining)
+                closed.append((trade, (trade.price - queue[0][0].price) * qty,
+                               (trade.trade_date - queue[0][0].trade_date).days))
+                remaining -= qty
+                queue[0][1] -= qty
+                if queue[0][1] == 0:
+                    queue.pop(0)
+    return closed
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = TradeJournal(tmp_path / 'trade_journal.db')
+    for trade in _random_trades(200):
+        assert journal.add_trade(trade)[0]
+    return journal
+
+
+def _stats_snapshot(journal):
+    return {by: journal.get_performance_breakdown(by).to_dict('records') for by in TradeJournal.STAT_DIMENSIONS}
+
+
+def _assert_stats_equal(left, right):
+    for by in TradeJournal.STAT_DIMENSIONS:
+        assert len(left[by]) == len(right[by])
+        for a, b in zip(left[by], right[by]):
+            assert a == pytest.approx(b)
+
+
+class TestAggregates:
+    """增量汇总"""
+
+    def test_performance_matches_fifo(self, journal):
+        trades = journal.get_all_trades()
+        closed = _legacy_closed(trades)
+        performance = journal.calculate_performance()
+
+        assert performance.total_trades == 200
+        assert performance.buy_trades == sum(t.action == TradeAction.BUY for t in trades)
+        assert performance.closed_trades == len(closed)
+        assert performance.profitable_trades == sum(p > 0 for _, p, _ in closed)
+        assert performance.total_profit == pytest.approx(sum(p for _, p, _ in closed))
+        assert performance.total_commission == pytest.approx(sum(t.commission for t in trades))
+        assert performance.average_holding_days == pytest.approx(sum(d for _, _, d in closed) / len(closed))
+
+        # 限定日期走区间内配对，覆盖全部日期时与汇总表一致
+        ranged = journal.calculate_performance(START, START + timedelta(days=365))
+        assert ranged.closed_trades == performance.closed_trades
+        assert ranged.net_profit == pytest.approx(performance.net_profit)
+
+    def test_breakdown_matches_fifo(self, journal):
+        trades = journal.get_all_trades()
+        closed = _legacy_closed(trades)
+
+        by_strategy = journal.get_performance_breakdown('strategy').set_index('strategy')
+        for strategy in STRATEGIES:
+            row = by_strategy.loc[strategy]
+            assert row['total_trades'] == sum(t.strategy == strategy for t in trades)
+            assert row['closed_trades'] == sum(s.strategy == strategy for s, _, _ in closed)
+            assert row['total_profit'] == pytest.approx(sum(p for s, p, _ in closed if s.strategy == strategy))
+
+        by_month = journal.get_performance_breakdown('month').set_index('month')
+        assert by_month['total_trades'].sum() == 200
+        march = [p for s, p, _ in closed if s.trade_date.strftime('%Y-%m') == '2025-03']
+        assert by_month.loc['2025-03', 'total_profit'] == pytest.approx(sum(march))
+
+        by_code = journal.get_performance_breakdown('code').set_index('code')
+        assert by_code['closed_trades'].sum() == len(closed)
+        assert journal.get_strategies() == ['MACD', 'RSRS']
+
+        with pytest.raises(ValueError):
+            journal.get_performance_breakdown('week')
+
+    def test_incremental_matches_rebuild(self, journal):
+        rng = random.Random(1)
+        trades = journal.get_all_trades()
+        for trade in rng.sample(trades, 60):
+            assert journal.delete_trade(trade.id)[0]
+        for trade in _random_trades(30, seed=2):
+            journal.add_trade(trade)
+
+        incremental = _stats_snapshot(journal)
+        journal.rebuild_stats()
+        _assert_stats_equal(incremental, _stats_snapshot(journal))
+
+
+class TestQueries:
+    """查询与删除"""
+
+    def test_filters_and_paging(self, journal):
+        trades = journal.get_trades()
+        assert [t.trade_date for t in trades] == sorted((t.trade_date for t in trades), reverse=True)
+        assert all(t.code == '000001' for t in journal.get_trades(code='000001'))
+        assert journal.count_trades(action=TradeAction.SELL) == len(journal.get_trades(action=TradeAction.SELL))
+        assert len(journal.get_trades(strategy='')) == journal.count_trades(strategy='')
+
+        pages = [journal.get_trades(limit=64, offset=offset) for offset in range(0, 200, 64)]
+        assert [t.id for page in pages for t in page] == [t.id for t in trades]
+        assert journal.date_range() == (min(t.trade_date for t in trades), max(t.trade_date for t in trades))
+
+    def test_add_and_delete(self, tmp_path):
+        journal = TradeJournal(tmp_path / 'trade_journal.db')
+        buy = _trade('000001', TradeAction.BUY, 10.0, 200, 0)
+        sell = _trade('000001', TradeAction.SELL, 12.0, 100, 3)
+
+        assert journal.add_trade(buy)[0] and journal.add_trade(sell)[0]
+        assert journal.add_trade(_trade('000001', TradeAction.BUY, -1.0, 100, 0)) == (False, "成交价格必须大于0")
+        assert not journal.add_trade(buy)[0]  # 重复 ID
+        assert journal.calculate_performance().total_profit == pytest.approx(200.0)
+
+        assert journal.delete_trade(sell.id)[0]
+        assert journal.delete_trade(sell.id) == (False, f"未找到交易记录: {sell.id}")
+        performance = journal.calculate_performance()
+        assert (performance.total_trades, performance.closed_trades) == (1, 0)
+
+        reopened = TradeJournal(tmp_path / 'trade_journal.db')
+        assert reopened.get_all_trades() == [buy]
+
+
+class TestSignals:
+    """信号执行统计"""
+
+    def test_execution_stats(self, tmp_path):
+        signal_store = SignalStore(tmp_path / 'signal_history.db')
+        signal_store.save_signals([
+            TradingSignal(code=code, name='测试', signal_type=SignalType.BUY, price_range=(10.0, 10.5),
+                          limit_cap=10.6, reason='MACD金叉', generated_at=START, trade_amount=50000.0,
+                          high_fee_warning=False, actual_fee_rate=0.0003, news_url='', in_report_window=False)
+            for code in CODES
+        ], START)
+
+        journal = TradeJournal(tmp_path / 'trade_journal.db')
+        journal.add_trade(_trade('000001', TradeAction.BUY, 10.2, 100, 1, signal_id=f"{START}_000001",
+                                 signal_price=10.0))
+        journal.add_trade(_trade('600036', TradeAction.BUY, 9.9, 100, 1, signal_id=f"{START}_600036",
+                                 signal_price=10.0))
+        journal.add_trade(_trade('300750', TradeAction.BUY, 10.0, 100, 1))
+
+        stats = journal.get_signal_execution_stats(signal_store=signal_store)
+        assert stats['executed_signals'] == 2
+        assert stats['total_signals'] == 3
+        assert stats['signal_execution_rate'] == pytest.approx(2 / 3)
+        assert stats['average_slippage'] == pytest.approx((0.02 - 0.01) / 2)
+        assert stats['unexecuted_signals'] == [f"{START}_300750"]
+
+
+class TestMigration:
+    """CSV 迁移与导出"""
+
+    def test_migrates_legacy_csv(self, journal, tmp_path):
+        csv_path = tmp_path / 'legacy' / 'trade_journal.csv'
+        csv_path.parent.mkdir()
+        csv_path.write_text(journal.export_csv() + '000002,,买入,,,,\n', encoding='utf-8')
+
+        migrated = TradeJournal(csv_path)
+        assert migrated.file_path == csv_path.with_suffix('.db')
+        assert migrated.get_all_trades() == journal.get_all_trades()
+        _assert_stats_equal(_stats_snapshot(migrated), _stats_snapshot(journal))
+
+        # 已有数据时不再重复导入
+        assert TradeJournal(csv_path).count_trades() == 200
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+隔夜选股流水线基准测试
+
+在临时目录合成一个股票池的日线CSV，对比：
+- 逐只评分：逐只加载 → 计算技术指标 → score_stock（原流程）
+- 分阶段流水线：并行加载 → 整个股票池一次向量化计算指标 → 一次 score_batch
+
+两种方式均从冷缓存开始，并报告流水线各阶段耗时。
+
+使用方法:
+    python tools/benchmark_overnight_picker.py [--stocks 800] [--days 250]
+"""
+
+import sys
+import os
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.overnight_picker import OvernightStockPicker
+from core.overnight_picker.scorer_v6 import ScorerV6
+from tests.test_overnight_picker_pipeline import HOT_TOPICS, _OfflineFundFlowStore, _daily, _serial_scores
+
+
+def _picker(data_dir: Path, pool: list, store) -> OvernightStockPicker:
+    picker = OvernightStockPicker(data_path=str(data_dir), stock_pool=pool)
+    picker.scorer = ScorerV6(enable_logging=False, fund_flow_store=store)
+    return picker
+
+
+def run_benchmark(stocks: int, days: int) -> None:
+    """合成股票池并打印两种评分方式的耗时"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / 'processed'
+        data_dir.mkdir()
+        pool = [f"{600000 + i:06d}" for i in range(stocks)]
+        for i, code in enumerate(pool):
+            _daily(days, seed=i).to_csv(data_dir / f"{code}.csv", index=False)
+        store = _OfflineFundFlowStore(Path(tmp) / 'fund_flow')
+
+        start = time.perf_counter()
+        serial = _serial_scores(_picker(data_dir, pool, store), HOT_TOPICS)
+        serial_seconds = time.perf_counter() - start
+
+        timings = {}
+        start = time.perf_counter()
+        scored = _picker(data_dir, pool, store)._score_all_stocks(HOT_TOPICS, timings)
+        pipeline_seconds = time.perf_counter() - start
+
+    mismatched = sum(1 for s in scored if s['score'] != serial[s['code']][0])
+
+    print("=" * 60)
+    print("  隔夜选股流水线基准测试")
+    print("=" * 60)
+    print(f"股票池: {stocks}只，每只 {days} 个交易日")
+    print(f"逐只评分: {serial_seconds:.2f}s")
+    print(f"分阶段流水线: {pipeline_seconds:.2f}s (加速 {serial_seconds / pipeline_seconds:.1f}x)")
+    for stage, seconds in timings.items():
+        print(f"  {stage:>10}: {seconds * 1000:.1f} ms")
+    print(f"评分不一致: {mismatched}只")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='隔夜选股流水线基准测试')
+    parser.add_argument('--stocks', type=int, default=800, help='股票池数量')
+    parser.add_argument('--days', type=int, default=250, help='每只股票的交易日数')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    run_benchmark(args.stocks, args.days)
+
+
+if __name__ == '__main__':
+    main()
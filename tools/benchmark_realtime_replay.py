@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+实时监控盘中回放基准测试
+
+回放一个行情录制文件（默认合成一个交易时段），尽快回放整条盘中链路
+（回放数据获取 → 指标组装 → 买卖信号评估），报告各阶段耗时。
+同一录制文件的回放结果确定，可用于对比优化前后的耗时。
+
+使用方法:
+    python tools/benchmark_realtime_replay.py [--ticks 200] [--codes 20]
+    python tools/benchmark_realtime_replay.py --file data/realtime_ticks/20240105.ticks
+"""
+
+import sys
+import os
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.realtime_monitor.monitor import RealtimeMonitor
+from core.realtime_monitor.replay import ReplayDriver
+from core.realtime_monitor.tick_recorder import TickRecorder
+from tests.test_realtime_recorder import SESSION_START, _flow, _history, _quote
+
+
+def _synthetic_session(path: Path, ticks: int, codes: int) -> None:
+    """合成一个交易时段录制（每 3 秒一个快照）"""
+    histories = {f"{600000 + i:06d}": _history(seed=i) for i in range(codes)}
+    with TickRecorder(path) as recorder:
+        for code, df in histories.items():
+            recorder.record_history(code, df, timestamp=SESSION_START)
+        for i in range(ticks):
+            ts = SESSION_START + i * 3.0
+            drift = 1 + 0.002 * ((i % 40) - 20)
+            recorder.record_quotes({
+                code: _quote(code, round(float(df['close'].iloc[-1]) * drift, 2), 1_000_000 + i * 10_000)
+                for code, df in histories.items()
+            }, timestamp=ts)
+            recorder.record_fund_flows({code: _flow(code, 100.0 * (i // 20)) for code in histories},
+                                       timestamp=ts)
+
+
+def run_benchmark(path: Path) -> None:
+    """回放并打印各阶段耗时（监控列表为空，评估快照中的全部股票）"""
+    report = ReplayDriver(path, monitor=RealtimeMonitor()).run()
+
+    print("=" * 60)
+    print("  实时监控盘中回放基准测试")
+    print("=" * 60)
+    print(f"录制文件: {path} ({path.stat().st_size / 1024:.1f} KB)")
+    print(f"节拍数: {report.ticks}，录制跨度 {report.recorded_seconds:.0f}s，回放耗时 {report.wall_seconds:.2f}s")
+    print(f"买入信号: {report.buy_signals}，卖出信号: {report.sell_signals}，状态迁移: {len(report.events)}")
+    print(f"{'阶段':>8} {'平均(ms)':>10} {'最大(ms)':>10}")
+    for stage, stats in report.latency.items():
+        print(f"{stage:>8} {stats['avg_ms']:>10.2f} {stats['max_ms']:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='实时监控盘中回放基准测试')
+    parser.add_argument('--file', type=str, default=None, help='录制文件（默认合成一个交易时段）')
+    parser.add_argument('--ticks', type=int, default=200, help='合成时段的快照数')
+    parser.add_argument('--codes', type=int, default=20, help='合成时段的股票数')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.file:
+        run_benchmark(Path(args.file))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'session.ticks'
+        _synthetic_session(path, args.ticks, args.codes)
+        run_benchmark(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+实时监控大容量模式基准测试
+
+逐步放大监控列表规模，对比：
+- 逐只组装：每只股票用完整历史调用 TechIndicators 计算指标（DataFetcher 的组装方式，不含网络）
+- 大容量模式：一次行情快照 + 增量指标状态向量化计算
+
+并报告指标状态的每只股票内存占用。
+
+使用方法:
+    python tools/benchmark_realtime_watchlist.py [--sizes 20,100,300,500] [--rounds 5]
+"""
+
+import sys
+import os
+import argparse
+import time
+import logging
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.test_realtime_monitor_bulk import _StubBulkFetcher, _universe
+
+
+def _per_code_refresh(fetcher, frames, quotes, codes):
+    """逐只组装：每次刷新对每只股票全量计算指标"""
+    for code in codes:
+        fetcher._build_stock_data(code, quotes[code], frames[code], None)
+
+
+def run_benchmark(sizes: list, rounds: int) -> None:
+    """运行基准测试并打印刷新耗时与内存占用"""
+    print("=" * 78)
+    print("  实时监控大容量模式基准测试")
+    print("=" * 78)
+    print(f"{'监控数量':>8} {'逐只组装(ms)':>14} {'大容量刷新(ms)':>16} {'状态构建(ms)':>14} {'每只内存(B)':>12}")
+
+    for size in sizes:
+        frames, quotes = _universe(size)
+        codes = list(frames)
+        fetcher = _StubBulkFetcher(frames, quotes)
+
+        start = time.perf_counter()
+        fetcher.prepare(codes)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fetcher.fetch_stock_data_batch(codes)
+        bulk_ms = (time.perf_counter() - start) * 1000 / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            _per_code_refresh(fetcher, frames, quotes, codes)
+        per_code_ms = (time.perf_counter() - start) * 1000 / rounds
+
+        memory = fetcher.memory_usage()
+        print(f"{size:>8} {per_code_ms:>14.1f} {bulk_ms:>16.1f} {build_ms:>14.1f} "
+              f"{memory['bytes_per_code']:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='实时监控大容量模式基准测试')
+    parser.add_argument('--sizes', type=str, default='20,100,300,500', help='监控数量列表（逗号分隔）')
+    parser.add_argument('--rounds', type=int, default=5, help='每个规模的刷新轮数')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    run_benchmark([int(s) for s in args.sizes.split(',')], args.rounds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+选股器精筛阶段快照索引基准测试
+
+固定候选股票数量，逐步放大预剪枝快照规模，
+验证精筛阶段单只股票的开销与快照规模无关。
+
+使用方法:
+    python tools/benchmark_screener_snapshot_index.py [--candidates N] [--sizes 100,1000,5000]
+"""
+
+import sys
+import os
+import argparse
+import time
+import logging
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.screener import Screener, MarketFilter, IndustryDiversification
+from tests.test_screener_validation import _StubDataFeed, _make_snapshot, _make_history
+
+
+def run_benchmark(candidates: int, sizes: list) -> None:
+    """运行基准测试并打印每只股票的平均开销"""
+    print("=" * 60)
+    print(f"  精筛快照索引基准测试（候选 {candidates} 只）")
+    print("=" * 60)
+    print(f"{'快照规模':>10} {'总耗时(ms)':>12} {'单股开销(ms)':>14} {'索引构建(ms)':>14}")
+
+    for size in sizes:
+        snapshot = _make_snapshot(size)
+        codes = snapshot['code'][:candidates].tolist()
+        history = {code: _make_history(seed=i) for i, code in enumerate(codes)}
+
+        screener = Screener(_StubDataFeed(snapshot, history))
+        screener.set_market_filter(MarketFilter(enabled=False))
+        screener.set_industry_diversification(IndustryDiversification(enabled=False))
+        screener._get_stock_industry = lambda code: '未知'
+        screener._check_report_window = lambda code, window_days=3: False
+
+        start = time.perf_counter()
+        Screener._build_snapshot_index(snapshot, codes)
+        index_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        screener.screen()
+        total_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{size:>10} {total_ms:>12.1f} {total_ms / len(codes):>14.2f} {index_ms:>14.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='选股器精筛快照索引基准测试')
+    parser.add_argument('--candidates', type=int, default=50, help='候选股票数量')
+    parser.add_argument('--sizes', type=str, default='100,1000,5000', help='快照规模列表（逗号分隔）')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    sizes = [int(x) for x in args.sizes.split(',') if x.strip()]
+    run_benchmark(args.candidates, sizes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+每日流程流水线命令行入口
+
+按 build_daily_pipeline 的阶段运行收盘后每日流程：
+读取本地日线 → 大盘状态 → 指标截面 → 选股 → 买入信号 / 持仓卖出信号 → 飞书通知。
+产物按内容哈希持久化在 data/pipeline，输入未变化的阶段复用上次结果。
+
+范围说明：流水线只覆盖 Screener + SignalGenerator + SellSignalChecker 的每日信号流程，
+隔夜选股（tools/overnight_stock_picker.py）、TechSignalGenerator 与股票池自动更新
+（auto_update_pool.py）仍按各自入口运行。
+
+使用方法:
+    python tools/daily_pipeline.py
+    python tools/daily_pipeline.py --codes 600519,000001 --no-notify
+"""
+
+import sys
+import os
+import argparse
+import logging
+from datetime import date
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import get_settings
+from config.stock_pool import get_watchlist
+from core.data_feed import DataFeed
+from core.pipeline import ArtifactStore, build_daily_pipeline
+from core.position_tracker import PositionTracker
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="每日流程流水线")
+    parser.add_argument('--codes', type=str, default='',
+                        help='股票池代码，用逗号分隔 (默认: 自选股池)')
+    parser.add_argument('--no-notify', action='store_true', help='不发送飞书通知')
+    parser.add_argument('--store', type=str, default=str(ArtifactStore.DEFAULT_ROOT),
+                        help=f'产物仓库目录 (默认: {ArtifactStore.DEFAULT_ROOT})')
+    parser.add_argument('--workers', type=int, default=4, help='最大并发阶段数 (默认: 4)')
+    parser.add_argument('--notify-timeout', type=float, default=30.0,
+                        help='退出前等待飞书通知送达的秒数 (默认: 30)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    settings = get_settings()
+    data_feed = DataFeed(
+        raw_path=settings.path.get_raw_path(),
+        processed_path=settings.path.get_processed_path()
+    )
+    stock_pool = [c.strip() for c in args.codes.split(',') if c.strip()] or list(get_watchlist())
+
+    pipeline = build_daily_pipeline(
+        data_feed,
+        store=ArtifactStore(args.store),
+        send_notification=not args.no_notify,
+        max_workers=args.workers,
+        notification_timeout=args.notify_timeout,
+    )
+    result = pipeline.run({
+        'stock_pool': stock_pool,
+        'positions': PositionTracker().get_all_positions(),
+        'trade_date': date.today().isoformat(),
+    })
+
+    print("=" * 60)
+    print(f"股票池: {len(stock_pool)} 只, 耗时 {result.total_duration:.2f} 秒")
+    for name, stage in result.stage_results.items():
+        line = f"  {name:<16} {stage.status:<9} {stage.duration:.2f}s"
+        print(line + (f"  {stage.error}" if stage.error else ""))
+
+    buy_signals = result.artifacts.get('buy_signals') or []
+    sell_signals = result.artifacts.get('sell_signals') or []
+    print(f"买入信号: {len(buy_signals)} 个")
+    for signal in buy_signals:
+        print(f"  {signal.code} {signal.name} {signal.reason}")
+    print(f"卖出信号: {len(sell_signals)} 个")
+    for signal in sell_signals:
+        print(f"  {signal.code} {signal.name} {signal.exit_reason}")
+    print("=" * 60)
+
+    return 0 if result.success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
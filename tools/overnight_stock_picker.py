@@ -39,6 +39,7 @@ from core.overnight_picker import (
     OvernightStockPicker,
     TradingPlan,
     create_overnight_picker,
+    get_feature_store,
     TradingPlanGenerator,
 )
 
@@ -168,6 +169,18 @@ def parse_args():
         help='炸板率 (用于情绪分析，默认: 0.15)'
     )
     
+    parser.add_argument(
+        '--limit-index',
+        action='store_true',
+        help='从股票池日线构建涨跌停索引，情绪分析与股性涨停/连板特征按索引计算'
+    )
+    
+    parser.add_argument(
+        '--feature-store',
+        action='store_true',
+        help='使用特征库 (data/features)：每晚增量更新后直接查表评分'
+    )
+    
     # 其他功能
     parser.add_argument(
         '--history',
@@ -281,6 +294,7 @@ def run_stock_picker(args) -> Optional[TradingPlan]:
         min_score=args.min_score,
         data_path=args.data_path,
         stock_pool=stock_pool,
+        feature_store=get_feature_store() if args.feature_store else None,
     )
     
     # 刷新数据
@@ -293,6 +307,11 @@ def run_stock_picker(args) -> Optional[TradingPlan]:
         if not quiet:
             print(f"数据刷新完成: 成功 {success_count}/{len(results)}")
     
+    # 涨跌停索引（在数据刷新之后构建）
+    if args.limit_index:
+        print_section("构建涨跌停索引", quiet)
+        picker.build_limit_index()
+    
     # 运行选股
     print_section("运行选股流程", quiet)
     
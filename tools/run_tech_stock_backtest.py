@@ -29,7 +29,8 @@ def main():
         max_recommendations=15,  # 每日推荐15只股票
         data_path='data/processed',
         stock_pool=tech_stocks,
-        save_report=True
+        save_report=True,
+        use_market_breadth=True,  # 按历史大盘环境与情绪仓位重现每日选股
     )
 
     # 输出结果